@@ -0,0 +1,125 @@
+"""Benchmarks the event driven Backtester and the vectorized fast path, in bars per second.
+
+The bars are a random walk for each symbol, so the benchmark doesn't need
+the TD Ameritrade API. Run it from the root of the repository:
+
+    python samples/benchmark_backtester.py
+"""
+
+import sys
+import time
+import pathlib
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.trades import Trade
+from pyrobot.signals import Condition
+from pyrobot.signals import SignalEvaluator
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.backtest import Backtester
+from pyrobot.backtest import SimulatedBroker
+from pyrobot.backtest import vectorized_backtest
+
+SYMBOLS = ['SYM{:03d}'.format(index) for index in range(20)]
+BARS_PER_SYMBOL = 1000
+
+# Buy when the close crosses above the SMA, sell when it falls below it.
+SIGNAL_EVALUATOR = SignalEvaluator(
+    buy_rule=Condition('close', '>', 'sma'),
+    sell_rule=Condition('close', '<', 'sma')
+)
+
+
+def create_bars() -> dict:
+    """Creates a random walk of one minute bars for each symbol."""
+
+    random_state = np.random.RandomState(42)
+    columns = {column: [] for column in ['symbol', 'datetime', 'open', 'close', 'high', 'low', 'volume']}
+
+    for symbol in SYMBOLS:
+
+        close = 100.0 * np.cumprod(1.0 + random_state.normal(0.0, 0.002, size=BARS_PER_SYMBOL))
+        open_price = np.concatenate([[close[0]], close[:-1]])
+
+        columns['symbol'].extend([symbol] * BARS_PER_SYMBOL)
+        columns['datetime'].extend((1586390400000 + np.arange(BARS_PER_SYMBOL) * 60000).tolist())
+        columns['open'].extend(open_price.tolist())
+        columns['close'].extend(close.tolist())
+        columns['high'].extend((np.maximum(open_price, close) * 1.001).tolist())
+        columns['low'].extend((np.minimum(open_price, close) * 0.999).tolist())
+        columns['volume'].extend([1000.0] * BARS_PER_SYMBOL)
+
+    return columns
+
+
+def create_trades() -> dict:
+    """Creates a buy trade for each symbol, which `PyRobot.execute_signals` executes on any signal."""
+
+    trades_to_execute = {}
+
+    for symbol in SYMBOLS:
+
+        trade = Trade()
+        trade.new_trade(trade_id=symbol + '_enter', order_type='mkt', side='long', enter_or_exit='enter')
+        trade.instrument(symbol=symbol, quantity=10, asset_type='EQUITY')
+        trades_to_execute[symbol] = {'trade_func': trade}
+
+    return trades_to_execute
+
+
+def main():
+
+    bars = create_bars()
+
+    backtester = Backtester(
+        bars=bars,
+        trades_to_execute=create_trades(),
+        warmup_bars=50,
+        broker=SimulatedBroker(cash=1000000.0, slippage=0.0005)
+    )
+    backtester.indicators.rsi(period=14)
+    backtester.indicators.sma(period=20)
+
+    # `execute_signals` executes the same trade on any signal, so only the buys are traded.
+    backtester.indicators.set_signal_rules(buy_rule=SIGNAL_EVALUATOR.buy_rule)
+
+    backtest_result = backtester.run()
+    summary = backtest_result.summary()
+    backtester.close()
+
+    print('Event driven: {bars} bars in {elapsed:.2f}s, {rate:,.0f} bars/s, {fills} fills'.format(
+        bars=summary['bars'],
+        elapsed=summary['elapsed'],
+        rate=summary['bars_per_second'],
+        fills=summary['number_of_fills']
+    ))
+
+    start = time.perf_counter()
+
+    stock_frame = StockFrame(data=bars)
+    indicator_client = Indicators(price_data_frame=stock_frame, engine='numpy')
+    indicator_client.rsi(period=14)
+    indicator_client.sma(period=20)
+
+    results = vectorized_backtest(
+        stock_frame=stock_frame,
+        signal_evaluator=SIGNAL_EVALUATOR,
+        slippage=0.0005
+    )
+
+    elapsed = time.perf_counter() - start
+    total_bars = len(SYMBOLS) * BARS_PER_SYMBOL
+
+    print('Vectorized: {bars} bars in {elapsed:.3f}s, {rate:,.0f} bars/s, mean return {mean_return:.4f}'.format(
+        bars=total_bars,
+        elapsed=elapsed,
+        rate=total_bars / elapsed,
+        mean_return=results['total_return'].mean()
+    ))
+
+
+if __name__ == '__main__':
+    main()
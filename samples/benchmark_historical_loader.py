@@ -0,0 +1,139 @@
+"""Benchmarks the HistoricalLoader against a local stub of the price history endpoint.
+
+The stub adds a fixed latency to every request, to stand in for the round
+trip to the TD Ameritrade API. Run it from the root of the repository:
+
+    python samples/benchmark_historical_loader.py
+"""
+
+import sys
+import json
+import time
+import pathlib
+import threading
+
+import pandas as pd
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.client import TDClient
+from pyrobot.stock_frame import StockFrame
+from pyrobot.historical import RateLimiter
+from pyrobot.historical import HistoricalLoader
+
+SYMBOLS = ['SYM{:03d}'.format(index) for index in range(300)]
+CANDLES_PER_SYMBOL = 390
+LATENCY = 0.05
+
+
+class PriceHistoryHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+
+        symbol = self.path.split('/')[3]
+        candles = [
+            {
+                'open': 100.0 + index,
+                'close': 100.5 + index,
+                'high': 101.0 + index,
+                'low': 99.0 + index,
+                'volume': 1000 + index,
+                'datetime': 1586390400000 + index * 60000
+            }
+            for index in range(CANDLES_PER_SYMBOL)
+        ]
+
+        content = json.dumps({'candles': candles, 'symbol': symbol, 'empty': False}).encode('utf-8')
+
+        time.sleep(LATENCY)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_client(port: int, credentials_path: str) -> TDClient:
+    """Creates a TDClient pointed at the stub, with a token that won't expire."""
+
+    td_client = TDClient(
+        client_id='BENCHMARK',
+        redirect_uri='http://localhost',
+        credentials_path=credentials_path
+    )
+    td_client.config['api_endpoint'] = 'http://127.0.0.1:{port}'.format(port=port)
+    td_client.state['access_token'] = 'BENCHMARK'
+    td_client.state['access_token_expires_at'] = time.time() + 3600
+
+    return td_client
+
+
+def load_one_at_a_time(td_client: TDClient) -> StockFrame:
+    """The old way, one symbol at a time, with a dictionary per candle."""
+
+    new_prices = []
+
+    for symbol in SYMBOLS:
+
+        historical_prices_response = td_client.get_price_history(symbol=symbol, period_type='day')
+
+        for candle in historical_prices_response['candles']:
+
+            new_price_mini_dict = {}
+            new_price_mini_dict['symbol'] = symbol
+            new_price_mini_dict['open'] = candle['open']
+            new_price_mini_dict['close'] = candle['close']
+            new_price_mini_dict['high'] = candle['high']
+            new_price_mini_dict['low'] = candle['low']
+            new_price_mini_dict['volume'] = candle['volume']
+            new_price_mini_dict['datetime'] = candle['datetime']
+            new_prices.append(new_price_mini_dict)
+
+    return StockFrame(data=new_prices)
+
+
+def load_concurrently(td_client: TDClient, max_workers: int) -> StockFrame:
+    """The HistoricalLoader, with a rate limit that doesn't get in the way."""
+
+    historical_loader = HistoricalLoader(
+        td_client=td_client,
+        max_workers=max_workers,
+        rate_limiter=RateLimiter(max_calls=10000, period=60.0)
+    )
+    _, new_prices = historical_loader.load(symbols=SYMBOLS, period_type='day')
+
+    return StockFrame(data=new_prices)
+
+
+if __name__ == '__main__':
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PriceHistoryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    credentials_path = str(pathlib.Path(__file__).parent.joinpath('benchmark_credentials.json'))
+    td_client = create_client(port=server.server_address[1], credentials_path=credentials_path)
+
+    print('{} symbols, {} candles each, {:.0f} ms latency per request.'.format(
+        len(SYMBOLS), CANDLES_PER_SYMBOL, LATENCY * 1000)
+    )
+
+    start = time.perf_counter()
+    sequential_frame = load_one_at_a_time(td_client=td_client)
+    print('One at a time:         {:.2f}s'.format(time.perf_counter() - start))
+
+    for max_workers in [8, 16, 32]:
+
+        start = time.perf_counter()
+        concurrent_frame = load_concurrently(td_client=td_client, max_workers=max_workers)
+        print('HistoricalLoader ({:>2}): {:.2f}s'.format(max_workers, time.perf_counter() - start))
+
+        pd.testing.assert_frame_equal(concurrent_frame.frame, sequential_frame.frame, check_dtype=False)
+
+    server.shutdown()
@@ -0,0 +1,131 @@
+"""Compares the size and read time of the long and wide level one formats.
+
+Writes the same stream of quote updates, where each update only sends the
+fields that changed, as a row per field in a CSV file, as wide records in a
+CSV file, and as wide records in column arrays. Then reads each one back
+into a frame with a row per update and a column per field. Run it from the
+root of the repository:
+
+    python samples/benchmark_level_one_records.py
+"""
+
+import sys
+import time
+import random
+import pathlib
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.stream import TDStreamerClient
+from td.sinks import CsvSink
+from td.sinks import ColumnarSink
+from td.sinks import records_path
+
+SYMBOLS = ['SYM{:03d}'.format(index) for index in range(50)]
+FIELDS = ['1', '2', '3', '4', '5', '8', '9', '10', '11', '12', '13', '28', '29', '49']
+UPDATES = 20000
+
+
+def create_messages() -> list:
+    """A full quote for every symbol, and then updates of a few fields at a time."""
+
+    random_state = random.Random(0)
+    messages = []
+
+    for timestamp in range(UPDATES // len(SYMBOLS)):
+
+        content = []
+
+        for symbol in SYMBOLS:
+
+            fields = FIELDS if timestamp == 0 else random_state.sample(FIELDS, k=3)
+            update = {'key': symbol}
+
+            for field in fields:
+                update[field] = round(random_state.uniform(10, 500), 2) if field not in ['4', '5', '8', '9'] else random_state.randint(1, 10000)
+
+            content.append(update)
+
+        messages.append({'data': [{'service': 'QUOTE', 'timestamp': 1591046000000 + timestamp, 'command': 'SUBS', 'content': content}]})
+
+    return messages
+
+
+def write(stream_client: TDStreamerClient, messages: list, sink, batch_size: int = 20) -> None:
+    """Parses the messages and writes them to the sink in batches, the way the `StreamWriter` would."""
+
+    for start in range(0, len(messages), batch_size):
+
+        level_one_rows = []
+        level_two_rows = []
+        records = {}
+
+        for message in messages[start:start + batch_size]:
+
+            message_level_one_rows, message_level_two_rows, message_records = stream_client._message_rows(data=message)
+            level_one_rows.extend(message_level_one_rows)
+            level_two_rows.extend(message_level_two_rows)
+
+            for schema, schema_records in message_records.items():
+                records.setdefault(schema, []).extend(schema_records)
+
+        sink.write_rows(level_one_rows=level_one_rows, level_two_rows=level_two_rows)
+
+        for schema, schema_records in records.items():
+            sink.write_records(schema=schema, records=schema_records)
+
+    sink.close()
+
+
+if __name__ == '__main__':
+
+    messages = create_messages()
+    folder = pathlib.Path(tempfile.mkdtemp())
+
+    stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+    stream_client.data_requests['requests'].append(
+        {'service': 'QUOTE', 'parameters': {'keys': ','.join(SYMBOLS), 'fields': ','.join(['0'] + FIELDS)}}
+    )
+
+    # A row per field.
+    long_path = folder.joinpath('long.csv')
+    write(stream_client=stream_client, messages=messages, sink=CsvSink(file_path=long_path, append_mode=False))
+
+    # A record per update, as CSV and as column arrays.
+    stream_client.write_behavior(file_path=str(folder.joinpath('unused.csv')), level_one_format='wide')
+    wide_path = folder.joinpath('wide.csv')
+    write(stream_client=stream_client, messages=messages, sink=CsvSink(file_path=wide_path, append_mode=False))
+
+    stream_client.level_one_records.reset()
+    write(stream_client=stream_client, messages=messages, sink=ColumnarSink(folder=folder.joinpath('columnar')))
+
+    wide_records_path = records_path(file_path=wide_path, service='QUOTE')
+    columnar_size = sum(path.stat().st_size for path in folder.joinpath('columnar').glob('records_*.npz'))
+
+    print('{} updates of {} symbols.'.format(UPDATES, len(SYMBOLS)))
+    print('Long CSV:      {:>10,} bytes'.format(long_path.stat().st_size))
+    print('Wide CSV:      {:>10,} bytes'.format(wide_records_path.stat().st_size))
+    print('Wide columnar: {:>10,} bytes'.format(columnar_size))
+
+    start = time.perf_counter()
+    long_frame = pd.read_csv(long_path, header=None, names=['timestamp', 'service', 'field_id', 'field_name', 'value'])
+    long_frame = long_frame[long_frame['field_name'] != 'symbol']
+    symbols = pd.read_csv(long_path, header=None, usecols=[0, 3, 4], names=['timestamp', 'field_name', 'value'])
+    long_frame = long_frame.assign(
+        symbol=symbols['value'].where(symbols['field_name'] == 'symbol').ffill(),
+        value=pd.to_numeric(long_frame['value'])
+    )
+    long_frame = long_frame.pivot_table(index=['timestamp', 'symbol'], columns='field_name', values='value')
+    long_frame = long_frame.groupby(level='symbol').ffill()
+    print('Read long CSV, pivot and forward fill: {:.3f}s'.format(time.perf_counter() - start))
+
+    start = time.perf_counter()
+    pd.read_csv(wide_records_path)
+    print('Read wide CSV:                         {:.3f}s'.format(time.perf_counter() - start))
+
+    start = time.perf_counter()
+    pd.DataFrame(ColumnarSink.read_records(folder=folder.joinpath('columnar'), service='QUOTE'))
+    print('Read wide columnar:                    {:.3f}s'.format(time.perf_counter() - start))
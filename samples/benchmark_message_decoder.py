@@ -0,0 +1,131 @@
+"""Measures how many stream messages a second each decoder gets through.
+
+Reads a capture of the stream, one raw message per line, and decodes it
+the way the stream used to, trying `json.loads` and repairing the message
+by encoding it again if that failed, the way `StreamingMessage` used to,
+always encoding it again, and with the `MessageDecoder`, once per
+installed backend. The `MessageDecoder` is also measured decoding into a
+record per service, with the level one updates typed. Without a capture,
+one is made of quotes and books, with one message in a hundred holding a
+replacement character, and saved with `--save`. Run it from the root of
+the repository:
+
+    python samples/benchmark_message_decoder.py --save capture.jsonl
+    python samples/benchmark_message_decoder.py [capture.jsonl]
+"""
+
+import sys
+import json
+import time
+import random
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.decoder import MessageDecoder
+from td.decoder import available_backends
+from td.records import LevelOneRecords
+
+MESSAGES = 20000
+
+
+def create_capture() -> list:
+    """Quotes of a few symbols, and a level two book every fifth message."""
+
+    random_state = random.Random(0)
+    messages = []
+
+    for index in range(MESSAGES):
+
+        if index % 5 == 0:
+            levels = [{'0': 100 + level / 100, '1': 100 * level, '2': 1, '3': [{'0': 'NSDQ', '1': 100, '2': 1000}]} for level in range(10)]
+            service = {'service': 'NASDAQ_BOOK', 'timestamp': index, 'command': 'SUBS', 'content': [{'key': 'MSFT', '1': index, '2': levels, '3': levels}]}
+        else:
+            content = [{'key': 'SYM{}'.format(symbol), '1': random_state.uniform(10, 500), '2': random_state.uniform(10, 500), '8': random_state.randint(1, 10 ** 6)} for symbol in range(5)]
+            service = {'service': 'QUOTE', 'timestamp': index, 'command': 'SUBS', 'content': content}
+
+        message = json.dumps({'data': [service]})
+
+        if index % 100 == 0:
+            message = message.replace('"8": ', '"8": \ufffd, "9": ', 1)
+
+        messages.append(message)
+
+    return messages
+
+
+def decode_before(message: str) -> dict:
+    """The old `TDStreamerClient._parse_json_message`."""
+
+    try:
+        message_decoded = json.loads(message)
+    except:
+        message = message.encode('utf-8').replace(b'\xef\xbf\xbd', bytes('"None"', 'utf-8')).decode('utf-8')
+        message_decoded = json.loads(message)
+
+    return message_decoded
+
+
+def decode_streaming_message_before(message: str) -> dict:
+    """The old `StreamingMessage.parse`."""
+
+    message = message.encode('utf-8').replace(b'\xef\xbf\xbd', bytes('"None"', 'utf-8')).decode('utf-8')
+
+    return json.loads(message)
+
+
+def decode_typed_before(level_one_records: LevelOneRecords):
+    """The old stream, decoding the message and then walking it again to type the level one updates."""
+
+    def decode(message: str) -> dict:
+
+        message_decoded = decode_before(message)
+
+        for service_result in message_decoded.get('data', []):
+            if level_one_records.has_schema(service=service_result['service']):
+                level_one_records.update(
+                    service=service_result['service'],
+                    timestamp=service_result['timestamp'],
+                    content=service_result['content']
+                )
+
+        return message_decoded
+
+    return decode
+
+
+def measure(name: str, decode, messages: list) -> None:
+
+    start = time.perf_counter()
+
+    for message in messages:
+        decode(message)
+
+    elapsed = time.perf_counter() - start
+    print('{:<36} {:>10,.0f} messages/s'.format(name + ':', len(messages) / elapsed))
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 2 and sys.argv[1] == '--save':
+        with open(sys.argv[2], 'w') as capture:
+            capture.writelines(message + '\n' for message in create_capture())
+        sys.exit()
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as capture:
+            messages = [line.rstrip('\n') for line in capture]
+    else:
+        messages = create_capture()
+
+    measure(name='Stream, before', decode=decode_before, messages=messages)
+    measure(name='StreamingMessage, before', decode=decode_streaming_message_before, messages=messages)
+    measure(name='Stream, before, typed', decode=decode_typed_before(level_one_records=LevelOneRecords()), messages=messages)
+
+    for backend in available_backends():
+
+        decoder = MessageDecoder(backend=backend)
+
+        measure(name='MessageDecoder ({})'.format(backend), decode=decoder.loads, messages=messages)
+        measure(name='MessageDecoder ({}), bytes'.format(backend), decode=decoder.loads, messages=[message.encode('utf-8') for message in messages])
+        measure(name='MessageDecoder ({}), typed'.format(backend), decode=decoder.decode, messages=messages)
@@ -0,0 +1,113 @@
+"""Replays recorded level two messages through the order books.
+
+Reads a recording of the stream, one JSON message per line, and measures
+how many messages a second the books are updated from, next to flattening
+the same messages into rows like the CSV writer does, and how long the
+queries of a book take. Without a recording, one is made of 20 symbols
+with 10 levels a side. Run it from the root of the repository:
+
+    python samples/benchmark_order_book.py [recording.jsonl]
+"""
+
+import sys
+import json
+import time
+import random
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.stream import TDStreamerClient
+from td.order_book import OrderBooks
+
+SYMBOLS = ['SYM{:03d}'.format(index) for index in range(20)]
+LEVELS = 10
+MESSAGES = 20000
+
+
+def create_recording(path: pathlib.Path) -> None:
+    """Records a random walk of the books of a few symbols, a symbol per message."""
+
+    random_state = random.Random(0)
+    mid_prices = {symbol: random_state.uniform(20, 500) for symbol in SYMBOLS}
+
+    with open(path, mode='w') as recording:
+
+        for index in range(MESSAGES):
+
+            symbol = SYMBOLS[index % len(SYMBOLS)]
+            mid_prices[symbol] += random_state.choice([-0.01, 0.0, 0.01])
+            best_bid = round(mid_prices[symbol] - 0.01, 2)
+
+            def levels(first, step):
+                return [
+                    {
+                        '0': round(first + step * level, 2),
+                        '1': random_state.randint(1, 50) * 100,
+                        '2': 1,
+                        '3': [{'0': 'NSDQ', '1': 100, '2': 1000}]
+                    }
+                    for level in range(LEVELS)
+                ]
+
+            message = {
+                'data': [
+                    {
+                        'service': 'NASDAQ_BOOK',
+                        'timestamp': 1591046000000 + index,
+                        'command': 'SUBS',
+                        'content': [
+                            {'key': symbol, '1': 1591046000000 + index, '2': levels(best_bid, -0.01), '3': levels(best_bid + 0.02, 0.01)}
+                        ]
+                    }
+                ]
+            }
+
+            recording.write(json.dumps(message) + '\n')
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 1:
+        recording_path = pathlib.Path(sys.argv[1])
+    else:
+        recording_path = pathlib.Path(tempfile.mkdtemp()).joinpath('level_two.jsonl')
+        create_recording(path=recording_path)
+
+    with open(recording_path) as recording:
+        messages = [json.loads(line) for line in recording]
+
+    stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+
+    start = time.perf_counter()
+    for message in messages:
+        stream_client._message_rows(data=message)
+    elapsed = time.perf_counter() - start
+    print('Flatten into rows:  {:>10,.0f} messages/s'.format(len(messages) / elapsed))
+
+    order_books = OrderBooks()
+
+    start = time.perf_counter()
+    order_books.replay(messages=messages)
+    elapsed = time.perf_counter() - start
+    print('Update the books:   {:>10,.0f} messages/s'.format(len(messages) / elapsed))
+
+    books = list(order_books)
+    queries = {
+        'best bid and ask': lambda order_book: (order_book.best_bid, order_book.best_ask),
+        'microprice': lambda order_book: order_book.microprice(),
+        'imbalance (5)': lambda order_book: order_book.imbalance(levels=5),
+        'snapshot (10)': lambda order_book: order_book.snapshot(levels=10)
+    }
+
+    for name, query in queries.items():
+
+        start = time.perf_counter()
+
+        for _ in range(1000):
+            for order_book in books:
+                query(order_book)
+
+        elapsed = time.perf_counter() - start
+        print('{:<18}  {:>10.2f} µs'.format(name + ':', elapsed / (1000 * len(books)) * 1e6))
@@ -0,0 +1,138 @@
+"""Benchmarks the OrderDispatcher against a local stub of the place order endpoint.
+
+The stub adds a fixed latency to every order, to stand in for the round trip
+to the TD Ameritrade API. The old way opened a new session for every order, so
+it's compared with the orders placed one at a time on a new connection each,
+one at a time on the pooled session, and all at once by the dispatcher. The
+stub is plain HTTP, so a new connection only costs a TCP handshake here, the
+TLS handshake of the real API would cost more. Run it from the root of the
+repository:
+
+    python samples/benchmark_order_dispatcher.py
+"""
+
+import sys
+import time
+import pathlib
+import threading
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.client import TDClient
+from pyrobot.historical import RateLimiter
+from pyrobot.order_dispatcher import OrderDispatcher
+
+SYMBOLS = ['SYM{:03d}'.format(index) for index in range(50)]
+LATENCY = 0.05
+
+
+class PlaceOrderHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+
+        self.rfile.read(int(self.headers['Content-Length']))
+
+        time.sleep(LATENCY)
+
+        self.send_response(201)
+        self.send_header('Location', 'http://127.0.0.1/v1/accounts/BENCHMARK/orders/{}'.format(time.monotonic_ns()))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_client(port: int, credentials_path: str) -> TDClient:
+    """Creates a TDClient pointed at the stub, with a token that won't expire."""
+
+    td_client = TDClient(
+        client_id='BENCHMARK',
+        redirect_uri='http://localhost',
+        credentials_path=credentials_path
+    )
+    td_client.config['api_endpoint'] = 'http://127.0.0.1:{port}'.format(port=port)
+    td_client.state['access_token'] = 'BENCHMARK'
+    td_client.state['access_token_expires_at'] = time.time() + 3600
+
+    return td_client
+
+
+def create_order(symbol: str) -> dict:
+    """A market order to buy a single share."""
+
+    return {
+        'orderType': 'MARKET',
+        'session': 'NORMAL',
+        'duration': 'DAY',
+        'orderStrategyType': 'SINGLE',
+        'orderLegCollection': [
+            {'instruction': 'BUY', 'quantity': 1, 'instrument': {'symbol': symbol, 'assetType': 'EQUITY'}}
+        ]
+    }
+
+
+def place_one_at_a_time(td_client: TDClient, orders: list, new_connection: bool) -> list:
+    """Places the orders one after another, like `execute_signals` used to."""
+
+    responses = []
+
+    for order in orders:
+
+        responses.append(td_client.place_order(account='BENCHMARK', order=order))
+
+        # The old `_make_request` closed its session after every request.
+        if new_connection:
+            td_client.close_session()
+
+    return responses
+
+
+def place_concurrently(td_client: TDClient, orders: list, max_workers: int) -> list:
+    """The OrderDispatcher, with a rate limit that doesn't get in the way."""
+
+    order_dispatcher = OrderDispatcher(
+        td_client=td_client,
+        max_workers=max_workers,
+        rate_limiter=RateLimiter(max_calls=10000, period=60.0)
+    )
+    results = order_dispatcher.place_orders(account='BENCHMARK', orders=orders)
+    order_dispatcher.close()
+
+    return [result.response for result in results if result.error is None]
+
+
+if __name__ == '__main__':
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PlaceOrderHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    credentials_path = str(pathlib.Path(__file__).parent.joinpath('benchmark_credentials.json'))
+    td_client = create_client(port=server.server_address[1], credentials_path=credentials_path)
+    orders = [create_order(symbol=symbol) for symbol in SYMBOLS]
+
+    print('{} orders, {:.0f} ms latency per order.'.format(len(orders), LATENCY * 1000))
+
+    start = time.perf_counter()
+    responses = place_one_at_a_time(td_client=td_client, orders=orders, new_connection=True)
+    print('One at a time, new connections: {:.2f}s'.format(time.perf_counter() - start))
+
+    start = time.perf_counter()
+    responses = place_one_at_a_time(td_client=td_client, orders=orders, new_connection=False)
+    print('One at a time, pooled session:  {:.2f}s'.format(time.perf_counter() - start))
+
+    for max_workers in [8, 16, 32]:
+
+        start = time.perf_counter()
+        responses = place_concurrently(td_client=td_client, orders=orders, max_workers=max_workers)
+        print('OrderDispatcher ({:>2}):          {:.2f}s'.format(max_workers, time.perf_counter() - start))
+
+        assert len(responses) == len(orders)
+
+    td_client.close_session()
+    server.shutdown()
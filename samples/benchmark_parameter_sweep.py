@@ -0,0 +1,85 @@
+"""Benchmarks a parameter sweep of the MACD, and a rerun served from the cache.
+
+The bars are a random walk for each symbol, so the benchmark doesn't need
+the TD Ameritrade API. Run it from the root of the repository:
+
+    python samples/benchmark_parameter_sweep.py
+"""
+
+import sys
+import time
+import pickle
+import pathlib
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.signals import Condition
+from pyrobot.signals import SignalEvaluator
+from pyrobot.stock_frame import StockFrame
+from pyrobot.sweep import ParameterSweep
+from pyrobot.sweep import parameter_grid
+
+SYMBOLS = ['SYM{:03d}'.format(index) for index in range(20)]
+BARS_PER_SYMBOL = 5000
+
+# Buy when the MACD signal line is above zero, sell when it's below.
+SIGNAL_EVALUATOR = SignalEvaluator(
+    buy_rule=Condition('macd', '>', 0.0),
+    sell_rule=Condition('macd', '<', 0.0)
+)
+
+
+def create_bars() -> dict:
+    """Creates a random walk of one minute bars for each symbol."""
+
+    random_state = np.random.RandomState(42)
+    columns = {column: [] for column in ['symbol', 'datetime', 'open', 'close', 'high', 'low', 'volume']}
+
+    for symbol in SYMBOLS:
+
+        close = 100.0 * np.cumprod(1.0 + random_state.normal(0.0, 0.002, size=BARS_PER_SYMBOL))
+        open_price = np.concatenate([[close[0]], close[:-1]])
+
+        columns['symbol'].extend([symbol] * BARS_PER_SYMBOL)
+        columns['datetime'].extend((1586390400000 + np.arange(BARS_PER_SYMBOL) * 60000).tolist())
+        columns['open'].extend(open_price.tolist())
+        columns['close'].extend(close.tolist())
+        columns['high'].extend((np.maximum(open_price, close) * 1.001).tolist())
+        columns['low'].extend((np.minimum(open_price, close) * 0.999).tolist())
+        columns['volume'].extend([1000.0] * BARS_PER_SYMBOL)
+
+    return columns
+
+
+if __name__ == '__main__':
+
+    stock_frame = StockFrame(data=create_bars())
+    grid = [
+        parameters for parameters in parameter_grid(grid={'fast_period': range(6, 16, 2), 'slow_period': range(20, 40, 4)})
+        if parameters['fast_period'] < parameters['slow_period']
+    ]
+
+    print('Cells: {cells}, rows: {rows:,}'.format(cells=len(grid), rows=stock_frame.frame.shape[0]))
+    print('Pickled StockFrame, sent with every cell: {size:,.0f} KB'.format(size=len(pickle.dumps(stock_frame)) / 1024))
+
+    with tempfile.TemporaryDirectory() as folder:
+
+        macd_sweep = ParameterSweep(stock_frame=stock_frame, indicator='macd', strategy=SIGNAL_EVALUATOR, folder=folder)
+
+        start = time.perf_counter()
+        ranked = macd_sweep.run(parameters=grid)
+        print('First run: {seconds:.2f} seconds'.format(seconds=time.perf_counter() - start))
+
+        rerun_sweep = ParameterSweep(stock_frame=stock_frame, indicator='macd', strategy=SIGNAL_EVALUATOR, folder=folder)
+
+        start = time.perf_counter()
+        rerun_sweep.run(parameters=grid)
+        print('Cached rerun: {seconds:.2f} seconds'.format(seconds=time.perf_counter() - start))
+
+    print('Best: {parameters}, total return {total_return:.2%}'.format(
+        parameters=ranked[0]['parameters'],
+        total_return=ranked[0]['total_return']
+    ))
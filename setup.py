@@ -43,6 +43,7 @@ setup(
         'websockets',
         'requests',
         'flask',
+        'numpy',
     ],
 
     # Here are the keywords of my library.
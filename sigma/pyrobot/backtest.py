@@ -0,0 +1,744 @@
+import time
+import tempfile
+import numpy as np
+
+from typing import List
+from typing import Dict
+from typing import Union
+from typing import Optional
+
+from pyrobot import vectorized
+from pyrobot.bar_buffer import BAR_COLUMNS
+from pyrobot.robot import PyRobot
+from pyrobot.signals import Signals
+from pyrobot.signals import SignalEvaluator
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+from pyrobot.order_journal import OrderJournal
+from pyrobot.order_dispatcher import OrderResult
+from td.client import TDClient
+
+
+# The direction each instruction moves the position in.
+INSTRUCTION_SIGNS = {
+    'BUY': 1,
+    'BUY_TO_COVER': 1,
+    'SELL': -1,
+    'SELL_SHORT': -1
+}
+
+
+def bars_to_columns(bars: Union[List[dict], Dict[str, List]]) -> Dict[str, np.ndarray]:
+    """Converts a list of bars, or a dictionary of columns, to column arrays sorted by time.
+
+    Arguments:
+    ----
+    bars {Union[List[dict], Dict[str, List]]} -- The bars, in the same format as `StockFrame`.
+
+    Returns:
+    ----
+    {Dict[str, np.ndarray]} -- The `symbol`, `datetime` and `BAR_COLUMNS` columns, sorted
+        by `datetime`, with the bars of the same time in their original order.
+    """
+
+    if not isinstance(bars, dict):
+        bars = {
+            column: [bar[column] for bar in bars]
+            for column in ['symbol', 'datetime'] + BAR_COLUMNS
+        }
+
+    columns = {
+        'symbol': np.asarray(bars['symbol'], dtype=object),
+        'datetime': np.asarray(bars['datetime'], dtype='int64')
+    }
+
+    for column in BAR_COLUMNS:
+        columns[column] = np.asarray(bars[column], dtype='float64')
+
+    order = np.argsort(columns['datetime'], kind='stable')
+
+    return {column: values[order] for column, values in columns.items()}
+
+
+class SimulatedBroker():
+
+    """
+    Fills the orders built by `Trade` against historical bars. An order
+    sent on one bar can only be filled from the next bar on, so a signal
+    never trades on the bar it was calculated from.
+
+    Overview:
+    ----
+    Market orders fill at the open. Limit orders fill at the open if it's
+    already through the limit, otherwise at the limit if the bar reaches it.
+    Stop orders fill the same way once the bar trades through the stop, and
+    stop-limit orders turn into limit orders once their stop is hit. Market
+    and stop fills pay the slippage, as a fraction of the price.
+
+    The child orders of a `TRIGGER` order, like the stop loss and take
+    profit added by `Trade.add_box_range`, are sent when the parent fills
+    and cancel each other, so only one of them closes the position. Orders
+    are kept until they fill, the `DAY` duration isn't simulated.
+
+    The broker has the same `place_orders` method as the `OrderDispatcher`,
+    so it can stand in for it behind `PyRobot.execute_signals`.
+    """
+
+    def __init__(self, cash: float = 100000.0, slippage: float = 0.0, commission: float = 0.0) -> None:
+        """Initalizes the SimulatedBroker object.
+
+        Keyword Arguments:
+        ----
+        cash {float} -- The starting cash. (default: {100000.0})
+
+        slippage {float} -- The slippage paid by market and stop fills, as a fraction of the
+            price. For example, `0.001` is 10 basis points. (default: {0.0})
+
+        commission {float} -- The commission paid for each fill. (default: {0.0})
+        """
+
+        self.starting_cash = cash
+        self.cash = cash
+        self.slippage = slippage
+        self.commission = commission
+
+        self.positions: Dict[str, float] = {}
+        self.orders: List[dict] = []
+        self.fills: List[dict] = []
+
+        # The time of the current bar, the orders of `place_orders` are sent on it.
+        self.timestamp: Optional[int] = None
+
+        self._working_orders: Dict[str, List[dict]] = {}
+        self._next_order_id = 0
+
+    def _new_order(self, order: dict, timestamp: int, oco_group: Optional[int] = None) -> dict:
+        """Creates the record of an order, and adds it to the working orders."""
+
+        self._next_order_id += 1
+
+        legs = order.get('orderLegCollection', [])
+        order_record = {
+            'order_id': str(self._next_order_id),
+            'request_body': order,
+            'timestamp': timestamp,
+            'status': 'WORKING',
+            'oco_group': oco_group,
+            'triggered': False
+        }
+
+        self.orders.append(order_record)
+
+        # Only single leg orders can be simulated.
+        if len(legs) != 1 or legs[0].get('instruction') not in INSTRUCTION_SIGNS:
+            order_record['status'] = 'REJECTED'
+            order_record['reason'] = 'Only single leg equity orders can be simulated.'
+            return order_record
+
+        leg = legs[0]
+        order_record['symbol'] = leg['instrument']['symbol']
+        order_record['instruction'] = leg['instruction']
+        order_record['quantity'] = float(leg['quantity'])
+
+        self._working_orders.setdefault(order_record['symbol'], []).append(order_record)
+
+        return order_record
+
+    def submit(self, order: dict, timestamp: int) -> dict:
+        """Sends an order to the broker.
+
+        Arguments:
+        ----
+        order {dict} -- The order, usually `Trade.order`.
+
+        timestamp {int} -- The time of the bar the order was sent on, in milliseconds
+            since epoch. The order can be filled from the next bar on.
+
+        Returns:
+        ----
+        {dict} -- The order record, with the `order_id`, `request_body`, `timestamp` and `status` keys.
+        """
+
+        return self._new_order(order=order, timestamp=timestamp)
+
+    def place_orders(self, account: str, orders: List[dict]) -> List[OrderResult]:
+        """Sends the orders on the current bar, like `OrderDispatcher.place_orders`.
+
+        Arguments:
+        ----
+        account {str} -- The account to place the orders for, which isn't used.
+
+        orders {List[dict]} -- The orders, for example the `order` of each `Trade`.
+
+        Raises:
+        ----
+        ValueError: If the time of the current bar isn't set.
+
+        Returns:
+        ----
+        {List[OrderResult]} -- The result of each order, with the order record as the response.
+        """
+
+        if self.timestamp is None:
+            raise ValueError("The time of the current bar has to be set before placing orders.")
+
+        return [
+            OrderResult(order=order, response=self.submit(order=order, timestamp=self.timestamp), error=None)
+            for order in orders
+        ]
+
+    def _fill_price(self, order_record: dict, open_price: float, high_price: float, low_price: float) -> Optional[float]:
+        """Works out the price an order fills at on a bar, or `None` if it doesn't fill."""
+
+        order = order_record['request_body']
+        order_type = order.get('orderType', 'MARKET')
+        is_buy = INSTRUCTION_SIGNS[order_record['instruction']] > 0
+        slippage = 1.0 + self.slippage if is_buy else 1.0 - self.slippage
+
+        if order_type == 'MARKET':
+            return open_price * slippage
+
+        # A stop limit order becomes a limit order once the stop is hit.
+        if order_type in ('STOP', 'STOP_LIMIT') and not order_record['triggered']:
+
+            stop_price = order['stopPrice']
+
+            if is_buy and open_price >= stop_price:
+                trigger_price = open_price
+            elif is_buy and high_price >= stop_price:
+                trigger_price = stop_price
+            elif not is_buy and open_price <= stop_price:
+                trigger_price = open_price
+            elif not is_buy and low_price <= stop_price:
+                trigger_price = stop_price
+            else:
+                return None
+
+            if order_type == 'STOP':
+                return trigger_price * slippage
+
+            order_record['triggered'] = True
+
+        # Limit orders, and triggered stop limit orders.
+        limit_price = order['price']
+
+        if is_buy and open_price <= limit_price:
+            return open_price
+        if is_buy and low_price <= limit_price:
+            return limit_price
+        if not is_buy and open_price >= limit_price:
+            return open_price
+        if not is_buy and high_price >= limit_price:
+            return limit_price
+
+        return None
+
+    def _fill(self, order_record: dict, price: float, timestamp: int) -> Optional[dict]:
+        """Applies a fill to the cash and the positions, or rejects the order if it can't be filled."""
+
+        symbol = order_record['symbol']
+        instruction = order_record['instruction']
+        quantity = order_record['quantity']
+        position = self.positions.get(symbol, 0.0)
+
+        # You can only sell what you own, and only cover what you're short.
+        if instruction == 'SELL' and position < quantity:
+            reason = 'Not enough shares to sell.'
+        elif instruction == 'BUY_TO_COVER' and -position < quantity:
+            reason = 'Not enough shares to cover.'
+        elif instruction == 'BUY' and self.cash < price * quantity + self.commission:
+            reason = 'Not enough cash.'
+        else:
+            reason = None
+
+        if reason:
+            order_record['status'] = 'REJECTED'
+            order_record['reason'] = reason
+            return None
+
+        signed_quantity = INSTRUCTION_SIGNS[instruction] * quantity
+
+        self.cash -= signed_quantity * price + self.commission
+        self.positions[symbol] = position + signed_quantity
+
+        order_record['status'] = 'FILLED'
+
+        fill = {
+            'order_id': order_record['order_id'],
+            'symbol': symbol,
+            'instruction': instruction,
+            'quantity': quantity,
+            'price': price,
+            'datetime': timestamp
+        }
+
+        self.fills.append(fill)
+
+        return fill
+
+    def process_bar(self, symbol: str, timestamp: int, open_price: float, high_price: float, low_price: float) -> List[dict]:
+        """Fills the working orders of a symbol against a new bar.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol of the bar.
+
+        timestamp {int} -- The time of the bar, in milliseconds since epoch.
+
+        open_price {float} -- The open of the bar.
+
+        high_price {float} -- The high of the bar.
+
+        low_price {float} -- The low of the bar.
+
+        Returns:
+        ----
+        {List[dict]} -- The fills.
+        """
+
+        working_orders = self._working_orders.get(symbol)
+
+        if not working_orders:
+            return []
+
+        fills = []
+
+        for order_record in list(working_orders):
+
+            # The order was cancelled by another order of its group, earlier in the bar.
+            if order_record['status'] != 'WORKING' or order_record['timestamp'] >= timestamp:
+                continue
+
+            price = self._fill_price(
+                order_record=order_record,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price
+            )
+
+            if price is None:
+                continue
+
+            fill = self._fill(order_record=order_record, price=price, timestamp=timestamp)
+
+            if fill:
+                fills.append(fill)
+                self._after_fill(order_record=order_record, timestamp=timestamp)
+
+        self._working_orders[symbol] = [
+            order_record for order_record in self._working_orders[symbol]
+            if order_record['status'] == 'WORKING'
+        ]
+
+        return fills
+
+    def _after_fill(self, order_record: dict, timestamp: int) -> None:
+        """Cancels the other orders of the group, and sends the child orders."""
+
+        if order_record['oco_group'] is not None:
+            for other_record in self._working_orders.get(order_record['symbol'], []):
+                if other_record['oco_group'] == order_record['oco_group'] and other_record['status'] == 'WORKING':
+                    other_record['status'] = 'CANCELED'
+
+        children = order_record['request_body'].get('childOrderStrategies', [])
+
+        if children:
+            for child_order in children:
+                self._new_order(order=child_order, timestamp=timestamp, oco_group=int(order_record['order_id']))
+
+    def equity(self, prices: Dict[str, float]) -> float:
+        """Values the account at a set of prices.
+
+        Arguments:
+        ----
+        prices {Dict[str, float]} -- The last price of each symbol.
+
+        Returns:
+        ----
+        {float} -- The cash plus the market value of every position.
+        """
+
+        return self.cash + sum(
+            quantity * prices.get(symbol, 0.0)
+            for symbol, quantity in self.positions.items()
+            if quantity
+        )
+
+
+class BacktestResult():
+
+    """Holds the fills, the equity curve and the throughput of a backtest."""
+
+    def __init__(self, broker: SimulatedBroker, datetime: np.ndarray, equity: np.ndarray, bars: int, elapsed: float) -> None:
+        """Initalizes the BacktestResult object.
+
+        Arguments:
+        ----
+        broker {SimulatedBroker} -- The broker the backtest traded with.
+
+        datetime {np.ndarray} -- The time of each step, in milliseconds since epoch.
+
+        equity {np.ndarray} -- The equity at the close of each step.
+
+        bars {int} -- The number of bars replayed.
+
+        elapsed {float} -- The number of seconds the replay took.
+        """
+
+        self.broker = broker
+        self.orders = broker.orders
+        self.fills = broker.fills
+        self.datetime = datetime
+        self.equity = equity
+        self.bars = bars
+        self.elapsed = elapsed
+
+    @property
+    def bars_per_second(self) -> float:
+        """The number of bars replayed per second."""
+
+        return self.bars / self.elapsed if self.elapsed else float('inf')
+
+    def summary(self) -> dict:
+        """Summarizes the backtest.
+
+        Returns:
+        ----
+        {dict} -- The total return, the max drawdown, the number of fills and the throughput.
+        """
+
+        if self.equity.size:
+            total_return = self.equity[-1] / self.broker.starting_cash - 1.0
+            max_drawdown = float(np.max(1.0 - self.equity / np.maximum.accumulate(self.equity)))
+        else:
+            total_return = 0.0
+            max_drawdown = 0.0
+
+        return {
+            'total_return': total_return,
+            'max_drawdown': max_drawdown,
+            'number_of_fills': len(self.fills),
+            'bars': self.bars,
+            'elapsed': self.elapsed,
+            'bars_per_second': self.bars_per_second
+        }
+
+
+class Backtester():
+
+    """
+    Replays stored bars through the same path the PyRobot uses live:
+    `StockFrame.add_rows`, `Indicators.refresh`, `Indicators.check_signals`
+    and `PyRobot.execute_signals`, with the orders sent to a `SimulatedBroker`.
+    """
+
+    def __init__(self, bars: Union[List[dict], Dict[str, List]], trades_to_execute: Dict[str, dict], warmup_bars: int = 50,
+                 broker: Optional[SimulatedBroker] = None, incremental: bool = True, engine: str = 'numpy',
+                 order_journal: Optional[OrderJournal] = None) -> None:
+        """Initalizes the Backtester object.
+
+        Arguments:
+        ----
+        bars {Union[List[dict], Dict[str, List]]} -- The bars to replay, either a list of bars or
+            a dictionary of columns like `historical_prices['aggregated']`.
+
+        trades_to_execute {Dict[str, dict]} -- The trades to execute for each symbol, in the
+            same format as `PyRobot.execute_signals`, which executes the `trade_func` trade on
+            any signal.
+
+        Keyword Arguments:
+        ----
+        warmup_bars {int} -- The number of bar times used to build the StockFrame before the
+            replay starts, no orders are sent on them. Has to be at least 1. (default: {50})
+
+        broker {SimulatedBroker} -- The broker to trade with. (default: {a new SimulatedBroker})
+
+        incremental {bool} -- Passed through to `Indicators`. (default: {True})
+
+        engine {str} -- Passed through to `Indicators`. (default: {'numpy'})
+
+        order_journal {OrderJournal} -- The journal the robot saves the orders to. If not
+            provided, a journal in a temporary folder is used, which is removed by
+            `close`. (default: {None})
+
+        Usage:
+        ----
+            >>> backtester = Backtester(
+                    bars=historical_prices['aggregated'],
+                    trades_to_execute={'MSFT': {'trade_func': msft_trade}},
+                    broker=SimulatedBroker(cash=100000.0, slippage=0.0005)
+                )
+            >>> backtester.indicators.rsi(period=14)
+            >>> backtester.indicators.set_indicator_signal(
+                    indicator='rsi',
+                    buy=30.0,
+                    sell=70.0,
+                    condition_buy=operator.lt,
+                    condition_sell=operator.gt
+                )
+            >>> backtest_result = backtester.run()
+            >>> backtest_result.summary()
+            >>> backtester.close()
+        """
+
+        columns = bars_to_columns(bars=bars)
+
+        times, starts = np.unique(columns['datetime'], return_index=True)
+
+        if times.size == 0:
+            raise ValueError("There are no bars to replay.")
+
+        warmup_bars = min(max(warmup_bars, 1), times.size)
+        self._columns = columns
+        self._starts = np.append(starts, columns['datetime'].size)
+        self._warmup_bars = warmup_bars
+        self.times = times
+
+        warmup_end = self._starts[warmup_bars]
+
+        self.trades_to_execute = trades_to_execute
+        self.broker = broker or SimulatedBroker()
+        self.stock_frame = StockFrame(
+            data={column: values[:warmup_end] for column, values in columns.items()}
+        )
+        self.indicators = Indicators(
+            price_data_frame=self.stock_frame,
+            incremental=incremental,
+            engine=engine
+        )
+        self.order_responses: List[dict] = []
+
+        # A robot with an offline session, that places its orders with the broker.
+        self._journal_folder = None
+
+        if order_journal is None:
+            self._journal_folder = tempfile.TemporaryDirectory(prefix='backtest-orders-')
+            order_journal = OrderJournal(folder=self._journal_folder.name)
+
+        self.trading_robot = PyRobot(
+            client_id='BACKTEST',
+            redirect_uri='http://localhost',
+            paper_trading=False,
+            trading_account='BACKTEST',
+            td_client=TDClient(client_id='BACKTEST', redirect_uri='http://localhost', _do_init=False)
+        )
+        self.trading_robot.order_dispatcher = self.broker
+        self.trading_robot.order_journal = order_journal
+        self.trading_robot.stock_frame = self.stock_frame
+        self.trading_robot.create_portfolio()
+
+        # Track the ownership of the traded symbols, like `execute_signals` does live.
+        self.trading_robot.portfolio.add_positions(
+            positions=[{'symbol': symbol, 'asset_type': 'equity'} for symbol in trades_to_execute]
+        )
+
+        self._last_prices: Dict[str, float] = dict(
+            zip(columns['symbol'][:warmup_end].tolist(), columns['close'][:warmup_end].tolist())
+        )
+
+    @property
+    def order_journal(self) -> OrderJournal:
+        """The journal the robot saved the orders to."""
+
+        return self.trading_robot.order_journal
+
+    def close(self) -> None:
+        """Closes the order journal, and removes it if it's in a temporary folder."""
+
+        self.order_journal.close()
+
+        if self._journal_folder is not None:
+            self._journal_folder.cleanup()
+            self._journal_folder = None
+
+    def execute_signals(self, signals: Signals, timestamp: int) -> List[dict]:
+        """Sends the trades for each signal to the broker, with `PyRobot.execute_signals`.
+
+        Arguments:
+        ----
+        signals {Signals} -- The signals of the current bar.
+
+        timestamp {int} -- The time of the current bar.
+
+        Returns:
+        ----
+        {List[dict]} -- The order responses.
+        """
+
+        self.broker.timestamp = timestamp
+
+        order_responses = self.trading_robot.execute_signals(
+            signals=signals,
+            trades_to_execute=self.trades_to_execute
+        )
+
+        self.order_responses.extend(order_responses)
+
+        return order_responses
+
+    def step(self, index: int) -> float:
+        """Replays the bars of a single bar time.
+
+        Arguments:
+        ----
+        index {int} -- The index of the bar time in `times`.
+
+        Returns:
+        ----
+        {float} -- The equity at the close of the bars.
+        """
+
+        start, end = self._starts[index], self._starts[index + 1]
+        timestamp = int(self.times[index])
+
+        symbols = self._columns['symbol'][start:end].tolist()
+        open_prices = self._columns['open'][start:end].tolist()
+        high_prices = self._columns['high'][start:end].tolist()
+        low_prices = self._columns['low'][start:end].tolist()
+        close_prices = self._columns['close'][start:end].tolist()
+
+        # Fill the orders sent on earlier bars.
+        for symbol, open_price, high_price, low_price in zip(symbols, open_prices, high_prices, low_prices):
+            self.broker.process_bar(
+                symbol=symbol,
+                timestamp=timestamp,
+                open_price=open_price,
+                high_price=high_price,
+                low_price=low_price
+            )
+
+        # Then run the bar through the same path as the live robot.
+        self.stock_frame.add_rows(
+            data={column: values[start:end] for column, values in self._columns.items()}
+        )
+        self.indicators.refresh()
+
+        signals = self.indicators.check_signals()
+        self.execute_signals(signals=signals, timestamp=timestamp)
+
+        self._last_prices.update(zip(symbols, close_prices))
+
+        return self.broker.equity(prices=self._last_prices)
+
+    def run(self, max_bars: Optional[int] = None) -> BacktestResult:
+        """Replays every bar time after the warmup.
+
+        Keyword Arguments:
+        ----
+        max_bars {int} -- The number of bar times to replay. (default: {all of them})
+
+        Returns:
+        ----
+        {BacktestResult} -- The fills, the equity curve and the throughput.
+        """
+
+        last_index = self.times.size if max_bars is None else min(self.times.size, self._warmup_bars + max_bars)
+        indexes = range(self._warmup_bars, last_index)
+
+        equity = np.empty(len(indexes), dtype='float64')
+        start = time.perf_counter()
+
+        for position, index in enumerate(indexes):
+            equity[position] = self.step(index=index)
+
+        elapsed = time.perf_counter() - start
+
+        return BacktestResult(
+            broker=self.broker,
+            datetime=self.times[self._warmup_bars:last_index],
+            equity=equity,
+            bars=int(self._starts[last_index] - self._starts[self._warmup_bars]),
+            elapsed=elapsed
+        )
+
+
+def vectorized_backtest(stock_frame: StockFrame, signal_evaluator: SignalEvaluator, slippage: float = 0.0) -> Dict[str, np.ndarray]:
+    """Backtests a long only strategy over a whole StockFrame at once.
+
+    Overview:
+    ----
+    The fast path for parameter sweeps. The indicators are calculated once
+    over the whole frame, the rules are evaluated on every row, and the
+    position of each symbol is worked out with array operations. A buy
+    signal goes long at the next open, a sell signal goes flat at the next
+    open, and each trade pays the slippage. When both signals fire on the
+    same bar, the sell wins. Each symbol is traded with
+    all of its own equity, so the results rank the parameters the same way
+    the event driven `Backtester` does, without its order handling.
+
+    Arguments:
+    ----
+    stock_frame {StockFrame} -- The StockFrame, with the indicator columns the rules need.
+
+    signal_evaluator {SignalEvaluator} -- The buy and sell rules.
+
+    Keyword Arguments:
+    ----
+    slippage {float} -- The cost of each trade, as a fraction of the price. (default: {0.0})
+
+    Returns:
+    ----
+    {Dict[str, np.ndarray]} -- The `symbol`, `total_return`, `max_drawdown` and `number_of_trades`
+        of each symbol, and the `equity` of each row, starting at `1.0` for each symbol.
+    """
+
+    frame = stock_frame.frame
+    offsets = vectorized.symbol_offsets(frame=frame)
+    symbols = np.asarray(frame.index.levels[0][frame.index.codes[0][offsets[:-1]]], dtype=object)
+
+    values = {column: frame[column].to_numpy(dtype='float64') for column in signal_evaluator.columns}
+    size = offsets[-1]
+
+    no_signals = np.zeros(size, dtype=bool)
+    buys = signal_evaluator.buy_rule.evaluate(values=values) if signal_evaluator.buy_rule else no_signals
+    sells = signal_evaluator.sell_rule.evaluate(values=values) if signal_evaluator.sell_rule else no_signals
+
+    # The target position after each bar, carried forward until the next signal.
+    # A sell wins over a buy on the same bar.
+    events = np.where(sells, 0.0, np.where(buys, 1.0, np.nan))
+    group_starts = np.repeat(offsets[:-1], np.diff(offsets))
+
+    last_event = np.where(np.isnan(events), -1, np.arange(size))
+    last_event = np.maximum.accumulate(last_event) if size else last_event
+    has_event = last_event >= group_starts
+    target = np.where(has_event, events[np.maximum(last_event, 0)], 0.0)
+
+    # The position held overnight, and the position held during each bar.
+    held_during = np.nan_to_num(vectorized.segmented_shift(values=target, offsets=offsets, periods=1))
+    held_overnight = np.nan_to_num(vectorized.segmented_shift(values=target, offsets=offsets, periods=2))
+
+    open_prices = frame['open'].to_numpy(dtype='float64')
+    close_prices = frame['close'].to_numpy(dtype='float64')
+    previous_close = vectorized.segmented_shift(values=close_prices, offsets=offsets, periods=1)
+
+    trades = np.abs(held_during - held_overnight)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = (
+            held_overnight * np.log(open_prices / previous_close)
+            + held_during * np.log(close_prices / open_prices)
+            + trades * np.log1p(-slippage)
+        )
+
+    log_returns = np.nan_to_num(log_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # The cumulative returns of each symbol, starting again at each symbol.
+    cumulative = np.cumsum(log_returns)
+    segment_base = np.concatenate([[0.0], cumulative])[offsets[:-1]]
+    log_equity = cumulative - np.repeat(segment_base, np.diff(offsets))
+
+    # The running max has to start again at each symbol too, so each symbol is lifted above the last.
+    lift = np.repeat(np.arange(offsets.size - 1) * (np.ptp(log_equity) + 1.0 if size else 0.0), np.diff(offsets))
+    running_max = np.maximum.accumulate(np.maximum(log_equity + lift, lift)) - lift
+    drawdown = 1.0 - np.exp(log_equity - running_max)
+
+    last_rows = offsets[1:] - 1
+    has_rows = np.diff(offsets) > 0
+
+    return {
+        'symbol': symbols,
+        'total_return': np.where(has_rows, np.exp(log_equity[last_rows]) - 1.0, 0.0),
+        'max_drawdown': np.maximum.reduceat(drawdown, offsets[:-1]) if size else np.zeros(0),
+        'number_of_trades': np.add.reduceat(trades, offsets[:-1]) if size else np.zeros(0),
+        'equity': np.exp(log_equity)
+    }
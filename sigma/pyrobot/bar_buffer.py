@@ -0,0 +1,396 @@
+import numpy as np
+import pandas as pd
+
+from typing import List
+from typing import Dict
+from typing import Union
+from typing import Iterable
+
+
+BAR_COLUMNS = ['open', 'close', 'high', 'low', 'volume']
+
+
+class SymbolBarBuffer():
+
+    """
+    Represents the bars of a single symbol, stored in preallocated NumPy
+    arrays that grow geometrically, so appending a bar is amortized O(1).
+    The bars are always kept sorted by their timestamp.
+    """
+
+    def __init__(self, initial_capacity: int = 256) -> None:
+        """Initalizes the SymbolBarBuffer object.
+
+        Keyword Arguments:
+        ----
+        initial_capacity {int} -- The number of bars to allocate room for. (default: {256})
+        """
+
+        self._size = 0
+        self._capacity = max(initial_capacity, 1)
+        self._datetime = np.empty(self._capacity, dtype='int64')
+        self._values = np.empty((len(BAR_COLUMNS), self._capacity), dtype='float64')
+
+        # The code of each timestamp in the datetime level of the `BarBuffer`, valid for the first `_coded` bars.
+        self._codes = np.empty(self._capacity, dtype='intp')
+        self._coded = 0
+
+        # Counts the batches that changed bars already in the buffer, and where the last one started.
+        self.rewrites = 0
+        self.rewritten_from = 0
+
+        # Counts the batches that were merged in out of order, which moves the bars after them.
+        self.merges = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def datetime(self) -> np.ndarray:
+        """The bar timestamps, in milliseconds since epoch, as a view on the buffer."""
+
+        return self._datetime[:self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        """The bar values, one row per column in `BAR_COLUMNS`, as a view on the buffer."""
+
+        return self._values[:, :self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a view on a single column of the buffer.
+
+        Arguments:
+        ----
+        name {str} -- One of the columns in `BAR_COLUMNS`.
+
+        Returns:
+        ----
+        {np.ndarray} -- The column values.
+        """
+
+        return self._values[BAR_COLUMNS.index(name), :self._size]
+
+    def _reserve(self, size: int) -> None:
+        """Makes sure the buffer has room for `size` bars.
+
+        Arguments:
+        ----
+        size {int} -- The number of bars the buffer needs to hold.
+        """
+
+        if size <= self._capacity:
+            return
+
+        capacity = self._capacity
+
+        while capacity < size:
+            capacity *= 2
+
+        datetime = np.empty(capacity, dtype='int64')
+        datetime[:self._size] = self._datetime[:self._size]
+
+        values = np.empty((len(BAR_COLUMNS), capacity), dtype='float64')
+        values[:, :self._size] = self._values[:, :self._size]
+
+        codes = np.empty(capacity, dtype='intp')
+        codes[:self._coded] = self._codes[:self._coded]
+
+        self._datetime = datetime
+        self._values = values
+        self._codes = codes
+        self._capacity = capacity
+
+    def extend(self, datetime: np.ndarray, values: np.ndarray) -> None:
+        """Adds a batch of bars to the buffer.
+
+        Overview:
+        ----
+        Bars that are newer than the last bar are copied to the end of
+        the buffer. A bar with the same timestamp as an existing bar replaces
+        it, the same way `DataFrame.loc` would. Bars that arrive out of order
+        are merged in, which is the only case that costs more than O(1) per bar.
+        Every batch that changes bars already in the buffer increments `rewrites`,
+        and sets `rewritten_from` to the position of the first bar it changed.
+
+        Arguments:
+        ----
+        datetime {np.ndarray} -- The bar timestamps, in milliseconds since epoch.
+
+        values {np.ndarray} -- The bar values, one row per column in `BAR_COLUMNS`.
+        """
+
+        count = datetime.size
+
+        if count == 0:
+            return
+
+        in_order = count == 1 or bool(np.all(datetime[1:] > datetime[:-1]))
+
+        if in_order and (self._size == 0 or datetime[0] > self._datetime[self._size - 1]):
+
+            self._reserve(self._size + count)
+            self._datetime[self._size:self._size + count] = datetime
+            self._values[:, self._size:self._size + count] = values
+            self._size += count
+            return
+
+        # The last bar was updated, like the open bar of a stream, so replace it in place.
+        if in_order and self._size and datetime[0] == self._datetime[self._size - 1]:
+
+            self._reserve(self._size + count - 1)
+            self._datetime[self._size - 1:self._size - 1 + count] = datetime
+            self._values[:, self._size - 1:self._size - 1 + count] = values
+            self._size += count - 1
+
+            self.rewrites += 1
+            self.rewritten_from = self._size - count
+            self._coded = min(self._coded, self.rewritten_from)
+            return
+
+        # Merge the bars, keeping the last bar for each timestamp.
+        merged_datetime = np.concatenate([self.datetime, datetime])
+        merged_values = np.concatenate([self.values, values], axis=1)
+
+        order = np.argsort(merged_datetime, kind='stable')
+        merged_datetime = merged_datetime[order]
+        merged_values = merged_values[:, order]
+
+        keep = np.ones(merged_datetime.size, dtype=bool)
+        keep[:-1] = merged_datetime[1:] != merged_datetime[:-1]
+
+        merged_datetime = merged_datetime[keep]
+        merged_values = merged_values[:, keep]
+
+        self._size = 0
+        self._reserve(merged_datetime.size)
+        self._datetime[:merged_datetime.size] = merged_datetime
+        self._values[:, :merged_datetime.size] = merged_values
+        self._size = merged_datetime.size
+
+        self.rewrites += 1
+        self.merges += 1
+        self.rewritten_from = int(np.searchsorted(merged_datetime, datetime.min()))
+        self._coded = min(self._coded, self.rewritten_from)
+
+
+class BarBuffer():
+
+    """
+    Holds the OHLCV bars of every symbol in a StockFrame, in one
+    `SymbolBarBuffer` per symbol. The multi-index frame can be built
+    from the buffer at any time with `to_frame`, which keeps the levels
+    of the index between calls so only the new bars have to be coded.
+    """
+
+    def __init__(self, initial_capacity: int = 256) -> None:
+        """Initalizes the BarBuffer object.
+
+        Keyword Arguments:
+        ----
+        initial_capacity {int} -- The number of bars to allocate room for,
+            for each new symbol. (default: {256})
+        """
+
+        self._initial_capacity = initial_capacity
+        self._symbols: Dict[str, SymbolBarBuffer] = {}
+        self.version = 0
+
+        # Every timestamp in the buffer, sorted, as the datetime level of the index.
+        self._datetime_level = np.empty(0, dtype='int64')
+        self._datetime_index = pd.to_datetime(self._datetime_level, unit='ms', origin='unix')
+
+    def __len__(self) -> int:
+        return sum(len(symbol_buffer) for symbol_buffer in self._symbols.values())
+
+    @property
+    def symbols(self) -> List[str]:
+        """The symbols in the buffer, sorted."""
+
+        return sorted(self._symbols)
+
+    def symbol(self, symbol: str) -> SymbolBarBuffer:
+        """Returns the buffer of a single symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        Returns:
+        ----
+        {SymbolBarBuffer} -- The symbol's bars.
+        """
+
+        return self._symbols[symbol]
+
+    def extend(self, symbols: Union[np.ndarray, List[str]], datetime: Iterable[int], columns: Dict[str, Iterable[float]]) -> None:
+        """Adds a batch of bars, for one or more symbols, to the buffer.
+
+        Arguments:
+        ----
+        symbols {Union[np.ndarray, List[str]]} -- The symbol of each bar.
+
+        datetime {Iterable[int]} -- The timestamp of each bar, in milliseconds since epoch.
+
+        columns {Dict[str, Iterable[float]]} -- The values of each bar, keyed by the
+            columns in `BAR_COLUMNS`.
+        """
+
+        # A single bar can be passed as scalars.
+        symbols = np.atleast_1d(np.asarray(symbols, dtype=object))
+
+        if symbols.size == 0:
+            return
+
+        datetime = np.atleast_1d(np.asarray(datetime, dtype='int64'))
+        values = np.vstack([
+            np.atleast_1d(np.asarray(columns[column], dtype='float64')) for column in BAR_COLUMNS
+        ])
+
+        unique_symbols, inverse = np.unique(symbols, return_inverse=True)
+
+        for symbol_index, symbol in enumerate(unique_symbols):
+
+            if len(unique_symbols) == 1:
+                rows = slice(None)
+            else:
+                rows = np.flatnonzero(inverse == symbol_index)
+
+            self.reserve(symbol=symbol, size=datetime[rows].size)
+            self._symbols[symbol].extend(
+                datetime=datetime[rows],
+                values=values[:, rows]
+            )
+
+        self.version += 1
+
+    def reserve(self, symbol: str, size: int) -> None:
+        """Makes sure a symbol's buffer has room for `size` bars, adding the symbol if it's new.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        size {int} -- The number of bars the symbol's buffer needs to hold.
+        """
+
+        if symbol not in self._symbols:
+            self._symbols[symbol] = SymbolBarBuffer(initial_capacity=max(self._initial_capacity, size))
+        else:
+            self._symbols[symbol]._reserve(size=size)
+
+    def extend_symbol(self, symbol: str, datetime: np.ndarray, values: np.ndarray) -> None:
+        """Adds a batch of bars of a single symbol, already split into arrays, to the buffer.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        datetime {np.ndarray} -- The bar timestamps, in milliseconds since epoch.
+
+        values {np.ndarray} -- The bar values, one row per column in `BAR_COLUMNS`.
+        """
+
+        if datetime.size == 0:
+            return
+
+        self.reserve(symbol=symbol, size=datetime.size)
+        self._symbols[symbol].extend(datetime=datetime, values=values)
+
+        self.version += 1
+
+    def load_frame(self, price_df: pd.DataFrame) -> None:
+        """Loads the bars from a multi-index frame created by a StockFrame.
+
+        Arguments:
+        ----
+        price_df {pd.DataFrame} -- A frame indexed by `symbol` and `datetime`.
+        """
+
+        datetime = price_df.index.get_level_values('datetime').values
+        datetime = datetime.astype('datetime64[ms]').astype('int64')
+
+        self.extend(
+            symbols=price_df.index.get_level_values('symbol').values,
+            datetime=datetime,
+            columns={column: price_df[column].values for column in BAR_COLUMNS}
+        )
+
+    def _update_codes(self, buffers: List[SymbolBarBuffer]) -> None:
+        """Codes the bars added since the last call against the datetime level.
+
+        Overview:
+        ----
+        New timestamps are normally later than every timestamp already in the
+        level, so they're appended to it, and the codes of the older bars stay
+        the same. Only a timestamp older than the last one in the level sorts
+        the level again, and codes every bar from scratch.
+
+        Arguments:
+        ----
+        buffers {List[SymbolBarBuffer]} -- The buffers of the symbols in the frame.
+        """
+
+        uncoded = [symbol_buffer.datetime[symbol_buffer._coded:] for symbol_buffer in buffers]
+        timestamps = np.unique(np.concatenate(uncoded)) if uncoded else np.empty(0, dtype='int64')
+
+        level = self._datetime_level
+        positions = np.searchsorted(level, timestamps)
+        is_new = positions == level.size
+        is_new[~is_new] = level[positions[~is_new]] != timestamps[~is_new]
+        new_timestamps = timestamps[is_new]
+
+        if new_timestamps.size:
+
+            if level.size and new_timestamps[0] < level[-1]:
+                level = np.union1d(level, new_timestamps)
+                for symbol_buffer in buffers:
+                    symbol_buffer._coded = 0
+            else:
+                level = np.concatenate([level, new_timestamps])
+
+            self._datetime_level = level
+            self._datetime_index = pd.to_datetime(level, unit='ms', origin='unix')
+
+        for symbol_buffer in buffers:
+            coded = symbol_buffer._coded
+            symbol_buffer._codes[coded:len(symbol_buffer)] = np.searchsorted(level, symbol_buffer.datetime[coded:])
+            symbol_buffer._coded = len(symbol_buffer)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Builds a multi-index frame from the buffer.
+
+        Overview:
+        ----
+        The index is built from its levels and codes, instead of factorizing
+        every timestamp again, so adding a bar only codes the new bar.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- A frame indexed by `symbol` and `datetime`, sorted.
+        """
+
+        symbols = [symbol for symbol in self.symbols if len(self._symbols[symbol])]
+        buffers = [self._symbols[symbol] for symbol in symbols]
+        lengths = [len(symbol_buffer) for symbol_buffer in buffers]
+
+        self._update_codes(buffers=buffers)
+
+        if buffers:
+            codes = np.concatenate([symbol_buffer._codes[:len(symbol_buffer)] for symbol_buffer in buffers])
+            values = np.concatenate([symbol_buffer.values for symbol_buffer in buffers], axis=1)
+        else:
+            codes = np.empty(0, dtype='intp')
+            values = np.empty((len(BAR_COLUMNS), 0), dtype='float64')
+
+        index = pd.MultiIndex(
+            levels=[pd.Index(np.asarray(symbols, dtype=object)), self._datetime_index],
+            codes=[np.repeat(np.arange(len(symbols)), lengths), codes],
+            names=['symbol', 'datetime'],
+            verify_integrity=False
+        )
+
+        return pd.DataFrame(
+            data={column: values[position] for position, column in enumerate(BAR_COLUMNS)},
+            index=index
+        )
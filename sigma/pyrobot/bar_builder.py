@@ -0,0 +1,321 @@
+from typing import List
+from typing import Dict
+from typing import Optional
+
+from td.stream import TDStreamerClient
+
+
+BAR_MILLISECONDS = {
+    'minute': 60000,
+    'hour': 3600000
+}
+
+
+class BarBuilder():
+
+    """
+    Builds OHLCV bars locally from the `CHART_EQUITY` or `TIMESALE_EQUITY`
+    streaming services, so the latest bar of each symbol can be read without
+    calling the price history endpoint.
+    """
+
+    def __init__(self, bar_size: int = 1, bar_type: str = 'minute') -> None:
+        """Initalizes the BarBuilder object.
+
+        Keyword Arguments:
+        ----
+        bar_size {int} -- Defines the size of each bar. (default: {1})
+
+        bar_type {str} -- Defines the bar type, can be one of the following:
+            `['minute', 'hour']` (default: {'minute'})
+
+        Raises:
+        ----
+        ValueError: If the bar type can't be built from the stream.
+        """
+
+        if bar_type not in BAR_MILLISECONDS:
+            raise ValueError(
+                "Bars can only be built from the stream for these bar types: {bar_types}".format(
+                    bar_types=', '.join(BAR_MILLISECONDS)
+                )
+            )
+
+        self.bar_size = bar_size
+        self.bar_type = bar_type
+        self.bar_milliseconds = bar_size * BAR_MILLISECONDS[bar_type]
+
+        self._open_bars: Dict[str, dict] = {}
+        self._latest_bars: Dict[str, dict] = {}
+        self._last_chart_time: Dict[str, int] = {}
+
+    def _bar_start(self, timestamp: int) -> int:
+        """Returns the start of the bar a timestamp falls in, in milliseconds since epoch."""
+
+        return timestamp - timestamp % self.bar_milliseconds
+
+    def _close_bar(self, symbol: str) -> dict:
+        """Moves the open bar of a symbol to the completed bars."""
+
+        bar = self._open_bars.pop(symbol)
+        self._latest_bars[symbol] = bar
+
+        return bar
+
+    def _add(self, symbol: str, timestamp: int, open_price: float, high_price: float,
+             low_price: float, close_price: float, volume: float) -> List[dict]:
+        """Adds a trade, or a one minute bar, to the open bar of a symbol.
+
+        Returns:
+        ----
+        {List[dict]} -- The bars that were completed by the update.
+        """
+
+        completed_bars = []
+        bar_start = self._bar_start(timestamp=timestamp)
+        open_bar = self._open_bars.get(symbol)
+
+        # Data for an older bar than the open one is too late to be used.
+        if open_bar and bar_start < open_bar['datetime']:
+            return completed_bars
+
+        if open_bar and bar_start > open_bar['datetime']:
+            completed_bars.append(self._close_bar(symbol=symbol))
+            open_bar = None
+
+        if not open_bar:
+            self._open_bars[symbol] = {
+                'symbol': symbol,
+                'open': open_price,
+                'close': close_price,
+                'high': high_price,
+                'low': low_price,
+                'volume': volume,
+                'datetime': bar_start
+            }
+        else:
+            open_bar['high'] = max(open_bar['high'], high_price)
+            open_bar['low'] = min(open_bar['low'], low_price)
+            open_bar['close'] = close_price
+            open_bar['volume'] += volume
+
+        return completed_bars
+
+    def add_chart_content(self, content: dict) -> List[dict]:
+        """Adds a `CHART_EQUITY` update.
+
+        Overview:
+        ----
+        Each update is a complete one minute bar, it closes the bar it
+        belongs to when it's the last minute of that bar.
+
+        Arguments:
+        ----
+        content {dict} -- A single item of the message's `content` list.
+
+        Returns:
+        ----
+        {List[dict]} -- The bars that were completed by the update.
+        """
+
+        symbol = content['key']
+        chart_time = int(content['7'])
+
+        # The same minute can be sent more than once, only count it the first time.
+        if chart_time <= self._last_chart_time.get(symbol, -1):
+            return []
+
+        self._last_chart_time[symbol] = chart_time
+
+        completed_bars = self._add(
+            symbol=symbol,
+            timestamp=chart_time,
+            open_price=content['1'],
+            high_price=content['2'],
+            low_price=content['3'],
+            close_price=content['4'],
+            volume=content['5']
+        )
+
+        # Close the bar as soon as its last minute is in.
+        bar_start = self._bar_start(timestamp=chart_time)
+        open_bar = self._open_bars.get(symbol)
+        is_last_minute = chart_time + BAR_MILLISECONDS['minute'] >= bar_start + self.bar_milliseconds
+
+        if open_bar and open_bar['datetime'] == bar_start and is_last_minute:
+            completed_bars.append(self._close_bar(symbol=symbol))
+
+        return completed_bars
+
+    def add_timesale_content(self, content: dict) -> List[dict]:
+        """Adds a `TIMESALE_EQUITY` trade.
+
+        Overview:
+        ----
+        A bar is closed by the first trade of the next bar, or by `close_bars`.
+
+        Arguments:
+        ----
+        content {dict} -- A single item of the message's `content` list.
+
+        Returns:
+        ----
+        {List[dict]} -- The bars that were completed by the trade.
+        """
+
+        last_price = content['2']
+
+        return self._add(
+            symbol=content['key'],
+            timestamp=int(content['1']),
+            open_price=last_price,
+            high_price=last_price,
+            low_price=last_price,
+            close_price=last_price,
+            volume=content['3']
+        )
+
+    def add_message(self, message: dict) -> List[dict]:
+        """Adds a message received from the `TDStreamerClient`.
+
+        Arguments:
+        ----
+        message {dict} -- The decoded message. Services other than `CHART_EQUITY`
+            and `TIMESALE_EQUITY` are ignored.
+
+        Returns:
+        ----
+        {List[dict]} -- The bars that were completed by the message.
+
+        Usage:
+        ----
+            >>> bar_builder = BarBuilder(bar_size=1, bar_type='minute')
+            >>> await td_stream_session.build_pipeline()
+            >>> while True:
+                    message = await td_stream_session.start_pipeline()
+                    new_bars = bar_builder.add_message(message=message)
+        """
+
+        completed_bars = []
+
+        for service_data in message.get('data', []):
+
+            service = service_data.get('service')
+
+            if service == 'CHART_EQUITY':
+                add_content = self.add_chart_content
+            elif service == 'TIMESALE_EQUITY':
+                add_content = self.add_timesale_content
+            else:
+                continue
+
+            for content in service_data.get('content', []):
+                completed_bars.extend(add_content(content=content))
+
+        return completed_bars
+
+    async def consume(self, streaming_client: TDStreamerClient) -> None:
+        """Builds bars from a streaming client until the stream is closed.
+
+        Arguments:
+        ----
+        streaming_client {TDStreamerClient} -- A streaming client with the
+            subscriptions added by `subscribe`.
+
+        Usage:
+        ----
+            >>> bar_builder = BarBuilder(bar_size=1, bar_type='minute')
+            >>> bar_builder.subscribe(streaming_client=td_stream_session, symbols=['MSFT'])
+            >>> asyncio.ensure_future(bar_builder.consume(streaming_client=td_stream_session))
+        """
+
+        await streaming_client.build_pipeline()
+
+        while True:
+
+            message = await streaming_client.start_pipeline()
+
+            # The pipeline returns nothing once the connection is closed.
+            if message is None:
+                break
+
+            self.add_message(message=message)
+
+    def close_bars(self, timestamp: int) -> List[dict]:
+        """Closes every open bar that ended at or before a timestamp.
+
+        Overview:
+        ----
+        A symbol that doesn't trade won't send the trade that closes its bar,
+        so the bars are also closed on the clock.
+
+        Arguments:
+        ----
+        timestamp {int} -- The current time, in milliseconds since epoch.
+
+        Returns:
+        ----
+        {List[dict]} -- The bars that were completed.
+        """
+
+        return [
+            self._close_bar(symbol=symbol)
+            for symbol, open_bar in list(self._open_bars.items())
+            if open_bar['datetime'] + self.bar_milliseconds <= timestamp
+        ]
+
+    def latest_bars(self, symbols: Optional[List[str]] = None) -> List[dict]:
+        """Returns the latest completed bar of each symbol.
+
+        Keyword Arguments:
+        ----
+        symbols {List[str]} -- The symbols to return. If `None`, every
+            symbol is returned. (default: {None})
+
+        Returns:
+        ----
+        {List[dict]} -- The bars, in the same format as `PyRobot.get_latest_bar`.
+        """
+
+        if symbols is None:
+            symbols = list(self._latest_bars)
+
+        return [
+            dict(self._latest_bars[symbol])
+            for symbol in symbols
+            if symbol in self._latest_bars
+        ]
+
+    @staticmethod
+    def subscribe(streaming_client: TDStreamerClient, symbols: List[str], service: str = 'CHART_EQUITY') -> None:
+        """Adds the subscription the builder needs to a streaming client.
+
+        Arguments:
+        ----
+        streaming_client {TDStreamerClient} -- The streaming client to add the subscription to.
+
+        symbols {List[str]} -- The symbols to stream.
+
+        Keyword Arguments:
+        ----
+        service {str} -- Either `CHART_EQUITY` or `TIMESALE_EQUITY`. (default: {'CHART_EQUITY'})
+
+        Raises:
+        ----
+        ValueError: If the service can't be used to build bars.
+        """
+
+        if service == 'CHART_EQUITY':
+            streaming_client.chart(
+                service='CHART_EQUITY',
+                symbols=symbols,
+                fields=[0, 1, 2, 3, 4, 5, 6, 7, 8]
+            )
+        elif service == 'TIMESALE_EQUITY':
+            streaming_client.timesale(
+                service='TIMESALE_EQUITY',
+                symbols=symbols,
+                fields=[0, 1, 2, 3, 4]
+            )
+        else:
+            raise ValueError("Bars can only be built from the CHART_EQUITY or TIMESALE_EQUITY services.")
@@ -0,0 +1,412 @@
+import os
+import mmap
+import shutil
+import pathlib
+import urllib.parse
+
+import numpy as np
+
+from datetime import datetime
+from datetime import timezone
+
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Iterator
+from typing import Optional
+
+from pyrobot.bar_buffer import BarBuffer
+from pyrobot.bar_buffer import SymbolBarBuffer
+from pyrobot.bar_buffer import BAR_COLUMNS
+
+
+MILLISECONDS_PER_DAY = 86400000
+
+
+def partition_date(timestamp: int) -> str:
+    """The UTC date of a bar, which names the partition it's stored in.
+
+    Arguments:
+    ----
+    timestamp {int} -- The bar timestamp, in milliseconds since epoch.
+
+    Returns:
+    ----
+    {str} -- The date, formatted as `YYYY-MM-DD`.
+    """
+
+    return datetime.fromtimestamp(timestamp // 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def map_array(path: pathlib.Path) -> np.ndarray:
+    """Memory maps an array saved with `np.save`, as a read-only view on the file.
+
+    Overview:
+    ----
+    Does the same as `np.load(path, mmap_mode='r')`, without the overhead of a
+    `np.memmap`, which adds up when a range spans thousands of small partitions.
+
+    Arguments:
+    ----
+    path {pathlib.Path} -- The `.npy` file.
+
+    Returns:
+    ----
+    {np.ndarray} -- The array.
+    """
+
+    with open(path, 'rb') as npy_file:
+
+        version = np.lib.format.read_magic(npy_file)
+
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(npy_file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(npy_file)
+
+        offset = npy_file.tell()
+        count = int(np.prod(shape))
+
+        if count == 0:
+            return np.empty(shape, dtype=dtype)
+
+        # The map stays open after the file is closed, for as long as the array is referenced.
+        memory_map = mmap.mmap(npy_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    array = np.frombuffer(memory_map, dtype=dtype, count=count, offset=offset)
+
+    return array.reshape(shape, order='F' if fortran_order else 'C')
+
+
+class BarStore():
+
+    """
+    Stores the bars of each symbol on disk, so they don't have to be grabbed
+    from the API again the next time the robot starts. The bars are kept in
+    a folder for each bar size and symbol, with one partition per UTC date.
+    Each partition holds the same two arrays as a `SymbolBarBuffer`, saved as
+    `.npy` files, so they're read back with a memory map instead of being
+    parsed, and only the partitions in the requested range are touched.
+
+    Overview:
+    ----
+    The layout of the folder is:
+
+        {folder}/{bar_size}/{symbol}/{YYYY-MM-DD}/datetime.npy
+        {folder}/{bar_size}/{symbol}/{YYYY-MM-DD}/values.npy
+
+    New bars are merged into the partition of their date, which only
+    rewrites that partition, so appending the latest bars stays cheap.
+    """
+
+    def __init__(self, folder: Union[str, pathlib.Path]) -> None:
+        """Initalizes the BarStore object.
+
+        Arguments:
+        ----
+        folder {Union[str, pathlib.Path]} -- The folder the bars are stored in,
+            created if it doesn't exist.
+        """
+
+        self.folder = pathlib.Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def _symbol_folder(self, symbol: str, bar_size: str) -> pathlib.Path:
+        """The folder of a symbol's partitions. Symbols like `/ES` are quoted to stay a single folder."""
+
+        return self.folder.joinpath(bar_size, urllib.parse.quote(symbol, safe=''))
+
+    def symbols(self, bar_size: str) -> List[str]:
+        """The symbols stored for a bar size.
+
+        Arguments:
+        ----
+        bar_size {str} -- The bar size, like `1minute`.
+
+        Returns:
+        ----
+        {List[str]} -- The symbols, sorted.
+        """
+
+        bar_size_folder = self.folder.joinpath(bar_size)
+
+        if not bar_size_folder.exists():
+            return []
+
+        return sorted(urllib.parse.unquote(path.name) for path in bar_size_folder.iterdir() if path.is_dir())
+
+    def dates(self, symbol: str, bar_size: str) -> List[str]:
+        """The dates of a symbol's partitions.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        bar_size {str} -- The bar size, like `1minute`.
+
+        Returns:
+        ----
+        {List[str]} -- The dates, formatted as `YYYY-MM-DD` and sorted.
+        """
+
+        symbol_folder = self._symbol_folder(symbol=symbol, bar_size=bar_size)
+
+        if not symbol_folder.exists():
+            return []
+
+        # Skip the partitions that are still being written.
+        return sorted(path.name for path in symbol_folder.iterdir() if '.' not in path.name)
+
+    def _read_partition(self, partition: pathlib.Path) -> Tuple[np.ndarray, np.ndarray]:
+        """Memory maps the arrays of a partition."""
+
+        return (
+            map_array(path=partition.joinpath('datetime.npy')),
+            map_array(path=partition.joinpath('values.npy'))
+        )
+
+    def _write_partition(self, partition: pathlib.Path, datetime: np.ndarray, values: np.ndarray) -> None:
+        """Writes the arrays of a partition, replacing the old partition only once they're complete."""
+
+        staging = partition.with_name(partition.name + '.new')
+        replaced = partition.with_name(partition.name + '.old')
+
+        for folder in [staging, replaced]:
+            if folder.exists():
+                shutil.rmtree(folder)
+
+        staging.mkdir(parents=True)
+        np.save(staging.joinpath('datetime.npy'), np.ascontiguousarray(datetime, dtype='int64'))
+        np.save(staging.joinpath('values.npy'), np.ascontiguousarray(values, dtype='float64'))
+
+        if partition.exists():
+            os.replace(partition, replaced)
+
+        os.replace(staging, partition)
+
+        if replaced.exists():
+            shutil.rmtree(replaced)
+
+    def partitions(self, symbol: str, bar_size: str, start: Optional[int] = None,
+                   end: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Reads a symbol's bars in a range, one partition at a time.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        bar_size {str} -- The bar size, like `1minute`.
+
+        Keyword Arguments:
+        ----
+        start {int} -- The first timestamp to read, in milliseconds since epoch. If `None`,
+            starts from the first stored bar. (default: {None})
+
+        end {int} -- The last timestamp to read, in milliseconds since epoch. If `None`,
+            reads up to the last stored bar. (default: {None})
+
+        Returns:
+        ----
+        {Iterator[Tuple[np.ndarray, np.ndarray]]} -- The timestamps and the values of each
+            partition, as read-only views on the memory mapped files.
+        """
+
+        first_date = partition_date(timestamp=start) if start is not None else None
+        last_date = partition_date(timestamp=end) if end is not None else None
+
+        symbol_folder = self._symbol_folder(symbol=symbol, bar_size=bar_size)
+
+        for date in self.dates(symbol=symbol, bar_size=bar_size):
+
+            if (first_date and date < first_date) or (last_date and date > last_date):
+                continue
+
+            datetime, values = self._read_partition(partition=symbol_folder.joinpath(date))
+
+            # Only the first and the last partition of the range can hold bars outside of it.
+            first = 0 if start is None else int(np.searchsorted(datetime, start, side='left'))
+            last = datetime.size if end is None else int(np.searchsorted(datetime, end, side='right'))
+
+            if last > first:
+                yield datetime[first:last], values[:, first:last]
+
+    def first_timestamp(self, symbol: str, bar_size: str) -> Optional[int]:
+        """The timestamp of a symbol's first stored bar, or `None` if it has none."""
+
+        dates = self.dates(symbol=symbol, bar_size=bar_size)
+
+        if not dates:
+            return None
+
+        datetime, _ = self._read_partition(partition=self._symbol_folder(symbol=symbol, bar_size=bar_size).joinpath(dates[0]))
+
+        return int(datetime[0])
+
+    def last_timestamp(self, symbol: str, bar_size: str) -> Optional[int]:
+        """The timestamp of a symbol's last stored bar, or `None` if it has none."""
+
+        dates = self.dates(symbol=symbol, bar_size=bar_size)
+
+        if not dates:
+            return None
+
+        datetime, _ = self._read_partition(partition=self._symbol_folder(symbol=symbol, bar_size=bar_size).joinpath(dates[-1]))
+
+        return int(datetime[-1])
+
+    def write(self, bar_size: str, columns: Dict[str, np.ndarray]) -> int:
+        """Merges bars into the store.
+
+        Overview:
+        ----
+        The bars are split by symbol and date, and merged into the partition of
+        each date. A bar with the same timestamp as a stored bar replaces it, the
+        same way `SymbolBarBuffer.extend` does, so the last, still forming bar of
+        an earlier run is updated instead of duplicated.
+
+        Arguments:
+        ----
+        bar_size {str} -- The bar size, like `1minute`.
+
+        columns {Dict[str, np.ndarray]} -- The `symbol`, `datetime` and `BAR_COLUMNS` columns,
+            like the ones returned by `HistoricalLoader.load`.
+
+        Returns:
+        ----
+        {int} -- The number of partitions written.
+        """
+
+        symbols = np.asarray(columns['symbol'], dtype=object)
+
+        if symbols.size == 0:
+            return 0
+
+        buffer = BarBuffer()
+        buffer.extend(symbols=symbols, datetime=columns['datetime'], columns=columns)
+
+        written = 0
+
+        for symbol in buffer.symbols:
+
+            symbol_buffer = buffer.symbol(symbol)
+            symbol_folder = self._symbol_folder(symbol=symbol, bar_size=bar_size)
+
+            # The bars are sorted, so each date is a contiguous range.
+            days = symbol_buffer.datetime // MILLISECONDS_PER_DAY
+            boundaries = np.flatnonzero(np.diff(days)) + 1
+
+            for first, last in zip(np.r_[0, boundaries], np.r_[boundaries, days.size]):
+
+                partition = symbol_folder.joinpath(partition_date(timestamp=int(symbol_buffer.datetime[first])))
+                stored = self._read_partition(partition=partition) if partition.exists() else None
+
+                merged = SymbolBarBuffer(initial_capacity=(stored[0].size if stored else 0) + last - first)
+
+                # Copy the stored bars, and let go of the memory maps before the files are replaced.
+                if stored:
+                    merged.extend(datetime=stored[0], values=stored[1])
+                    stored = None
+
+                merged.extend(datetime=symbol_buffer.datetime[first:last], values=symbol_buffer.values[:, first:last])
+
+                self._write_partition(partition=partition, datetime=merged.datetime, values=merged.values)
+                written += 1
+
+        return written
+
+    def save(self, buffer: BarBuffer, bar_size: str) -> int:
+        """Saves the bars of a StockFrame's buffer that are newer than the stored ones.
+
+        Overview:
+        ----
+        For each symbol, the bars from its last stored bar onwards are written,
+        so saving the buffer of a running robot only rewrites the latest partitions.
+
+        Arguments:
+        ----
+        buffer {BarBuffer} -- The buffer, see `StockFrame.buffer`.
+
+        bar_size {str} -- The bar size, like `1minute`.
+
+        Returns:
+        ----
+        {int} -- The number of partitions written.
+
+        Usage:
+        ----
+            >>> bar_store = BarStore(folder='data/bars')
+            >>> bar_store.save(buffer=stock_frame.buffer, bar_size='1minute')
+        """
+
+        columns = []
+
+        for symbol in buffer.symbols:
+
+            symbol_buffer = buffer.symbol(symbol)
+            last_timestamp = self.last_timestamp(symbol=symbol, bar_size=bar_size)
+
+            first = 0 if last_timestamp is None else int(np.searchsorted(symbol_buffer.datetime, last_timestamp))
+            count = len(symbol_buffer) - first
+
+            if count <= 0:
+                continue
+
+            symbol_columns = {
+                'symbol': np.full(count, symbol, dtype=object),
+                'datetime': symbol_buffer.datetime[first:]
+            }
+
+            for position, column in enumerate(BAR_COLUMNS):
+                symbol_columns[column] = symbol_buffer.values[position, first:]
+
+            columns.append(symbol_columns)
+
+        if not columns:
+            return 0
+
+        return self.write(
+            bar_size=bar_size,
+            columns={column: np.concatenate([symbol_columns[column] for symbol_columns in columns]) for column in columns[0]}
+        )
+
+    def read(self, symbols: List[str], bar_size: str, start: Optional[int] = None, end: Optional[int] = None) -> BarBuffer:
+        """Reads the bars of several symbols in a range into a new buffer.
+
+        Overview:
+        ----
+        The partitions are memory mapped, and each one is copied once, straight
+        into the symbol's buffer, which is sized for the whole range up front.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols to read. Symbols without stored bars are left out.
+
+        bar_size {str} -- The bar size, like `1minute`.
+
+        Keyword Arguments:
+        ----
+        start {int} -- The first timestamp to read, in milliseconds since epoch. (default: {None})
+
+        end {int} -- The last timestamp to read, in milliseconds since epoch. (default: {None})
+
+        Returns:
+        ----
+        {BarBuffer} -- The bars, which a `StockFrame` can be built from.
+        """
+
+        buffer = BarBuffer()
+
+        for symbol in symbols:
+
+            partitions = list(self.partitions(symbol=symbol, bar_size=bar_size, start=start, end=end))
+
+            if not partitions:
+                continue
+
+            buffer.reserve(symbol=symbol, size=sum(datetime.size for datetime, _ in partitions))
+
+            for datetime, values in partitions:
+                buffer.extend_symbol(symbol=symbol, datetime=datetime, values=values)
+
+        return buffer
@@ -0,0 +1,434 @@
+import time
+import threading
+import collections
+import concurrent.futures
+import numpy as np
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Optional
+
+from pyrobot.bar_buffer import BAR_COLUMNS
+from pyrobot.bar_store import BarStore
+from td.client import TDClient
+
+
+class PriceHistoryError(Exception):
+
+    """Raised when the price history endpoint keeps returning an error for a symbol."""
+
+    pass
+
+
+class RateLimiter():
+
+    """
+    A thread safe rate limiter, which allows at most `max_calls`
+    calls in any window of `period` seconds. The TD Ameritrade API
+    allows 120 calls per minute.
+    """
+
+    def __init__(self, max_calls: int = 120, period: float = 60.0) -> None:
+        """Initalizes the RateLimiter object.
+
+        Keyword Arguments:
+        ----
+        max_calls {int} -- The number of calls allowed in each window. (default: {120})
+
+        period {float} -- The length of the window, in seconds. (default: {60.0})
+        """
+
+        self.max_calls = max_calls
+        self.period = period
+
+        self._calls = collections.deque(maxlen=max_calls)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until another call can be made, and records it."""
+
+        with self._lock:
+
+            # If the window is full, wait for the oldest call to fall out of it.
+            if len(self._calls) == self.max_calls:
+
+                wait_time = self._calls[0] + self.period - time.monotonic()
+
+                if wait_time > 0:
+                    time.sleep(wait_time)
+
+            self._calls.append(time.monotonic())
+
+
+def decode_candles(symbol: str, candles: List[dict]) -> Dict[str, np.ndarray]:
+    """Decodes the candles of a price history response into column arrays.
+
+    Arguments:
+    ----
+    symbol {str} -- The symbol the candles belong to.
+
+    candles {List[dict]} -- The `candles` list of the price history response.
+
+    Returns:
+    ----
+    {Dict[str, np.ndarray]} -- The `symbol`, `datetime` and `BAR_COLUMNS` columns.
+    """
+
+    count = len(candles)
+
+    columns = {
+        'symbol': np.full(count, symbol, dtype=object),
+        'datetime': np.fromiter((candle['datetime'] for candle in candles), dtype='int64', count=count)
+    }
+
+    for column in BAR_COLUMNS:
+        columns[column] = np.fromiter((candle[column] for candle in candles), dtype='float64', count=count)
+
+    return columns
+
+
+def concatenate_columns(columns: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Joins the decoded columns of several symbols together.
+
+    Arguments:
+    ----
+    columns {List[Dict[str, np.ndarray]]} -- The columns returned by `decode_candles`.
+
+    Returns:
+    ----
+    {Dict[str, np.ndarray]} -- One array per column, which can be passed straight to a `StockFrame`.
+    """
+
+    if not columns:
+        return decode_candles(symbol='', candles=[])
+
+    return {
+        column: np.concatenate([symbol_columns[column] for symbol_columns in columns])
+        for column in columns[0]
+    }
+
+
+class HistoricalLoader():
+
+    """
+    Grabs the price history of many symbols at once, using a bounded
+    pool of worker threads that share a `RateLimiter`. The candles are
+    decoded into column arrays, which a `StockFrame` can load directly.
+    Each symbol is retried on its own, with an exponential backoff, so
+    a failing symbol never holds up the others.
+    """
+
+    def __init__(self, td_client: TDClient, max_workers: int = 8, rate_limiter: RateLimiter = None,
+                 max_retries: int = 2, backoff: float = 0.5) -> None:
+        """Initalizes the HistoricalLoader object.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- An authenticated TDClient session.
+
+        Keyword Arguments:
+        ----
+        max_workers {int} -- The number of requests that can be in flight at once. (default: {8})
+
+        rate_limiter {RateLimiter} -- The rate limiter to share between the workers. If not
+            provided, a new one is created with the TD Ameritrade API limits. (default: {None})
+
+        max_retries {int} -- The number of times a symbol is retried after an error. (default: {2})
+
+        backoff {float} -- The number of seconds to wait before the first retry, doubled
+            after each retry. (default: {0.5})
+        """
+
+        self.td_client = td_client
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._executor: ThreadPoolExecutor = None
+        self._pending: Dict[str, Future] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The worker pool, created the first time it's needed."""
+
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return self._executor
+
+    def close(self) -> None:
+        """Shuts down the worker pool, without waiting for requests still in flight."""
+
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        self._pending = {}
+
+    def _grab_candles(self, symbol: str, price_history_arguments: dict) -> List[dict]:
+        """Grabs the candles of a single symbol, retrying on errors.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol to grab.
+
+        price_history_arguments {dict} -- The arguments passed through to `TDClient.get_price_history`.
+
+        Raises:
+        ----
+        PriceHistoryError: If the response is still an error after the last retry. Any
+            other exception raised by the last attempt is passed through.
+
+        Returns:
+        ----
+        {List[dict]} -- The candles.
+        """
+
+        for attempt in range(self.max_retries + 1):
+
+            is_last_attempt = attempt == self.max_retries
+
+            if attempt > 0:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            self.rate_limiter.acquire()
+
+            try:
+                historical_prices_response = self.td_client.get_price_history(
+                    symbol=symbol,
+                    **price_history_arguments
+                )
+            except Exception:
+                if is_last_attempt:
+                    raise
+                continue
+
+            if 'error' not in historical_prices_response:
+                return historical_prices_response.get('candles', [])
+
+            if is_last_attempt:
+                raise PriceHistoryError(
+                    '{symbol}: {error}'.format(symbol=symbol, error=historical_prices_response['error'])
+                )
+
+    def _submit(self, symbol: str, price_history_arguments: dict) -> Future:
+        """Submits a symbol to the worker pool, unless a request for it is still in flight.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol to grab.
+
+        price_history_arguments {dict} -- The arguments passed through to `TDClient.get_price_history`.
+
+        Returns:
+        ----
+        {Future} -- The future for the symbol's candles.
+        """
+
+        future = self._pending.get(symbol)
+
+        if future is None or future.done():
+            future = self.executor.submit(self._grab_candles, symbol, price_history_arguments)
+            self._pending[symbol] = future
+
+        return future
+
+    def load(self, symbols: List[str], **price_history_arguments) -> Tuple[Dict[str, List[dict]], Dict[str, np.ndarray]]:
+        """Grabs the price history of each symbol.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols to grab.
+
+        Keyword Arguments:
+        ----
+        **price_history_arguments -- The arguments passed through to `TDClient.get_price_history`,
+            for example `period_type`, `start_date`, `end_date`, `frequency_type` and `frequency`.
+
+        Raises:
+        ----
+        The first error raised while grabbing a symbol, after the other requests have finished.
+
+        Returns:
+        ----
+        {Tuple[Dict[str, List[dict]], Dict[str, np.ndarray]]} -- The raw candles of each symbol,
+            and the decoded columns of all the symbols, in the same order as `symbols`.
+
+        Usage:
+        ----
+            >>> historical_loader = HistoricalLoader(td_client=trading_robot.session)
+            >>> candles, columns = historical_loader.load(
+                symbols=['MSFT', 'AAPL'],
+                period_type='year',
+                period=1,
+                frequency_type='daily',
+                frequency=1
+            )
+            >>> stock_frame = StockFrame(data=columns)
+        """
+
+        return self._load_requests(requests=[(symbol, price_history_arguments) for symbol in symbols])
+
+    def _load_requests(self, requests: List[Tuple[str, dict]]) -> Tuple[Dict[str, List[dict]], Dict[str, np.ndarray]]:
+        """Submits the requests of every symbol at once, and waits for all of them.
+
+        Arguments:
+        ----
+        requests {List[Tuple[str, dict]]} -- The symbol, and its arguments for `TDClient.get_price_history`.
+
+        Raises:
+        ----
+        The first error raised while grabbing a symbol, after the other requests have finished.
+
+        Returns:
+        ----
+        {Tuple[Dict[str, List[dict]], Dict[str, np.ndarray]]} -- The raw candles of each symbol,
+            and the decoded columns of all the symbols, in the order of the requests.
+        """
+
+        futures = [
+            self.executor.submit(self._grab_candles, symbol, price_history_arguments)
+            for symbol, price_history_arguments in requests
+        ]
+
+        concurrent.futures.wait(futures)
+
+        candles = {}
+        columns = []
+
+        for (symbol, _), future in zip(requests, futures):
+            candles[symbol] = future.result()
+            columns.append(decode_candles(symbol=symbol, candles=candles[symbol]))
+
+        return candles, concatenate_columns(columns=columns)
+
+    def load_latest(self, symbols: List[str], timeout: Optional[float] = None,
+                    **price_history_arguments) -> Tuple[List[dict], List[str]]:
+        """Grabs the latest bar of each symbol.
+
+        Overview:
+        ----
+        All the symbols are requested at once. Symbols that fail, or that don't
+        finish within `timeout`, are returned in a separate list so the caller
+        can carry on with the others. A symbol that is still in flight from an
+        earlier call is not requested again, its pending request is reused.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols to grab.
+
+        Keyword Arguments:
+        ----
+        timeout {float} -- The number of seconds to wait for the requests. If `None`,
+            waits for all of them. (default: {None})
+
+        **price_history_arguments -- The arguments passed through to `TDClient.get_price_history`.
+
+        Returns:
+        ----
+        {Tuple[List[dict], List[str]]} -- The latest bars, and the symbols that didn't return one.
+        """
+
+        symbols = list(symbols)
+        futures = [self._submit(symbol, price_history_arguments) for symbol in symbols]
+
+        concurrent.futures.wait(futures, timeout=timeout)
+
+        latest_prices = []
+        missed_symbols = []
+
+        for symbol, future in zip(symbols, futures):
+
+            if not future.done() or future.exception() is not None or not future.result():
+                missed_symbols.append(symbol)
+                continue
+
+            candle = future.result()[-1]
+
+            new_price_mini_dict = {}
+            new_price_mini_dict['symbol'] = symbol
+            new_price_mini_dict['open'] = candle['open']
+            new_price_mini_dict['close'] = candle['close']
+            new_price_mini_dict['high'] = candle['high']
+            new_price_mini_dict['low'] = candle['low']
+            new_price_mini_dict['volume'] = candle['volume']
+            new_price_mini_dict['datetime'] = candle['datetime']
+            latest_prices.append(new_price_mini_dict)
+
+        return latest_prices, missed_symbols
+
+    def update_store(self, bar_store: BarStore, symbols: List[str], bar_size: str, start: int, end: int,
+                     **price_history_arguments) -> Dict[str, int]:
+        """Grabs the bars missing from a `BarStore`, and writes them to it.
+
+        Overview:
+        ----
+        Each symbol is only grabbed from its last stored bar onwards, so the last bar
+        of an earlier run is refreshed and the gap since then is filled. A symbol
+        with no stored bars, or whose last stored bar is before `start`, is grabbed
+        from `start`. The store is only extended forward, bars before the first
+        stored bar are never grabbed again. Every symbol is requested at once,
+        each from its own start, and the bars are written when all of them are in.
+
+        Arguments:
+        ----
+        bar_store {BarStore} -- The store to update.
+
+        symbols {List[str]} -- The symbols to update.
+
+        bar_size {str} -- The bar size the bars are stored under, like `1minute`. It has to
+            match the `frequency_type` and `frequency` of the price history arguments.
+
+        start {int} -- The first timestamp of the range, in milliseconds since epoch.
+
+        end {int} -- The last timestamp of the range, in milliseconds since epoch.
+
+        Keyword Arguments:
+        ----
+        **price_history_arguments -- The other arguments passed through to
+            `TDClient.get_price_history`, like `frequency_type` and `frequency`.
+
+        Returns:
+        ----
+        {Dict[str, int]} -- The number of bars grabbed for each symbol.
+
+        Usage:
+        ----
+            >>> historical_loader = HistoricalLoader(td_client=trading_robot.session)
+            >>> historical_loader.update_store(
+                bar_store=BarStore(folder='data/bars'),
+                symbols=['MSFT', 'AAPL'],
+                bar_size='1minute',
+                start=start,
+                end=end,
+                period_type='day',
+                frequency_type='minute',
+                frequency=1
+            )
+        """
+
+        requests = []
+
+        for symbol in symbols:
+
+            last_timestamp = bar_store.last_timestamp(symbol=symbol, bar_size=bar_size)
+
+            if last_timestamp is None or last_timestamp < start:
+                gap_start = start
+            else:
+                gap_start = last_timestamp
+
+            requests.append((symbol, dict(price_history_arguments, start_date=str(gap_start), end_date=str(end))))
+
+        candles, columns = self._load_requests(requests=requests)
+
+        bar_store.write(bar_size=bar_size, columns=columns)
+
+        counts = {symbol: len(symbol_candles) for symbol, symbol_candles in candles.items()}
+
+        return counts
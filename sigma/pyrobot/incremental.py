@@ -0,0 +1,1087 @@
+import math
+import numpy as np
+import pandas as pd
+
+from collections import deque
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Optional
+
+from pyrobot.bar_buffer import BarBuffer
+
+
+NAN = float('nan')
+
+# Marks an undo record with no value that fell out of a window.
+_NOTHING = object()
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Divides two floats the same way NumPy does.
+
+    Overview:
+    ----
+    The batch indicators are calculated with NumPy arrays, where a division
+    by zero returns `inf` or `nan` instead of raising an error. To keep the
+    incremental values identical, plain Python floats have to follow those
+    same rules.
+
+    Arguments:
+    ----
+    numerator {float} -- The numerator.
+
+    denominator {float} -- The denominator.
+
+    Returns:
+    ----
+    {float} -- The result of the division.
+    """
+
+    if denominator == 0.0:
+        if numerator == 0.0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+
+    return numerator / denominator
+
+
+class Lag():
+
+    """
+    Keeps the last `periods` values of a series, so that `shift`, `diff`
+    and `pct_change` can be calculated one value at a time.
+    """
+
+    def __init__(self, periods: int = 1) -> None:
+        """Initalizes the Lag object.
+
+        Keyword Arguments:
+        ----
+        periods {int} -- The number of periods to shift by. (default: {1})
+        """
+
+        self.periods = periods
+        self._values = deque(maxlen=periods + 1)
+        self._undo = None
+
+    def update(self, value: float) -> float:
+        """Adds a new value and returns the value `periods` bars ago.
+
+        Arguments:
+        ----
+        value {float} -- The newest value in the series.
+
+        Returns:
+        ----
+        {float} -- The shifted value, `nan` if there isn't enough history yet.
+        """
+
+        self._values.append(value)
+
+        if len(self._values) > self.periods:
+            return self._values[0]
+        else:
+            return NAN
+
+    def checkpoint(self) -> None:
+        """Remembers the value the next `update` pushes out, so it can be undone with `rollback`."""
+
+        is_full = len(self._values) == self._values.maxlen
+        self._undo = self._values[0] if is_full else _NOTHING
+
+    def rollback(self) -> None:
+        """Undoes the one `update` since the last `checkpoint`."""
+
+        self._values.pop()
+
+        if self._undo is not _NOTHING:
+            self._values.appendleft(self._undo)
+
+
+class ExponentialMean():
+
+    """
+    Calculates `pd.Series.ewm(span=span, min_periods=min_periods).mean()` one
+    value at a time, using the same recursion pandas uses internally.
+    """
+
+    def __init__(self, span: float, min_periods: int = 0) -> None:
+        """Initalizes the ExponentialMean object.
+
+        Arguments:
+        ----
+        span {float} -- The span of the exponential window.
+
+        Keyword Arguments:
+        ----
+        min_periods {int} -- The minimum number of observations required
+            to have a value. (default: {0})
+        """
+
+        alpha = 2.0 / (span + 1.0)
+
+        self._old_wt_factor = 1.0 - alpha
+        self._min_periods = max(min_periods, 1)
+        self._weighted = NAN
+        self._old_wt = 1.0
+        self._nobs = 0
+        self._undo = None
+
+    def checkpoint(self) -> None:
+        """Remembers the running values, so the next `update` can be undone with `rollback`."""
+
+        self._undo = (self._weighted, self._old_wt, self._nobs)
+
+    def rollback(self) -> None:
+        """Undoes the one `update` since the last `checkpoint`."""
+
+        self._weighted, self._old_wt, self._nobs = self._undo
+
+    def update(self, value: float) -> float:
+        """Adds a new value and returns the current weighted average.
+
+        Arguments:
+        ----
+        value {float} -- The newest value in the series.
+
+        Returns:
+        ----
+        {float} -- The exponentially weighted mean.
+        """
+
+        is_observation = value == value
+        self._nobs += is_observation
+
+        if self._weighted == self._weighted:
+
+            self._old_wt *= self._old_wt_factor
+
+            if is_observation:
+                if self._weighted != value:
+                    self._weighted = (
+                        (self._old_wt * self._weighted) + value
+                    ) / (self._old_wt + 1.0)
+                self._old_wt += 1.0
+
+        elif is_observation:
+            self._weighted = value
+
+        if self._nobs >= self._min_periods:
+            return self._weighted
+        else:
+            return NAN
+
+
+class ExponentialStd():
+
+    """
+    Calculates `pd.Series.ewm(span=span).std()` one value at a time, using
+    the same bias corrected recursion pandas uses internally.
+    """
+
+    def __init__(self, span: float, min_periods: int = 0) -> None:
+        """Initalizes the ExponentialStd object.
+
+        Arguments:
+        ----
+        span {float} -- The span of the exponential window.
+
+        Keyword Arguments:
+        ----
+        min_periods {int} -- The minimum number of observations required
+            to have a value. (default: {0})
+        """
+
+        alpha = 2.0 / (span + 1.0)
+
+        self._old_wt_factor = 1.0 - alpha
+        self._min_periods = max(min_periods, 1)
+        self._mean = NAN
+        self._cov = 0.0
+        self._sum_wt = 1.0
+        self._sum_wt2 = 1.0
+        self._old_wt = 1.0
+        self._nobs = 0
+        self._undo = None
+
+    def checkpoint(self) -> None:
+        """Remembers the running values, so the next `update` can be undone with `rollback`."""
+
+        self._undo = (self._mean, self._cov, self._sum_wt, self._sum_wt2, self._old_wt, self._nobs)
+
+    def rollback(self) -> None:
+        """Undoes the one `update` since the last `checkpoint`."""
+
+        self._mean, self._cov, self._sum_wt, self._sum_wt2, self._old_wt, self._nobs = self._undo
+
+    def update(self, value: float) -> float:
+        """Adds a new value and returns the current weighted standard deviation.
+
+        Arguments:
+        ----
+        value {float} -- The newest value in the series.
+
+        Returns:
+        ----
+        {float} -- The exponentially weighted standard deviation.
+        """
+
+        is_observation = value == value
+        self._nobs += is_observation
+
+        if self._mean == self._mean:
+
+            self._sum_wt *= self._old_wt_factor
+            self._sum_wt2 *= self._old_wt_factor * self._old_wt_factor
+            self._old_wt *= self._old_wt_factor
+
+            if is_observation:
+
+                old_mean = self._mean
+
+                if self._mean != value:
+                    self._mean = (
+                        (self._old_wt * old_mean) + value
+                    ) / (self._old_wt + 1.0)
+
+                self._cov = (
+                    (self._old_wt * (self._cov + ((old_mean - self._mean) * (old_mean - self._mean)))) +
+                    ((value - self._mean) * (value - self._mean))
+                ) / (self._old_wt + 1.0)
+
+                self._sum_wt += 1.0
+                self._sum_wt2 += 1.0
+                self._old_wt += 1.0
+
+        elif is_observation:
+            self._mean = value
+
+        if self._nobs < self._min_periods:
+            return NAN
+
+        numerator = self._sum_wt * self._sum_wt
+        denominator = numerator - self._sum_wt2
+
+        if denominator > 0.0:
+            return math.sqrt(max((numerator / denominator) * self._cov, 0.0))
+        else:
+            return NAN
+
+
+class RollingWindow():
+
+    """
+    Keeps a fixed size window of values along with a running sum and a
+    Welford style running variance, so that `rolling().sum()`, `rolling().mean()`
+    and `rolling().std()` can be calculated one value at a time.
+    """
+
+    def __init__(self, window: int, min_periods: int = None) -> None:
+        """Initalizes the RollingWindow object.
+
+        Arguments:
+        ----
+        window {int} -- The size of the window.
+
+        Keyword Arguments:
+        ----
+        min_periods {int} -- The minimum number of observations in the window
+            required to have a value, defaults to the window size. (default: {None})
+        """
+
+        self.window = window
+        self._min_periods = window if min_periods is None else min_periods
+        self._values = deque()
+        self._nobs = 0
+        self._sum = 0.0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._undo = None
+
+    def checkpoint(self) -> None:
+        """Remembers the running values, and the value the next `update` pushes out of the
+        window, so it can be undone with `rollback`."""
+
+        evicted = self._values[0] if len(self._values) >= self.window else _NOTHING
+        self._undo = (self._nobs, self._sum, self._mean, self._ssqdm, evicted)
+
+    def rollback(self) -> None:
+        """Undoes the one `update` since the last `checkpoint`."""
+
+        self._nobs, self._sum, self._mean, self._ssqdm, evicted = self._undo
+        self._values.pop()
+
+        if evicted is not _NOTHING:
+            self._values.appendleft(evicted)
+
+    def _add(self, value: float) -> None:
+
+        if value == value:
+            self._nobs += 1
+            self._sum += value
+            delta = value - self._mean
+            self._mean += delta / self._nobs
+            self._ssqdm += delta * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+
+        if value == value:
+            self._nobs -= 1
+            self._sum -= value
+
+            if self._nobs:
+                delta = value - self._mean
+                self._mean -= delta / self._nobs
+                self._ssqdm -= ((self._nobs + 1) * delta * delta) / self._nobs
+            else:
+                self._sum = 0.0
+                self._mean = 0.0
+                self._ssqdm = 0.0
+
+    def update(self, value: float) -> 'RollingWindow':
+        """Adds a new value to the window, removing the oldest one if needed.
+
+        Arguments:
+        ----
+        value {float} -- The newest value in the series.
+
+        Returns:
+        ----
+        {RollingWindow} -- The window itself, so the statistics can be chained.
+        """
+
+        self._values.append(value)
+        self._add(value)
+
+        if len(self._values) > self.window:
+            self._remove(self._values.popleft())
+
+        return self
+
+    @property
+    def sum(self) -> float:
+        """The sum of the window, `nan` if there aren't enough observations."""
+
+        if self._nobs >= self._min_periods and self._nobs > 0:
+            return self._sum
+        return NAN
+
+    @property
+    def mean(self) -> float:
+        """The mean of the window, `nan` if there aren't enough observations."""
+
+        if self._nobs >= self._min_periods and self._nobs > 0:
+            return self._sum / self._nobs
+        return NAN
+
+    @property
+    def std(self) -> float:
+        """The sample standard deviation of the window, `nan` if there aren't enough observations."""
+
+        if self._nobs >= self._min_periods and self._nobs > 1:
+            return math.sqrt(max(self._ssqdm / (self._nobs - 1), 0.0))
+        return NAN
+
+
+    @property
+    def mean_absolute_deviation(self) -> float:
+        """The mean absolute deviation of the window around its mean, `nan` unless the window is full.
+
+        Overview:
+        ----
+        The deviation depends on the mean of the whole window, so it's taken over
+        the values kept in the window, in O(window) time per bar.
+        """
+
+        if self._nobs < self.window:
+            return NAN
+
+        mean = self._sum / self._nobs
+
+        return sum(abs(value - mean) for value in self._values) / self._nobs
+
+
+class RollingExtremes():
+
+    """
+    Keeps the minimum and the maximum of a fixed size window, using a
+    monotonic deque for each, so `rolling().min()` and `rolling().max()`
+    can be calculated one value at a time in amortized O(1) time.
+    """
+
+    def __init__(self, window: int) -> None:
+        """Initalizes the RollingExtremes object.
+
+        Arguments:
+        ----
+        window {int} -- The size of the window, which also has to be full to have a value.
+        """
+
+        self.window = window
+        self._position = 0
+        self._is_full = False
+        self._missing = deque()
+
+        # The positions and values that can still become the extreme, increasing for the
+        # minimum and decreasing for the maximum, so the extreme is always at the front.
+        self._minimums = deque()
+        self._maximums = deque()
+
+        # While recording, the candidates and missing positions the next update drops.
+        self._recording = False
+        self._undo = None
+
+    def checkpoint(self) -> None:
+        """Records what the next `update` drops, so it can be undone with `rollback`."""
+
+        self._recording = True
+        self._undo = (self._is_full, [], [], [], [], [])
+
+    def rollback(self) -> None:
+        """Undoes the one `update` since the last `checkpoint`."""
+
+        is_full, minimums_popped, maximums_popped, minimums_expired, maximums_expired, missing_expired = self._undo
+
+        self._position -= 1
+        self._is_full = is_full
+
+        # Undo the steps of `update` in reverse: the expired values, the new value, the popped candidates.
+        self._minimums.extendleft(reversed(minimums_expired))
+        self._maximums.extendleft(reversed(maximums_expired))
+        self._missing.extendleft(reversed(missing_expired))
+
+        if self._missing and self._missing[-1] == self._position:
+            self._missing.pop()
+        else:
+            self._minimums.pop()
+            self._maximums.pop()
+
+        self._minimums.extend(reversed(minimums_popped))
+        self._maximums.extend(reversed(maximums_popped))
+
+    def update(self, value: float) -> 'RollingExtremes':
+        """Adds a new value to the window, dropping the values that fell out of it.
+
+        Arguments:
+        ----
+        value {float} -- The newest value in the series.
+
+        Returns:
+        ----
+        {RollingExtremes} -- The extremes themselves, so the statistics can be chained.
+        """
+
+        first_position = self._position - self.window + 1
+
+        if self._recording:
+            self._recording = False
+            _, minimums_popped, maximums_popped, minimums_expired, maximums_expired, missing_expired = self._undo
+        else:
+            minimums_popped = maximums_popped = minimums_expired = maximums_expired = missing_expired = None
+
+        if value == value:
+
+            while self._minimums and self._minimums[-1][1] >= value:
+                candidate = self._minimums.pop()
+                if minimums_popped is not None:
+                    minimums_popped.append(candidate)
+
+            while self._maximums and self._maximums[-1][1] <= value:
+                candidate = self._maximums.pop()
+                if maximums_popped is not None:
+                    maximums_popped.append(candidate)
+
+            self._minimums.append((self._position, value))
+            self._maximums.append((self._position, value))
+
+        else:
+            self._missing.append(self._position)
+
+        # Drop the values, and the missing positions, that fell out of the window.
+        for candidates, expired in [(self._minimums, minimums_expired), (self._maximums, maximums_expired)]:
+            while candidates and candidates[0][0] < first_position:
+                candidate = candidates.popleft()
+                if expired is not None:
+                    expired.append(candidate)
+
+        while self._missing and self._missing[0] < first_position:
+            position = self._missing.popleft()
+            if missing_expired is not None:
+                missing_expired.append(position)
+
+        self._is_full = first_position >= 0 and not self._missing
+        self._position += 1
+
+        return self
+
+    @property
+    def min(self) -> float:
+        """The minimum of the window, `nan` unless the window is full of observations."""
+
+        return self._minimums[0][1] if self._is_full else NAN
+
+    @property
+    def max(self) -> float:
+        """The maximum of the window, `nan` unless the window is full of observations."""
+
+        return self._maximums[0][1] if self._is_full else NAN
+
+
+class IncrementalIndicator():
+
+    """
+    Represents the rolling state of a single indicator for a single symbol.
+    Each subclass takes the same arguments as its `Indicators` method, and
+    produces the values for one new bar with `update`.
+    """
+
+    columns: List[str] = []
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+        """Calculates the indicator values for a new bar.
+
+        Arguments:
+        ----
+        open_price {float} -- The open of the bar.
+
+        close {float} -- The close of the bar.
+
+        high {float} -- The high of the bar.
+
+        low {float} -- The low of the bar.
+
+        volume {float} -- The volume of the bar.
+
+        Returns:
+        ----
+        {Tuple[float, ...]} -- The new values, in the same order as `columns`.
+        """
+
+        raise NotImplementedError()
+
+    def checkpoint(self) -> None:
+        """Keeps an undo record of the rolling state, so the next `update` can be undone.
+
+        Overview:
+        ----
+        Each part of the state only remembers its running values, and the value
+        the next bar pushes out of its window, so a checkpoint costs O(1)
+        instead of a copy of the windows.
+        """
+
+        for part in vars(self).values():
+            if hasattr(part, 'rollback'):
+                part.checkpoint()
+
+    def rollback(self) -> None:
+        """Undoes the one `update` since the last `checkpoint`."""
+
+        for part in vars(self).values():
+            if hasattr(part, 'rollback'):
+                part.rollback()
+
+
+class ChangeInPrice(IncrementalIndicator):
+
+    columns = ['change_in_price']
+
+    def __init__(self) -> None:
+        self._close = Lag(periods=1)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+        return (close - self._close.update(close),)
+
+
+class RelativeStrengthIndex(IncrementalIndicator):
+
+    columns = ['rsi']
+
+    def __init__(self, period: int, method: str = 'wilders') -> None:
+        self._close = Lag(periods=1)
+        self._ewma_up = ExponentialMean(span=period)
+        self._ewma_down = ExponentialMean(span=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        change = close - self._close.update(close)
+
+        up_day = change if change >= 0 else 0.0
+        down_day = abs(change) if change < 0 else 0.0
+
+        relative_strength = _divide(
+            self._ewma_up.update(up_day),
+            self._ewma_down.update(down_day)
+        )
+        relative_strength_index = 100.0 - _divide(100.0, 1.0 + relative_strength)
+
+        if relative_strength_index == 0:
+            return (100.0,)
+        else:
+            return (100.0 - _divide(100.0, 1.0 + relative_strength_index),)
+
+
+class SimpleMovingAverage(IncrementalIndicator):
+
+    columns = ['sma']
+
+    def __init__(self, period: int) -> None:
+        self._window = RollingWindow(window=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+        return (self._window.update(close).mean,)
+
+
+class ExponentialMovingAverage(IncrementalIndicator):
+
+    columns = ['ema']
+
+    def __init__(self, period: int, alpha: float = 0.0) -> None:
+        self._ewma = ExponentialMean(span=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+        return (self._ewma.update(close),)
+
+
+class RateOfChange(IncrementalIndicator):
+
+    columns = ['rate_of_change']
+
+    def __init__(self, period: int = 1) -> None:
+        self._close = Lag(periods=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+        return (_divide(close, self._close.update(close)) - 1.0,)
+
+
+class BollingerBands(IncrementalIndicator):
+
+    columns = ['band_upper', 'band_lower']
+
+    def __init__(self, period: int = 20) -> None:
+        self._window = RollingWindow(window=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        self._window.update(close)
+        moving_avg = self._window.mean
+        moving_std = self._window.std
+
+        band_upper = 4 * _divide(moving_std, moving_avg)
+        band_lower = (close - moving_avg) + _divide(2 * moving_std, 4 * moving_std)
+
+        return (band_upper, band_lower)
+
+
+class AverageTrueRange(IncrementalIndicator):
+
+    columns = ['average_true_range']
+
+    def __init__(self, period: int = 14) -> None:
+        self._close = Lag(periods=1)
+        self._ewma = ExponentialMean(span=period, min_periods=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        previous_close = self._close.update(close)
+
+        # Like `DataFrame.max(axis=1)`, missing values are skipped.
+        true_range = max(
+            value for value in [
+                abs(high - low),
+                abs(high - previous_close),
+                abs(low - previous_close)
+            ] if value == value
+        )
+
+        return (self._ewma.update(true_range),)
+
+
+class StochasticOscillator(IncrementalIndicator):
+
+    columns = ['stochastic_oscillator']
+
+    def __init__(self, period: int = 14) -> None:
+        self._lows = RollingExtremes(window=period)
+        self._highs = RollingExtremes(window=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        lowest_low = self._lows.update(low).min
+        highest_high = self._highs.update(high).max
+
+        return (_divide(100 * (close - lowest_low), highest_high - lowest_low),)
+
+
+class MovingAverageConvergenceDivergence(IncrementalIndicator):
+
+    columns = ['macd_fast', 'macd_slow', 'macd_diff', 'macd']
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26) -> None:
+        self._fast = ExponentialMean(span=fast_period, min_periods=fast_period)
+        self._slow = ExponentialMean(span=slow_period, min_periods=slow_period)
+        self._signal = ExponentialMean(span=9, min_periods=8)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        macd_fast = self._fast.update(close)
+        macd_slow = self._slow.update(close)
+        macd_diff = macd_fast - macd_slow
+
+        return (macd_fast, macd_slow, macd_diff, self._signal.update(macd_diff))
+
+
+class MassIndex(IncrementalIndicator):
+
+    columns = ['mass_index']
+
+    def __init__(self, period: int = 9) -> None:
+        self._ewma_1 = ExponentialMean(span=period, min_periods=period - 1)
+        self._ewma_2 = ExponentialMean(span=period, min_periods=period - 1)
+        self._window = RollingWindow(window=25)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        mass_index_1 = self._ewma_1.update(high - low)
+        mass_index_2 = self._ewma_2.update(mass_index_1)
+        mass_index_raw = _divide(mass_index_1, mass_index_2)
+
+        return (self._window.update(mass_index_raw).sum,)
+
+
+class ForceIndex(IncrementalIndicator):
+
+    columns = ['force_index']
+
+    def __init__(self, period: int) -> None:
+        self._close = Lag(periods=period)
+        self._volume = Lag(periods=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        close_diff = close - self._close.update(close)
+        volume_diff = volume - self._volume.update(volume)
+
+        return (close_diff * volume_diff,)
+
+
+class EaseOfMovement(IncrementalIndicator):
+
+    columns = ['ease_of_movement']
+
+    def __init__(self, period: int) -> None:
+        self._high = Lag(periods=1)
+        self._low = Lag(periods=1)
+        self._window = RollingWindow(window=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        high_plus_low = (
+            (high - self._high.update(high)) +
+            (low - self._low.update(low))
+        )
+        diff_divi_vol = _divide(high - low, 2 * volume)
+
+        return (self._window.update(high_plus_low * diff_divi_vol).mean,)
+
+
+class CommodityChannelIndex(IncrementalIndicator):
+
+    columns = ['commodity_channel_index']
+
+    def __init__(self, period: int) -> None:
+        self._window = RollingWindow(window=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        typical_price = (high + low + close) / 3
+        self._window.update(typical_price)
+
+        return (_divide(typical_price - self._window.mean, 0.015 * self._window.mean_absolute_deviation),)
+
+
+class StandardDeviation(IncrementalIndicator):
+
+    columns = ['standard_deviation']
+
+    def __init__(self, period: int) -> None:
+        self._ewmstd = ExponentialStd(span=period)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+        return (self._ewmstd.update(close),)
+
+
+class ChaikinOscillator(IncrementalIndicator):
+
+    columns = ['chaikin_oscillator']
+
+    def __init__(self, period: int) -> None:
+        self._ewma_3 = ExponentialMean(span=3, min_periods=2)
+        self._ewma_10 = ExponentialMean(span=10, min_periods=9)
+
+    def update(self, open_price: float, close: float, high: float, low: float, volume: float) -> Tuple[float, ...]:
+
+        money_flow_multiplier_top = 2 * (close - high - low)
+        money_flow_multiplier_bot = high - low
+        money_flow_volume = _divide(money_flow_multiplier_top, money_flow_multiplier_bot) * volume
+
+        return (self._ewma_3.update(money_flow_volume) - self._ewma_10.update(money_flow_volume),)
+
+
+INCREMENTAL_INDICATORS = {
+    'change_in_price': ChangeInPrice,
+    'rsi': RelativeStrengthIndex,
+    'sma': SimpleMovingAverage,
+    'ema': ExponentialMovingAverage,
+    'rate_of_change': RateOfChange,
+    'bollinger_bands': BollingerBands,
+    'average_true_range': AverageTrueRange,
+    'stochastic_oscillator': StochasticOscillator,
+    'macd': MovingAverageConvergenceDivergence,
+    'mass_index': MassIndex,
+    'force_index': ForceIndex,
+    'ease_of_movement': EaseOfMovement,
+    'commodity_channel_index': CommodityChannelIndex,
+    'standard_deviation': StandardDeviation,
+    'chaikin_oscillator': ChaikinOscillator
+}
+
+
+class IncrementalEngine():
+
+    """
+    Keeps the rolling state of every registered indicator, for every symbol
+    in a StockFrame, so that only the newly appended bars have to be calculated
+    when the `Indicators` object is refreshed.
+    """
+
+    def __init__(self) -> None:
+        """Initalizes the IncrementalEngine object."""
+
+        self._states: Dict[str, Dict[str, IncrementalIndicator]] = {}
+        self._arguments: Dict[str, dict] = {}
+        self._rows_seen: Dict[str, Dict[str, int]] = {}
+
+        # The buffer rewrites seen for each symbol, and the row of its last bar, which
+        # its state has an undo record for, so a bar that changed in place can be calculated again.
+        self._rewrites_seen: Dict[str, Dict[str, int]] = {}
+        self._checkpoints: Dict[str, Dict[str, int]] = {}
+
+    def is_supported(self, indicator: str) -> bool:
+        """Specifies whether an indicator can be calculated incrementally.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator key, for example `ema` or `sma`.
+
+        Returns:
+        ----
+        {bool} -- `True` if there is an incremental implementation, `False` otherwise.
+        """
+
+        return indicator in INCREMENTAL_INDICATORS
+
+    def reset(self, indicator: str = None) -> None:
+        """Drops the rolling state, for one indicator or for all of them.
+
+        Keyword Arguments:
+        ----
+        indicator {str} -- The indicator key, if not provided all the states
+            are dropped. (default: {None})
+        """
+
+        if indicator:
+            self._states.pop(indicator, None)
+            self._arguments.pop(indicator, None)
+            self._rows_seen.pop(indicator, None)
+            self._rewrites_seen.pop(indicator, None)
+            self._checkpoints.pop(indicator, None)
+        else:
+            self._states = {}
+            self._arguments = {}
+            self._rows_seen = {}
+            self._rewrites_seen = {}
+            self._checkpoints = {}
+
+    def _symbol_ranges(self, frame: pd.DataFrame) -> List[Tuple[Any, int, int]]:
+        """Finds the row range of each symbol in a sorted multi-index frame.
+
+        Arguments:
+        ----
+        frame {pd.DataFrame} -- A multi-index frame, sorted by symbol and datetime.
+
+        Returns:
+        ----
+        {List[Tuple[Any, int, int]]} -- The symbol, the first row and the last row (exclusive).
+        """
+
+        if not frame.index.is_monotonic_increasing:
+            raise ValueError(
+                "The StockFrame must be sorted by symbol and datetime to be refreshed incrementally."
+            )
+
+        codes = np.asarray(frame.index.codes[0])
+
+        if codes.size == 0:
+            return []
+
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+        stops = np.concatenate([starts[1:], [codes.size]])
+        symbols = frame.index.levels[0][codes[starts]]
+
+        return list(zip(symbols, starts.tolist(), stops.tolist()))
+
+    def _first_changed_row(self, indicator: str, symbol: str, buffer: Optional[BarBuffer]) -> int:
+        """Finds the first row of a symbol that has to be calculated again.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator key.
+
+        symbol {str} -- The ticker symbol.
+
+        buffer {Optional[BarBuffer]} -- The buffer the frame was built from, if any.
+
+        Returns:
+        ----
+        {int} -- The row, counted from the first row of the symbol.
+        """
+
+        rows_seen = self._rows_seen[indicator][symbol]
+
+        if buffer is None:
+            return rows_seen
+
+        symbol_buffer = buffer.symbol(symbol)
+        rewrites_seen = self._rewrites_seen[indicator][symbol]
+
+        # Like the `BarResampler`, if there was more than one rewrite we
+        # don't know where the earlier ones started.
+        if symbol_buffer.rewrites == rewrites_seen:
+            return rows_seen
+        elif symbol_buffer.rewrites == rewrites_seen + 1:
+            return min(rows_seen, symbol_buffer.rewritten_from)
+        else:
+            return 0
+
+    def update(self, frame: pd.DataFrame, indicators: Dict[str, dict], buffer: Optional[BarBuffer] = None) -> List[str]:
+        """Calculates the new rows for each indicator and writes them to the frame.
+
+        Overview:
+        ----
+        The first time an indicator is seen, the state is built by replaying
+        the whole history of each symbol. After that, only the bars appended
+        since the last update are calculated.
+
+        If the buffer the frame was built from is passed, the bars it changed
+        in place, like the forming bar of `get_latest_bar` that comes back with
+        the same timestamp, or merged in out of order, are calculated again.
+        Each state keeps an undo record of the last bar, see
+        `IncrementalIndicator.checkpoint`, so when only the last bar changed
+        the state is rolled back by one bar. If older bars changed, the
+        symbol's whole history is replayed.
+
+        Arguments:
+        ----
+        frame {pd.DataFrame} -- The StockFrame's multi-index frame.
+
+        indicators {Dict[str, dict]} -- The registered indicators, with their
+            `args` and `func`.
+
+        Keyword Arguments:
+        ----
+        buffer {BarBuffer} -- The StockFrame's bar buffer, to find the bars that
+            changed. If not provided, bars are expected to only be appended in
+            time order. (default: {None})
+
+        Returns:
+        ----
+        {List[str]} -- The indicators that can't be calculated incrementally, these
+            need to be refreshed with the batch path.
+        """
+
+        unsupported = []
+        symbol_ranges = self._symbol_ranges(frame=frame)
+
+        # The columns, in the order of the arguments of `IncrementalIndicator.update`.
+        base_columns = [
+            frame[column].to_numpy(dtype=float)
+            for column in ['open', 'close', 'high', 'low', 'volume']
+        ]
+
+        for indicator, details in indicators.items():
+
+            if not self.is_supported(indicator=indicator):
+                unsupported.append(indicator)
+                continue
+
+            # If the arguments changed, then the old state is no longer valid.
+            if self._arguments.get(indicator) != details['args']:
+                self.reset(indicator=indicator)
+                self._arguments[indicator] = dict(details['args'])
+                self._states[indicator] = {}
+                self._rows_seen[indicator] = {}
+                self._rewrites_seen[indicator] = {}
+                self._checkpoints[indicator] = {}
+
+            indicator_class = INCREMENTAL_INDICATORS[indicator]
+            states = self._states[indicator]
+            rows_seen = self._rows_seen[indicator]
+            rewrites_seen = self._rewrites_seen[indicator]
+            checkpoints = self._checkpoints[indicator]
+
+            positions = []
+            values = []
+
+            for symbol, start, stop in symbol_ranges:
+
+                if symbol not in states:
+                    states[symbol] = indicator_class(**details['args'])
+                    rows_seen[symbol] = 0
+                    rewrites_seen[symbol] = buffer.symbol(symbol).rewrites if buffer is not None else 0
+
+                first = self._first_changed_row(indicator=indicator, symbol=symbol, buffer=buffer)
+
+                # Rows already calculated changed, so roll the state back. The state
+                # has only taken the last bar since its checkpoint, so it can be undone.
+                if first < rows_seen[symbol]:
+
+                    if checkpoints.get(symbol) == first:
+                        states[symbol].rollback()
+                    else:
+                        first, states[symbol] = 0, indicator_class(**details['args'])
+
+                state = states[symbol]
+                last = stop - start - 1
+
+                bars = zip(*[column_values[start + first:stop].tolist() for column_values in base_columns])
+
+                for row, bar in enumerate(bars, start=first):
+
+                    if row == last:
+                        state.checkpoint()
+                        checkpoints[symbol] = row
+
+                    positions.append(start + row)
+                    values.append(state.update(*bar))
+
+                rows_seen[symbol] = stop - start
+
+                if buffer is not None:
+                    rewrites_seen[symbol] = buffer.symbol(symbol).rewrites
+
+            if not positions:
+                continue
+
+            values = np.asarray(values, dtype=float).reshape(len(positions), -1)
+
+            for index, column in enumerate(indicator_class.columns):
+
+                if column not in frame.columns:
+                    frame[column] = np.nan
+
+                frame.iloc[positions, frame.columns.get_loc(column)] = values[:, index]
+
+        return unsupported
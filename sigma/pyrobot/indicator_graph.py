@@ -0,0 +1,350 @@
+import numpy as np
+import pandas as pd
+
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Callable
+
+from pyrobot import rolling
+from pyrobot import vectorized
+
+
+class Node():
+
+    """
+    A single calculation in the indicator graph, like the EMA of the close
+    or the difference of two other nodes. A node is identified by its
+    operation, its inputs and its parameters, so two indicators that
+    describe the same calculation share a single result.
+    """
+
+    def __init__(self, operation: str, inputs: Tuple['Node', ...] = (), **parameters: Any) -> None:
+        """Initalizes the Node object.
+
+        Arguments:
+        ----
+        operation {str} -- The operation, like `ewm` or `add`. Each one is evaluated by the
+            `IndicatorGraph` method with the same name and a leading underscore.
+
+        Keyword Arguments:
+        ----
+        inputs {Tuple[Node, ...]} -- The nodes the operation is applied to. (default: {()})
+
+        parameters {Any} -- The parameters of the operation, which have to be hashable.
+        """
+
+        self.operation = operation
+        self.inputs = inputs
+        self.parameters = parameters
+        self.key = (operation, tuple(node.key for node in inputs), tuple(sorted(parameters.items())))
+
+    def __repr__(self) -> str:
+        return 'Node({key})'.format(key=self.key)
+
+    def shift(self, periods: int = 1) -> 'Node':
+        """Shifts the values within each symbol."""
+
+        return Node('shift', (self,), periods=periods)
+
+    def diff(self, periods: int = 1) -> 'Node':
+        """The difference of the values within each symbol."""
+
+        return Node('diff', (self,), periods=periods)
+
+    def pct_change(self, periods: int = 1) -> 'Node':
+        """The percent change of the values within each symbol."""
+
+        return Node('pct_change', (self,), periods=periods)
+
+    def rolling(self, window: int, statistic: str = 'mean') -> 'Node':
+        """A rolling `mean`, `std`, `sum`, `min`, `max` or `mad` (mean absolute deviation) within each symbol."""
+
+        return Node('rolling', (self,), window=window, statistic=statistic)
+
+    def ewm(self, span: float, min_periods: int = 0, statistic: str = 'mean') -> 'Node':
+        """An exponentially weighted `mean` or `std` within each symbol."""
+
+        return Node('ewm', (self,), span=span, min_periods=min_periods, statistic=statistic)
+
+    def __add__(self, other: Union['Node', float]) -> 'Node':
+        return Node('add', (self, as_node(other)))
+
+    def __radd__(self, other: float) -> 'Node':
+        return Node('add', (as_node(other), self))
+
+    def __sub__(self, other: Union['Node', float]) -> 'Node':
+        return Node('subtract', (self, as_node(other)))
+
+    def __rsub__(self, other: float) -> 'Node':
+        return Node('subtract', (as_node(other), self))
+
+    def __mul__(self, other: Union['Node', float]) -> 'Node':
+        return Node('multiply', (self, as_node(other)))
+
+    def __rmul__(self, other: float) -> 'Node':
+        return Node('multiply', (as_node(other), self))
+
+    def __truediv__(self, other: Union['Node', float]) -> 'Node':
+        return Node('divide', (self, as_node(other)))
+
+    def __rtruediv__(self, other: float) -> 'Node':
+        return Node('divide', (as_node(other), self))
+
+    def __abs__(self) -> 'Node':
+        return Node('absolute', (self,))
+
+
+def frame_column(name: str) -> Node:
+    """A column of the frame, like `close`."""
+
+    return Node('column', name=name)
+
+
+def constant(value: float) -> Node:
+    """A constant value."""
+
+    return Node('constant', value=float(value))
+
+
+def as_node(value: Union[Node, float]) -> Node:
+    """Wraps a number in a constant node."""
+
+    return value if isinstance(value, Node) else constant(value=value)
+
+
+def maximum(*nodes: Node) -> Node:
+    """The largest value of the nodes on each row, ignoring missing values."""
+
+    return Node('maximum', tuple(nodes))
+
+
+def apply(function: Callable, *nodes: Node) -> Node:
+    """Applies a row by row NumPy function to the nodes.
+
+    Overview:
+    ----
+    The function is part of the node's key, so define it once at the top of
+    a module for it to be shared, instead of passing a new lambda each time.
+    """
+
+    return Node('apply', tuple(nodes), function=function)
+
+
+class IndicatorGraph():
+
+    """
+    Evaluates the nodes of the indicators over a StockFrame's frame. Each
+    node is calculated at most once until the graph is reset, so the
+    intermediates shared by several indicators, like the change in price
+    or the EMA of the close, are only calculated once per refresh.
+    """
+
+    def __init__(self, engine: str = 'pandas') -> None:
+        """Initalizes the IndicatorGraph object.
+
+        Keyword Arguments:
+        ----
+        engine {str} -- The backend of the calculations within each symbol, either
+            `pandas` or `numpy`. (default: {'pandas'})
+        """
+
+        self.engine = engine
+        self.evaluations = 0
+
+        self._frame = None
+        self._columns = None
+        self._offsets = None
+        self._codes = None
+        self._layouts: Dict[int, rolling.BlockLayout] = {}
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    def reset(self, frame: pd.DataFrame) -> None:
+        """Drops the cached results, and evaluates the nodes over a new frame.
+
+        Arguments:
+        ----
+        frame {pd.DataFrame} -- The StockFrame's multi-index frame, sorted by symbol and datetime.
+        """
+
+        self._frame = frame
+        self._columns = None
+        self._offsets = None
+        self._codes = None
+        self._layouts = {}
+        self._cache = {}
+
+    def reset_columns(self, columns: Dict[str, np.ndarray], offsets: np.ndarray) -> None:
+        """Drops the cached results, and evaluates the nodes over a set of column arrays.
+
+        Arguments:
+        ----
+        columns {Dict[str, np.ndarray]} -- The columns the nodes read, sorted by symbol and datetime.
+
+        offsets {np.ndarray} -- The row offsets of each symbol, see `vectorized.symbol_offsets`.
+        """
+
+        self._frame = None
+        self._columns = columns
+        self._offsets = offsets
+        self._codes = None
+        self._layouts = {}
+        self._cache = {}
+
+    def clear(self) -> None:
+        """Drops the cached results, to free their memory, and keeps the frame."""
+
+        self._cache = {}
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """The row offsets of each symbol in the frame."""
+
+        if self._offsets is None:
+            self._offsets = vectorized.symbol_offsets(frame=self._frame)
+
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def evaluate(self, node: Node) -> np.ndarray:
+        """Calculates a node, and any inputs that aren't cached yet.
+
+        Arguments:
+        ----
+        node {Node} -- The node to calculate.
+
+        Returns:
+        ----
+        {np.ndarray} -- The values of the node, one per row of the frame.
+        """
+
+        values = self._cache.get(node.key)
+
+        if values is None:
+
+            inputs = [self.evaluate(node=input_node) for input_node in node.inputs]
+            values = getattr(self, '_' + node.operation)(*inputs, **node.parameters)
+
+            self._cache[node.key] = values
+            self.evaluations += 1
+
+        return values
+
+    def _grouped(self, values: np.ndarray, function: Callable) -> np.ndarray:
+        """Applies a pandas function to the values of each symbol."""
+
+        # Grouping by a code for each symbol is faster than grouping by the index level.
+        if self._codes is None:
+            self._codes = np.repeat(np.arange(self.offsets.size - 1), np.diff(self.offsets))
+
+        return pd.Series(values).groupby(self._codes, sort=False).transform(function).to_numpy(dtype=float)
+
+    def _column(self, name: str) -> np.ndarray:
+
+        if self._columns is not None:
+            return np.asarray(self._columns[name], dtype=float)
+
+        return self._frame[name].to_numpy(dtype=float)
+
+    def _constant(self, value: float) -> np.ndarray:
+        return np.full(self.offsets[-1], value)
+
+    def _shift(self, values: np.ndarray, periods: int) -> np.ndarray:
+
+        if self.engine == 'numpy':
+            return vectorized.segmented_shift(values=values, offsets=self.offsets, periods=periods)
+
+        return self._grouped(values=values, function=lambda x: x.shift(periods))
+
+    def _diff(self, values: np.ndarray, periods: int) -> np.ndarray:
+
+        if self.engine == 'numpy':
+            return vectorized.segmented_diff(values=values, offsets=self.offsets, periods=periods)
+
+        return self._grouped(values=values, function=lambda x: x.diff(periods))
+
+    def _pct_change(self, values: np.ndarray, periods: int) -> np.ndarray:
+
+        if self.engine == 'numpy':
+            return vectorized.segmented_pct_change(values=values, offsets=self.offsets, periods=periods)
+
+        return self._grouped(values=values, function=lambda x: x.pct_change(periods=periods))
+
+    def _rolling(self, values: np.ndarray, window: int, statistic: str) -> np.ndarray:
+
+        # Pandas has no rolling mean absolute deviation, so both engines use the kernel.
+        if statistic == 'mad':
+            return rolling.rolling_mean_absolute_deviation(values=values, offsets=self.offsets, window=window)
+
+        if self.engine == 'numpy':
+
+            functions = {
+                'mean': rolling.rolling_mean,
+                'std': rolling.rolling_std,
+                'sum': rolling.rolling_sum,
+                'min': rolling.rolling_min,
+                'max': rolling.rolling_max
+            }
+
+            # The blocks of a window only depend on the offsets, so they're shared by every column.
+            if window not in self._layouts:
+                self._layouts[window] = rolling.BlockLayout(offsets=self.offsets, window=window)
+
+            return functions[statistic](
+                values=values,
+                offsets=self.offsets,
+                window=window,
+                layout=self._layouts[window]
+            )
+
+        return self._grouped(values=values, function=lambda x: getattr(x.rolling(window=window), statistic)())
+
+    def _ewm(self, values: np.ndarray, span: float, min_periods: int, statistic: str) -> np.ndarray:
+
+        if self.engine == 'numpy':
+
+            functions = {
+                'mean': vectorized.segmented_ewm_mean,
+                'std': vectorized.segmented_ewm_std
+            }
+
+            return functions[statistic](values=values, offsets=self.offsets, span=span, min_periods=min_periods)
+
+        return self._grouped(
+            values=values,
+            function=lambda x: getattr(x.ewm(span=span, min_periods=min_periods), statistic)()
+        )
+
+    def _add(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return left + right
+
+    def _subtract(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return left - right
+
+    def _multiply(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return left * right
+
+    def _divide(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return left / right
+
+    def _absolute(self, values: np.ndarray) -> np.ndarray:
+        return np.abs(values)
+
+    def _maximum(self, *values: np.ndarray) -> np.ndarray:
+
+        result = values[0]
+
+        for other in values[1:]:
+            result = np.fmax(result, other)
+
+        return result
+
+    def _apply(self, *values: np.ndarray, function: Callable) -> np.ndarray:
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.asarray(function(*values), dtype=float)
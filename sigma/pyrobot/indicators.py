@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 
 from typing import Any
+from typing import Set
 from typing import List
 from typing import Dict
 from typing import Tuple
@@ -10,7 +11,39 @@ from typing import Union
 from typing import Optional
 from typing import Iterable
 
+from pyrobot.indicator_graph import Node
+from pyrobot.indicator_graph import IndicatorGraph
+from pyrobot.indicator_graph import apply
+from pyrobot.indicator_graph import maximum
+from pyrobot.indicator_graph import frame_column
+from pyrobot.signals import Rule
+from pyrobot.signals import Signals
+from pyrobot.signals import SignalEvaluator
 from pyrobot.stock_frame import StockFrame
+from pyrobot.incremental import IncrementalEngine
+from pyrobot.sharding import ShardedEvaluator
+from pyrobot.profiler import measure
+from pyrobot.profiler import profiled
+from pyrobot.profiler import Profiler
+
+
+ENGINES = ['pandas', 'numpy']
+
+
+def _up_days(change_in_price: np.ndarray) -> np.ndarray:
+    """The change in price on the up days, and zero on the others."""
+
+    return np.where(change_in_price >= 0, change_in_price, 0)
+
+
+def _down_days(change_in_price: np.ndarray) -> np.ndarray:
+    """The size of the change in price on the down days, and zero on the others."""
+
+    return np.where(change_in_price < 0, np.abs(change_in_price), 0)
+
+
+def _relative_strength_index(relative_strength_index: np.ndarray) -> np.ndarray:
+    return np.where(relative_strength_index == 0, 100, 100 - (100 / (1 + relative_strength_index)))
 
 
 class Indicators():
@@ -20,13 +53,38 @@ class Indicators():
     to easily add technical indicators to a StockFrame.
     """    
     
-    def __init__(self, price_data_frame: StockFrame) -> None:
+    def __init__(self, price_data_frame: StockFrame, incremental: bool = False, engine: str = 'pandas',
+                 timeframe: Optional[str] = None, max_workers: int = 1) -> None:
         """Initalizes the Indicator Client.
 
         Arguments:
         ----
         price_data_frame {pyrobot.StockFrame} -- The price data frame which is used to add indicators to.
             At a minimum this data frame must have the following columns: `['timestamp','close','open','high','low']`.
+
+        Keyword Arguments:
+        ----
+        incremental {bool} -- If `True`, `refresh` keeps a rolling state for each indicator and
+            symbol, and only calculates the rows that were added since the last refresh. If `False`,
+            every indicator is recalculated over the whole frame. (default: {False})
+
+        engine {str} -- The backend used to calculate the indicators over the whole frame. `pandas`
+            applies each calculation to every symbol group, `numpy` runs it once over the flat
+            columns of the frame, with every symbol at the same time. (default: {'pandas'})
+
+        timeframe {str} -- Calculates the indicators on a higher timeframe view of the
+            StockFrame, like `15min` or `daily`, instead of its own bars. See
+            `StockFrame.timeframe`. (default: {None})
+
+        max_workers {int} -- The number of processes the indicator columns are calculated
+            with. If more than `1`, the symbols are split into shards with about the same
+            number of rows, and each process reads the prices from shared memory and writes
+            its columns back to it. Call `close` when you're done to stop the processes.
+            (default: {1})
+
+        Raises:
+        ----
+        ValueError: If the engine is not one of `ENGINES`.
         
         Usage:
         ----
@@ -41,11 +99,32 @@ class Indicators():
             >>> indicator_client.price_data_frame
         """
 
+        if timeframe:
+            price_data_frame = price_data_frame.timeframe(timeframe=timeframe)
+
         self._stock_frame: StockFrame = price_data_frame
-        self._price_groups = price_data_frame.symbol_groups
         self._current_indicators = {}
         self._indicator_signals = {}
+        self._signal_rules = None
+        self._signal_evaluator = None
         self._frame = self._stock_frame.frame
+        self._incremental = incremental
+        self._incremental_engine = IncrementalEngine() if incremental else None
+
+        if engine not in ENGINES:
+            raise ValueError("The engine must be one of: {engines}".format(engines=', '.join(ENGINES)))
+
+        self._engine = engine
+
+        # The calculations of every indicator, shared between them, and the
+        # output columns that haven't been calculated since the last refresh.
+        self._graph = IndicatorGraph(engine=engine)
+        self._graph.reset(frame=self._frame)
+        self._stale_columns: Dict[str, Node] = {}
+        self._sharded_evaluator = ShardedEvaluator(max_workers=max_workers, engine=engine) if max_workers > 1 else None
+
+        # Set by `PyRobot.enable_profiling`, to time `refresh`, `check_signals` and each indicator.
+        self.profiler: Optional[Profiler] = None
         
         if self.is_multi_index:
             True
@@ -115,15 +194,73 @@ class Indicators():
         self._indicator_signals[indicator]['buy_operator_max'] = condition_buy_max
         self._indicator_signals[indicator]['sell_operator_max'] = condition_sell_max
 
+        # The rules have to be compiled again.
+        self._signal_evaluator = None
+
+    def set_signal_rules(self, buy_rule: Rule = None, sell_rule: Rule = None) -> None:
+        """Sets buy and sell rules that combine several indicators.
+
+        Overview:
+        ----
+        The rules are trees of conditions, combined with `&` (and) and `|` (or).
+        Once set, they're used by `check_signals` instead of the signals set
+        with `set_indicator_signal`.
+
+        Keyword Arguments:
+        ----
+        buy_rule {Rule} -- The rule a symbol must meet to be bought. (default: {None})
+
+        sell_rule {Rule} -- The rule a symbol must meet to be sold. (default: {None})
+
+        Usage:
+        ----
+            >>> from pyrobot.signals import Condition
+            >>> indicator_client.set_signal_rules(
+                buy_rule=Condition('rsi', '<', 30.0) & (Condition('close', '>', 'sma') | Condition('macd', '>', 0.0)),
+                sell_rule=Condition('rsi', '>', 70.0)
+            )
+        """
+
+        self._signal_rules = {'buy_rule': buy_rule, 'sell_rule': sell_rule}
+        self._signal_evaluator = None
+
+    @property
+    def signal_evaluator(self) -> SignalEvaluator:
+        """The compiled buy and sell rules, used by `check_signals`.
+
+        Returns:
+        ----
+        {SignalEvaluator} -- The rules set with `set_signal_rules`, or if there aren't any,
+            the signals set with `set_indicator_signal`.
+        """
+
+        if self._signal_evaluator is None:
+
+            if self._signal_rules:
+                self._signal_evaluator = SignalEvaluator(**self._signal_rules)
+            else:
+                self._signal_evaluator = SignalEvaluator.from_indicator_signals(
+                    indicator_signals=self._indicator_signals
+                )
+
+        return self._signal_evaluator
+
     @property
     def price_data_frame(self) -> pd.DataFrame:
         """Return the raw Pandas Dataframe Object.
 
+        Overview:
+        ----
+        Any indicator columns `refresh` left for later are calculated first.
+
         Returns:
         ----
         {pd.DataFrame} -- A multi-index data frame.
         """
 
+        if self._stale_columns:
+            self.materialize()
+
         return self._frame
 
     @price_data_frame.setter
@@ -136,6 +273,78 @@ class Indicators():
         """
 
         self._frame = price_data_frame
+        self._graph.reset(frame=price_data_frame)
+        self._stale_columns = {}
+
+    @property
+    def engine(self) -> str:
+        """The backend used to calculate the indicators.
+
+        Returns:
+        ----
+        {str} -- Either `pandas` or `numpy`.
+        """
+
+        return self._engine
+
+    def _set_outputs(self, indicator: str, outputs: Dict[str, Node]) -> None:
+        """Registers the output columns of an indicator, and adds them to the frame.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator key, for example `ema` or `sma`.
+
+        outputs {Dict[str, Node]} -- The graph node of each output column.
+        """
+
+        self._current_indicators[indicator]['outputs'] = outputs
+        self._calculate_columns(outputs=outputs)
+
+    def _calculate_columns(self, outputs: Dict[str, Node]) -> None:
+        """Calculates output columns, and writes them to the frame.
+
+        Arguments:
+        ----
+        outputs {Dict[str, Node]} -- The graph node of each output column.
+        """
+
+        if self._sharded_evaluator is not None:
+            values = self._sharded_evaluator.evaluate(frame=self._frame, outputs=outputs)
+        else:
+            values = {column: self._graph.evaluate(node=node) for column, node in outputs.items()}
+
+        for column, column_values in values.items():
+            self._frame[column] = column_values
+            self._stale_columns.pop(column, None)
+
+    def _signal_columns(self) -> Optional[Set[str]]:
+        """The columns the signal rules read, or `None` if there aren't any rules."""
+
+        signal_evaluator = self.signal_evaluator
+
+        if signal_evaluator.buy_rule is None and signal_evaluator.sell_rule is None:
+            return None
+
+        return signal_evaluator.columns
+
+    def materialize(self) -> pd.DataFrame:
+        """Calculates the indicator columns that `refresh` left for later.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- The frame, with every indicator column up to date.
+        """
+
+        self._calculate_columns(outputs=dict(self._stale_columns))
+        self._graph.clear()
+
+        return self._frame
+
+    def close(self) -> None:
+        """Stops the processes started when `max_workers` is more than `1`."""
+
+        if self._sharded_evaluator is not None:
+            self._sharded_evaluator.close()
 
     @property
     def is_multi_index(self) -> bool:
@@ -167,9 +376,10 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.change_in_price
 
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.diff()
-        )
+        # Calculate the Change in Price.
+        change_in_price = frame_column('close').diff()
+
+        self._set_outputs(indicator=column_name, outputs={column_name: change_in_price})
 
         return self._frame
 
@@ -210,44 +420,27 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.rsi
 
-        # First calculate the Change in Price.
-        if 'change_in_price' not in self._frame.columns:
-            self.change_in_price()
-
-        # Define the up days.
-        self._frame['up_day'] = self._price_groups['change_in_price'].transform(
-            lambda x : np.where(x >= 0, x, 0)
-        )
-
-        # Define the down days.
-        self._frame['down_day'] = self._price_groups['change_in_price'].transform(
-            lambda x : np.where(x < 0, x.abs(), 0)
-        )
+        # First calculate the Change in Price, it's shared with `change_in_price`.
+        change_in_price = frame_column('close').diff()
 
-        # Calculate the EWMA for the Up days.
-        self._frame['ewma_up'] = self._price_groups['up_day'].transform(
-            lambda x: x.ewm(span = period).mean()
-        )
+        # Define the up days, and the down days.
+        up_day = apply(_up_days, change_in_price)
+        down_day = apply(_down_days, change_in_price)
 
-        # Calculate the EWMA for the Down days.
-        self._frame['ewma_down'] = self._price_groups['down_day'].transform(
-            lambda x: x.ewm(span = period).mean()
-        )
+        # Calculate the EWMA for the Up days, and for the Down days.
+        ewma_up = up_day.ewm(span=period)
+        ewma_down = down_day.ewm(span=period)
 
         # Calculate the Relative Strength
-        relative_strength = self._frame['ewma_up'] / self._frame['ewma_down']
+        relative_strength = ewma_up / ewma_down
 
         # Calculate the Relative Strength Index
         relative_strength_index = 100.0 - (100.0 / (1.0 + relative_strength))
 
         # Add the info to the data frame.
-        self._frame['rsi'] = np.where(relative_strength_index == 0, 100, 100 - (100 / (1 + relative_strength_index)))
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['ewma_up', 'ewma_down', 'down_day', 'up_day', 'change_in_price'],
-            axis=1,
-            inplace=True
+        self._set_outputs(
+            indicator=column_name,
+            outputs={column_name: apply(_relative_strength_index, relative_strength_index)}
         )
 
         return self._frame
@@ -285,9 +478,7 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.sma
 
         # Add the SMA
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.rolling(window=period).mean()
-        )
+        self._set_outputs(indicator=column_name, outputs={column_name: frame_column('close').rolling(window=period)})
 
         return self._frame
 
@@ -326,9 +517,7 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.ema
 
         # Add the EMA
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.ewm(span=period).mean()
-        )
+        self._set_outputs(indicator=column_name, outputs={column_name: frame_column('close').ewm(span=period)})
 
         return self._frame
 
@@ -365,9 +554,7 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.rate_of_change
 
         # Add the Momentum indicator.
-        self._frame[column_name] = self._price_groups['close'].transform(
-            lambda x: x.pct_change(periods=period)
-        )
+        self._set_outputs(indicator=column_name, outputs={column_name: frame_column('close').pct_change(periods=period)})
 
         return self._frame        
 
@@ -404,32 +591,19 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.bollinger_bands
 
+        close = frame_column('close')
+
         # Define the Moving Avg.
-        self._frame['moving_avg'] = self._price_groups['close'].transform(
-            lambda x : x.rolling(window=period).mean()
-        )
+        moving_avg = close.rolling(window=period)
 
         # Define Moving Std.
-        self._frame['moving_std'] = self._price_groups['close'].transform(
-            lambda x : x.rolling(window=period).std()
-        )
+        moving_std = close.rolling(window=period, statistic='std')
 
-        # Define the Upper Band.
-        self._frame['band_upper'] = 4 * (self._frame['moving_std'] / self._frame['moving_avg'])
+        # Define the Upper Band, and the Lower Band.
+        band_upper = 4 * (moving_std / moving_avg)
+        band_lower = (close - moving_avg) + (2 * moving_std) / (4 * moving_std)
 
-        # Define the lower band
-        self._frame['band_lower'] = (
-            (self._frame['close'] - self._frame['moving_avg']) + 
-            (2 * self._frame['moving_std']) / 
-            (4 * self._frame['moving_std'])
-        )
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['moving_avg', 'moving_std'],
-            axis=1,
-            inplace=True
-        )
+        self._set_outputs(indicator=column_name, outputs={'band_upper': band_upper, 'band_lower': band_lower})
 
         return self._frame   
 
@@ -466,32 +640,31 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.average_true_range
 
+        high = frame_column('high')
+        low = frame_column('low')
 
         # Calculate the different parts of True Range.
-        self._frame['true_range_0'] = abs(self._frame['high'] - self._frame['low'])
-        self._frame['true_range_1'] = abs(self._frame['high'] - self._frame['close'].shift())
-        self._frame['true_range_2'] = abs(self._frame['low'] - self._frame['close'].shift())
+        previous_close = frame_column('close').shift()
 
         # Grab the Max.
-        self._frame['true_range'] = self._frame[['true_range_0', 'true_range_1', 'true_range_2']].max(axis=1)
+        true_range = maximum(abs(high - low), abs(high - previous_close), abs(low - previous_close))
 
         # Calculate the Average True Range.
-        self._frame['average_true_range'] = self._frame['true_range'].transform(
-            lambda x: x.ewm(span = period, min_periods = period).mean()
-        )
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['true_range_0', 'true_range_1', 'true_range_2', 'true_range'],
-            axis=1,
-            inplace=True
+        self._set_outputs(
+            indicator=column_name,
+            outputs={column_name: true_range.ewm(span=period, min_periods=period)}
         )
 
         return self._frame   
 
-    def stochastic_oscillator(self) -> pd.DataFrame:
+    def stochastic_oscillator(self, period: int = 14) -> pd.DataFrame:
         """Calculates the Stochastic Oscillator.
 
+        Arguments:
+        ----
+        period {int} -- The number of periods the highest high and the lowest
+            low are taken over. (default: {14})
+
         Returns:
         ----
         {pd.DataFrame} -- A Pandas data frame with the Stochastic Oscillator included.
@@ -517,11 +690,14 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.stochastic_oscillator
 
-        # Calculate the stochastic_oscillator.
-        self._frame['stochastic_oscillator'] = (
-            self._frame['close'] - self._frame['low'] / 
-            self._frame['high'] - self._frame['low']
-        )
+        # Grab the lowest low and the highest high of the period.
+        lowest_low = frame_column('low').rolling(window=period, statistic='min')
+        highest_high = frame_column('high').rolling(window=period, statistic='max')
+
+        # Calculate the stochastic_oscillator, where the close sits in the range.
+        stochastic_oscillator = 100 * (frame_column('close') - lowest_low) / (highest_high - lowest_low)
+
+        self._set_outputs(indicator=column_name, outputs={column_name: stochastic_oscillator})
 
         return self._frame 
 
@@ -561,22 +737,26 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.macd
 
+        close = frame_column('close')
+
         # Calculate the Fast Moving MACD.
-        self._frame['macd_fast'] = self._frame['close'].transform(
-            lambda x: x.ewm(span = fast_period, min_periods = fast_period).mean()
-        )
+        macd_fast = close.ewm(span=fast_period, min_periods=fast_period)
 
         # Calculate the Slow Moving MACD.
-        self._frame['macd_slow'] = self._frame['close'].transform(
-            lambda x: x.ewm(span = slow_period, min_periods = slow_period).mean()
-        )
+        macd_slow = close.ewm(span=slow_period, min_periods=slow_period)
 
         # Calculate the difference between the fast and the slow.
-        self._frame['macd_diff'] = self._frame['macd_fast'] - self._frame['macd_slow']
+        macd_diff = macd_fast - macd_slow
 
         # Calculate the Exponential moving average of the fast.
-        self._frame['macd'] = self._frame['macd_diff'].transform(
-            lambda x: x.ewm(span = 9, min_periods = 8).mean()
+        self._set_outputs(
+            indicator=column_name,
+            outputs={
+                'macd_fast': macd_fast,
+                'macd_slow': macd_slow,
+                'macd_diff': macd_diff,
+                'macd': macd_diff.ewm(span=9, min_periods=8)
+            }
         )
 
         return self._frame 
@@ -615,32 +795,19 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.mass_index
 
         # Calculate the Diff.
-        self._frame['diff'] = self._frame['high'] - self._frame['low']
+        diff = frame_column('high') - frame_column('low')
 
         # Calculate Mass Index 1
-        self._frame['mass_index_1'] = self._frame['diff'].transform(
-            lambda x: x.ewm(span = period, min_periods = period - 1).mean()
-        )
+        mass_index_1 = diff.ewm(span=period, min_periods=period - 1)
 
         # Calculate Mass Index 2
-        self._frame['mass_index_2'] = self._frame['mass_index_1'].transform(
-            lambda x: x.ewm(span = period, min_periods = period - 1).mean()
-        )
-        
+        mass_index_2 = mass_index_1.ewm(span=period, min_periods=period - 1)
+
         # Grab the raw index.
-        self._frame['mass_index_raw'] = self._frame['mass_index_1'] / self._frame['mass_index_2']
+        mass_index_raw = mass_index_1 / mass_index_2
 
         # Calculate the Mass Index.
-        self._frame['mass_index'] = self._frame['mass_index_raw'].transform(
-            lambda x: x.rolling(window=25).sum()
-        )
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['diff', 'mass_index_1', 'mass_index_2', 'mass_index_raw'],
-            axis=1,
-            inplace=True
-        )
+        self._set_outputs(indicator=column_name, outputs={column_name: mass_index_raw.rolling(window=25, statistic='sum')})
 
         return self._frame
     
@@ -678,7 +845,9 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.force_index
 
         # Calculate the Force Index.
-        self._frame[column_name] = self._frame['close'].diff(period)  * self._frame['volume'].diff(period)
+        force_index = frame_column('close').diff(periods=period) * frame_column('volume').diff(periods=period)
+
+        self._set_outputs(indicator=column_name, outputs={column_name: force_index})
 
         return self._frame
 
@@ -714,23 +883,17 @@ class Indicators():
         self._current_indicators[column_name] = {}
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.ease_of_movement
-        
+
+        high = frame_column('high')
+        low = frame_column('low')
+
         # Calculate the ease of movement.
-        high_plus_low = (self._frame['high'].diff(1) + self._frame['low'].diff(1))
-        diff_divi_vol = (self._frame['high'] - self._frame['low']) / (2 * self._frame['volume'])
-        self._frame['ease_of_movement_raw'] = high_plus_low * diff_divi_vol
+        high_plus_low = high.diff() + low.diff()
+        diff_divi_vol = (high - low) / (2 * frame_column('volume'))
+        ease_of_movement_raw = high_plus_low * diff_divi_vol
 
         # Calculate the Rolling Average of the Ease of Movement.
-        self._frame['ease_of_movement'] = self._frame['ease_of_movement_raw'].transform(
-            lambda x: x.rolling(window=period).mean()
-        )
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['ease_of_movement_raw'],
-            axis=1,
-            inplace=True
-        )
+        self._set_outputs(indicator=column_name, outputs={column_name: ease_of_movement_raw.rolling(window=period)})
 
         return self._frame
 
@@ -768,26 +931,16 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.commodity_channel_index
 
         # Calculate the Typical Price.
-        self._frame['typical_price'] = (self._frame['high'] + self._frame['low'] + self._frame['close']) / 3
+        typical_price = (frame_column('high') + frame_column('low') + frame_column('close')) / 3
 
-        # Calculate the Rolling Average of the Typical Price.
-        self._frame['typical_price_mean'] = self._frame['pp'].transform(
-            lambda x: x.rolling(window=period).mean()
-        )
-
-        # Calculate the Rolling Standard Deviation of the Typical Price.
-        self._frame['typical_price_std'] = self._frame['pp'].transform(
-            lambda x: x.rolling(window=period).std()
-        )
+        # Calculate the Rolling Average, and the Mean Absolute Deviation, of the Typical Price.
+        typical_price_mean = typical_price.rolling(window=period)
+        typical_price_deviation = typical_price.rolling(window=period, statistic='mad')
 
         # Calculate the Commodity Channel Index.
-        self._frame[column_name] = self._frame['typical_price_mean'] / self._frame['typical_price_std']
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['typical_price', 'typical_price_mean', 'typical_price_std'],
-            axis=1,
-            inplace=True
+        self._set_outputs(
+            indicator=column_name,
+            outputs={column_name: (typical_price - typical_price_mean) / (0.015 * typical_price_deviation)}
         )
 
         return self._frame
@@ -826,8 +979,9 @@ class Indicators():
         self._current_indicators[column_name]['func'] = self.standard_deviation
 
         # Calculate the Standard Deviation.
-        self._frame[column_name] = self._frame['close'].transform(
-            lambda x: x.ewm(span=period).std()
+        self._set_outputs(
+            indicator=column_name,
+            outputs={column_name: frame_column('close').ewm(span=period, statistic='std')}
         )
 
         return self._frame
@@ -865,46 +1019,48 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.chaikin_oscillator
 
+        high = frame_column('high')
+        low = frame_column('low')
+
         # Calculate the Money Flow Multiplier.
-        money_flow_multiplier_top = 2 * (self._frame['close'] - self._frame['high'] - self._frame['low'])
-        money_flow_multiplier_bot = (self._frame['high'] - self._frame['low'])
+        money_flow_multiplier_top = 2 * (frame_column('close') - high - low)
+        money_flow_multiplier_bot = high - low
 
         # Calculate Money Flow Volume
-        self._frame['money_flow_volume'] = (money_flow_multiplier_top / money_flow_multiplier_bot) * self._frame['volume']
+        money_flow_volume = (money_flow_multiplier_top / money_flow_multiplier_bot) * frame_column('volume')
 
         # Calculate the 3-Day moving average of the Money Flow Volume.
-        self._frame['money_flow_volume_3'] = self._frame['money_flow_volume'].transform(
-            lambda x: x.ewm(span=3, min_periods=2).mean()
-        )
+        money_flow_volume_3 = money_flow_volume.ewm(span=3, min_periods=2)
 
         # Calculate the 10-Day moving average of the Money Flow Volume.
-        self._frame['money_flow_volume_10'] = self._frame['money_flow_volume'].transform(
-            lambda x: x.ewm(span=10, min_periods=9).mean()
-        )
+        money_flow_volume_10 = money_flow_volume.ewm(span=10, min_periods=9)
 
         # Calculate the Chaikin Oscillator.
-        self._frame[column_name] = self._frame['money_flow_volume_3'] - self._frame['money_flow_volume_10']
-
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['money_flow_volume_3', 'money_flow_volume_10', 'money_flow_volume'],
-            axis=1,
-            inplace=True
-        )
+        self._set_outputs(indicator=column_name, outputs={column_name: money_flow_volume_3 - money_flow_volume_10})
 
         return self._frame
 
-    def kst_oscillator(self, r1: int, r2: int, r3: int, r4: int, n1: int, n2: int, n3: int, n4: int) -> pd.DataFrame:
-        """Calculates the Mass Index indicator.
+    def kst_oscillator(self, r1: int = 10, r2: int = 15, r3: int = 20, r4: int = 30, n1: int = 10, n2: int = 10,
+                       n3: int = 10, n4: int = 15, signal_period: int = 9) -> pd.DataFrame:
+        """Calculates the Know Sure Thing (KST) Oscillator.
 
         Arguments:
         ----
-        period {int} -- The number of periods to use when calculating 
-            the mass index. (default: {9})
+        r1, r2, r3, r4 {int} -- The number of periods to use when calculating
+            each of the four rates of change. (default: {10, 15, 20, 30})
+
+        n1, n2, n3, n4 {int} -- The number of periods each rate of change is
+            summed over. (default: {10, 10, 10, 15})
+
+        Keyword Arguments:
+        ----
+        signal_period {int} -- The number of periods in the moving average
+            of the signal line. (default: {9})
 
         Returns:
         ----
-        {pd.DataFrame} -- A Pandas data frame with the Mass Index included.
+        {pd.DataFrame} -- A Pandas data frame with the KST Oscillator and
+            its signal line included.
 
         Usage:
         ----
@@ -916,7 +1072,7 @@ class Indicators():
             )
             >>> price_data_frame = pd.DataFrame(data=historical_prices)
             >>> indicator_client = Indicators(price_data_frame=price_data_frame)
-            >>> indicator_client.mass_index(period=9)
+            >>> indicator_client.kst_oscillator(r1=10, r2=15, r3=20, r4=30, n1=10, n2=10, n3=10, n4=15)
         """
 
         locals_data = locals()
@@ -927,49 +1083,24 @@ class Indicators():
         self._current_indicators[column_name]['args'] = locals_data
         self._current_indicators[column_name]['func'] = self.kst_oscillator
 
-        # Calculate the ROC 1.
-        self._frame['roc_1'] = self._frame['close'].diff(r1 - 1)  / self._frame['close'].shift(r1 - 1)
-
-        # Calculate the ROC 2.
-        self._frame['roc_2'] = self._frame['close'].diff(r2 - 1)  / self._frame['close'].shift(r2 - 1)
-
-        # Calculate the ROC 3.
-        self._frame['roc_3'] = self._frame['close'].diff(r3 - 1)  / self._frame['close'].shift(r3 - 1)
+        close = frame_column('close')
 
-        # Calculate the ROC 4.
-        self._frame['roc_4'] = self._frame['close'].diff(r4 - 1)  / self._frame['close'].shift(r4 - 1)
+        # Calculate each ROC, and sum it over its window, within each symbol.
+        roc_sums = [
+            (close.diff(periods=roc_period - 1) / close.shift(periods=roc_period - 1)).rolling(window=sum_period, statistic='sum')
+            for roc_period, sum_period in zip([r1, r2, r3, r4], [n1, n2, n3, n4])
+        ]
 
+        # Calculate the KST Oscillator.
+        kst_oscillator = 100 * (roc_sums[0] + 2 * roc_sums[1] + 3 * roc_sums[2] + 4 * roc_sums[3])
 
-        # Calculate the Mass Index.
-        self._frame['roc_1_n'] = self._frame['roc_1'].transform(
-            lambda x: x.rolling(window=n1).sum()
-        )
-
-        # Calculate the Mass Index.
-        self._frame['roc_2_n'] = self._frame['roc_2'].transform(
-            lambda x: x.rolling(window=n2).sum()
-        )
-
-        # Calculate the Mass Index.
-        self._frame['roc_3_n'] = self._frame['roc_3'].transform(
-            lambda x: x.rolling(window=n3).sum()
-        )
-
-        # Calculate the Mass Index.
-        self._frame['roc_4_n'] = self._frame['roc_4'].transform(
-            lambda x: x.rolling(window=n4).sum()
-        )
-
-        self._frame[column_name] = 100 * (self._frame['roc_1_n'] + 2 * self._frame['roc_2_n'] + 3 * self._frame['roc_3_n'] + 4 * self._frame['roc_4_n'])
-        self._frame[column_name + "_signal"] = self._frame['column_name'].transform(
-            lambda x: x.rolling().mean()
-        )
-        
-        # Clean up before sending back.
-        self._frame.drop(
-            labels=['roc_1', 'roc_2', 'roc_3', 'roc_4', 'roc_1_n', 'roc_2_n', 'roc_3_n', 'roc_4_n'],
-            axis=1,
-            inplace=True
+        # Calculate the signal line.
+        self._set_outputs(
+            indicator=column_name,
+            outputs={
+                column_name: kst_oscillator,
+                column_name + '_signal': kst_oscillator.rolling(window=signal_period)
+            }
         )
 
         return self._frame
@@ -993,34 +1124,97 @@ class Indicators():
 #     df = df.join(KST)  
 #     return df
 
+    @profiled(category='cycle')
     def refresh(self):
-        """Updates the Indicator columns after adding the new rows."""
+        """Updates the Indicator columns after adding the new rows.
+
+        Overview:
+        ----
+        In the default mode every indicator is recalculated over the whole
+        frame. If the client was initalized with `incremental=True`, only the
+        rows added, or changed, since the last refresh are calculated, using the
+        rolling state kept for each indicator and symbol. Indicators that don't
+        have an incremental implementation are still recalculated in full.
+
+        The calculations the indicators are built from, like the change in
+        price or the EMA of the close, are shared, so each one is calculated
+        once per refresh. If signal rules are set, only the columns they read
+        are calculated right away. The other columns are calculated the next
+        time `price_data_frame` is read, or `materialize` is called.
+
+        If the client has a `profiler`, the columns of each indicator are
+        calculated one indicator at a time, and timed under its key. The
+        calculations shared by several indicators are timed with the first
+        indicator that needs them.
+        """
+
+        # First update the frame and the graph since, we have new rows.
+        self._frame = self._stock_frame.frame
+        self._graph.reset(frame=self._frame)
+        self._stale_columns = {}
+
+        if self._incremental:
+
+            with measure(self.profiler, category='indicator', name='incremental_update'):
+                indicators_to_refresh = self._incremental_engine.update(
+                    frame=self._frame,
+                    indicators=self._current_indicators,
+                    buffer=self._stock_frame.buffer
+                )
+
+        else:
+            indicators_to_refresh = list(self._current_indicators)
 
-        # First update the groups since, we have new rows.
-        self._price_groups = self._stock_frame.symbol_groups
+        signal_columns = self._signal_columns()
+        outputs = {}
 
         # Grab all the details of the indicators so far.
-        for indicator in self._current_indicators:
-            
-            # Grab the function.
-            indicator_argument = self._current_indicators[indicator]['args']
+        for indicator in indicators_to_refresh:
+
+            indicator_details = self._current_indicators[indicator]
+
+            # Indicators that aren't built from the graph are calculated again in full.
+            if 'outputs' not in indicator_details:
+
+                with measure(self.profiler, category='indicator', name=indicator):
+                    indicator_details['func'](**indicator_details['args'])
+
+                continue
+
+            outputs[indicator] = {}
 
-            # Grab the arguments.
-            indicator_function = self._current_indicators[indicator]['func']
+            for column, node in indicator_details['outputs'].items():
+
+                if signal_columns is None or column in signal_columns:
+                    outputs[indicator][column] = node
+                else:
+                    self._stale_columns[column] = node
+
+        if self.profiler is None:
+            self._calculate_columns(
+                outputs={column: node for columns in outputs.values() for column, node in columns.items()}
+            )
+
+        else:
+            for indicator, columns in outputs.items():
+                with self.profiler.measure(category='indicator', name=indicator):
+                    self._calculate_columns(outputs=columns)
 
-            # Update the function.
-            indicator_function(**indicator_argument)
+        # Nothing is left for later, so the intermediates aren't needed anymore.
+        if not self._stale_columns:
+            self._graph.clear()
 
-    def check_signals(self) -> Union[pd.DataFrame, None]:
+    @profiled(category='cycle')
+    def check_signals(self) -> Signals:
         """Checks to see if any signals have been generated.
 
         Returns:
         ----
-        {Union[pd.DataFrame, None]} -- If signals are generated then a pandas.DataFrame
-            is returned otherwise nothing is returned.
+        {Signals} -- The symbols with a buy signal, and the symbols with a sell
+            signal, which can be passed to `PyRobot.execute_signals`.
         """
 
-        signals_df = self._stock_frame._check_signals(indicators=self._indicator_signals)
+        signals = self._stock_frame._check_signals(signal_evaluator=self.signal_evaluator)
 
-        return signals_df
+        return signals
 
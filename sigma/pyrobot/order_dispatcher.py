@@ -0,0 +1,146 @@
+import time
+import collections
+import concurrent.futures
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import List
+
+from pyrobot.historical import RateLimiter
+from td.client import TDClient
+from td.exceptions import ExdLmtError
+
+
+# The outcome of placing a single order: the order, and either the response or the error.
+OrderResult = collections.namedtuple('OrderResult', ['order', 'response', 'error'])
+
+
+class OrderDispatcher():
+
+    """
+    Places a batch of independent orders at the same time, using a bounded
+    pool of worker threads that share a `RateLimiter` and the connection
+    pool of the `TDClient` session. The results come back in the same order
+    as the orders, and an order that fails never stops the others.
+    """
+
+    def __init__(self, td_client: TDClient, max_workers: int = 8, rate_limiter: RateLimiter = None,
+                 max_retries: int = 2, backoff: float = 0.5) -> None:
+        """Initalizes the OrderDispatcher object.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- An authenticated TDClient session.
+
+        Keyword Arguments:
+        ----
+        max_workers {int} -- The number of orders that can be in flight at once. (default: {8})
+
+        rate_limiter {RateLimiter} -- The rate limiter to share between the workers. If not
+            provided, a new one is created with the TD Ameritrade order limits. (default: {None})
+
+        max_retries {int} -- The number of times an order is retried after the API rejected
+            it for going over the rate limit. (default: {2})
+
+        backoff {float} -- The number of seconds to wait before the first retry, doubled
+            after each retry. (default: {0.5})
+        """
+
+        self.td_client = td_client
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._executor: ThreadPoolExecutor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The worker pool, created the first time it's needed."""
+
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return self._executor
+
+    def close(self) -> None:
+        """Shuts down the worker pool, after the orders in flight are placed."""
+
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _place_order(self, account: str, order: dict) -> dict:
+        """Places a single order, retrying it if the API rejects it for the rate limit.
+
+        Overview:
+        ----
+        Only the rate limit errors are retried, since the API turned the order
+        down before placing it. Any other error could mean the order was placed,
+        so it's passed through instead of risking placing the order twice.
+
+        Arguments:
+        ----
+        account {str} -- The account to place the order for.
+
+        order {dict} -- The order.
+
+        Returns:
+        ----
+        {dict} -- The order response of `TDClient.place_order`.
+        """
+
+        for attempt in range(self.max_retries + 1):
+
+            if attempt > 0:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            self.rate_limiter.acquire()
+
+            try:
+                return self.td_client.place_order(account=account, order=order)
+            except ExdLmtError:
+                if attempt == self.max_retries:
+                    raise
+
+    def place_orders(self, account: str, orders: List[dict]) -> List[OrderResult]:
+        """Places the orders at the same time.
+
+        Arguments:
+        ----
+        account {str} -- The account to place the orders for.
+
+        orders {List[dict]} -- The orders, for example the `order` of each `Trade`.
+
+        Returns:
+        ----
+        {List[OrderResult]} -- The result of each order, in the same order as `orders`.
+            The `response` of a placed order is the response of `TDClient.place_order`,
+            and the `error` of an order that failed is the exception it raised.
+
+        Usage:
+        ----
+            >>> order_dispatcher = OrderDispatcher(td_client=trading_robot.session)
+            >>> results = order_dispatcher.place_orders(
+                account=trading_robot.trading_account,
+                orders=[trade.order for trade in trading_robot.trades.values()]
+            )
+            >>> failed = [result for result in results if result.error is not None]
+        """
+
+        futures = [self.executor.submit(self._place_order, account, order) for order in orders]
+
+        concurrent.futures.wait(futures)
+
+        results = []
+
+        for order, future in zip(orders, futures):
+
+            error = future.exception()
+
+            if error is None:
+                results.append(OrderResult(order=order, response=future.result(), error=None))
+            else:
+                results.append(OrderResult(order=order, response=None, error=error))
+
+        return results
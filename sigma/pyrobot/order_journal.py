@@ -0,0 +1,527 @@
+import os
+import json
+import time
+import queue
+import pathlib
+import threading
+import collections
+
+from datetime import date
+from datetime import datetime
+
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Iterator
+from typing import Optional
+
+
+OrderLocation = collections.namedtuple('OrderLocation', ['path', 'offset', 'length'])
+
+
+def decode_request_body(request_body: Union[dict, str, bytes, None]) -> Optional[dict]:
+    """Decodes the order of an order response.
+
+    Overview:
+    ----
+    The responses of `TDClient` orders hold the body of the request as it was
+    sent, `response.request.body`, which is JSON encoded bytes. Paper trades
+    hold the order itself.
+
+    Arguments:
+    ----
+    request_body {Union[dict, str, bytes, None]} -- The order, or its JSON.
+
+    Returns:
+    ----
+    {Optional[dict]} -- The order, or `None` if there isn't one, or it isn't a JSON object.
+    """
+
+    if isinstance(request_body, (str, bytes, bytearray)):
+        try:
+            request_body = json.loads(request_body)
+        except ValueError:
+            return None
+
+    return request_body if isinstance(request_body, dict) else None
+
+
+def order_symbols(order: dict) -> List[str]:
+    """Grabs the symbols of each leg of an order response.
+
+    Arguments:
+    ----
+    order {dict} -- An order response, with the order, or its JSON, in the `request_body` key.
+
+    Returns:
+    ----
+    {List[str]} -- The symbols, without duplicates.
+    """
+
+    request_body = decode_request_body(request_body=order.get('request_body')) or {}
+    symbols = []
+
+    for leg in request_body.get('orderLegCollection', []):
+
+        symbol = leg.get('instrument', {}).get('symbol')
+
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+
+    return symbols
+
+
+def order_date(order: dict) -> str:
+    """Grabs the date of an order response, as `YYYY-MM-DD`.
+
+    Arguments:
+    ----
+    order {dict} -- An order response, with an ISO `timestamp` key.
+
+    Returns:
+    ----
+    {str} -- The date of the order, or today if it doesn't have a timestamp.
+    """
+
+    timestamp = order.get('timestamp')
+
+    if timestamp:
+        return timestamp[:10]
+
+    return date.today().isoformat()
+
+
+class OrderJournal():
+
+    """
+    An append-only journal of order responses. Each order is written as a
+    single JSON line, so saving an order costs the same no matter how many
+    orders were saved before it. The journal is split into segments, a new
+    one is started each day and whenever a segment grows past `max_bytes`.
+
+    The orders are written by a background thread, and synced to disk in
+    batches, so `append` never waits on the disk.
+    """
+
+    def __init__(self, folder: Union[str, pathlib.Path], max_bytes: int = 64 * 1024 * 1024, fsync_every: int = 64,
+                 fsync_interval: float = 1.0, background: bool = True) -> None:
+        """Initalizes the OrderJournal object.
+
+        Arguments:
+        ----
+        folder {Union[str, pathlib.Path]} -- The folder the segments are written to.
+
+        Keyword Arguments:
+        ----
+        max_bytes {int} -- The size a segment can grow to before a new one is started. (default: {64 MB})
+
+        fsync_every {int} -- The number of orders written before the segment is synced. (default: {64})
+
+        fsync_interval {float} -- The number of seconds an order can wait to be synced. (default: {1.0})
+
+        background {bool} -- If `True`, the orders are written by a background thread,
+            otherwise `append` writes and syncs the order before returning. (default: {True})
+
+        Usage:
+        ----
+            >>> order_journal = OrderJournal(folder='data/orders')
+            >>> order_journal.append(order={
+                    'order_id': 'MSFT_long_enter_1586390396.75',
+                    'request_body': trade_obj.order,
+                    'timestamp': datetime.now().isoformat()
+                })
+            >>> order_journal.get(order_id='MSFT_long_enter_1586390396.75')
+        """
+
+        self.folder = pathlib.Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.background = background
+
+        self._lock = threading.RLock()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._closed = False
+
+        # The number of orders that couldn't be written, and the last error.
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._segment = None
+        self._segment_path: Optional[pathlib.Path] = None
+        self._segment_date: Optional[str] = None
+        self._segment_size = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        self._by_id: Dict[str, OrderLocation] = {}
+        self._by_symbol: Dict[str, List[str]] = collections.defaultdict(list)
+        self._by_date: Dict[str, List[pathlib.Path]] = collections.defaultdict(list)
+
+        self._rebuild_index()
+
+    def _segment_paths(self) -> List[pathlib.Path]:
+        """Returns the segments in the folder, oldest first."""
+
+        return sorted(self.folder.glob('orders-*.jsonl'))
+
+    @staticmethod
+    def _parse_segment_name(path: pathlib.Path) -> Tuple[str, int]:
+        """Splits a segment name, `orders-YYYY-MM-DD-NNNN.jsonl`, into its date and sequence number."""
+
+        stem = path.stem[len('orders-'):]
+
+        return stem[:10], int(stem[11:])
+
+    def _index_order(self, order: dict, location: OrderLocation) -> None:
+        """Adds an order to the index."""
+
+        order_id = str(order.get('order_id'))
+        self._by_id[order_id] = location
+
+        for symbol in order_symbols(order=order):
+            self._by_symbol[symbol].append(order_id)
+
+    def _rebuild_index(self) -> None:
+        """Scans the segments already in the folder, and indexes their orders.
+
+        Overview:
+        ----
+        A line that was only partly written, because the process died before it
+        was synced, is skipped. New orders always go to a new segment, so the
+        partial line is never appended to.
+        """
+
+        for path in self._segment_paths():
+
+            segment_date, _ = self._parse_segment_name(path=path)
+            self._by_date[segment_date].append(path)
+
+            offset = 0
+
+            with open(path, 'rb') as segment:
+                for line in segment:
+
+                    if line.endswith(b'\n'):
+                        try:
+                            order = json.loads(line)
+                        except ValueError:
+                            order = None
+
+                        if order is not None:
+                            self._index_order(
+                                order=order,
+                                location=OrderLocation(path=path, offset=offset, length=len(line))
+                            )
+
+                    offset += len(line)
+
+    def _open_segment(self, segment_date: str) -> None:
+        """Closes the current segment and starts a new one for a date."""
+
+        self._close_segment()
+
+        sequence = 0
+
+        for path in self._by_date.get(segment_date, []):
+            sequence = max(sequence, self._parse_segment_name(path=path)[1] + 1)
+
+        self._segment_path = self.folder.joinpath(
+            'orders-{date}-{sequence:04d}.jsonl'.format(date=segment_date, sequence=sequence)
+        )
+        self._segment = open(self._segment_path, 'ab')
+        self._segment_date = segment_date
+        self._segment_size = self._segment_path.stat().st_size
+        self._by_date[segment_date].append(self._segment_path)
+
+    def _sync(self) -> None:
+        """Flushes the current segment and syncs it to disk."""
+
+        if self._segment and self._unsynced:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close_segment(self) -> None:
+        """Syncs and closes the current segment."""
+
+        if self._segment:
+            self._sync()
+            self._segment.close()
+
+        self._segment = None
+        self._segment_path = None
+        self._segment_date = None
+        self._segment_size = 0
+
+    def _write(self, orders: List[dict]) -> None:
+        """Writes a batch of orders, rotating the segment when needed."""
+
+        with self._lock:
+
+            for order in orders:
+
+                # One bad order is skipped, so it can't hold up the others.
+                try:
+                    line, line_date = self._encode(order=order)
+                except Exception as error:
+                    self._record_error(order=order, error=error)
+                    continue
+
+                if self._segment is None or line_date != self._segment_date or self._segment_size + len(line) > self.max_bytes:
+                    self._open_segment(segment_date=line_date)
+
+                location = OrderLocation(path=self._segment_path, offset=self._segment_size, length=len(line))
+
+                self._segment.write(line)
+                self._segment_size += len(line)
+                self._unsynced += 1
+
+                self._index_order(order=order, location=location)
+
+            # The orders have to be readable right away, even if they aren't synced yet.
+            self._segment.flush()
+
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _encode(self, order: dict) -> Tuple[bytes, str]:
+        """Encodes an order as a JSON line, with its order decoded, and grabs its date."""
+
+        if isinstance(order.get('request_body'), (str, bytes, bytearray)):
+            order = dict(order, request_body=decode_request_body(request_body=order['request_body']))
+
+        line = json.dumps(order, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+
+        return line, order_date(order=order)
+
+    def _record_error(self, order: dict, error: BaseException) -> None:
+        """Counts an order that couldn't be written."""
+
+        self.errors += 1
+        self.last_error = error
+
+        print('Could not write order {order_id} to the journal: {error!r}'.format(
+            order_id=order.get('order_id') if isinstance(order, dict) else None,
+            error=error
+        ))
+
+    def _run_writer(self) -> None:
+        """Writes the queued orders in batches, until the journal is closed."""
+
+        while True:
+
+            try:
+                orders = [self._queue.get(timeout=self.fsync_interval)]
+            except queue.Empty:
+                with self._lock:
+                    self._sync()
+                continue
+
+            # Grab everything else that's waiting, so it's written as one batch.
+            while True:
+                try:
+                    orders.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in orders
+            batch = [order for order in orders if order is not None]
+
+            # The thread has to keep running, or `flush` and `close` would wait forever.
+            try:
+                if batch:
+                    self._write(orders=batch)
+            except Exception as error:
+                self._record_error(order={'order_id': None}, error=error)
+            finally:
+                for _ in orders:
+                    self._queue.task_done()
+
+            if stop:
+                break
+
+    def append(self, order: dict) -> None:
+        """Adds an order to the journal.
+
+        Arguments:
+        ----
+        order {dict} -- An order response, with the `order_id`, `request_body`
+            and `timestamp` keys.
+
+        Raises:
+        ----
+        ValueError: If the journal was closed.
+        """
+
+        self.extend(orders=[order])
+
+    def extend(self, orders: List[dict]) -> None:
+        """Adds a list of orders to the journal.
+
+        Arguments:
+        ----
+        orders {List[dict]} -- The order responses.
+
+        Raises:
+        ----
+        ValueError: If the journal was closed.
+        """
+
+        if self._closed:
+            raise ValueError("The order journal is closed.")
+
+        if not self.background:
+            self._write(orders=orders)
+            return
+
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name='order-journal', daemon=True)
+                self._writer.start()
+
+        for order in orders:
+            self._queue.put(order)
+
+    def flush(self) -> None:
+        """Waits for the queued orders to be written, and syncs them to disk."""
+
+        if self._writer is not None:
+            self._queue.join()
+
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Writes the queued orders, stops the background thread and closes the segment."""
+
+        if self._closed:
+            return
+
+        self._closed = True
+
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+        with self._lock:
+            self._close_segment()
+
+    def _read(self, location: OrderLocation) -> dict:
+        """Reads a single order from its location."""
+
+        with open(location.path, 'rb') as segment:
+            segment.seek(location.offset)
+            return json.loads(segment.read(location.length))
+
+    def get(self, order_id: str) -> Optional[dict]:
+        """Grabs a single order by its ID.
+
+        Arguments:
+        ----
+        order_id {str} -- The order ID.
+
+        Returns:
+        ----
+        {Optional[dict]} -- The order, or `None` if it isn't in the journal.
+        """
+
+        self.flush()
+
+        with self._lock:
+            location = self._by_id.get(order_id)
+
+        return self._read(location=location) if location else None
+
+    def orders_for_symbol(self, symbol: str) -> List[dict]:
+        """Grabs every order of a symbol, oldest first.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol.
+
+        Returns:
+        ----
+        {List[dict]} -- The orders.
+        """
+
+        self.flush()
+
+        with self._lock:
+            locations = [self._by_id[order_id] for order_id in self._by_symbol.get(symbol, [])]
+
+        return [self._read(location=location) for location in locations]
+
+    def replay(self, day: Union[date, datetime, str]) -> Iterator[dict]:
+        """Reads back every order of a day, in the order they were saved.
+
+        Overview:
+        ----
+        Each segment is read in one go and split into lines, so replaying
+        a day only reads the segments of that day.
+
+        Arguments:
+        ----
+        day {Union[date, datetime, str]} -- The day, as a date or as `YYYY-MM-DD`.
+
+        Yields:
+        ----
+        {dict} -- The orders.
+
+        Usage:
+        ----
+            >>> for order in trading_robot.order_journal.replay(day=date.today()):
+                    print(order['order_id'])
+        """
+
+        if isinstance(day, (date, datetime)):
+            day = day.isoformat()
+
+        day = day[:10]
+
+        self.flush()
+
+        with self._lock:
+            paths = list(self._by_date.get(day, []))
+
+        for path in paths:
+
+            with open(path, 'rb') as segment:
+                lines = segment.read().split(b'\n')
+
+            # The last item is the empty string after the last new line, or a partial line.
+            for line in lines[:-1]:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    @property
+    def order_ids(self) -> List[str]:
+        """The IDs of every order in the journal."""
+
+        with self._lock:
+            return list(self._by_id)
+
+    @property
+    def days(self) -> List[str]:
+        """The days with orders in the journal, as `YYYY-MM-DD`."""
+
+        with self._lock:
+            return sorted(self._by_date)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __enter__(self) -> 'OrderJournal':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -3,11 +3,18 @@ import numpy as np
 from pandas import DataFrame
 from typing import Tuple
 from typing import List
+from typing import Dict
+from typing import Union
 from typing import Optional
 from typing import Iterable
 
 
+from pyrobot.positions import PositionsTable
+from pyrobot.positions import ReturnsCovariance
+from pyrobot.positions import daily_returns
 from pyrobot.stock_frame import StockFrame
+from pyrobot.historical import HistoricalLoader
+from pyrobot.quotes import QuoteCache
 from td.client import TDClient
 
 
@@ -21,7 +28,7 @@ class Portfolio():
         account_number {str} -- An accout number to associate with the Portfolio. (default: {None})
         """
 
-        self.positions = {}
+        self._positions = PositionsTable()
         self.positions_count = 0
 
         self.profit_loss = 0.00
@@ -32,8 +39,31 @@ class Portfolio():
         self._historical_prices = []
 
         self._td_client: TDClient = None
+        self._quote_cache: QuoteCache = None
+        self._historical_loader: HistoricalLoader = None
+        self._owns_historical_loader = False
         self._stock_frame: StockFrame = None
         self._stock_frame_daily: StockFrame = None
+        self._returns_covariance: ReturnsCovariance = None
+
+    @property
+    def positions(self) -> PositionsTable:
+        """The positions in the portfolio.
+
+        Overview:
+        ----
+        The positions are stored in a `PositionsTable`, which can be read like
+        a dictionary of positions keyed by symbol. Use `add_position` and
+        `remove_position` to add and remove them. The fields of a position
+        can be changed in place, `positions['MSFT']['quantity'] = 20` changes
+        the table.
+
+        Returns:
+        ----
+        {PositionsTable} -- The positions table.
+        """
+
+        return self._positions
 
     def add_positions(self, positions: List[dict]) -> dict:
         """Add Multiple positions to the portfolio at once.
@@ -149,17 +179,14 @@ class Portfolio():
             }
         """
 
-        self.positions[symbol] = {}
-        self.positions[symbol]['symbol'] = symbol
-        self.positions[symbol]['quantity'] = quantity
-        self.positions[symbol]['purchase_price'] = purchase_price
-        self.positions[symbol]['purchase_date'] = purchase_date
-        self.positions[symbol]['asset_type'] = asset_type
-
-        if purchase_date:
-            self.positions[symbol]['ownership_status'] = True
-        else:
-            self.positions[symbol]['ownership_status'] = False
+        self.positions.add(
+            symbol=symbol,
+            asset_type=asset_type,
+            quantity=quantity,
+            purchase_price=purchase_price,
+            purchase_date=purchase_date,
+            ownership_status=bool(purchase_date)
+        )
 
         return self.positions[symbol]
 
@@ -196,7 +223,7 @@ class Portfolio():
         """
 
         if symbol in self.positions:
-            del self.positions[symbol]
+            self.positions.remove(symbol=symbol)
             return (True, "{symbol} was successfully removed.".format(symbol=symbol))
         else:
             return (False, "{symbol} did not exist in the porfolio.".format(symbol=symbol))
@@ -216,7 +243,20 @@ class Portfolio():
             for symbol in self.positions:
                 total_allocation[self.positions[symbol]['asset_type']].append(self.positions[symbol])
 
-    def portfolio_variance(self, weights: dict, covariance_matrix: DataFrame) -> dict:
+    def portfolio_variance(self, weights: dict, covariance_matrix: Union[DataFrame, np.ndarray]) -> float:
+        """Calculates the variance of the portfolio.
+
+        Arguments:
+        ----
+        weights {dict} -- The weight of each symbol.
+
+        covariance_matrix {Union[DataFrame, np.ndarray]} -- The covariance of the returns,
+            with the symbols sorted.
+
+        Returns:
+        ----
+        {float} -- The portfolio variance.
+        """
 
         sorted_keys = list(weights.keys())
         sorted_keys.sort()
@@ -257,108 +297,139 @@ class Portfolio():
         # Calculate the weights.
         porftolio_weights = self.portfolio_weights()
 
-        # Calculate the Daily Returns (%)
-        self._stock_frame_daily.frame['daily_returns_pct'] = self._stock_frame_daily.symbol_groups['close'].transform(
-            lambda x: x.pct_change()
-        )
-
-        # Calculate the Daily Returns (Mean)
-        self._stock_frame_daily.frame['daily_returns_avg'] = self._stock_frame_daily.symbol_groups['daily_returns_pct'].transform(
-            lambda x: x.mean()
-        )
-
-        # Calculate the Daily Returns (Standard Deviation)
-        self._stock_frame_daily.frame['daily_returns_std'] = self._stock_frame_daily.symbol_groups['daily_returns_pct'].transform(
-            lambda x: x.std()
-        )
-
-        # Calculate the Covariance.
-        returns_cov = self._stock_frame_daily.frame.unstack(
-            level=0)['daily_returns_pct'].cov()
+        # Build the daily returns, one column per symbol.
+        bar_buffer = self._stock_frame_daily.buffer
+        symbols = bar_buffer.symbols
+        _, returns = daily_returns(bar_buffer=bar_buffer, symbols=symbols)
+
+        # Calculate the Daily Returns (Mean) and (Standard Deviation) of each symbol.
+        with np.errstate(invalid='ignore', divide='ignore'):
+            counts = (~np.isnan(returns)).sum(axis=0)
+            returns_avg = np.nansum(returns, axis=0) / counts
+            returns_std = np.sqrt(
+                np.nansum((returns - returns_avg) ** 2, axis=0) / (counts - 1)
+            )
 
-        # Take the other columns and get ready to add them to our dictionary.
-        returns_avg = self._stock_frame_daily.symbol_groups['daily_returns_avg'].tail(
-            n=1
-        ).to_dict()
+        # Calculate the Covariance, it's kept so it can be updated one day at a time.
+        self._returns_covariance = ReturnsCovariance.from_returns(symbols=symbols, returns=returns)
+        returns_cov = self._returns_covariance.covariance
 
-        returns_std = self._stock_frame_daily.symbol_groups['daily_returns_std'].tail(
-            n=1
-        ).to_dict()
+        weights = np.array([porftolio_weights.get(symbol, 0.0) for symbol in symbols])
 
         metrics_dict = {}
 
-        portfolio_variance = self.portfolio_variance(
-            weights=porftolio_weights,
-            covariance_matrix=returns_cov
-        )
-
-        for index_tuple in returns_std:
+        for index, symbol in enumerate(symbols):
 
-            symbol = index_tuple[0]
             metrics_dict[symbol] = {}
-            metrics_dict[symbol]['weight'] = porftolio_weights[symbol]
-            metrics_dict[symbol]['average_returns'] = returns_avg[index_tuple]
-            metrics_dict[symbol]['weighted_returns'] = returns_avg[index_tuple] * \
-                metrics_dict[symbol]['weight']
-            metrics_dict[symbol]['standard_deviation_of_returns'] = returns_std[index_tuple]
-            metrics_dict[symbol]['variance_of_returns'] = returns_std[index_tuple] ** 2
-            metrics_dict[symbol]['covariance_of_returns'] = returns_cov.loc[[
-                symbol]].to_dict()
+            metrics_dict[symbol]['weight'] = weights[index]
+            metrics_dict[symbol]['average_returns'] = returns_avg[index]
+            metrics_dict[symbol]['weighted_returns'] = returns_avg[index] * weights[index]
+            metrics_dict[symbol]['standard_deviation_of_returns'] = returns_std[index]
+            metrics_dict[symbol]['variance_of_returns'] = returns_std[index] ** 2
+            metrics_dict[symbol]['covariance_of_returns'] = {
+                other_symbol: {symbol: returns_cov[index, other_index]}
+                for other_index, other_symbol in enumerate(symbols)
+            }
 
         metrics_dict['portfolio'] = {}
-        metrics_dict['portfolio']['variance'] = portfolio_variance
+        metrics_dict['portfolio']['variance'] = self._returns_covariance.portfolio_variance(weights=weights)
 
         return metrics_dict
 
-    def portfolio_weights(self) -> dict:
-        """Calculate the weights for each position in the portfolio
+    def update_daily_returns(self, returns: Dict[str, float], weights: Optional[Dict[str, float]] = None) -> float:
+        """Adds one day of returns to the covariance, and recalculates the portfolio variance.
+
+        Overview:
+        ----
+        The covariance built by `portfolio_metrics` is updated in place, so it
+        doesn't have to be recalculated from the whole history each day.
+
+        Arguments:
+        ----
+        returns {Dict[str, float]} -- The return of each symbol for the day.
+
+        Keyword Arguments:
+        ----
+        weights {Dict[str, float]} -- The weight of each symbol. If `None`, the
+            weights are calculated from the current quotes. (default: {None})
+
+        Raises:
+        ----
+        ValueError: If `portfolio_metrics` hasn't been called yet.
 
         Returns:
         ----
-        {dict} -- Each symbol with their designated weights.
+        {float} -- The portfolio variance.
         """
 
-        weights = {}
+        if self._returns_covariance is None:
+            raise ValueError("Call `portfolio_metrics` before updating the daily returns.")
 
-        # First grab all the symbols.
-        symbols = self.positions.keys()
+        symbols = self._returns_covariance.symbols
+        self._returns_covariance.update(
+            returns=[returns.get(symbol, np.nan) for symbol in symbols]
+        )
 
-        # Grab the quotes.
-        quotes = self.td_client.get_quotes(instruments=list(symbols))
+        if weights is None:
+            weights = self.portfolio_weights()
 
-        # Grab the projected market value.
-        projected_market_value_dict = self.projected_market_value(
-            current_prices=quotes
+        return self._returns_covariance.portfolio_variance(
+            weights=np.array([weights.get(symbol, 0.0) for symbol in symbols])
         )
 
-        # Loop through each symbol.
-        for symbol in projected_market_value_dict:
+    def portfolio_weights(self, current_prices: Optional[dict] = None) -> dict:
+        """Calculate the weights for each position in the portfolio
+
+        Keyword Arguments:
+        ----
+        current_prices {dict} -- The quotes of each symbol. If `None`, the quotes
+            are grabbed from the quote cache. (default: {None})
+
+        Returns:
+        ----
+        {dict} -- Each symbol with their designated weights.
+        """
+
+        # Grab the quotes.
+        if current_prices is None:
+            current_prices = self.grab_quotes()
 
-            # Calculate the weights.
-            if symbol != 'total':
-                weights[symbol] = projected_market_value_dict[symbol]['total_market_value'] / \
-                    projected_market_value_dict['total']['total_market_value']
+        # Value every position at once.
+        valuation = self.valuation(current_prices=current_prices)
 
-        return weights
+        return dict(zip(valuation['symbol'].tolist(), valuation['weight'].tolist()))
 
     def portfolio_summary(self):
         """Generates a summary of our portfolio."""
 
-        # First grab all the symbols.
-        symbols = self.positions.keys()
-
-        # Grab the quotes.
-        quotes = self.td_client.get_quotes(instruments=list(symbols))
+        # Grab the quotes once, for both the market value and the weights.
+        quotes = self.grab_quotes()
 
         portfolio_summary_dict = {}
         portfolio_summary_dict['projected_market_value'] = self.projected_market_value(
             current_prices=quotes
         )
-        portfolio_summary_dict['portfolio_weights'] = self.portfolio_weights()
+        portfolio_summary_dict['portfolio_weights'] = self.portfolio_weights(
+            current_prices=quotes
+        )
         portfolio_summary_dict['portfolio_risk'] = ""
 
         return portfolio_summary_dict
 
+    def grab_quotes(self, max_age: Optional[float] = None) -> dict:
+        """Grabs the quotes of every position, through the quote cache.
+
+        Keyword Arguments:
+        ----
+        max_age {float} -- The oldest quote, in seconds, that can be used. (default: {the cache's TTL})
+
+        Returns:
+        ----
+        {dict} -- The quotes, keyed by symbol.
+        """
+
+        return self.quote_cache.get_quotes(symbols=list(self.positions), max_age=max_age)
+
     def in_portfolio(self, symbol: str) -> bool:
         """checks if the symbol is in the portfolio.
 
@@ -419,8 +490,8 @@ class Portfolio():
         KeyError: If the symbol does not exist in the portfolio it will return an error.
         """
 
-        if self.in_portfolio(symbol=symbol) and self.positions[symbol]['ownership_status']:
-            self.positions[symbol]['ownership_status'] = ownership
+        if self.in_portfolio(symbol=symbol):
+            self.positions.set_ownership_status(symbol=symbol, ownership=ownership)
         else:
             raise KeyError(
                 "Can't set ownership status, as you do not have the symbol in your portfolio."
@@ -497,65 +568,87 @@ class Portfolio():
             >>> portfolio_summary = portfolio.projected_market_value(current_prices={'MSFT':{'lastPrice': 8.00, 'openPrice': 7.50}})        
         """
 
-        projected_value = {}
-        total_value = 0.0
-        total_invested_capital = 0.0
-        total_profit_or_loss = 0.0
+        valuation = self.valuation(current_prices=current_prices)
+        profit_or_loss = valuation['profit_or_loss']
 
-        position_count_profitable = 0
-        position_count_not_profitable = 0
-        position_count_break_even = 0
+        projected_value = {}
 
-        for symbol in current_prices:
+        columns = zip(
+            valuation['symbol'].tolist(),
+            valuation['purchase_price'].tolist(),
+            valuation['current_price'].tolist(),
+            valuation['quantity'].tolist(),
+            valuation['is_profitable'].tolist(),
+            valuation['market_value'].tolist(),
+            valuation['invested_capital'].tolist(),
+            profit_or_loss.tolist(),
+            valuation['profit_or_loss_pct'].tolist()
+        )
 
-            if self.in_portfolio(symbol=symbol):
+        for symbol, purchase_price, current_price, quantity, is_profitable, market_value, invested_capital, gain, gain_pct in columns:
+            projected_value[symbol] = {
+                'purchase_price': purchase_price,
+                'current_price': current_price,
+                'quantity': quantity,
+                'is_profitable': is_profitable,
+                'total_market_value': market_value,
+                'total_invested_capital': invested_capital,
+                'total_loss_or_gain_$': gain,
+                'total_loss_or_gain_%': gain_pct
+            }
 
-                projected_value[symbol] = {}
-                current_quantity = self.positions[symbol]['quantity']
-                purchase_price = self.positions[symbol]['purchase_price']
-                current_price = current_prices[symbol]['lastPrice']
-                is_profitable = self.is_profitable(
-                    symbol=symbol, current_price=current_price)
+        projected_value['total'] = {}
+        projected_value['total']['total_positions'] = len(self.positions)
+        projected_value['total']['total_market_value'] = valuation['market_value'].sum().item()
+        projected_value['total']['total_invested_capital'] = valuation['invested_capital'].sum().item()
+        projected_value['total']['total_profit_or_loss'] = profit_or_loss.sum().item()
+        projected_value['total']['number_of_profitable_positions'] = int((profit_or_loss > 0).sum())
+        projected_value['total']['number_of_non_profitable_positions'] = int((profit_or_loss < 0).sum())
+        projected_value['total']['number_of_breakeven_positions'] = int((profit_or_loss == 0).sum())
 
-                projected_value[symbol]['purchase_price'] = purchase_price
-                projected_value[symbol]['current_price'] = current_prices[symbol]['lastPrice']
-                projected_value[symbol]['quantity'] = current_quantity
-                projected_value[symbol]['is_profitable'] = is_profitable
+        return projected_value
 
-                # Calculate total market value.
-                projected_value[symbol]['total_market_value'] = (
-                    current_price * current_quantity
-                )
+    def valuation(self, current_prices: Dict[str, Union[dict, float]]) -> Dict[str, np.ndarray]:
+        """Values every position with a current price, in one vectorized pass.
 
-                # Calculate total invested capital.
-                projected_value[symbol]['total_invested_capital'] = (
-                    current_quantity * purchase_price
-                )
+        Overview:
+        ----
+        This is the array version of `projected_market_value`, it skips building
+        a dictionary for each position, so a large portfolio can be revalued on
+        every tick.
 
-                projected_value[symbol]['total_loss_or_gain_$'] = ((current_price - purchase_price) * current_quantity)
-                projected_value[symbol]['total_loss_or_gain_%'] = round(((current_price - purchase_price) / purchase_price), 4)
+        Arguments:
+        ----
+        current_prices {Dict[str, Union[dict, float]]} -- The quotes of each symbol, with
+            the price in the `lastPrice` key, or the price of each symbol.
 
-                total_value += projected_value[symbol]['total_market_value']
-                total_profit_or_loss += projected_value[symbol]['total_loss_or_gain_$']
-                total_invested_capital += projected_value[symbol]['total_invested_capital']
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- The `symbol`, `quantity`, `purchase_price`, `current_price`,
+            `market_value`, `invested_capital`, `profit_or_loss`, `profit_or_loss_pct`,
+            `is_profitable` and `weight` columns, one item per position.
 
-                if projected_value[symbol]['total_loss_or_gain_$'] > 0:
-                    position_count_profitable += 1
-                elif projected_value[symbol]['total_loss_or_gain_$'] < 0:
-                    position_count_not_profitable += 1
-                else:
-                    position_count_break_even += 1
+        Usage:
+        ----
+            >>> valuation = portfolio.valuation(current_prices={'MSFT': 8.00, 'SQ': 61.25})
+            >>> valuation['market_value'].sum()
+        """
 
-        projected_value['total'] = {}
-        projected_value['total']['total_positions'] = len(self.positions)
-        projected_value['total']['total_market_value'] = total_value
-        projected_value['total']['total_invested_capital'] = total_invested_capital
-        projected_value['total']['total_profit_or_loss'] = total_profit_or_loss
-        projected_value['total']['number_of_profitable_positions'] = position_count_profitable
-        projected_value['total']['number_of_non_profitable_positions'] = position_count_not_profitable
-        projected_value['total']['number_of_breakeven_positions'] = position_count_break_even
+        symbols = list(current_prices)
+        price_positions, rows = self.positions.rows(symbols=symbols)
+
+        prices = np.fromiter(
+            (
+                current_prices[symbols[position]]['lastPrice']
+                if isinstance(current_prices[symbols[position]], dict)
+                else current_prices[symbols[position]]
+                for position in price_positions.tolist()
+            ),
+            dtype='float64',
+            count=price_positions.size
+        )
 
-        return projected_value
+        return self.positions.valuation(rows=rows, prices=prices)
 
     @property
     def historical_prices(self) -> List[dict]:
@@ -623,6 +716,71 @@ class Portfolio():
 
         self._td_client: TDClient = td_client
 
+    @property
+    def quote_cache(self) -> QuoteCache:
+        """Gets the QuoteCache the Portfolio grabs its quotes with.
+
+        Returns:
+        ----
+        {QuoteCache} -- The quote cache, shared with the PyRobot when it created
+            the Portfolio, otherwise a new one for the Portfolio's `TDClient`.
+        """
+
+        if self._quote_cache is None or self._quote_cache.td_client is not self.td_client:
+            self._quote_cache = QuoteCache(td_client=self.td_client)
+
+        return self._quote_cache
+
+    @quote_cache.setter
+    def quote_cache(self, quote_cache: QuoteCache) -> None:
+        """Sets the QuoteCache for the Portfolio
+
+        Arguments:
+        ----
+        quote_cache {QuoteCache} -- The quote cache to share.
+        """
+
+        self._quote_cache = quote_cache
+
+    @property
+    def historical_loader(self) -> HistoricalLoader:
+        """Gets the HistoricalLoader the Portfolio grabs its price history with.
+
+        Returns:
+        ----
+        {HistoricalLoader} -- The loader, shared with the PyRobot when it created
+            the Portfolio, otherwise one for the Portfolio's `TDClient` that shares
+            the rate limit of its quote cache.
+        """
+
+        if self._historical_loader is None or self._historical_loader.td_client is not self.td_client:
+
+            if self._owns_historical_loader:
+                self._historical_loader.close()
+
+            self._historical_loader = HistoricalLoader(
+                td_client=self.td_client,
+                rate_limiter=self.quote_cache.rate_limiter
+            )
+            self._owns_historical_loader = True
+
+        return self._historical_loader
+
+    @historical_loader.setter
+    def historical_loader(self, historical_loader: HistoricalLoader) -> None:
+        """Sets the HistoricalLoader for the Portfolio
+
+        Arguments:
+        ----
+        historical_loader {HistoricalLoader} -- The loader to share.
+        """
+
+        if self._owns_historical_loader and self._historical_loader is not historical_loader:
+            self._historical_loader.close()
+
+        self._historical_loader = historical_loader
+        self._owns_historical_loader = False
+
     def _grab_daily_historical_prices(self) -> StockFrame:
         """Grabs the daily historical prices for each position.
 
@@ -631,14 +789,12 @@ class Portfolio():
         {StockFrame} -- A StockFrame object with data organized, grouped, and sorted.
         """
 
-        new_prices = []
+        historical_loader = self.historical_loader
 
-        # Loop through each position.
-        for symbol in self.positions:
-
-            # Grab the historical prices.
-            historical_prices_response = self.td_client.get_price_history(
-                symbol=symbol,
+        # Grab the historical prices for every position at once.
+        try:
+            _, new_prices = historical_loader.load(
+                symbols=list(self.positions),
                 period_type='year',
                 period=1,
                 frequency_type='daily',
@@ -646,21 +802,12 @@ class Portfolio():
                 extended_hours=True
             )
 
-            # Loop through the chandles.
-            for candle in historical_prices_response['candles']:
-
-                new_price_mini_dict = {}
-                new_price_mini_dict['symbol'] = symbol
-                new_price_mini_dict['open'] = candle['open']
-                new_price_mini_dict['close'] = candle['close']
-                new_price_mini_dict['high'] = candle['high']
-                new_price_mini_dict['low'] = candle['low']
-                new_price_mini_dict['volume'] = candle['volume']
-                new_price_mini_dict['datetime'] = candle['datetime']
-                new_prices.append(new_price_mini_dict)
+        # A loader of our own isn't used again soon, so don't keep its workers around.
+        finally:
+            if self._owns_historical_loader:
+                historical_loader.close()
 
         # Create and set the StockFrame
         self._stock_frame_daily = StockFrame(data=new_prices)
-        self._stock_frame_daily.create_frame()
 
         return self._stock_frame_daily
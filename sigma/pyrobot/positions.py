@@ -0,0 +1,470 @@
+import numpy as np
+
+from collections.abc import MutableMapping
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Iterator
+from typing import Optional
+
+from pyrobot.bar_buffer import BarBuffer
+
+
+# The fields of a position that can be changed, and the array each one is kept in.
+POSITION_FIELDS = {
+    'quantity': '_quantity',
+    'purchase_price': '_purchase_price',
+    'purchase_date': '_purchase_date',
+    'asset_type': '_asset_type',
+    'ownership_status': '_ownership_status'
+}
+
+
+class PositionRow(MutableMapping):
+
+    """
+    A single position of a `PositionsTable`, in the dictionary format of
+    `Portfolio.add_position`. It's a view on the row of the table, so
+    changing a field, like `positions['MSFT']['quantity'] = 20`, changes
+    the table. The symbol can't be changed, and the fields can't be deleted.
+    """
+
+    def __init__(self, table: 'PositionsTable', symbol: str) -> None:
+        """Initalizes the PositionRow object.
+
+        Arguments:
+        ----
+        table {PositionsTable} -- The table the position is in.
+
+        symbol {str} -- The symbol of the position.
+        """
+
+        self._table = table
+        self._symbol = symbol
+
+    def __getitem__(self, field: str) -> Any:
+
+        row = self._table._rows[self._symbol]
+
+        if field == 'symbol':
+            return self._symbol
+        elif field not in POSITION_FIELDS:
+            raise KeyError(field)
+
+        value = getattr(self._table, POSITION_FIELDS[field])[row]
+
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __setitem__(self, field: str, value: Any) -> None:
+
+        if field not in POSITION_FIELDS:
+            raise KeyError("The {field} of a position can't be set.".format(field=field))
+
+        getattr(self._table, POSITION_FIELDS[field])[self._table._rows[self._symbol]] = value
+
+    def __delitem__(self, field: str) -> None:
+        raise TypeError("The fields of a position can't be deleted.")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(['symbol'] + list(POSITION_FIELDS))
+
+    def __len__(self) -> int:
+        return len(POSITION_FIELDS) + 1
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class PositionsTable():
+
+    """
+    Holds the positions of a Portfolio in parallel NumPy arrays, one
+    row per symbol, so the whole portfolio can be valued in a single
+    vectorized pass. The table also behaves like the dictionary of
+    positions the Portfolio used to keep, and its positions are views
+    that write through to the arrays.
+    """
+
+    def __init__(self, initial_capacity: int = 64) -> None:
+        """Initalizes the PositionsTable object.
+
+        Keyword Arguments:
+        ----
+        initial_capacity {int} -- The number of positions to allocate room for. (default: {64})
+        """
+
+        self._size = 0
+        self._capacity = max(initial_capacity, 1)
+        self._rows: Dict[str, int] = {}
+
+        self._symbol = np.empty(self._capacity, dtype=object)
+        self._asset_type = np.empty(self._capacity, dtype=object)
+        self._purchase_date = np.empty(self._capacity, dtype=object)
+        self._quantity = np.zeros(self._capacity, dtype='float64')
+        self._purchase_price = np.zeros(self._capacity, dtype='float64')
+        self._ownership_status = np.zeros(self._capacity, dtype=bool)
+
+    def _reserve(self, size: int) -> None:
+        """Makes sure the table has room for `size` positions."""
+
+        if size <= self._capacity:
+            return
+
+        capacity = self._capacity
+
+        while capacity < size:
+            capacity *= 2
+
+        for name in ['_symbol', '_asset_type', '_purchase_date', '_quantity', '_purchase_price', '_ownership_status']:
+
+            old_array = getattr(self, name)
+            new_array = np.zeros(capacity, dtype=old_array.dtype) if old_array.dtype != object else np.empty(capacity, dtype=object)
+            new_array[:self._size] = old_array[:self._size]
+
+            setattr(self, name, new_array)
+
+        self._capacity = capacity
+
+    def add(self, symbol: str, asset_type: str, quantity: float = 0, purchase_price: float = 0.0,
+            purchase_date: Optional[str] = None, ownership_status: bool = False) -> None:
+        """Adds a position, or replaces the position of a symbol already in the table.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol of the instrument.
+
+        asset_type {str} -- The type of the instrument.
+
+        Keyword Arguments:
+        ----
+        quantity {float} -- The number of shares or contracts. (default: {0})
+
+        purchase_price {float} -- The price the position was purchased at. (default: {0.0})
+
+        purchase_date {str} -- The date the position was purchased. (default: {None})
+
+        ownership_status {bool} -- Whether the position is owned. (default: {False})
+        """
+
+        row = self._rows.get(symbol)
+
+        if row is None:
+            self._reserve(self._size + 1)
+            row = self._size
+            self._rows[symbol] = row
+            self._size += 1
+
+        self._symbol[row] = symbol
+        self._asset_type[row] = asset_type
+        self._purchase_date[row] = purchase_date
+        self._quantity[row] = quantity
+        self._purchase_price[row] = purchase_price
+        self._ownership_status[row] = ownership_status
+
+    def remove(self, symbol: str) -> None:
+        """Removes a position, by moving the last row into its place.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol of the instrument.
+
+        Raises:
+        ----
+        KeyError: If the symbol isn't in the table.
+        """
+
+        row = self._rows.pop(symbol)
+        last_row = self._size - 1
+
+        if row != last_row:
+
+            for name in ['_symbol', '_asset_type', '_purchase_date', '_quantity', '_purchase_price', '_ownership_status']:
+                array = getattr(self, name)
+                array[row] = array[last_row]
+
+            self._rows[self._symbol[row]] = row
+
+        self._symbol[last_row] = None
+        self._asset_type[last_row] = None
+        self._purchase_date[last_row] = None
+        self._size -= 1
+
+    def set_ownership_status(self, symbol: str, ownership: bool) -> None:
+        """Sets the ownership status of a position.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol of the instrument.
+
+        ownership {bool} -- The new ownership status.
+        """
+
+        self._ownership_status[self._rows[symbol]] = ownership
+
+    @property
+    def symbols(self) -> np.ndarray:
+        """The symbol of each row."""
+
+        return self._symbol[:self._size]
+
+    @property
+    def quantity(self) -> np.ndarray:
+        """The quantity of each row."""
+
+        return self._quantity[:self._size]
+
+    @property
+    def purchase_price(self) -> np.ndarray:
+        """The purchase price of each row."""
+
+        return self._purchase_price[:self._size]
+
+    @property
+    def asset_type(self) -> np.ndarray:
+        """The asset type of each row."""
+
+        return self._asset_type[:self._size]
+
+    @property
+    def ownership_status(self) -> np.ndarray:
+        """The ownership status of each row."""
+
+        return self._ownership_status[:self._size]
+
+    def rows(self, symbols: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the rows of a list of symbols.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols, symbols that aren't in the table are skipped.
+
+        Returns:
+        ----
+        {Tuple[np.ndarray, np.ndarray]} -- The position of each found symbol in `symbols`,
+            and its row in the table.
+        """
+
+        found = [(index, self._rows[symbol]) for index, symbol in enumerate(symbols) if symbol in self._rows]
+
+        if not found:
+            return np.zeros(0, dtype='int64'), np.zeros(0, dtype='int64')
+
+        positions, rows = zip(*found)
+
+        return np.array(positions, dtype='int64'), np.array(rows, dtype='int64')
+
+    def valuation(self, rows: np.ndarray, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Values a set of rows at the current prices, in one vectorized pass.
+
+        Arguments:
+        ----
+        rows {np.ndarray} -- The rows to value.
+
+        prices {np.ndarray} -- The current price of each row.
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- The `symbol`, `quantity`, `purchase_price`, `current_price`,
+            `market_value`, `invested_capital`, `profit_or_loss`, `profit_or_loss_pct`,
+            `is_profitable` and `weight` columns.
+        """
+
+        prices = np.asarray(prices, dtype='float64')
+        quantity = self._quantity[rows]
+        purchase_price = self._purchase_price[rows]
+
+        market_value = prices * quantity
+        invested_capital = purchase_price * quantity
+        profit_or_loss = (prices - purchase_price) * quantity
+        total_market_value = market_value.sum()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_or_loss_pct = np.round((prices - purchase_price) / purchase_price, 4)
+            weight = market_value / total_market_value
+
+        return {
+            'symbol': self._symbol[rows],
+            'quantity': quantity,
+            'purchase_price': purchase_price,
+            'current_price': prices,
+            'market_value': market_value,
+            'invested_capital': invested_capital,
+            'profit_or_loss': profit_or_loss,
+            'profit_or_loss_pct': profit_or_loss_pct,
+            'is_profitable': purchase_price <= prices,
+            'weight': weight
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._rows))
+
+    def keys(self) -> List[str]:
+        return list(self._rows)
+
+    def __getitem__(self, symbol: str) -> PositionRow:
+        """Returns a single position, as a view on its row, see `PositionRow`."""
+
+        if symbol not in self._rows:
+            raise KeyError(symbol)
+
+        return PositionRow(table=self, symbol=symbol)
+
+    def get(self, symbol: str, default: Optional[PositionRow] = None) -> Optional[PositionRow]:
+        return self[symbol] if symbol in self._rows else default
+
+    def items(self) -> List[Tuple[str, PositionRow]]:
+        return [(symbol, self[symbol]) for symbol in self._rows]
+
+    def values(self) -> List[PositionRow]:
+        return [self[symbol] for symbol in self._rows]
+
+    def to_dict(self) -> Dict[str, dict]:
+        """Returns a copy of the positions, as dictionaries keyed by symbol."""
+
+        return {symbol: dict(position) for symbol, position in self.items()}
+
+
+def daily_returns(bar_buffer: BarBuffer, symbols: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Builds a matrix of daily returns, aligned on the bar timestamps.
+
+    Overview:
+    ----
+    The returns of each symbol are calculated over its own bars, like
+    `pct_change` on each symbol group, and then placed in the row of
+    their timestamp. Timestamps a symbol doesn't have are left as `NaN`.
+
+    Arguments:
+    ----
+    bar_buffer {BarBuffer} -- The buffer holding the daily bars.
+
+    symbols {List[str]} -- The symbols, one column each.
+
+    Returns:
+    ----
+    {Tuple[np.ndarray, np.ndarray]} -- The timestamps, and the returns, one row per timestamp.
+    """
+
+    datetimes = [bar_buffer.symbol(symbol).datetime for symbol in symbols]
+
+    if not datetimes:
+        return np.zeros(0, dtype='int64'), np.zeros((0, 0), dtype='float64')
+
+    timestamps = np.unique(np.concatenate(datetimes))
+    returns = np.full((timestamps.size, len(symbols)), np.nan)
+
+    for column, symbol in enumerate(symbols):
+
+        close = bar_buffer.symbol(symbol).column('close')
+
+        if close.size < 2:
+            continue
+
+        rows = np.searchsorted(timestamps, datetimes[column][1:])
+        returns[rows, column] = close[1:] / close[:-1] - 1.0
+
+    return timestamps, returns
+
+
+class ReturnsCovariance():
+
+    """
+    Keeps the mean and covariance of a set of return series, and updates
+    them one day at a time in O(n^2) with Welford's algorithm, instead of
+    recalculating them from the whole history.
+    """
+
+    def __init__(self, symbols: List[str]) -> None:
+        """Initalizes the ReturnsCovariance object.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols, in the order of the matrix rows and columns.
+        """
+
+        size = len(symbols)
+
+        self.symbols = list(symbols)
+        self.count = 0
+        self.mean = np.zeros(size, dtype='float64')
+        self._comoment = np.zeros((size, size), dtype='float64')
+
+    @classmethod
+    def from_returns(cls, symbols: List[str], returns: np.ndarray) -> 'ReturnsCovariance':
+        """Builds the covariance from a matrix of returns.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols, one column each.
+
+        returns {np.ndarray} -- The returns, one row per day. Days where any
+            symbol is missing a return are left out.
+
+        Returns:
+        ----
+        {ReturnsCovariance} -- The covariance of the complete days.
+        """
+
+        covariance = cls(symbols=symbols)
+        complete = returns[~np.isnan(returns).any(axis=1)]
+
+        covariance.count = complete.shape[0]
+
+        if covariance.count:
+            covariance.mean = complete.mean(axis=0)
+            centered = complete - covariance.mean
+            covariance._comoment = centered.T @ centered
+
+        return covariance
+
+    def update(self, returns: Union[np.ndarray, List[float]]) -> None:
+        """Adds one day of returns.
+
+        Arguments:
+        ----
+        returns {Union[np.ndarray, List[float]]} -- The return of each symbol, in the
+            order of `symbols`. Days with a missing return are skipped.
+        """
+
+        returns = np.asarray(returns, dtype='float64')
+
+        if np.isnan(returns).any():
+            return
+
+        self.count += 1
+        delta = returns - self.mean
+        self.mean += delta / self.count
+        self._comoment += np.outer(delta, returns - self.mean)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """The sample covariance matrix."""
+
+        if self.count < 2:
+            return np.full(self._comoment.shape, np.nan)
+
+        return self._comoment / (self.count - 1)
+
+    def portfolio_variance(self, weights: np.ndarray) -> float:
+        """Calculates the variance of a portfolio.
+
+        Arguments:
+        ----
+        weights {np.ndarray} -- The weight of each symbol, in the order of `symbols`.
+
+        Returns:
+        ----
+        {float} -- The portfolio variance, `w' * S * w`.
+        """
+
+        weights = np.asarray(weights, dtype='float64')
+
+        return float(weights @ self.covariance @ weights)
@@ -0,0 +1,355 @@
+import os
+import json
+import math
+import time
+import pathlib
+import threading
+import functools
+import contextlib
+import collections
+import pandas as pd
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+
+# Each power of two is split into this many buckets, so a percentile is within about 19% of the true value.
+BUCKETS_PER_OCTAVE = 4
+
+# The shortest duration with its own bucket, anything faster falls into the first one.
+SMALLEST_DURATION = 1e-6
+
+TraceEvent = collections.namedtuple('TraceEvent', ['category', 'name', 'start', 'duration', 'thread', 'args'])
+
+
+class LatencyHistogram():
+
+    """
+    A histogram of durations with logarithmic buckets, which keeps a
+    fixed amount of memory however many durations are added to it.
+    """
+
+    def __init__(self) -> None:
+        """Initalizes the LatencyHistogram object."""
+
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self.buckets: Dict[int, int] = collections.defaultdict(int)
+
+    def add(self, seconds: float) -> None:
+        """Adds a duration to the histogram.
+
+        Arguments:
+        ----
+        seconds {float} -- The duration, in seconds.
+        """
+
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        self.buckets[self._bucket(seconds=seconds)] += 1
+
+    def _bucket(self, seconds: float) -> int:
+
+        if seconds <= SMALLEST_DURATION:
+            return 0
+
+        return int(math.log2(seconds / SMALLEST_DURATION) * BUCKETS_PER_OCTAVE) + 1
+
+    def _upper_edge(self, bucket: int) -> float:
+        return SMALLEST_DURATION * 2 ** (bucket / BUCKETS_PER_OCTAVE)
+
+    @property
+    def mean(self) -> float:
+        """The mean duration, in seconds."""
+
+        return self.total / self.count if self.count else math.nan
+
+    def percentile(self, percent: float) -> float:
+        """Estimates a percentile of the durations from the buckets.
+
+        Arguments:
+        ----
+        percent {float} -- The percentile, between `0` and `100`.
+
+        Returns:
+        ----
+        {float} -- The upper edge of the bucket the percentile falls in, in seconds,
+            which is never more than the longest duration.
+        """
+
+        if not self.count:
+            return math.nan
+
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+
+            seen += self.buckets[bucket]
+
+            if seen >= rank:
+                return min(max(self._upper_edge(bucket=bucket), self.minimum), self.maximum)
+
+        return self.maximum
+
+    def histogram(self) -> List[Tuple[float, int]]:
+        """The non-empty buckets, as `(upper edge in seconds, count)` pairs in increasing order."""
+
+        return [(self._upper_edge(bucket=bucket), self.buckets[bucket]) for bucket in sorted(self.buckets)]
+
+
+class Profiler():
+
+    """
+    Records how long each stage of the trading loop takes, like `get_latest_bar`,
+    `add_rows`, `refresh`, `check_signals` and `place_order`, along with the time
+    each indicator takes to refresh and the calls made to the TD Ameritrade API.
+
+    Overview:
+    ----
+    The durations are kept in a `LatencyHistogram` per category and name, and
+    the most recent calls are kept as trace events, which can be exported to a
+    trace file and opened in `chrome://tracing` or Perfetto. The objects are
+    profiled by setting their `profiler` attribute, see `PyRobot.enable_profiling`.
+    When it's `None`, which is the default, a profiled call only costs a check.
+    """
+
+    def __init__(self, max_events: int = 100000) -> None:
+        """Initalizes the Profiler object.
+
+        Keyword Arguments:
+        ----
+        max_events {int} -- The number of trace events kept, the oldest ones are dropped
+            first. The histograms count every call. (default: {100000})
+        """
+
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.events = collections.deque(maxlen=max_events)
+
+        self._lock = threading.Lock()
+
+        # The trace timestamps are relative to when the profiler was created.
+        self._origin = time.perf_counter()
+
+    def record(self, category: str, name: str, seconds: float, start: Optional[float] = None, **args: Any) -> None:
+        """Records a single call.
+
+        Arguments:
+        ----
+        category {str} -- The group of the call, like `robot`, `indicator` or `api`.
+
+        name {str} -- The name of the call, like `refresh` or `GET marketdata/{}/pricehistory`.
+
+        seconds {float} -- How long the call took.
+
+        Keyword Arguments:
+        ----
+        start {float} -- The `time.perf_counter` value when the call started, defaults
+            to `seconds` before now. (default: {None})
+
+        args {Any} -- Details added to the trace event, like the status code of a request.
+        """
+
+        if start is None:
+            start = time.perf_counter() - seconds
+
+        key = (category, name)
+
+        with self._lock:
+
+            histogram = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+
+            histogram.add(seconds=seconds)
+            self.events.append(
+                TraceEvent(category, name, start - self._origin, seconds, threading.get_ident(), args)
+            )
+
+    @contextlib.contextmanager
+    def measure(self, category: str, name: str, **args: Any) -> Iterator[None]:
+        """Records how long the `with` block takes.
+
+        Arguments:
+        ----
+        category {str} -- The group of the call, like `robot`, `indicator` or `api`.
+
+        name {str} -- The name of the call.
+
+        Keyword Arguments:
+        ----
+        args {Any} -- Details added to the trace event.
+
+        Usage:
+        ----
+            >>> profiler = Profiler()
+            >>> with profiler.measure(category='robot', name='add_rows'):
+                    stock_frame.add_rows(data=latest_bars)
+        """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record(category=category, name=name, seconds=time.perf_counter() - start, start=start, **args)
+
+    def summary(self, category: Optional[str] = None) -> pd.DataFrame:
+        """Summarizes the durations of each call.
+
+        Keyword Arguments:
+        ----
+        category {str} -- Only summarize the calls of this category. (default: {None})
+
+        Returns:
+        ----
+        {pd.DataFrame} -- The `count` of each call, and its `total`, `mean`, `p50`, `p90`,
+            `p99` and `max` durations in milliseconds, indexed by `category` and `name`
+            and sorted by the total time.
+
+        Usage:
+        ----
+            >>> print(profiler.summary().to_string())
+        """
+
+        with self._lock:
+            histograms = [
+                (key, histogram) for key, histogram in self.histograms.items()
+                if category is None or key[0] == category
+            ]
+
+            rows = [
+                {
+                    'category': key[0],
+                    'name': key[1],
+                    'count': histogram.count,
+                    'total': histogram.total * 1000,
+                    'mean': histogram.mean * 1000,
+                    'p50': histogram.percentile(percent=50) * 1000,
+                    'p90': histogram.percentile(percent=90) * 1000,
+                    'p99': histogram.percentile(percent=99) * 1000,
+                    'max': histogram.maximum * 1000
+                }
+                for key, histogram in histograms
+            ]
+
+        columns = ['category', 'name', 'count', 'total', 'mean', 'p50', 'p90', 'p99', 'max']
+        summary = pd.DataFrame(data=rows, columns=columns).set_index(keys=['category', 'name'])
+
+        return summary.sort_values(by='total', ascending=False)
+
+    def export_trace(self, path: Union[str, pathlib.Path]) -> pathlib.Path:
+        """Writes the trace events to a file in the Chrome trace event format.
+
+        Arguments:
+        ----
+        path {Union[str, pathlib.Path]} -- The path of the JSON file.
+
+        Returns:
+        ----
+        {pathlib.Path} -- The path of the file.
+        """
+
+        with self._lock:
+            events = list(self.events)
+
+        trace_events = [
+            {
+                'name': event.name,
+                'cat': event.category,
+                'ph': 'X',
+                'ts': event.start * 1e6,
+                'dur': event.duration * 1e6,
+                'pid': os.getpid(),
+                'tid': event.thread,
+                'args': {key: value if isinstance(value, (int, float, str, bool)) else str(value) for key, value in event.args.items()}
+            }
+            for event in events
+        ]
+
+        path = pathlib.Path(path)
+
+        with open(file=path, mode='w') as trace_file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, trace_file)
+
+        return path
+
+    def reset(self) -> None:
+        """Drops the recorded calls."""
+
+        with self._lock:
+            self.histograms = {}
+            self.events.clear()
+
+
+# A `with` block that does nothing, shared by every call that isn't profiled.
+_NOT_PROFILED = contextlib.nullcontext()
+
+
+def measure(profiler: Optional[Profiler], category: str, name: str, **args: Any) -> contextlib.AbstractContextManager:
+    """Records how long the `with` block takes, if there's a profiler.
+
+    Arguments:
+    ----
+    profiler {Optional[Profiler]} -- The profiler, or `None` if profiling is off.
+
+    category {str} -- The group of the call.
+
+    name {str} -- The name of the call.
+
+    Returns:
+    ----
+    {contextlib.AbstractContextManager} -- The block to run the call in.
+    """
+
+    if profiler is None:
+        return _NOT_PROFILED
+
+    return profiler.measure(category=category, name=name, **args)
+
+
+def profiled(category: str, name: Optional[str] = None) -> Callable:
+    """Decorates a method, so it's measured by the `profiler` attribute of its object.
+
+    Arguments:
+    ----
+    category {str} -- The group of the call.
+
+    Keyword Arguments:
+    ----
+    name {str} -- The name of the call, defaults to the name of the method. (default: {None})
+
+    Returns:
+    ----
+    {Callable} -- The decorator.
+    """
+
+    def decorator(method: Callable) -> Callable:
+
+        call_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+
+            profiler = self.profiler
+
+            if profiler is None:
+                return method(self, *args, **kwargs)
+
+            with profiler.measure(category=category, name=call_name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
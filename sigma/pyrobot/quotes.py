@@ -0,0 +1,214 @@
+import time
+import threading
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import List
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import FrozenSet
+
+from pyrobot.historical import RateLimiter
+from td.client import TDClient
+
+
+class QuoteCache():
+
+    """
+    A snapshot cache for the Get Quotes endpoint, shared by the PyRobot and
+    its Portfolio. Quotes younger than the TTL are served from the cache,
+    so the summary, the weights and the robot's own quotes in a single
+    trading cycle come from one round trip. Large symbol lists are split
+    into chunks that are fetched at the same time, and callers asking for
+    the same chunk while it's in flight share the request.
+    """
+
+    def __init__(self, td_client: TDClient, ttl: float = 1.0, chunk_size: int = 300, max_workers: int = 4,
+                 rate_limiter: RateLimiter = None) -> None:
+        """Initalizes the QuoteCache object.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- An authenticated TDClient session.
+
+        Keyword Arguments:
+        ----
+        ttl {float} -- The number of seconds a quote is fresh for. (default: {1.0})
+
+        chunk_size {int} -- The maximum number of symbols in a single request. (default: {300})
+
+        max_workers {int} -- The number of chunks fetched at the same time. (default: {4})
+
+        rate_limiter {RateLimiter} -- The rate limiter to share with the other API calls. If
+            `None`, a new one is created. (default: {None})
+
+        Usage:
+        ----
+            >>> quote_cache = QuoteCache(td_client=trading_robot.session, ttl=1.0)
+            >>> quotes = quote_cache.get_quotes(symbols=['MSFT', 'AAPL'])
+        """
+
+        self.td_client = td_client
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        self.request_count = 0
+
+        self._quotes: Dict[str, dict] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._pending: Dict[FrozenSet[str], Future] = {}
+        self._lock = threading.RLock()
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The thread pool the chunks are fetched with, created the first time it's needed."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return self._executor
+
+    def close(self) -> None:
+        """Shuts down the thread pool."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _fetch_chunk(self, symbols: List[str]) -> Dict[str, dict]:
+        """Grabs the quotes of a single chunk, and stores them.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols of the chunk.
+
+        Returns:
+        ----
+        {Dict[str, dict]} -- The quotes, keyed by symbol.
+        """
+
+        self.rate_limiter.acquire()
+
+        quotes = self.td_client.get_quotes(instruments=symbols)
+        fetched_at = time.monotonic()
+
+        with self._lock:
+
+            self.request_count += 1
+
+            for symbol, quote in quotes.items():
+                self._quotes[symbol] = quote
+                self._fetched_at[symbol] = fetched_at
+
+        return quotes
+
+    def _submit(self, symbols: List[str]) -> Future:
+        """Starts fetching a chunk, or returns the request already fetching it.
+
+        Has to be called with the lock held.
+        """
+
+        key = frozenset(symbols)
+        future = self._pending.get(key)
+
+        if future is None:
+
+            future = self.executor.submit(self._fetch_chunk, symbols)
+            self._pending[key] = future
+
+            def _remove_pending(done_future: Future) -> None:
+                with self._lock:
+                    if self._pending.get(key) is done_future:
+                        del self._pending[key]
+
+            future.add_done_callback(_remove_pending)
+
+        return future
+
+    def get_quotes(self, symbols: Iterable[str], max_age: Optional[float] = None) -> Dict[str, dict]:
+        """Grabs the quotes of a list of symbols, from the cache when they're fresh enough.
+
+        Arguments:
+        ----
+        symbols {Iterable[str]} -- The symbols.
+
+        Keyword Arguments:
+        ----
+        max_age {float} -- The oldest quote, in seconds, the caller accepts. Pass `0`
+            to always fetch new quotes. (default: {the cache's TTL})
+
+        Returns:
+        ----
+        {Dict[str, dict]} -- The quotes, in the same format as `TDClient.get_quotes`.
+            Symbols the API didn't return a quote for are left out.
+        """
+
+        symbols = list(dict.fromkeys(symbols))
+        max_age = self.ttl if max_age is None else max_age
+
+        if not symbols:
+            return {}
+
+        now = time.monotonic()
+
+        with self._lock:
+
+            stale = [
+                symbol for symbol in symbols
+                if symbol not in self._fetched_at or now - self._fetched_at[symbol] >= max_age
+            ]
+
+            futures = [
+                self._submit(symbols=stale[start:start + self.chunk_size])
+                for start in range(0, len(stale), self.chunk_size)
+            ]
+
+        # Wait for every chunk, so one failing chunk doesn't leave the others running.
+        fetched = {}
+        errors = []
+
+        for future in futures:
+            try:
+                fetched.update(future.result())
+            except Exception as error:
+                errors.append(error)
+
+        if errors:
+            raise errors[0]
+
+        stale = set(stale)
+        quotes = {}
+
+        with self._lock:
+            for symbol in symbols:
+                if symbol in fetched:
+                    quotes[symbol] = fetched[symbol]
+                elif symbol not in stale and symbol in self._quotes:
+                    quotes[symbol] = self._quotes[symbol]
+
+        return quotes
+
+    def invalidate(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Removes quotes from the cache.
+
+        Keyword Arguments:
+        ----
+        symbols {Iterable[str]} -- The symbols to remove. If `None`, every
+            quote is removed. (default: {None})
+        """
+
+        with self._lock:
+
+            if symbols is None:
+                self._quotes.clear()
+                self._fetched_at.clear()
+                return
+
+            for symbol in symbols:
+                self._quotes.pop(symbol, None)
+                self._fetched_at.pop(symbol, None)
@@ -0,0 +1,204 @@
+import re
+import numpy as np
+
+from typing import Dict
+from typing import Tuple
+
+from pyrobot.bar_buffer import BarBuffer
+from pyrobot.bar_buffer import BAR_COLUMNS
+
+
+# The length of each timeframe unit, in milliseconds.
+TIMEFRAME_UNITS = {
+    'min': 60000,
+    'minute': 60000,
+    'h': 3600000,
+    'hour': 3600000,
+    'd': 86400000,
+    'day': 86400000
+}
+
+TIMEFRAME_ALIASES = {
+    'daily': '1d',
+    'hourly': '1h'
+}
+
+# The positions of each column in a buffer's values.
+OPEN, CLOSE, HIGH, LOW, VOLUME = [BAR_COLUMNS.index(column) for column in ['open', 'close', 'high', 'low', 'volume']]
+
+
+def timeframe_milliseconds(timeframe: str) -> int:
+    """Converts a timeframe, like `5min`, `1h` or `daily`, to milliseconds.
+
+    Arguments:
+    ----
+    timeframe {str} -- A number followed by one of the units in `TIMEFRAME_UNITS`,
+        or one of the `TIMEFRAME_ALIASES`.
+
+    Raises:
+    ----
+    ValueError: If the timeframe can't be parsed.
+
+    Returns:
+    ----
+    {int} -- The length of a bar, in milliseconds.
+    """
+
+    timeframe = TIMEFRAME_ALIASES.get(timeframe.lower(), timeframe.lower())
+    match = re.fullmatch(r'(\d+)\s*([a-z]+)', timeframe)
+
+    if not match or match.group(2) not in TIMEFRAME_UNITS or int(match.group(1)) < 1:
+        raise ValueError(
+            "The timeframe must be a number followed by one of: {units}, got: {timeframe}".format(
+                units=', '.join(TIMEFRAME_UNITS),
+                timeframe=timeframe
+            )
+        )
+
+    return int(match.group(1)) * TIMEFRAME_UNITS[match.group(2)]
+
+
+def aggregate_bars(datetime: np.ndarray, values: np.ndarray, milliseconds: int, offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Aggregates sorted bars into bars of a higher timeframe.
+
+    Arguments:
+    ----
+    datetime {np.ndarray} -- The bar timestamps, in milliseconds since epoch, sorted.
+
+    values {np.ndarray} -- The bar values, one row per column in `BAR_COLUMNS`.
+
+    milliseconds {int} -- The length of the new bars.
+
+    Keyword Arguments:
+    ----
+    offset {int} -- Shifts the start of each bar, in milliseconds. (default: {0})
+
+    Returns:
+    ----
+    {Tuple[np.ndarray, np.ndarray]} -- The start of each new bar, and its values.
+    """
+
+    buckets = datetime - (datetime - offset) % milliseconds
+
+    starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+    stops = np.concatenate([starts[1:], [buckets.size]])
+
+    aggregated = np.empty((len(BAR_COLUMNS), starts.size), dtype='float64')
+    aggregated[OPEN] = values[OPEN, starts]
+    aggregated[CLOSE] = values[CLOSE, stops - 1]
+    aggregated[HIGH] = np.maximum.reduceat(values[HIGH], starts)
+    aggregated[LOW] = np.minimum.reduceat(values[LOW], starts)
+    aggregated[VOLUME] = np.add.reduceat(values[VOLUME], starts)
+
+    return buckets[starts], aggregated
+
+
+class BarResampler():
+
+    """
+    Keeps the bars of a higher timeframe, derived from the bars of a source
+    `BarBuffer`. Only the bar the first new source bar falls in, and the bars
+    after it, are aggregated again on each update, so the cost of an update
+    is the size of one bar, not the size of the history.
+    """
+
+    def __init__(self, source: BarBuffer, timeframe: str, offset: int = 0) -> None:
+        """Initalizes the BarResampler object.
+
+        Arguments:
+        ----
+        source {BarBuffer} -- The buffer with the base bars.
+
+        timeframe {str} -- The timeframe of the new bars, like `5min`, `1h` or `daily`.
+
+        Keyword Arguments:
+        ----
+        offset {int} -- Shifts the start of each bar, in minutes. Bars start at
+            multiples of the timeframe since midnight UTC, so daily bars can be
+            moved to a local midnight with, for example, `offset=-300`. (default: {0})
+
+        Usage:
+        ----
+            >>> resampler = BarResampler(source=stock_frame.buffer, timeframe='15min')
+            >>> resampler.update()
+            >>> resampler.buffer.to_frame()
+        """
+
+        self.source = source
+        self.timeframe = timeframe
+        self.milliseconds = timeframe_milliseconds(timeframe=timeframe)
+        self.offset = offset * 60000
+        self.buffer = BarBuffer()
+
+        self._source_version = None
+
+        # The number of source bars, and source rewrites, seen for each symbol.
+        self._seen: Dict[str, Tuple[int, int]] = {}
+
+    def update(self) -> bool:
+        """Aggregates the source bars that changed since the last update.
+
+        Returns:
+        ----
+        {bool} -- `True` if the bars were updated, `False` if the source didn't change.
+        """
+
+        if self._source_version == self.source.version:
+            return False
+
+        symbols = []
+        datetime = []
+        values = []
+
+        for symbol in self.source.symbols:
+
+            symbol_buffer = self.source.symbol(symbol)
+            size_seen, rewrites_seen = self._seen.get(symbol, (0, symbol_buffer.rewrites))
+
+            # Find the first source bar that changed. If there was more than one
+            # rewrite, we don't know where the earlier ones started.
+            if symbol_buffer.rewrites == rewrites_seen:
+                start = size_seen
+            elif symbol_buffer.rewrites == rewrites_seen + 1:
+                start = min(size_seen, symbol_buffer.rewritten_from)
+            else:
+                start = 0
+
+            self._seen[symbol] = (len(symbol_buffer), symbol_buffer.rewrites)
+
+            if start >= len(symbol_buffer):
+                continue
+
+            # Go back to the first source bar of the bar that changed.
+            source_datetime = symbol_buffer.datetime
+            first_datetime = source_datetime[start]
+            first = int(np.searchsorted(
+                source_datetime,
+                first_datetime - (first_datetime - self.offset) % self.milliseconds
+            ))
+
+            symbol_datetime, symbol_values = aggregate_bars(
+                datetime=source_datetime[first:],
+                values=symbol_buffer.values[:, first:],
+                milliseconds=self.milliseconds,
+                offset=self.offset
+            )
+
+            symbols.append(np.full(symbol_datetime.size, symbol, dtype=object))
+            datetime.append(symbol_datetime)
+            values.append(symbol_values)
+
+        self._source_version = self.source.version
+
+        if not symbols:
+            return False
+
+        values = np.concatenate(values, axis=1)
+
+        self.buffer.extend(
+            symbols=np.concatenate(symbols),
+            datetime=np.concatenate(datetime),
+            columns={column: values[position] for position, column in enumerate(BAR_COLUMNS)}
+        )
+
+        return True
@@ -1,4 +1,3 @@
-import json
 import time as time_true
 import pprint
 import pathlib
@@ -18,10 +17,24 @@ from typing import Optional
 from pyrobot.trades import Trade
 from pyrobot.portfolio import Portfolio
 from pyrobot.stock_frame import StockFrame
+from pyrobot.bar_store import BarStore
+from pyrobot.historical import HistoricalLoader
+from pyrobot.quotes import QuoteCache
+from pyrobot.bar_builder import BarBuilder
+from pyrobot.scheduler import BarClock
+from pyrobot.scheduler import BarScheduler
+from pyrobot.signals import Signals
+from pyrobot.order_journal import OrderJournal
+from pyrobot.order_dispatcher import OrderDispatcher
+from pyrobot.indicators import Indicators
+from pyrobot.profiler import measure
+from pyrobot.profiler import profiled
+from pyrobot.profiler import Profiler
 
 current_td_version = pkg_resources.get_distribution('td-ameritrade-python-api').version
 
 from td.client import TDClient
+from td.stream import TDStreamerClient
 
 if current_td_version == '0.3.0':
     from td.utils import TDUtilities
@@ -32,7 +45,8 @@ else:
 
 class PyRobot():
 
-    def __init__(self, client_id: str, redirect_uri: str, paper_trading: bool = True, credentials_path: Optional[str] = None, trading_account: Optional[str] = None) -> None:
+    def __init__(self, client_id: str, redirect_uri: str, paper_trading: bool = True, credentials_path: Optional[str] = None, trading_account: Optional[str] = None,
+                 td_client: Optional[TDClient] = None) -> None:
         """Initalizes a new instance of the robot and logs into the API platform specified.
 
         Arguments:
@@ -50,6 +64,9 @@ class PyRobot():
 
         trading_account {str} -- Your TD Ameritrade account number. (default: {None})
 
+        td_client {TDClient} -- A session to use, instead of creating a new one and logging
+            into it, like the offline session of the `Backtester`. (default: {None})
+
         """
 
         # Set the attirbutes
@@ -57,7 +74,7 @@ class PyRobot():
         self.client_id = client_id
         self.redirect_uri = redirect_uri
         self.credentials_path = credentials_path
-        self.session: TDClient = self._create_session()
+        self.session: TDClient = td_client or self._create_session()
         self.trades = {}
         self.historical_prices = {}
         self.stock_frame: StockFrame = None
@@ -65,6 +82,12 @@ class PyRobot():
 
         self._bar_size = None
         self._bar_type = None
+        self._historical_loader = None
+        self._quote_cache = None
+        self.bar_builder: BarBuilder = None
+        self._order_journal = None
+        self._order_dispatcher = None
+        self.profiler: Optional[Profiler] = None
 
     def _create_session(self) -> TDClient:
         """Start a new session.
@@ -90,6 +113,38 @@ class PyRobot():
 
         return td_client
 
+    @property
+    def historical_loader(self) -> HistoricalLoader:
+        """The loader used to grab the price history of many symbols at once.
+
+        Returns:
+        ----
+        {HistoricalLoader} -- A loader that shares the robot's `TDClient` session.
+        """
+
+        if not self._historical_loader:
+            self._historical_loader = HistoricalLoader(td_client=self.session)
+
+        return self._historical_loader
+
+    @property
+    def quote_cache(self) -> QuoteCache:
+        """The cache the robot and its portfolio grab their quotes with.
+
+        Returns:
+        ----
+        {QuoteCache} -- A quote cache that shares the robot's `TDClient` session,
+            and the rate limit of the historical loader.
+        """
+
+        if not self._quote_cache:
+            self._quote_cache = QuoteCache(
+                td_client=self.session,
+                rate_limiter=self.historical_loader.rate_limiter
+            )
+
+        return self._quote_cache
+
     @property
     def pre_market_open(self) -> bool:
         """Checks if pre-market is open.
@@ -244,8 +299,10 @@ class PyRobot():
         # Initalize the portfolio.
         self.portfolio = Portfolio(account_number=self.trading_account)
 
-        # Assign the Client
+        # Assign the Client, and share the quotes and the price history loader.
         self.portfolio.td_client = self.session
+        self.portfolio.quote_cache = self.quote_cache
+        self.portfolio.historical_loader = self.historical_loader
 
         return self.portfolio
 
@@ -442,13 +499,13 @@ class PyRobot():
         # First grab all the symbols.
         symbols = self.portfolio.positions.keys()
 
-        # Grab the quotes.
-        quotes = self.session.get_quotes(instruments=list(symbols))
+        # Grab the quotes, they're shared with the portfolio for the rest of the cycle.
+        quotes = self.quote_cache.get_quotes(symbols=list(symbols))
 
         return quotes
 
     def grab_historical_prices(self, start: datetime, end: datetime, bar_size: int = 1,
-                               bar_type: str = 'minute', symbols: Optional[List[str]] = None) -> List[dict]:
+                               bar_type: str = 'minute', symbols: Optional[List[str]] = None) -> Dict:
         """Grabs the historical prices for all the postions in a portfolio.
 
         Overview:
@@ -473,7 +530,8 @@ class PyRobot():
 
         Returns:
         ----
-        {List[Dict]} -- The historical price candles.
+        {Dict} -- The historical price candles of each symbol, and under the `aggregated` key
+            a dictionary of column arrays for all the symbols, which can be passed to a `StockFrame`.
 
         Usage:
         ----
@@ -498,45 +556,161 @@ class PyRobot():
         start = str(milliseconds_since_epoch(dt_object=start))
         end = str(milliseconds_since_epoch(dt_object=end))
 
-        new_prices = []
+        if not symbols:
+            symbols = self.portfolio.positions
+
+        # Grab all the symbols at once, the candles come back as column arrays.
+        candles, new_prices = self.historical_loader.load(
+            symbols=symbols,
+            period_type='day',
+            start_date=start,
+            end_date=end,
+            frequency_type=bar_type,
+            frequency=bar_size,
+            extended_hours=True
+        )
+
+        for symbol in candles:
+            self.historical_prices[symbol] = {}
+            self.historical_prices[symbol]['candles'] = candles[symbol]
+
+        self.historical_prices['aggregated'] = new_prices
+
+        return self.historical_prices
+
+    def load_stock_frame(self, bar_store: BarStore, start: datetime, end: datetime, bar_size: int = 1,
+                         bar_type: str = 'minute', symbols: Optional[List[str]] = None) -> StockFrame:
+        """Creates the StockFrame from a local bar store, only grabbing the bars it's missing.
+
+        Overview:
+        ----
+        The bars since the last stored bar of each symbol are grabbed and saved
+        to the store, then the whole range is read back from the store. So after
+        the first run, starting the robot only grabs the bars since the last run.
+        Call `bar_store.save(buffer=stock_frame.buffer, bar_size=...)` before
+        shutting down to keep the bars added while the robot was running.
+
+        Arguments:
+        ----
+        bar_store {BarStore} -- The store the bars are saved in.
+
+        start {datetime} -- Defines the start date for the historical prices.
+
+        end {datetime} -- Defines the end date for the historical prices.
+
+        Keyword Arguments:
+        ----
+        bar_size {int} -- Defines the size of each bar. (default: {1})
+
+        bar_type {str} -- Defines the bar type, can be one of the following:
+            `['minute', 'week', 'month', 'year']` (default: {'minute'})
+
+        symbols {List[str]} -- A list of ticker symbols to pull. (default: None)
+
+        Returns:
+        ----
+        {StockFrame} -- The robot's StockFrame, with the bars of the whole range.
+
+        Usage:
+        ----
+            >>> bar_store = BarStore(folder='data/bars')
+            >>> stock_frame = trading_robot.load_stock_frame(
+                    bar_store=bar_store,
+                    start=datetime.today() - timedelta(days=30),
+                    end=datetime.today()
+                )
+        """
+
+        self._bar_size = bar_size
+        self._bar_type = bar_type
+
+        start = milliseconds_since_epoch(dt_object=start)
+        end = milliseconds_since_epoch(dt_object=end)
 
         if not symbols:
             symbols = self.portfolio.positions
 
-        for symbol in symbols:
+        # The bars of each bar size are stored apart, under a key like `1minute`.
+        bar_size_key = '{bar_size}{bar_type}'.format(bar_size=bar_size, bar_type=bar_type)
+
+        self.historical_loader.update_store(
+            bar_store=bar_store,
+            symbols=symbols,
+            bar_size=bar_size_key,
+            start=start,
+            end=end,
+            period_type='day',
+            frequency_type=bar_type,
+            frequency=bar_size,
+            extended_hours=True
+        )
 
-            historical_prices_response = self.session.get_price_history(
-                symbol=symbol,
-                period_type='day',
-                start_date=start,
-                end_date=end,
-                frequency_type=bar_type,
-                frequency=bar_size,
-                extended_hours=True
-            )
+        self.stock_frame = StockFrame.from_bar_store(
+            bar_store=bar_store,
+            symbols=list(symbols),
+            bar_size=bar_size_key,
+            start=start,
+            end=end
+        )
 
-            self.historical_prices[symbol] = {}
-            self.historical_prices[symbol]['candles'] = historical_prices_response['candles']
+        return self.stock_frame
 
-            for candle in historical_prices_response['candles']:
+    def build_bars_from_stream(self, streaming_client: TDStreamerClient, service: str = 'CHART_EQUITY') -> BarBuilder:
+        """Builds the latest bars locally from a streaming service, instead of polling for them.
 
-                new_price_mini_dict = {}
-                new_price_mini_dict['symbol'] = symbol
-                new_price_mini_dict['open'] = candle['open']
-                new_price_mini_dict['close'] = candle['close']
-                new_price_mini_dict['high'] = candle['high']
-                new_price_mini_dict['low'] = candle['low']
-                new_price_mini_dict['volume'] = candle['volume']
-                new_price_mini_dict['datetime'] = candle['datetime']
-                new_prices.append(new_price_mini_dict)
+        Overview:
+        ----
+        Adds a subscription for each position in the portfolio to the streaming
+        client and creates a `BarBuilder`. Once the builder is consuming the stream,
+        `get_latest_bar` reads the bars from it, without any requests to the API.
 
-        self.historical_prices['aggregated'] = new_prices
+        Arguments:
+        ----
+        streaming_client {TDStreamerClient} -- The streaming client, from `TDClient.create_streaming_session`.
 
-        return self.historical_prices
+        Keyword Arguments:
+        ----
+        service {str} -- Either `CHART_EQUITY` or `TIMESALE_EQUITY`. (default: {'CHART_EQUITY'})
+
+        Returns:
+        ----
+        {BarBuilder} -- The bar builder, which needs to be consuming the stream.
 
-    def get_latest_bar(self) -> List[dict]:
+        Usage:
+        ----
+            >>> td_stream_session = trading_robot.session.create_streaming_session()
+            >>> bar_builder = trading_robot.build_bars_from_stream(streaming_client=td_stream_session)
+            >>> asyncio.ensure_future(bar_builder.consume(streaming_client=td_stream_session))
+        """
+
+        self.bar_builder = BarBuilder(
+            bar_size=self._bar_size or 1,
+            bar_type=self._bar_type or 'minute'
+        )
+        self.bar_builder.subscribe(
+            streaming_client=streaming_client,
+            symbols=list(self.portfolio.positions),
+            service=service
+        )
+
+        return self.bar_builder
+
+    @profiled(category='cycle')
+    def get_latest_bar(self, timeout: Optional[float] = None) -> List[dict]:
         """Returns the latest bar for each symbol in the portfolio.
 
+        Overview:
+        ----
+        If `build_bars_from_stream` was called, the bars come from the stream.
+        Otherwise, every symbol is requested at the same time and retried on its
+        own. Symbols that fail, or take longer than `timeout`, are left out and
+        requested again on the next call.
+
+        Keyword Arguments:
+        ----
+        timeout {float} -- The number of seconds to wait for the requests. If `None`,
+            waits for all of them. (default: {None})
+
         Returns:
         ---
         {List[dict]} -- A simplified quote list.
@@ -552,6 +726,15 @@ class PyRobot():
             >>> latest_bars
         """
 
+        if self.bar_builder:
+
+            # Close the bars of symbols that haven't traded since their bar ended.
+            self.bar_builder.close_bars(
+                timestamp=milliseconds_since_epoch(dt_object=datetime.now())
+            )
+
+            return self.bar_builder.latest_bars(symbols=list(self.portfolio.positions))
+
         # Grab the info from the last quest.
         bar_size = self._bar_size
         bar_type = self._bar_type
@@ -562,55 +745,70 @@ class PyRobot():
         start = str(milliseconds_since_epoch(dt_object=start_date))
         end = str(milliseconds_since_epoch(dt_object=end_date))
 
-        latest_prices = []
+        latest_prices, _ = self.historical_loader.load_latest(
+            symbols=self.portfolio.positions,
+            timeout=timeout,
+            period_type='day',
+            start_date=start,
+            end_date=end,
+            frequency_type=bar_type,
+            frequency=bar_size,
+            extended_hours=True
+        )
 
-        # Loop through each symbol.
-        for symbol in self.portfolio.positions:
+        return latest_prices
 
-            # Grab the request.
-            historical_prices_response = self.session.get_price_history(
-                symbol=symbol,
-                period_type='day',
-                start_date=start,
-                end_date=end,
-                frequency_type=bar_type,
-                frequency=bar_size,
-                extended_hours=True
-            )
+    def create_bar_scheduler(self, align_to_market_hours: bool = True, settle_time: float = 0.0) -> BarScheduler:
+        """Creates an asyncio scheduler that runs tasks at the close of each bar.
 
-            if 'error' in historical_prices_response:
+        Overview:
+        ----
+        The bars use the `bar_size` and `bar_type` of the last call to
+        `grab_historical_prices`. Unlike `wait_till_next_bar`, the scheduler
+        doesn't block the process, and runs its tasks concurrently.
 
-                time_true.sleep(2)
+        Keyword Arguments:
+        ----
+        align_to_market_hours {bool} -- If `True`, the bars are aligned to today's
+            regular market hours from `get_market_hours`. (default: {True})
 
-                # Grab the request.
-                historical_prices_response = self.session.get_price_history(
-                    symbol=symbol,
-                    period_type='day',
-                    start_date=start,
-                    end_date=end,
-                    frequency_type=bar_type,
-                    frequency=bar_size,
-                    extended_hours=True
-                )
+        settle_time {float} -- The number of seconds to wait after the close, so the
+            bar is available from the API. (default: {0.0})
 
-            # parse the candles.
-            for candle in historical_prices_response['candles'][-1:]:
+        Returns:
+        ----
+        {BarScheduler} -- The scheduler, without any tasks.
 
-                new_price_mini_dict = {}
-                new_price_mini_dict['symbol'] = symbol
-                new_price_mini_dict['open'] = candle['open']
-                new_price_mini_dict['close'] = candle['close']
-                new_price_mini_dict['high'] = candle['high']
-                new_price_mini_dict['low'] = candle['low']
-                new_price_mini_dict['volume'] = candle['volume']
-                new_price_mini_dict['datetime'] = candle['datetime']
-                latest_prices.append(new_price_mini_dict)
+        Usage:
+        ----
+            >>> bar_scheduler = trading_robot.create_bar_scheduler()
+            >>> bar_scheduler.add_task(name='signals', task=evaluate_signals)
+            >>> bar_scheduler.add_task(name='save', task=save_positions)
+            >>> asyncio.get_event_loop().run_until_complete(bar_scheduler.run())
+        """
 
-        return latest_prices
+        bar_size = self._bar_size or 1
+        bar_type = self._bar_type or 'minute'
+
+        if align_to_market_hours:
+            bar_clock = BarClock.from_market_hours(
+                td_client=self.session,
+                bar_size=bar_size,
+                bar_type=bar_type
+            )
+        else:
+            bar_clock = BarClock(bar_size=bar_size, bar_type=bar_type)
+
+        return BarScheduler(bar_clock=bar_clock, settle_time=settle_time)
 
     def wait_till_next_bar(self, last_bar_timestamp: pd.DatetimeIndex) -> None:
         """Waits the number of seconds till the next bar is released.
 
+        Overview:
+        ----
+        This blocks the process until the next bar, use `create_bar_scheduler`
+        to keep doing other work in the meantime.
+
         Arguments:
         ----
         last_bar_timestamp {pd.DatetimeIndex} -- The last bar's timestamp.
@@ -618,7 +816,13 @@ class PyRobot():
 
         last_bar_time = last_bar_timestamp.to_pydatetime()[
             0].replace(tzinfo=timezone.utc)
-        next_bar_time = last_bar_time + timedelta(seconds=60)
+
+        # Bar types the clock doesn't know still wait a minute, like they used to.
+        try:
+            bar_clock = BarClock(bar_size=self._bar_size or 1, bar_type=self._bar_type or 'minute')
+            next_bar_time = bar_clock.add_bars(moment=last_bar_time)
+        except ValueError:
+            next_bar_time = last_bar_time + timedelta(seconds=60)
         curr_bar_time = datetime.now(tz=timezone.utc)
 
         last_bar_timestamp = int(last_bar_time.timestamp())
@@ -648,12 +852,13 @@ class PyRobot():
 
         time_true.sleep(time_to_wait_now)
 
-    def create_stock_frame(self, data: List[dict]) -> StockFrame:
+    def create_stock_frame(self, data: Union[List[dict], Dict[str, List]]) -> StockFrame:
         """Generates a new StockFrame Object.
 
         Arguments:
         ----
-        data {List[dict]} -- The data to add to the StockFrame object.
+        data {Union[List[dict], Dict[str, List]]} -- The data to add to the StockFrame object, either
+            a list of bars or a dictionary of columns like `historical_prices['aggregated']`.
 
         Returns:
         ----
@@ -665,13 +870,22 @@ class PyRobot():
 
         return self.stock_frame
 
-    def execute_signals(self, signals: List[pd.Series], trades_to_execute: dict) -> List[dict]:
+    @profiled(category='cycle')
+    def execute_signals(self, signals: Union[Signals, List[tuple]], trades_to_execute: dict) -> List[dict]:
         """Executes the specified trades for each signal.
 
+        Overview:
+        ----
+        The orders of all the signals are placed at the same time by the
+        `order_dispatcher`. If an order fails, the others are still placed, and
+        its response has an `error` instead of an `order_id`. The trade isn't
+        marked as executed and the ownership of the symbol isn't changed, so
+        it's tried again on the next signal. Only placed orders are saved.
+
         Arguments:
         ----
-        signals {list} -- A pandas.Series object representing the buy signals and sell signals.
-            Will check if series is empty before making any trades.
+        signals {Union[Signals, List[tuple]]} -- The `Signals` returned by `Indicators.check_signals`.
+            The older list of `('buys', pd.Series)` and `('sells', pd.Series)` tuples is also accepted.
 
         Trades:
         ----
@@ -679,7 +893,7 @@ class PyRobot():
 
         Returns:
         ----
-        {List[dict]} -- Returns all order responses.
+        {List[dict]} -- Returns all order responses, in the order of the signals.
 
         Usage:
         ----
@@ -696,110 +910,82 @@ class PyRobot():
                 )
         """
 
-        buys: pd.Series = signals[0][1]
-        sells: pd.Series = signals[1][1]
-
-        order_responses = []
+        if isinstance(signals, Signals):
+            buys = signals.buys.tolist()
+            sells = signals.sells.tolist()
+        else:
+            buys = signals[0][1].index.get_level_values(0).to_list()
+            sells = signals[1][1].index.get_level_values(0).to_list()
 
-        # If we have buys or sells continue.
-        if not buys.empty:
+        signaled = []
 
-            # Grab the buy Symbols.
-            symbols_list = buys.index.get_level_values(0).to_list()
+        # Buying a symbol means we own it, selling it means we don't.
+        for symbols_list, ownership in [(buys, True), (sells, False)]:
 
-            # Loop through each symbol.
+            # Loop through each symbol, if there is a Trade object for it.
             for symbol in symbols_list:
-
-                # Check to see if there is a Trade object.
                 if symbol in trades_to_execute:
+                    signaled.append((symbol, ownership, trades_to_execute[symbol]['trade_func']))
 
-                    if self.portfolio.in_portfolio(symbol=symbol):
-                        self.portfolio.set_ownership_status(
-                            symbol=symbol,
-                            ownership=True
-                        )
-
-                    # Set the Execution Flag.
-                    trades_to_execute[symbol]['has_executed'] = True
-                    trade_obj: Trade = trades_to_execute[symbol]['trade_func']
-
-                    if not self.paper_trading:
-
-                        # Execute the order.
-                        order_response = self.execute_orders(
-                            trade_obj=trade_obj
-                        )
+        if not self.paper_trading:
 
-                        order_response = {
-                            'order_id': order_response['order_id'],
-                            'request_body': order_response['request_body'],
-                            'timestamp': datetime.now().isoformat()
-                        }
-
-                        order_responses.append(order_response)
-
-                    else:
-
-                        order_response = {
-                            'order_id': trade_obj._generate_order_id(),
-                            'request_body': trade_obj.order,
-                            'timestamp': datetime.now().isoformat()
-                        }
-
-                        order_responses.append(order_response)
-
-        elif not sells.empty:
-
-            # Grab the buy Symbols.
-            symbols_list = sells.index.get_level_values(0).to_list()
+            # Place all the orders at once.
+            with measure(self.profiler, category='cycle', name='place_order'):
+                results = self.order_dispatcher.place_orders(
+                    account=self.trading_account,
+                    orders=[trade_obj.order for _, _, trade_obj in signaled]
+                )
 
-            # Loop through each symbol.
-            for symbol in symbols_list:
+        order_responses = []
+        placed_orders = []
 
-                # Check to see if there is a Trade object.
-                if symbol in trades_to_execute:
+        for index, (symbol, ownership, trade_obj) in enumerate(signaled):
 
-                    # Set the Execution Flag.
-                    trades_to_execute[symbol]['has_executed'] = True
+            if self.paper_trading:
 
-                    if self.portfolio.in_portfolio(symbol=symbol):
-                        self.portfolio.set_ownership_status(
-                            symbol=symbol,
-                            ownership=False
-                        )
+                order_response = {
+                    'order_id': trade_obj._generate_order_id(),
+                    'request_body': trade_obj.order,
+                    'timestamp': datetime.now().isoformat()
+                }
 
-                    trade_obj: Trade = trades_to_execute[symbol]['trade_func']
+            elif results[index].error is not None:
 
-                    if not self.paper_trading:
+                order_responses.append({
+                    'order_id': None,
+                    'request_body': trade_obj.order,
+                    'timestamp': datetime.now().isoformat(),
+                    'error': str(results[index].error)
+                })
 
-                        # Execute the order.
-                        order_response = self.execute_orders(
-                            trade_obj=trade_obj
-                        )
+                continue
 
-                        order_response = {
-                            'order_id': order_response['order_id'],
-                            'request_body': order_response['request_body'],
-                            'timestamp': datetime.now().isoformat()
-                        }
+            else:
 
-                        order_responses.append(order_response)
+                order_response = {
+                    'order_id': results[index].response['order_id'],
+                    'request_body': results[index].response['request_body'],
+                    'timestamp': datetime.now().isoformat()
+                }
 
-                    else:
+            if self.portfolio.in_portfolio(symbol=symbol):
+                self.portfolio.set_ownership_status(
+                    symbol=symbol,
+                    ownership=ownership
+                )
 
-                        order_response = {
-                            'order_id': trade_obj._generate_order_id(),
-                            'request_body': trade_obj.order,
-                            'timestamp': datetime.now().isoformat()
-                        }
+            # Set the Execution Flag.
+            trades_to_execute[symbol]['has_executed'] = True
 
-                        order_responses.append(order_response)
+            order_responses.append(order_response)
+            placed_orders.append(order_response)
 
         # Save the response.
-        self.save_orders(order_response_dict=order_responses)
+        self.save_orders(order_response_dict=placed_orders)
 
         return order_responses
 
+    @profiled(category='cycle', name='place_order')
     def execute_orders(self, trade_obj: Trade) -> dict:
         """Executes a Trade Object.
 
@@ -826,42 +1012,144 @@ class PyRobot():
 
         return order_dict
 
-    def save_orders(self, order_response_dict: dict) -> bool:
-        """Saves the order to a JSON file for further review.
+    def enable_profiling(self, indicators: Optional[Indicators] = None, max_events: int = 100000) -> Profiler:
+        """Starts timing each stage of the trading loop, each indicator and each API call.
+
+        Overview:
+        ----
+        The profiler is set on the robot, its `TDClient` session, its StockFrame and
+        the indicator client passed, so `get_latest_bar`, `add_rows`, `refresh`,
+        `check_signals`, `execute_signals` and `place_order` are timed in the `cycle`
+        category, each indicator's refresh in the `indicator` category, and each request
+        in the `api` category. Call it again after creating a new StockFrame.
+
+        Keyword Arguments:
+        ----
+        indicators {Indicators} -- The indicator client to profile. (default: {None})
+
+        max_events {int} -- The number of trace events kept. (default: {100000})
+
+        Returns:
+        ----
+        {Profiler} -- The profiler, which is reused if profiling is already on.
+
+        Usage:
+        ----
+            >>> profiler = trading_robot.enable_profiling(indicators=indicator_client)
+            >>> # Run the trading loop for a while...
+            >>> print(profiler.summary().to_string())
+            >>> profiler.export_trace(path='trace.json')
+        """
+
+        if self.profiler is None:
+            self.profiler = Profiler(max_events=max_events)
+
+        self._set_profiler(profiler=self.profiler, indicators=indicators)
+
+        return self.profiler
+
+    def disable_profiling(self, indicators: Optional[Indicators] = None) -> Optional[Profiler]:
+        """Stops profiling the trading loop.
+
+        Keyword Arguments:
+        ----
+        indicators {Indicators} -- The indicator client to stop profiling. (default: {None})
+
+        Returns:
+        ----
+        {Optional[Profiler]} -- The profiler, with the calls recorded so far.
+        """
+
+        profiler = self.profiler
+        self.profiler = None
+        self._set_profiler(profiler=None, indicators=indicators)
+
+        return profiler
+
+    def _set_profiler(self, profiler: Optional[Profiler], indicators: Optional[Indicators]) -> None:
+
+        self.session.profiler = profiler
+
+        if self.stock_frame is not None:
+            self.stock_frame.profiler = profiler
+
+        if indicators is not None:
+            indicators.profiler = profiler
+            indicators._stock_frame.profiler = profiler
+
+    @property
+    def order_dispatcher(self) -> OrderDispatcher:
+        """The dispatcher `execute_signals` places its orders with.
+
+        Returns:
+        ----
+        {OrderDispatcher} -- A dispatcher that shares the robot's `TDClient` session,
+            with its own rate limit, since the orders are limited apart from the other calls.
+        """
+
+        if not self._order_dispatcher:
+            self._order_dispatcher = OrderDispatcher(td_client=self.session)
+
+        return self._order_dispatcher
+
+    @order_dispatcher.setter
+    def order_dispatcher(self, order_dispatcher: OrderDispatcher) -> None:
+        """Sets the dispatcher `execute_signals` places its orders with.
 
         Arguments:
         ----
-        order_response {dict} -- A single order response.
+        order_dispatcher {OrderDispatcher} -- The dispatcher, or any object with the same
+            `place_orders` method, like the `SimulatedBroker` of a backtest.
+        """
+
+        self._order_dispatcher = order_dispatcher
+
+    @property
+    def order_journal(self) -> OrderJournal:
+        """The journal the orders are saved to.
 
         Returns:
         ----
-        {bool} -- `True` if the orders were successfully saved.
+        {OrderJournal} -- An append-only journal, in the `data/orders` folder.
         """
 
-        # Define the folder.
-        folder: pathlib.PurePath = pathlib.Path(
-            __file__).parents[1].joinpath("data")
+        if self._order_journal is None:
+            self._order_journal = OrderJournal(
+                folder=pathlib.Path(__file__).parents[1].joinpath('data', 'orders')
+            )
 
-        # See if it exist, if not create it.
-        if not folder.exists():
-            folder.mkdir()
+        return self._order_journal
 
-        # Define the file path.
-        file_path = folder.joinpath('orders.json')
+    @order_journal.setter
+    def order_journal(self, order_journal: OrderJournal) -> None:
+        """Sets the journal the orders are saved to.
 
-        # First check if the file alread exists.
-        if file_path.exists():
-            with open('data/orders.json', 'r') as order_json:
-                orders_list = json.load(order_json)
-        else:
-            orders_list = []
+        Arguments:
+        ----
+        order_journal {OrderJournal} -- The order journal.
+        """
+
+        self._order_journal = order_journal
+
+    def save_orders(self, order_response_dict: List[dict]) -> bool:
+        """Saves the orders to the order journal for further review.
+
+        Overview:
+        ----
+        The orders are appended to the journal and written by a background
+        thread, so saving doesn't hold up the trading loop. Use
+        `order_journal.replay` to read back a day's orders.
 
-        # Combine both lists.
-        orders_list = orders_list + order_response_dict
+        Arguments:
+        ----
+        order_response_dict {List[dict]} -- The order responses.
+
+        Returns:
+        ----
+        {bool} -- `True` if the orders were successfully queued.
+        """
 
-        # Write the new data back.
-        with open(file='data/orders.json', mode='w+') as order_json:
-            json.dump(obj=orders_list, fp=order_json, indent=4)
+        self.order_journal.extend(orders=order_response_dict)
 
         return True
 
@@ -0,0 +1,480 @@
+import numpy as np
+
+from typing import Tuple
+from typing import Optional
+
+from pyrobot.vectorized import group_positions
+
+
+# The largest number of values a chunk of windows is expanded to, in `rolling_mean_absolute_deviation`.
+CHUNK_VALUES = 1 << 18
+
+
+class BlockLayout():
+
+    """
+    Lays the flat column values of a StockFrame out in blocks of `window` rows,
+    where each block belongs to a single symbol, so a statistic can be scanned
+    from the start and from the end of every block at once.
+
+    Overview:
+    ----
+    Every window of `window` rows either is a whole block, or starts in one
+    block and ends in the next. So the statistic of a window is the suffix of
+    the first block combined with the prefix of the second one, the same trick
+    the van Herk / Gil-Werman algorithm uses for rolling extremes. Each row is
+    visited a fixed number of times, whatever the window size, and no scan runs
+    further than a block, so the sums stay as accurate as the window itself
+    instead of drifting over the whole history.
+
+    The blocks are the columns of a `(window, blocks)` array, so each step of
+    a scan is a single vector operation over all the blocks, and the suffix a
+    window starts in is the same slot shifted by one block, which is a slice.
+    """
+
+    def __init__(self, offsets: np.ndarray, window: int) -> None:
+        """Initalizes the BlockLayout object.
+
+        Arguments:
+        ----
+        offsets {np.ndarray} -- The symbol offsets, see `vectorized.symbol_offsets`.
+
+        window {int} -- The size of the window, and of each block.
+        """
+
+        lengths = np.diff(offsets)
+        blocks = -(-lengths // window)
+        first_blocks = np.concatenate([[0], np.cumsum(blocks)[:-1]]).astype('int64')
+
+        self.window = window
+        self.shape = (window, int(blocks.sum()))
+
+        # Each symbol starts a new block, so the blocks are only padded at the end of a symbol.
+        positions = group_positions(offsets)
+        slot = positions % window
+
+        self.index = slot * self.shape[1] + np.repeat(first_blocks, lengths) + positions // window
+        self.block_starts = np.flatnonzero(slot == 0)
+
+        # The first block of each symbol has no previous block to take a suffix from.
+        self.starts_symbol = np.zeros(self.shape[1], dtype=bool)
+        self.starts_symbol[first_blocks[blocks > 0]] = True
+
+    def scatter(self, values: np.ndarray, fill: float = np.nan) -> np.ndarray:
+        """Copies the flat values into the blocks, padding the end of each symbol with `fill`."""
+
+        blocks = np.full(self.shape, fill)
+        blocks.ravel()[self.index] = values
+
+        return blocks
+
+    def gather(self, blocks: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Copies the values of the rows back out of the blocks, into `out` if it's passed."""
+
+        return np.take(blocks.ravel(), self.index, out=out)
+
+    def prefix(self, blocks: np.ndarray, function: np.ufunc) -> np.ndarray:
+        """Accumulates a ufunc from the start of every block."""
+
+        return function.accumulate(blocks, axis=0)
+
+    def suffix(self, blocks: np.ndarray, function: np.ufunc, identity: float) -> np.ndarray:
+        """Accumulates a ufunc from the end of every block, lined up with the prefixes it's merged with.
+
+        Overview:
+        ----
+        Slot `j` of block `b` holds the suffix that starts on slot `j + 1` of block `b - 1`,
+        which is the part of the window ending on slot `j` of block `b` that falls in the
+        previous block. The last slot, where the window is the whole block, and the first
+        block of each symbol, have no such part, and hold `identity`.
+        """
+
+        suffix = np.full(self.shape, identity)
+        suffix[:-1, 1:] = function.accumulate(blocks[:0:-1, :-1], axis=0)[::-1]
+        suffix[:, self.starts_symbol] = identity
+
+        return suffix
+
+
+def _moments(values: np.ndarray, layout: BlockLayout, squares: bool = True) -> Tuple[Optional[np.ndarray], ...]:
+    """Calculates the count, the sum and the sum of squared deviations of each window.
+
+    Overview:
+    ----
+    The values of each block are centered on the block's first observation before
+    they are summed, and the two parts of a window are merged with the pairwise
+    update of Chan et al., the batch form of Welford's algorithm, so the variance
+    never comes from the difference of two large sums of squares.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    layout {BlockLayout} -- The blocks of the window.
+
+    Keyword Arguments:
+    ----
+    squares {bool} -- If `False`, the sum of squared deviations isn't calculated,
+        and `None` is returned in its place. (default: {True})
+
+    Returns:
+    ----
+    {Tuple[Optional[np.ndarray], ...]} -- The count, the sum and the sum of squared
+        deviations of the window ending on each slot, laid out like the blocks.
+    """
+
+    blocks = layout.scatter(values=values)
+    is_observation = blocks == blocks
+
+    # Without missing values, the counts only depend on the slot.
+    has_missing = np.isnan(np.asarray(values, dtype=float)).any()
+
+    # Center each block on its first observation, or on zero if it has none.
+    if has_missing:
+        centers = blocks[np.argmax(is_observation, axis=0), np.arange(layout.shape[1])]
+        centers[centers != centers] = 0.0
+    else:
+        centers = blocks[0].copy()
+
+    # The part of a window in the previous block is centered on that block's center.
+    previous_centers = np.zeros(layout.shape[1])
+    previous_centers[1:] = centers[:-1]
+
+    blocks -= centers
+
+    if has_missing:
+        np.copyto(blocks, 0.0, where=~is_observation)
+        is_observation = is_observation.astype(float)
+        count_b = layout.prefix(blocks=is_observation, function=np.add)
+        count_a = layout.suffix(blocks=is_observation, function=np.add, identity=0.0)
+    else:
+        count_b = np.arange(1.0, layout.window + 1.0)[:, None]
+        count_a = (layout.window - count_b) * ~layout.starts_symbol
+
+    del is_observation
+
+    sum_b = layout.prefix(blocks=blocks, function=np.add)
+    sum_a = layout.suffix(blocks=blocks, function=np.add, identity=0.0)
+
+    nobs = count_a + count_b
+    total = count_a * previous_centers
+    total += count_b * centers
+    total += sum_a
+    total += sum_b
+
+    if not squares:
+        return nobs, total, None
+
+    np.multiply(blocks, blocks, out=blocks)
+    squared_deviations = layout.prefix(blocks=blocks, function=np.add)
+    squares_a = layout.suffix(blocks=blocks, function=np.add, identity=0.0)
+    del blocks
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        # Each part's sum of squared deviations from its own mean, reusing the sums.
+        mean_b = sum_b / count_b
+        mean_a = sum_a / count_a
+
+        sum_b *= mean_b
+        sum_a *= mean_a
+        squared_deviations -= sum_b
+        squares_a -= sum_a
+        del sum_a, sum_b
+
+        # The difference of the means of the two parts, on the same center.
+        mean_b += centers
+        mean_a += previous_centers
+        mean_b -= mean_a
+        del mean_a
+
+        mean_b *= mean_b
+        mean_b *= count_a
+        mean_b *= count_b
+        mean_b /= nobs
+
+    # A part without observations adds nothing, its mean is `nan`.
+    np.copyto(squared_deviations, 0.0, where=count_b == 0)
+    np.copyto(squares_a, 0.0, where=count_a == 0)
+    np.copyto(mean_b, 0.0, where=mean_b != mean_b)
+
+    np.maximum(squared_deviations, 0.0, out=squared_deviations)
+    np.maximum(squares_a, 0.0, out=squares_a)
+
+    squared_deviations += squares_a
+    squared_deviations += mean_b
+
+    return nobs, total, squared_deviations
+
+
+def _finish(layout: BlockLayout, blocks: np.ndarray, nobs: np.ndarray, min_periods: int, least: int,
+            out: Optional[np.ndarray]) -> np.ndarray:
+    """Blanks the windows without enough observations, and copies the rows into the output array."""
+
+    if out is not None and out.shape != (layout.index.size,):
+        raise ValueError('The output array must have one value per row, got the shape {shape}.'.format(shape=out.shape))
+
+    np.copyto(blocks, np.nan, where=(nobs < min_periods) | (nobs < least))
+
+    return layout.gather(blocks=blocks, out=out)
+
+
+def rolling_sum(values: np.ndarray, offsets: np.ndarray, window: int, min_periods: int = None,
+                out: np.ndarray = None, layout: BlockLayout = None) -> np.ndarray:
+    """Calculates the rolling sum of each symbol, like `groupby().rolling(window).sum()`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    window {int} -- The size of the window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value, defaults to the window size. (default: {None})
+
+    out {np.ndarray} -- The array the results are written to, one value per row.
+        A new one is allocated if it's not passed. (default: {None})
+
+    layout {BlockLayout} -- The blocks of the window, which can be shared by the
+        kernels called with the same offsets and window. (default: {None})
+
+    Returns:
+    ----
+    {np.ndarray} -- The rolling sums, `nan` where there aren't enough observations.
+    """
+
+    layout = layout or BlockLayout(offsets=offsets, window=window)
+    nobs, total, _ = _moments(values=values, layout=layout, squares=False)
+
+    return _finish(layout=layout, blocks=total, nobs=nobs, min_periods=min_periods or window, least=1, out=out)
+
+
+def rolling_mean(values: np.ndarray, offsets: np.ndarray, window: int, min_periods: int = None,
+                 out: np.ndarray = None, layout: BlockLayout = None) -> np.ndarray:
+    """Calculates the rolling mean of each symbol, like `groupby().rolling(window).mean()`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    window {int} -- The size of the window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value, defaults to the window size. (default: {None})
+
+    out {np.ndarray} -- The array the results are written to, one value per row.
+        A new one is allocated if it's not passed. (default: {None})
+
+    layout {BlockLayout} -- The blocks of the window, which can be shared by the
+        kernels called with the same offsets and window. (default: {None})
+
+    Returns:
+    ----
+    {np.ndarray} -- The rolling means, `nan` where there aren't enough observations.
+    """
+
+    layout = layout or BlockLayout(offsets=offsets, window=window)
+    nobs, total, _ = _moments(values=values, layout=layout, squares=False)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total /= nobs
+
+    return _finish(layout=layout, blocks=total, nobs=nobs, min_periods=min_periods or window, least=1, out=out)
+
+
+def rolling_std(values: np.ndarray, offsets: np.ndarray, window: int, min_periods: int = None,
+                out: np.ndarray = None, layout: BlockLayout = None) -> np.ndarray:
+    """Calculates the rolling sample standard deviation of each symbol, like `groupby().rolling(window).std()`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    window {int} -- The size of the window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value, defaults to the window size. (default: {None})
+
+    out {np.ndarray} -- The array the results are written to, one value per row.
+        A new one is allocated if it's not passed. (default: {None})
+
+    layout {BlockLayout} -- The blocks of the window, which can be shared by the
+        kernels called with the same offsets and window. (default: {None})
+
+    Returns:
+    ----
+    {np.ndarray} -- The rolling standard deviations, `nan` where there aren't enough observations.
+    """
+
+    layout = layout or BlockLayout(offsets=offsets, window=window)
+    nobs, _, squared_deviations = _moments(values=values, layout=layout)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        squared_deviations /= nobs - 1
+        np.sqrt(squared_deviations, out=squared_deviations)
+
+    return _finish(layout=layout, blocks=squared_deviations, nobs=nobs, min_periods=min_periods or window, least=2, out=out)
+
+
+def _rolling_extreme(values: np.ndarray, offsets: np.ndarray, window: int, min_periods: Optional[int],
+                     out: Optional[np.ndarray], layout: Optional[BlockLayout], function: np.ufunc) -> np.ndarray:
+    """Calculates a rolling minimum or maximum, with the prefix and the suffix of each block."""
+
+    layout = layout or BlockLayout(offsets=offsets, window=window)
+    blocks = layout.scatter(values=values)
+
+    # `fmin` and `fmax` skip the missing values, the count decides if there's a value.
+    extreme = layout.prefix(blocks=blocks, function=function)
+    function(extreme, layout.suffix(blocks=blocks, function=function, identity=np.nan), out=extreme)
+
+    is_observation = (blocks == blocks).astype(float)
+    del blocks
+
+    nobs = layout.prefix(blocks=is_observation, function=np.add)
+    nobs += layout.suffix(blocks=is_observation, function=np.add, identity=0.0)
+
+    return _finish(layout=layout, blocks=extreme, nobs=nobs, min_periods=min_periods or window, least=1, out=out)
+
+
+def rolling_min(values: np.ndarray, offsets: np.ndarray, window: int, min_periods: int = None,
+                out: np.ndarray = None, layout: BlockLayout = None) -> np.ndarray:
+    """Calculates the rolling minimum of each symbol, like `groupby().rolling(window).min()`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    window {int} -- The size of the window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value, defaults to the window size. (default: {None})
+
+    out {np.ndarray} -- The array the results are written to, one value per row.
+        A new one is allocated if it's not passed. (default: {None})
+
+    layout {BlockLayout} -- The blocks of the window, which can be shared by the
+        kernels called with the same offsets and window. (default: {None})
+
+    Returns:
+    ----
+    {np.ndarray} -- The rolling minimums, `nan` where there aren't enough observations.
+    """
+
+    return _rolling_extreme(
+        values=values,
+        offsets=offsets,
+        window=window,
+        min_periods=min_periods,
+        out=out,
+        layout=layout,
+        function=np.fmin
+    )
+
+
+def rolling_max(values: np.ndarray, offsets: np.ndarray, window: int, min_periods: int = None,
+                out: np.ndarray = None, layout: BlockLayout = None) -> np.ndarray:
+    """Calculates the rolling maximum of each symbol, like `groupby().rolling(window).max()`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    window {int} -- The size of the window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value, defaults to the window size. (default: {None})
+
+    out {np.ndarray} -- The array the results are written to, one value per row.
+        A new one is allocated if it's not passed. (default: {None})
+
+    layout {BlockLayout} -- The blocks of the window, which can be shared by the
+        kernels called with the same offsets and window. (default: {None})
+
+    Returns:
+    ----
+    {np.ndarray} -- The rolling maximums, `nan` where there aren't enough observations.
+    """
+
+    return _rolling_extreme(
+        values=values,
+        offsets=offsets,
+        window=window,
+        min_periods=min_periods,
+        out=out,
+        layout=layout,
+        function=np.fmax
+    )
+
+
+def rolling_mean_absolute_deviation(values: np.ndarray, offsets: np.ndarray, window: int,
+                                    out: np.ndarray = None) -> np.ndarray:
+    """Calculates the rolling mean absolute deviation of each symbol, around the mean of each window.
+
+    Overview:
+    ----
+    The deviation of a window depends on its own mean, so it can't be rolled
+    forward like a sum. The windows are expanded a chunk of rows at a time,
+    as views on the values, so the temporary memory stays under `CHUNK_VALUES`
+    values whatever the size of the frame. A window needs `window` observations
+    to have a value, like `rolling(window)` with the default `min_periods`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    window {int} -- The size of the window.
+
+    Keyword Arguments:
+    ----
+    out {np.ndarray} -- The array the results are written to. (default: {None})
+
+    Returns:
+    ----
+    {np.ndarray} -- The rolling mean absolute deviations.
+    """
+
+    values = np.asarray(values, dtype=float)
+    out = rolling_mean(values=values, offsets=offsets, window=window, out=out)
+
+    if values.size < window:
+        return out
+
+    # Row `row` of the view is the window that ends on row `row + window - 1`.
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    chunk = max(CHUNK_VALUES // window, 1)
+    deviations = np.empty((min(chunk, windows.shape[0]), window))
+
+    for first in range(0, windows.shape[0], chunk):
+
+        last = min(first + chunk, windows.shape[0])
+        means = out[first + window - 1:last + window - 1]
+
+        # The means are `nan` for windows that cross into the previous symbol, so their deviation is too.
+        block = deviations[:last - first]
+        np.subtract(windows[first:last], means[:, None], out=block)
+        np.abs(block, out=block)
+        np.mean(block, axis=1, out=means)
+
+    return out
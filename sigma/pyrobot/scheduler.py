@@ -0,0 +1,529 @@
+import time
+import asyncio
+import inspect
+import calendar
+import collections
+
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from datetime import timedelta
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+
+from td.client import TDClient
+
+
+BAR_SECONDS = {
+    'minute': 60,
+    'hour': 3600,
+    'daily': 86400
+}
+
+# The bars that close on calendar boundaries instead of after a fixed number of
+# seconds. Weeks start on Monday, and the first Monday after the epoch is their origin.
+CALENDAR_BAR_TYPES = ['weekly', 'monthly']
+WEEK_ORIGIN = date(1970, 1, 5)
+
+
+def parse_market_hours(market_hours: dict, session: str = 'regularMarket') -> List[Tuple[datetime, datetime]]:
+    """Grabs the session start and end times from a market hours response.
+
+    Arguments:
+    ----
+    market_hours {dict} -- The response of `TDClient.get_market_hours`.
+
+    Keyword Arguments:
+    ----
+    session {str} -- The session to use, can be one of the following:
+        `['preMarket', 'regularMarket', 'postMarket']` (default: {'regularMarket'})
+
+    Returns:
+    ----
+    {List[Tuple[datetime, datetime]]} -- The start and end of each session, in exchange time, sorted.
+    """
+
+    sessions = []
+
+    for market in market_hours.values():
+        for product in market.values():
+
+            if not product.get('isOpen', False):
+                continue
+
+            for session_hours in product.get('sessionHours', {}).get(session, []):
+                sessions.append((
+                    datetime.fromisoformat(session_hours['start']),
+                    datetime.fromisoformat(session_hours['end'])
+                ))
+
+    return sorted(set(sessions))
+
+
+class BarClock():
+
+    """
+    Works out when each bar closes. Without sessions the bars are aligned
+    to the UTC epoch, with sessions they're aligned to the start of each
+    session and the last bar closes with the session. Weekly and monthly
+    bars close at the start of the next week or month, or with sessions,
+    at the end of the last session of the week or month.
+    """
+
+    def __init__(self, bar_size: int = 1, bar_type: str = 'minute', sessions: Optional[List[Tuple[datetime, datetime]]] = None) -> None:
+        """Initalizes the BarClock object.
+
+        Keyword Arguments:
+        ----
+        bar_size {int} -- Defines the size of each bar. (default: {1})
+
+        bar_type {str} -- Defines the bar type, can be one of the following:
+            `['minute', 'hour', 'daily', 'weekly', 'monthly']` (default: {'minute'})
+
+        sessions {List[Tuple[datetime, datetime]]} -- The start and end of each trading
+            session, as timezone aware datetimes. (default: {None})
+
+        Raises:
+        ----
+        ValueError: If the bar type isn't supported.
+        """
+
+        bar_types = list(BAR_SECONDS) + CALENDAR_BAR_TYPES
+
+        if bar_type not in bar_types:
+            raise ValueError(
+                "The bar type must be one of: {bar_types}".format(bar_types=', '.join(bar_types))
+            )
+
+        self.bar_size = bar_size
+        self.bar_type = bar_type
+        self.sessions = sorted(sessions) if sessions else []
+
+        # Weeks and months don't have a fixed duration, see `add_bars`.
+        if bar_type in BAR_SECONDS:
+            self.bar_duration = timedelta(seconds=bar_size * BAR_SECONDS[bar_type])
+        else:
+            self.bar_duration = None
+
+    @classmethod
+    def from_market_hours(cls, td_client: TDClient, bar_size: int = 1, bar_type: str = 'minute', market_date: Optional[date] = None,
+                          market: str = 'EQUITY', session: str = 'regularMarket') -> 'BarClock':
+        """Creates a clock aligned to the exchange's trading hours.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- An authenticated TDClient session.
+
+        Keyword Arguments:
+        ----
+        bar_size {int} -- Defines the size of each bar. (default: {1})
+
+        bar_type {str} -- Defines the bar type. (default: {'minute'})
+
+        market_date {date} -- The day to grab the hours for. (default: {today})
+
+        market {str} -- The market to grab the hours for. (default: {'EQUITY'})
+
+        session {str} -- The session to align the bars with. (default: {'regularMarket'})
+
+        Returns:
+        ----
+        {BarClock} -- A clock aligned to the session.
+
+        Usage:
+        ----
+            >>> bar_clock = BarClock.from_market_hours(
+                td_client=trading_robot.session,
+                bar_size=5,
+                bar_type='minute'
+            )
+        """
+
+        market_date = market_date or date.today()
+        market_hours = td_client.get_market_hours(markets=[market], date=market_date.isoformat())
+
+        return cls(
+            bar_size=bar_size,
+            bar_type=bar_type,
+            sessions=parse_market_hours(market_hours=market_hours, session=session)
+        )
+
+    def next_close(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Returns the close of the next bar, after `now`.
+
+        Keyword Arguments:
+        ----
+        now {datetime} -- A timezone aware datetime. (default: {the current time})
+
+        Returns:
+        ----
+        {Optional[datetime]} -- The bar close, or `None` if every session has ended.
+        """
+
+        now = now or datetime.now(tz=timezone.utc)
+        is_calendar_bar = self.bar_type in CALENDAR_BAR_TYPES
+
+        if not self.sessions:
+
+            if is_calendar_bar:
+                return self._period_start(period=self._period(moment=now) + 1, tzinfo=now.tzinfo)
+
+            epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+            bars_so_far = (now - epoch) // self.bar_duration
+
+            return epoch + (bars_so_far + 1) * self.bar_duration
+
+        for session_start, session_end in self.sessions:
+
+            if now >= session_end:
+                continue
+
+            # The bar closes with the session of the last weekday of its period, holidays aren't known.
+            if is_calendar_bar:
+
+                next_weekday = session_end + timedelta(days=1)
+
+                while next_weekday.weekday() >= 5:
+                    next_weekday += timedelta(days=1)
+
+                if self._period(moment=next_weekday) == self._period(moment=session_end):
+                    continue
+
+                return session_end
+
+            if self.bar_type == 'daily' or now < session_start:
+                bar_close = session_start + self.bar_duration
+            else:
+                bar_close = session_start + ((now - session_start) // self.bar_duration + 1) * self.bar_duration
+
+            return min(bar_close, session_end)
+
+        return None
+
+    def add_bars(self, moment: datetime, bars: int = 1) -> datetime:
+        """Moves a time forward by a number of bars.
+
+        Overview:
+        ----
+        Monthly bars are moved by calendar months, keeping the day of the
+        month where it exists, and using the last day of the month otherwise.
+        Every other bar type is moved by its duration.
+
+        Arguments:
+        ----
+        moment {datetime} -- The time to move forward, like the time of the last bar.
+
+        Keyword Arguments:
+        ----
+        bars {int} -- The number of bars to move forward by. (default: {1})
+
+        Returns:
+        ----
+        {datetime} -- The time `bars` bars later.
+        """
+
+        if self.bar_type == 'weekly':
+            return moment + timedelta(weeks=self.bar_size * bars)
+
+        if self.bar_type == 'monthly':
+
+            months = moment.year * 12 + moment.month - 1 + self.bar_size * bars
+            year, month = divmod(months, 12)
+            day = min(moment.day, calendar.monthrange(year, month + 1)[1])
+
+            return moment.replace(year=year, month=month + 1, day=day)
+
+        return moment + bars * self.bar_duration
+
+    def _period(self, moment: datetime) -> int:
+        """Counts the weekly or monthly bars from the epoch to the one `moment` falls in.
+
+        Arguments:
+        ----
+        moment {datetime} -- The time, counted in its own timezone.
+
+        Returns:
+        ----
+        {int} -- The number of the bar.
+        """
+
+        if self.bar_type == 'weekly':
+            return (moment.date() - WEEK_ORIGIN).days // 7 // self.bar_size
+
+        return ((moment.year - 1970) * 12 + moment.month - 1) // self.bar_size
+
+    def _period_start(self, period: int, tzinfo: Any) -> datetime:
+        """The start of a weekly or monthly bar, at midnight.
+
+        Arguments:
+        ----
+        period {int} -- The number of the bar, see `_period`.
+
+        tzinfo {Any} -- The timezone of the start.
+
+        Returns:
+        ----
+        {datetime} -- The start of the bar.
+        """
+
+        if self.bar_type == 'weekly':
+            start = WEEK_ORIGIN + timedelta(weeks=period * self.bar_size)
+            return datetime(start.year, start.month, start.day, tzinfo=tzinfo)
+
+        year, month = divmod(period * self.bar_size, 12)
+
+        return datetime(1970 + year, month + 1, 1, tzinfo=tzinfo)
+
+
+class BarMetrics():
+
+    """Records how on time the scheduler was, for a single bar."""
+
+    def __init__(self, bar_close: datetime, drift: float, skipped_bars: int) -> None:
+        """Initalizes the BarMetrics object.
+
+        Arguments:
+        ----
+        bar_close {datetime} -- The bar close the tasks ran for.
+
+        drift {float} -- The number of seconds between the bar close and the scheduler
+            waking up, which is how far the event loop timer drifted.
+
+        skipped_bars {int} -- The number of bars that closed while the previous
+            tasks were still running, and were not run.
+        """
+
+        self.bar_close = bar_close
+        self.drift = drift
+        self.skipped_bars = skipped_bars
+        self.lateness = None
+        self.task_durations: Dict[str, float] = {}
+        self.task_errors: Dict[str, BaseException] = {}
+
+    def to_dict(self) -> dict:
+        """Returns the metrics as a dictionary."""
+
+        return {
+            'bar_close': self.bar_close,
+            'drift': self.drift,
+            'lateness': self.lateness,
+            'skipped_bars': self.skipped_bars,
+            'task_durations': dict(self.task_durations),
+            'task_errors': {name: repr(error) for name, error in self.task_errors.items()}
+        }
+
+
+class BarScheduler():
+
+    """
+    An asyncio scheduler, which runs a set of tasks at the close of each
+    bar. The tasks run concurrently, blocking functions are run in the
+    default executor so they don't hold up the event loop.
+    """
+
+    def __init__(self, bar_clock: BarClock, settle_time: float = 0.0, metrics_size: int = 1000) -> None:
+        """Initalizes the BarScheduler object.
+
+        Arguments:
+        ----
+        bar_clock {BarClock} -- The clock used to work out when the bars close.
+
+        Keyword Arguments:
+        ----
+        settle_time {float} -- The number of seconds to wait after the close, so the
+            bar is available from the API. (default: {0.0})
+
+        metrics_size {int} -- The number of bars to keep the metrics for. (default: {1000})
+        """
+
+        self.bar_clock = bar_clock
+        self.settle_time = settle_time
+        self.metrics = collections.deque(maxlen=metrics_size)
+
+        self._tasks: Dict[str, Callable] = {}
+        self._stopped = False
+
+    def add_task(self, name: str, task: Callable[[datetime], Any]) -> None:
+        """Adds a task to run at the close of each bar.
+
+        Arguments:
+        ----
+        name {str} -- The name of the task, used in the metrics.
+
+        task {Callable[[datetime], Any]} -- A function or coroutine function, which
+            is called with the bar close.
+
+        Usage:
+        ----
+            >>> bar_scheduler.add_task(name='signals', task=evaluate_signals)
+            >>> bar_scheduler.add_task(name='orders', task=save_orders)
+        """
+
+        self._tasks[name] = task
+
+    def remove_task(self, name: str) -> None:
+        """Removes a task.
+
+        Arguments:
+        ----
+        name {str} -- The name of the task.
+        """
+
+        self._tasks.pop(name, None)
+
+    def stop(self) -> None:
+        """Stops the scheduler after the current bar."""
+
+        self._stopped = True
+
+    async def _run_task(self, name: str, task: Callable, bar_close: datetime, bar_metrics: BarMetrics) -> None:
+        """Runs a single task and records how long it took.
+
+        Arguments:
+        ----
+        name {str} -- The name of the task.
+
+        task {Callable} -- The task.
+
+        bar_close {datetime} -- The bar close.
+
+        bar_metrics {BarMetrics} -- The metrics of the bar.
+        """
+
+        start = time.perf_counter()
+
+        try:
+
+            if inspect.iscoroutinefunction(task):
+                await task(bar_close)
+            else:
+                await asyncio.get_event_loop().run_in_executor(None, task, bar_close)
+
+        except Exception as error:
+            bar_metrics.task_errors[name] = error
+
+        bar_metrics.task_durations[name] = time.perf_counter() - start
+
+    async def run_bar(self, bar_close: datetime, drift: float = 0.0, skipped_bars: int = 0) -> BarMetrics:
+        """Runs every task for a single bar, at the same time.
+
+        Arguments:
+        ----
+        bar_close {datetime} -- The bar close.
+
+        Keyword Arguments:
+        ----
+        drift {float} -- The number of seconds the scheduler woke up late. (default: {0.0})
+
+        skipped_bars {int} -- The number of bars skipped before this one. (default: {0})
+
+        Returns:
+        ----
+        {BarMetrics} -- The metrics of the bar.
+        """
+
+        bar_metrics = BarMetrics(bar_close=bar_close, drift=drift, skipped_bars=skipped_bars)
+
+        await asyncio.gather(*[
+            self._run_task(name=name, task=task, bar_close=bar_close, bar_metrics=bar_metrics)
+            for name, task in list(self._tasks.items())
+        ])
+
+        bar_metrics.lateness = (datetime.now(tz=timezone.utc) - bar_close).total_seconds()
+        self.metrics.append(bar_metrics)
+
+        return bar_metrics
+
+    async def run(self, max_bars: Optional[int] = None) -> None:
+        """Runs the tasks at the close of each bar.
+
+        Overview:
+        ----
+        The scheduler sleeps on the event loop until the next bar closes, so other
+        coroutines, like a streaming client, keep running in the meantime. It
+        stops when `stop` is called, after `max_bars` bars, or when the last
+        session of the clock has ended.
+
+        Keyword Arguments:
+        ----
+        max_bars {int} -- The number of bars to run for. (default: {None})
+
+        Usage:
+        ----
+            >>> bar_scheduler = BarScheduler(bar_clock=BarClock(bar_size=1, bar_type='minute'))
+            >>> bar_scheduler.add_task(name='signals', task=evaluate_signals)
+            >>> asyncio.get_event_loop().run_until_complete(bar_scheduler.run())
+        """
+
+        self._stopped = False
+        bars_run = 0
+        last_bar_close = None
+
+        while not self._stopped and (max_bars is None or bars_run < max_bars):
+
+            now = datetime.now(tz=timezone.utc)
+            bar_close = self.bar_clock.next_close(now=now)
+
+            if bar_close is None:
+                break
+
+            # Count the bars that closed while the last tasks were running.
+            skipped_bars = 0
+
+            if last_bar_close is not None:
+                while True:
+                    missed_close = self.bar_clock.next_close(now=last_bar_close)
+                    if missed_close is None or missed_close >= bar_close:
+                        break
+                    skipped_bars += 1
+                    last_bar_close = missed_close
+
+            wake_time = bar_close + timedelta(seconds=self.settle_time)
+            await asyncio.sleep(max((wake_time - datetime.now(tz=timezone.utc)).total_seconds(), 0.0))
+
+            drift = (datetime.now(tz=timezone.utc) - wake_time).total_seconds()
+
+            await self.run_bar(bar_close=bar_close, drift=drift, skipped_bars=skipped_bars)
+
+            last_bar_close = bar_close
+            bars_run += 1
+
+    def summary(self) -> dict:
+        """Summarizes the metrics of the bars run so far.
+
+        Returns:
+        ----
+        {dict} -- The mean and max drift and lateness, in seconds, the number of
+            skipped bars, the number of task errors and the mean duration of each task.
+        """
+
+        if not self.metrics:
+            return {}
+
+        drifts = [bar_metrics.drift for bar_metrics in self.metrics]
+        lateness = [bar_metrics.lateness for bar_metrics in self.metrics]
+
+        task_durations = collections.defaultdict(list)
+
+        for bar_metrics in self.metrics:
+            for name, duration in bar_metrics.task_durations.items():
+                task_durations[name].append(duration)
+
+        return {
+            'bars': len(self.metrics),
+            'drift_mean': sum(drifts) / len(drifts),
+            'drift_max': max(drifts),
+            'lateness_mean': sum(lateness) / len(lateness),
+            'lateness_max': max(lateness),
+            'skipped_bars': sum(bar_metrics.skipped_bars for bar_metrics in self.metrics),
+            'task_errors': sum(len(bar_metrics.task_errors) for bar_metrics in self.metrics),
+            'task_duration_mean': {
+                name: sum(durations) / len(durations)
+                for name, durations in task_durations.items()
+            }
+        }
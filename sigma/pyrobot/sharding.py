@@ -0,0 +1,241 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Optional
+
+from pyrobot import vectorized
+from pyrobot.bar_buffer import BAR_COLUMNS
+from pyrobot.indicator_graph import Node
+from pyrobot.indicator_graph import IndicatorGraph
+
+
+def balance_shards(offsets: np.ndarray, shards: int) -> List[Tuple[int, int]]:
+    """Splits the symbols into contiguous shards with about the same number of rows.
+
+    Arguments:
+    ----
+    offsets {np.ndarray} -- The row offsets of each symbol, see `vectorized.symbol_offsets`.
+
+    shards {int} -- The number of shards to split the symbols into.
+
+    Returns:
+    ----
+    {List[Tuple[int, int]]} -- The first and the last (exclusive) symbol of each shard.
+        Empty shards are left out, so there can be fewer than `shards`.
+    """
+
+    symbols = offsets.size - 1
+
+    if symbols <= 0:
+        return []
+
+    # Cut after the symbol whose last row is closest to each multiple of the target size.
+    targets = offsets[-1] * np.arange(1, shards) / shards
+    cuts = np.clip(np.searchsorted(offsets, targets, side='left'), 1, symbols)
+
+    nearer_previous = np.abs(offsets[cuts - 1] - targets) < np.abs(offsets[cuts] - targets)
+    cuts = np.where(nearer_previous & (cuts > 1), cuts - 1, cuts)
+
+    boundaries = np.unique(np.concatenate([[0], cuts, [symbols]]))
+
+    return list(zip(boundaries[:-1].tolist(), boundaries[1:].tolist()))
+
+
+# The shared memory blocks each worker process is attached to, by name.
+_worker_blocks: Dict[str, SharedMemory] = {}
+
+
+def _worker_array(name: str, shape: Tuple[int, int]) -> np.ndarray:
+    """Returns an array over a shared memory block, attaching to it the first time."""
+
+    # The workers share the resource tracker of the process that created the
+    # block, so attaching doesn't track it twice, and only the creator unlinks it.
+    if name not in _worker_blocks:
+        _worker_blocks[name] = SharedMemory(name=name)
+
+    return np.ndarray(shape=shape, dtype='float64', buffer=_worker_blocks[name].buf)
+
+
+def _evaluate_shard(prices_block: Tuple[str, Tuple[int, int]], outputs_block: Tuple[str, Tuple[int, int]],
+                    offsets: np.ndarray, outputs: List[Node], engine: str) -> None:
+    """Calculates the output columns of a shard, and writes them to the outputs block.
+
+    Arguments:
+    ----
+    prices_block {Tuple[str, Tuple[int, int]]} -- The name and the shape of the prices block,
+        one row per column in `BAR_COLUMNS`.
+
+    outputs_block {Tuple[str, Tuple[int, int]]} -- The name and the shape of the outputs block,
+        one row per output column.
+
+    offsets {np.ndarray} -- The row offsets of each symbol in the shard, from the start of the frame.
+
+    outputs {List[Node]} -- The node of each output column.
+
+    engine {str} -- The backend of the calculations within each symbol.
+    """
+
+    # Let go of the blocks the parent replaced with bigger ones.
+    for name in list(_worker_blocks):
+        if name not in (prices_block[0], outputs_block[0]):
+            _worker_blocks.pop(name).close()
+
+    prices = _worker_array(*prices_block)
+    results = _worker_array(*outputs_block)
+
+    start, stop = int(offsets[0]), int(offsets[-1])
+
+    graph = IndicatorGraph(engine=engine)
+    graph.reset_columns(
+        columns={column: prices[position, start:stop] for position, column in enumerate(BAR_COLUMNS)},
+        offsets=offsets - start
+    )
+
+    for position, node in enumerate(outputs):
+        results[position, start:stop] = graph.evaluate(node=node)
+
+
+def _release(blocks: List[SharedMemory], executors: List[ProcessPoolExecutor]) -> None:
+    """Shuts down the pool, and frees the shared memory blocks."""
+
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+    for shared_memory in blocks:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    blocks.clear()
+    executors.clear()
+
+
+class ShardedEvaluator():
+
+    """
+    Calculates the output columns of the indicator graph with a process pool.
+    The symbols are split into shards with about the same number of rows, and
+    each worker reads the prices of its shard from a shared memory block and
+    writes its columns back to another one, so neither the frame nor the
+    results are pickled.
+    """
+
+    def __init__(self, max_workers: int, engine: str = 'pandas') -> None:
+        """Initalizes the ShardedEvaluator object.
+
+        Arguments:
+        ----
+        max_workers {int} -- The number of worker processes, and shards.
+
+        Keyword Arguments:
+        ----
+        engine {str} -- The backend of the calculations within each symbol. (default: {'pandas'})
+        """
+
+        self.max_workers = max_workers
+        self.engine = engine
+
+        self._prices: Optional[SharedMemory] = None
+        self._outputs: Optional[SharedMemory] = None
+
+        # Kept in lists so the finalizer can free whatever is allocated when it runs.
+        self._blocks: List[SharedMemory] = []
+        self._executors: List[ProcessPoolExecutor] = []
+        self._finalizer = weakref.finalize(self, _release, self._blocks, self._executors)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The process pool, started the first time it's needed and kept between refreshes."""
+
+        if not self._executors:
+            self._executors.append(ProcessPoolExecutor(max_workers=self.max_workers))
+
+        return self._executors[0]
+
+    def _block(self, current: Optional[SharedMemory], size: int) -> SharedMemory:
+        """Returns a shared memory block of at least `size` bytes, replacing the current one if it's too small."""
+
+        if current is not None and current.size >= size:
+            return current
+
+        if current is not None:
+            self._blocks.remove(current)
+            current.close()
+            current.unlink()
+
+        # Leave room to grow, so new bars don't need a new block every refresh.
+        shared_memory = SharedMemory(create=True, size=max(int(size * 1.5), 8))
+        self._blocks.append(shared_memory)
+
+        return shared_memory
+
+    def evaluate(self, frame: pd.DataFrame, outputs: Dict[str, Node]) -> Dict[str, np.ndarray]:
+        """Calculates the output columns over a StockFrame's frame.
+
+        Arguments:
+        ----
+        frame {pd.DataFrame} -- The StockFrame's multi-index frame, sorted by symbol and datetime.
+
+        outputs {Dict[str, Node]} -- The node of each output column. The nodes can only read
+            the `BAR_COLUMNS` of the frame.
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- The values of each output column.
+        """
+
+        if not outputs:
+            return {}
+
+        rows = frame.shape[0]
+        offsets = vectorized.symbol_offsets(frame=frame)
+
+        self._prices = self._block(current=self._prices, size=len(BAR_COLUMNS) * rows * 8)
+        self._outputs = self._block(current=self._outputs, size=len(outputs) * rows * 8)
+
+        prices_shape = (len(BAR_COLUMNS), rows)
+        outputs_shape = (len(outputs), rows)
+
+        prices = np.ndarray(shape=prices_shape, dtype='float64', buffer=self._prices.buf)
+
+        for position, column in enumerate(BAR_COLUMNS):
+            prices[position] = frame[column].to_numpy(dtype='float64')
+
+        nodes = list(outputs.values())
+
+        futures = [
+            self.executor.submit(
+                _evaluate_shard,
+                (self._prices.name, prices_shape),
+                (self._outputs.name, outputs_shape),
+                offsets[first:last + 1],
+                nodes,
+                self.engine
+            )
+            for first, last in balance_shards(offsets=offsets, shards=self.max_workers)
+        ]
+
+        for future in futures:
+            future.result()
+
+        results = np.ndarray(shape=outputs_shape, dtype='float64', buffer=self._outputs.buf)
+
+        # Copy the columns out, the block is written over on the next refresh.
+        return {column: results[position].copy() for position, column in enumerate(outputs)}
+
+    def close(self) -> None:
+        """Shuts down the pool, and frees the shared memory."""
+
+        self._prices = None
+        self._outputs = None
+        self._finalizer()
+
+        # The evaluator can still be used, it starts a new pool when it's needed.
+        self._finalizer = weakref.finalize(self, _release, self._blocks, self._executors)
@@ -0,0 +1,303 @@
+import operator
+import numpy as np
+
+from typing import Set
+from typing import Dict
+from typing import Union
+from typing import Callable
+from typing import Optional
+
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+
+class Rule():
+
+    """
+    The base class of the signal rules. Rules can be combined into trees
+    with `&` and `|`, or with the `All` and `Any` rules, and are evaluated
+    for every symbol at once.
+    """
+
+    @property
+    def columns(self) -> Set[str]:
+        """The StockFrame columns the rule needs."""
+
+        raise NotImplementedError
+
+    def evaluate(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """Evaluates the rule for every symbol.
+
+        Arguments:
+        ----
+        values {Dict[str, np.ndarray]} -- The last value of each column, one item per symbol.
+
+        Returns:
+        ----
+        {np.ndarray} -- A boolean mask, `True` for the symbols that meet the rule.
+        """
+
+        raise NotImplementedError
+
+    def __and__(self, other: 'Rule') -> 'All':
+        return All(self, other)
+
+    def __or__(self, other: 'Rule') -> 'Any':
+        return Any(self, other)
+
+
+class Condition(Rule):
+
+    """Compares an indicator column with a threshold, or with another column."""
+
+    def __init__(self, indicator: str, condition: Union[str, Callable], target: Union[float, str]) -> None:
+        """Initalizes the Condition object.
+
+        Arguments:
+        ----
+        indicator {str} -- The indicator column, for example `rsi`.
+
+        condition {Union[str, Callable]} -- The operator, either a string like `">"` or
+            a function from the `operator` module like `operator.gt`.
+
+        target {Union[float, str]} -- The threshold, or the name of another column.
+
+        Raises:
+        ----
+        ValueError: If the operator isn't supported.
+
+        Usage:
+        ----
+            >>> rsi_oversold = Condition(indicator='rsi', condition='<', target=30.0)
+            >>> above_average = Condition(indicator='close', condition=operator.gt, target='sma')
+        """
+
+        if isinstance(condition, str):
+
+            if condition not in OPERATORS:
+                raise ValueError(
+                    "The condition must be one of: {operators}".format(operators=', '.join(OPERATORS))
+                )
+
+            condition = OPERATORS[condition]
+
+        self.indicator = indicator
+        self.condition = condition
+        self.target = target
+
+    @property
+    def columns(self) -> Set[str]:
+
+        if isinstance(self.target, str):
+            return {self.indicator, self.target}
+
+        return {self.indicator}
+
+    def evaluate(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+
+        target = values[self.target] if isinstance(self.target, str) else self.target
+
+        return np.asarray(self.condition(values[self.indicator], target), dtype=bool)
+
+    def __repr__(self) -> str:
+
+        # Show the operator the same way it was passed in, when it's one of ours.
+        condition = next(
+            (symbol for symbol, function in OPERATORS.items() if function is self.condition),
+            getattr(self.condition, '__name__', self.condition)
+        )
+
+        return 'Condition({indicator!r}, {condition!r}, {target!r})'.format(
+            indicator=self.indicator,
+            condition=condition,
+            target=self.target
+        )
+
+
+class All(Rule):
+
+    """Met when all of its rules are met."""
+
+    def __init__(self, *rules: Rule) -> None:
+        self.rules = list(rules)
+
+    @property
+    def columns(self) -> Set[str]:
+        return set().union(*[rule.columns for rule in self.rules])
+
+    def evaluate(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+
+        mask = None
+
+        for rule in self.rules:
+            rule_mask = rule.evaluate(values=values)
+            mask = rule_mask if mask is None else mask & rule_mask
+
+        return mask
+
+    def __repr__(self) -> str:
+        return 'All({rules})'.format(rules=', '.join(repr(rule) for rule in self.rules))
+
+
+class Any(Rule):
+
+    """Met when any of its rules is met."""
+
+    def __init__(self, *rules: Rule) -> None:
+        self.rules = list(rules)
+
+    @property
+    def columns(self) -> Set[str]:
+        return set().union(*[rule.columns for rule in self.rules])
+
+    def evaluate(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+
+        mask = None
+
+        for rule in self.rules:
+            rule_mask = rule.evaluate(values=values)
+            mask = rule_mask if mask is None else mask | rule_mask
+
+        return mask
+
+    def __repr__(self) -> str:
+        return 'Any({rules})'.format(rules=', '.join(repr(rule) for rule in self.rules))
+
+
+class Signals():
+
+    """The symbols with a buy or a sell signal on the last bar."""
+
+    def __init__(self, buys: np.ndarray, sells: np.ndarray) -> None:
+        """Initalizes the Signals object.
+
+        Arguments:
+        ----
+        buys {np.ndarray} -- The symbols with a buy signal.
+
+        sells {np.ndarray} -- The symbols with a sell signal.
+        """
+
+        self.buys = buys
+        self.sells = sells
+
+    def __repr__(self) -> str:
+        return 'Signals(buys={buys}, sells={sells})'.format(
+            buys=self.buys.tolist(),
+            sells=self.sells.tolist()
+        )
+
+
+class SignalEvaluator():
+
+    """
+    Holds the compiled buy and sell rules, and evaluates them against
+    the last row of each symbol in a StockFrame.
+    """
+
+    def __init__(self, buy_rule: Optional[Rule] = None, sell_rule: Optional[Rule] = None) -> None:
+        """Initalizes the SignalEvaluator object.
+
+        Keyword Arguments:
+        ----
+        buy_rule {Rule} -- The rule a symbol must meet to be bought. (default: {None})
+
+        sell_rule {Rule} -- The rule a symbol must meet to be sold. (default: {None})
+        """
+
+        self.buy_rule = buy_rule
+        self.sell_rule = sell_rule
+
+    def __repr__(self) -> str:
+        return 'SignalEvaluator(buy_rule={buy_rule!r}, sell_rule={sell_rule!r})'.format(
+            buy_rule=self.buy_rule,
+            sell_rule=self.sell_rule
+        )
+
+    @classmethod
+    def from_indicator_signals(cls, indicator_signals: Dict[str, dict], combine: str = 'all') -> 'SignalEvaluator':
+        """Compiles the signals set with `Indicators.set_indicator_signal`.
+
+        Arguments:
+        ----
+        indicator_signals {Dict[str, dict]} -- The indicator signals.
+
+        Keyword Arguments:
+        ----
+        combine {str} -- How the rules of each indicator are combined, `all` means every
+            indicator has to signal, `any` means one indicator is enough. (default: {'all'})
+
+        Returns:
+        ----
+        {SignalEvaluator} -- The compiled evaluator.
+        """
+
+        rule_type = {'all': All, 'any': Any}[combine]
+
+        buy_rules = []
+        sell_rules = []
+
+        for indicator, signal in indicator_signals.items():
+
+            for side, rules in [('buy', buy_rules), ('sell', sell_rules)]:
+
+                rule = Condition(
+                    indicator=indicator,
+                    condition=signal[side + '_operator'],
+                    target=signal[side]
+                )
+
+                # The max threshold has to be met as well.
+                if signal.get(side + '_max') is not None and signal.get(side + '_operator_max') is not None:
+                    rule = rule & Condition(
+                        indicator=indicator,
+                        condition=signal[side + '_operator_max'],
+                        target=signal[side + '_max']
+                    )
+
+                rules.append(rule)
+
+        return cls(
+            buy_rule=rule_type(*buy_rules) if buy_rules else None,
+            sell_rule=rule_type(*sell_rules) if sell_rules else None
+        )
+
+    @property
+    def columns(self) -> Set[str]:
+        """The StockFrame columns the rules need."""
+
+        columns = set()
+
+        for rule in [self.buy_rule, self.sell_rule]:
+            if rule is not None:
+                columns |= rule.columns
+
+        return columns
+
+    def evaluate(self, symbols: np.ndarray, values: Dict[str, np.ndarray]) -> Signals:
+        """Evaluates the buy and sell rules for every symbol at once.
+
+        Arguments:
+        ----
+        symbols {np.ndarray} -- The symbols, one item per symbol.
+
+        values {Dict[str, np.ndarray]} -- The last value of each column, one item per symbol.
+
+        Returns:
+        ----
+        {Signals} -- The symbols with a buy signal and the symbols with a sell signal.
+        """
+
+        no_signals = np.zeros(len(symbols), dtype=bool)
+
+        buy_mask = self.buy_rule.evaluate(values=values) if self.buy_rule else no_signals
+        sell_mask = self.sell_rule.evaluate(values=values) if self.sell_rule else no_signals
+
+        return Signals(buys=symbols[buy_mask], sells=symbols[sell_mask])
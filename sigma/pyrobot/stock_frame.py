@@ -7,22 +7,36 @@ from datetime import timezone
 
 from typing import List
 from typing import Dict
+from typing import Tuple
 from typing import Union
+from typing import Optional
 
 from pandas.core.groupby import DataFrameGroupBy
 from pandas.core.window import RollingGroupby
 from pandas.core.window import Window
 
+from pyrobot.bar_buffer import BarBuffer
+from pyrobot.bar_buffer import BAR_COLUMNS
+from pyrobot.bar_store import BarStore
+from pyrobot.profiler import measure
+from pyrobot.profiler import profiled
+from pyrobot.profiler import Profiler
+from pyrobot.resample import BarResampler
+from pyrobot.signals import Signals
+from pyrobot.signals import SignalEvaluator
+from pyrobot.vectorized import symbol_offsets
+
 
 class StockFrame():
 
-    def __init__(self, data: List[Dict]) -> None:
+    def __init__(self, data: Union[List[Dict], Dict[str, List]]) -> None:
         """Initalizes the Stock Data Frame Object.
 
         Arguments:
         ----
-        data {List[Dict]} -- The data to convert to a frame. Normally, this is 
-            returned from the historical prices endpoint.
+        data {Union[List[Dict], Dict[str, List]]} -- The data to convert to a frame. Normally, this is 
+            returned from the historical prices endpoint. Can either be a list of bars, or a
+            dictionary of columns.
         """        
         
         self._data = data
@@ -30,16 +44,239 @@ class StockFrame():
         self._symbol_groups = None
         self._symbol_rolling_groups = None
 
+        # The bars are stored in a columnar buffer, the frame is built from it when needed.
+        self._buffer = BarBuffer()
+        self._buffer.load_frame(price_df=self._frame)
+        self._frame_version = self._buffer.version
+
+        # The offset, length and merge count of each symbol in the frame, once it's built from the buffer.
+        self._frame_layout: Optional[Dict[str, Tuple[int, int, int]]] = None
+
+        # The position of the last row of each symbol, rebuilt when new rows are added.
+        self._last_row_version = None
+        self._last_row_positions = None
+        self._last_row_symbols = None
+
+        # The higher timeframe views of this frame, and the resampler feeding this frame, if it's a view.
+        self._timeframes: Dict[Tuple[str, int], 'StockFrame'] = {}
+        self._resampler = None
+
+        # Set by `PyRobot.enable_profiling`, to time `add_rows` and the rebuilds of the frame.
+        self.profiler: Optional[Profiler] = None
+
+    @classmethod
+    def from_bar_store(cls, bar_store: BarStore, symbols: List[str], bar_size: str,
+                       start: Optional[int] = None, end: Optional[int] = None) -> 'StockFrame':
+        """Creates a StockFrame from the bars saved in a `BarStore`.
+
+        Overview:
+        ----
+        The bars are read from the store's memory mapped partitions straight into
+        the StockFrame's buffer, without going through a list of bars or a frame.
+        The frame is built from the buffer the first time it's used.
+
+        Arguments:
+        ----
+        bar_store {BarStore} -- The store to read the bars from.
+
+        symbols {List[str]} -- The symbols to load.
+
+        bar_size {str} -- The bar size the bars are stored under, like `1minute`.
+
+        Keyword Arguments:
+        ----
+        start {int} -- The first timestamp to load, in milliseconds since epoch. (default: {None})
+
+        end {int} -- The last timestamp to load, in milliseconds since epoch. (default: {None})
+
+        Returns:
+        ----
+        {StockFrame} -- A StockFrame with the stored bars.
+
+        Usage:
+        ----
+            >>> bar_store = BarStore(folder='data/bars')
+            >>> stock_frame = StockFrame.from_bar_store(
+                bar_store=bar_store,
+                symbols=['MSFT', 'AAPL'],
+                bar_size='1minute'
+            )
+        """
+
+        stock_frame = cls(data={column: [] for column in ['symbol', 'datetime'] + BAR_COLUMNS})
+        stock_frame._buffer = bar_store.read(symbols=symbols, bar_size=bar_size, start=start, end=end)
+        stock_frame._frame_version = None
+
+        return stock_frame
+
     @property
     def frame(self) -> pd.DataFrame:
         """The frame object.
 
+        Overview:
+        ----
+        New rows are stored in a columnar buffer by `add_rows`. The frame is
+        only rebuilt from that buffer the first time it's requested after new
+        rows were added, after that the cached frame is returned. Any other
+        columns, like indicators, are carried over to the rebuilt frame.
+
         Returns:
         ----
         pd.DataFrame -- A pandas data frame with the price data.
-        """        
+        """
+
+        if self._resampler is not None:
+            self._resampler.update()
+
+        if self._frame_version != self._buffer.version:
+
+            with measure(self.profiler, category='stock_frame', name='build_frame'):
+                self._frame = self._materialize_frame()
+
+            self._frame_version = self._buffer.version
+
         return self._frame
 
+    @property
+    def buffer(self) -> BarBuffer:
+        """The columnar buffer that holds the bars.
+
+        Returns:
+        ----
+        {BarBuffer} -- The bar buffer, with one set of arrays per symbol.
+        """
+
+        if self._resampler is not None:
+            self._resampler.update()
+
+        return self._buffer
+
+    def timeframe(self, timeframe: str, offset: int = 0) -> 'StockFrame':
+        """Returns a view of the StockFrame with bars of a higher timeframe.
+
+        Overview:
+        ----
+        The view is a StockFrame of its own, so indicators can be added to it
+        and its signals checked. It's cached, and its bars are built from the
+        bars of this StockFrame. When rows are added here, only the bars of the
+        view they fall in are aggregated again, the next time the view is used.
+        The last bar of each symbol is still forming, and is replaced as new rows
+        are added, so `Indicators` with `incremental=True` calculate it again.
+
+        Arguments:
+        ----
+        timeframe {str} -- The timeframe of the view, like `5min`, `15min`, `1h` or `daily`.
+
+        Keyword Arguments:
+        ----
+        offset {int} -- Shifts the start of each bar, in minutes. Bars start at
+            multiples of the timeframe since midnight UTC. (default: {0})
+
+        Returns:
+        ----
+        {StockFrame} -- The StockFrame of the higher timeframe.
+
+        Usage:
+        ----
+            >>> stock_frame = trading_robot.create_stock_frame(
+                data=historical_prices['aggregated']
+            )
+            >>> stock_frame_15 = stock_frame.timeframe(timeframe='15min')
+            >>> stock_frame_15.frame
+        """
+
+        key = (timeframe, offset)
+
+        if key not in self._timeframes:
+
+            resampler = BarResampler(source=self._buffer, timeframe=timeframe, offset=offset)
+
+            stock_frame = StockFrame(data={column: [] for column in ['symbol', 'datetime'] + BAR_COLUMNS})
+            stock_frame._buffer = resampler.buffer
+            stock_frame._frame_version = None
+            stock_frame._resampler = resampler
+
+            self._timeframes[key] = stock_frame
+
+        return self._timeframes[key]
+
+    def _materialize_frame(self) -> pd.DataFrame:
+        """Builds the frame from the buffer, keeping any non-price columns.
+
+        Overview:
+        ----
+        Bars are appended to the end of each symbol, or replace its last bar,
+        so the rows of the old frame keep their place within each symbol. The
+        other columns are carried over by those positions, without matching the
+        index. Only when bars were merged in out of order is the index matched.
+
+        Returns:
+        ----
+        {pd.DataFrame} -- A pandas dataframe.
+        """
+
+        price_df = self._buffer.to_frame()
+
+        other_columns = [
+            column for column in self._frame.columns if column not in BAR_COLUMNS
+        ]
+
+        # Carry over the other columns, new rows will be left empty.
+        if other_columns:
+
+            positions = self._frame_positions()
+
+            if positions is None:
+                other_df = self._frame[other_columns].reindex(index=price_df.index)
+            else:
+                other_df = self._frame[other_columns].reset_index(drop=True).reindex(index=positions)
+                other_df.index = price_df.index
+
+            price_df = pd.concat([price_df, other_df], axis=1)
+
+        layout = {}
+        offset = 0
+
+        for symbol in self._buffer.symbols:
+            symbol_buffer = self._buffer.symbol(symbol)
+            layout[symbol] = (offset, len(symbol_buffer), symbol_buffer.merges)
+            offset += len(symbol_buffer)
+
+        self._frame_layout = layout
+
+        return price_df
+
+    def _frame_positions(self) -> Optional[np.ndarray]:
+        """Maps each row of the buffer to its row in the current frame.
+
+        Returns:
+        ----
+        {Optional[np.ndarray]} -- The position of each row in the current frame, `-1`
+            for new rows, or `None` if the rows of a symbol moved.
+        """
+
+        if self._frame_layout is None:
+            return None
+
+        positions = []
+
+        for symbol in self._buffer.symbols:
+
+            symbol_buffer = self._buffer.symbol(symbol)
+            offset, length, merges = self._frame_layout.get(symbol, (0, 0, symbol_buffer.merges))
+
+            if merges != symbol_buffer.merges:
+                return None
+
+            kept = min(length, len(symbol_buffer))
+            positions.append(np.arange(offset, offset + kept))
+            positions.append(np.full(len(symbol_buffer) - kept, -1))
+
+        if not positions:
+            return np.empty(0, dtype='int64')
+
+        return np.concatenate(positions)
+
     @property
     def symbol_groups(self) -> DataFrameGroupBy:
         """Returns the Groups in the StockFrame.
@@ -56,7 +293,7 @@ class StockFrame():
         """  
 
         # Group by Symbol.   
-        self._symbol_groups: DataFrameGroupBy = self._frame.groupby(
+        self._symbol_groups: DataFrameGroupBy = self.frame.groupby(
             by='symbol',
             as_index=False,
             sort=True
@@ -131,14 +368,24 @@ class StockFrame():
 
         price_df = price_df.set_index(keys=['symbol','datetime'])
 
+        # Keep the rows sorted, the same way `add_rows` does.
+        price_df = price_df.sort_index()
+
         return price_df
 
-    def add_rows(self, data: Dict) -> None:
+    @profiled(category='cycle')
+    def add_rows(self, data: Union[List[Dict], Dict[str, List]]) -> None:
         """Adds a new row to our StockFrame.
 
+        Overview:
+        ----
+        The rows are appended to the columnar buffer in amortized O(1) time
+        per row. The frame itself is rebuilt lazily, the next time it's used.
+
         Arguments:
         ----
-        data {Dict} -- A list of quotes.
+        data {Union[List[Dict], Dict[str, List]]} -- A list of quotes, or a dictionary of
+            columns with the `symbol`, `datetime`, `open`, `close`, `high`, `low` and `volume` keys.
 
         Usage:
         ----
@@ -159,36 +406,21 @@ class StockFrame():
             >>> stock_frame.add_rows(data=fake_data)
         """        
 
-        column_names = ['open', 'close', 'high', 'low', 'volume']
-
-        for quote in data:
-
-            # Parse the Timestamp.
-            time_stamp = pd.to_datetime(
-                quote['datetime'],
-                unit='ms',
-                origin='unix'
-            )
-
-            # Define the Index Tuple.
-            row_id = (quote['symbol'], time_stamp)
-
-            # Define the values.
-            row_values = [
-                quote['open'],
-                quote['close'],
-                quote['high'],
-                quote['low'],
-                quote['volume']
-            ]
-
-            # Create a new row.
-            new_row  = pd.Series(data=row_values)
-            
-            # Add the row.
-            self.frame.loc[row_id, column_names] = new_row.values
+        # Convert the quotes to columns.
+        if isinstance(data, dict):
+            columns = data
+        else:
+            columns = {
+                column: [quote[column] for quote in data]
+                for column in ['symbol', 'datetime'] + BAR_COLUMNS
+            }
 
-            self.frame.sort_index(inplace=True)
+        # Add the rows.
+        self._buffer.extend(
+            symbols=columns['symbol'],
+            datetime=columns['datetime'],
+            columns=columns
+        )
 
     def do_indicator_exist(self, column_names: List[str]) -> bool:
         """Checks to see if the indicator columns specified exist.
@@ -213,62 +445,81 @@ class StockFrame():
         bool -- `True` if all the columns exist.
         """
 
-        if set(column_names).issubset(self._frame.columns):
+        if set(column_names).issubset(self.frame.columns):
             return True
         else:
             raise KeyError("The following indicator columns are missing from the StockFrame: {missing_columns}".format(
-                missing_columns=set(column_names).difference(self._frame.columns)
+                missing_columns=set(column_names).difference(self.frame.columns)
             )) 
 
-    def _check_signals(self, indicators: dict) -> Union[pd.DataFrame, None]:
-        """Returns the last row of the StockFrame if conditions are met.
+    def last_rows(self, columns: List[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Returns the last value of each column, for every symbol.
 
         Overview:
         ----
-        Before a trade is executed, we must check to make sure if the
-        conditions that warrant a `buy` or `sell` signal are met. This
-        method will take last row for each symbol in the StockFrame and
-        compare the indicator column values with the conditions specified
-        by the user.
-
-        If the conditions are met the row will be returned back to the user.
+        The positions of the last rows are cached until new rows are added,
+        so only the values are gathered each time.
 
         Arguments:
         ----
-        indicators {dict} -- A dictionary containing all the indicators to be checked
-            along with their buy and sell criteria.
+        columns {List[str]} -- The columns to grab.
 
         Returns:
         ----
-        {Union[pd.DataFrame, None]} -- If signals are generated then, a pandas.DataFrame object
-            will be returned. If no signals are found then nothing will be returned.
-        """        
+        {Tuple[np.ndarray, Dict[str, np.ndarray]]} -- The symbols, sorted, and the last value
+            of each column in the same order.
+        """
 
-        # Grab the last rows.
-        last_rows = self._symbol_groups.tail(1)
+        frame = self.frame
 
-        conditions = []
+        if self._last_row_version != self._frame_version or self._last_row_positions is None:
 
-        # Check to see if all the columns exist.
-        if self.do_indicator_exist(column_names=indicators.keys()):
+            positions = symbol_offsets(frame=frame)[1:] - 1
+            codes = np.asarray(frame.index.codes[0])[positions]
 
-            for indicator in indicators:
+            self._last_row_positions = positions
+            self._last_row_symbols = np.asarray(frame.index.levels[0], dtype=object)[codes]
+            self._last_row_version = self._frame_version
 
-                column = last_rows[indicator]
+        values = {
+            column: frame[column].to_numpy()[self._last_row_positions]
+            for column in columns
+        }
 
-                buy_condition_target = indicators[indicator]['buy']
-                sell_condition_target = indicators[indicator]['sell']
+        return self._last_row_symbols, values
 
-                buy_condition_operator = indicators[indicator]['buy_operator']
-                sell_condition_operator = indicators[indicator]['sell_operator']
+    def _check_signals(self, indicators: dict = None, signal_evaluator: SignalEvaluator = None) -> Signals:
+        """Returns the symbols whose last row meets the buy or the sell conditions.
 
-                condition_1: pd.Series = buy_condition_operator(column, buy_condition_target)
-                condition_2: pd.Series = sell_condition_operator(column, sell_condition_target)
+        Overview:
+        ----
+        Before a trade is executed, we must check to make sure if the
+        conditions that warrant a `buy` or `sell` signal are met. This
+        method will take last row for each symbol in the StockFrame and
+        compare the indicator column values with the conditions specified
+        by the user. Every condition is checked for all the symbols at once.
+
+        Arguments:
+        ----
+        indicators {dict} -- A dictionary containing all the indicators to be checked
+            along with their buy and sell criteria. Ignored if `signal_evaluator`
+            is provided. (default: {None})
+
+        signal_evaluator {SignalEvaluator} -- The compiled buy and sell rules. (default: {None})
 
-                condition_1 = condition_1.where(lambda x : x == True).dropna()
-                condition_2 = condition_2.where(lambda x : x == True).dropna()
+        Returns:
+        ----
+        {Signals} -- The symbols with a buy signal, and the symbols with a sell signal.
+        """
+
+        if signal_evaluator is None:
+            signal_evaluator = SignalEvaluator.from_indicator_signals(indicator_signals=indicators or {})
+
+        columns = sorted(signal_evaluator.columns)
+
+        # Check to see if all the columns exist.
+        self.do_indicator_exist(column_names=columns)
 
-                conditions.append(('buys', condition_1))
-                conditions.append(('sells', condition_2))
+        symbols, values = self.last_rows(columns=columns)
 
-        return conditions
\ No newline at end of file
+        return signal_evaluator.evaluate(symbols=symbols, values=values)
@@ -0,0 +1,648 @@
+import json
+import types
+import hashlib
+import pathlib
+import itertools
+
+import numpy as np
+
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Union
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+
+from pyrobot.bar_buffer import BAR_COLUMNS
+from pyrobot.signals import SignalEvaluator
+from pyrobot.indicators import Indicators
+from pyrobot.stock_frame import StockFrame
+from pyrobot.backtest import vectorized_backtest
+
+
+# The metrics every cell is scored on, and whether a bigger value is better.
+METRICS = {
+    'total_return': True,
+    'max_drawdown': False,
+    'number_of_trades': True
+}
+
+
+def parameter_grid(grid: Dict[str, Iterable]) -> List[dict]:
+    """Builds every combination of a grid of parameters.
+
+    Arguments:
+    ----
+    grid {Dict[str, Iterable]} -- The values to try, keyed by parameter name.
+
+    Returns:
+    ----
+    {List[dict]} -- One dictionary of keyword arguments per combination.
+
+    Usage:
+    ----
+        >>> parameter_grid(grid={'fast_period': [8, 12], 'slow_period': [26, 30]})
+        [{'fast_period': 8, 'slow_period': 26}, {'fast_period': 8, 'slow_period': 30}, ...]
+    """
+
+    names = list(grid)
+
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*[list(grid[name]) for name in names])
+    ]
+
+
+def random_parameters(space: Dict[str, Union[tuple, Sequence]], samples: int, seed: Optional[int] = None) -> List[dict]:
+    """Draws random combinations of parameters, without repeating one.
+
+    Arguments:
+    ----
+    space {Dict[str, Union[tuple, Sequence]]} -- The values of each parameter. A tuple of two
+        integers is an inclusive range of integers, a tuple of two floats is a uniform range,
+        and a list is a set of choices.
+
+    samples {int} -- The number of combinations to draw.
+
+    Keyword Arguments:
+    ----
+    seed {int} -- The seed of the random generator, so a search can be repeated. (default: {None})
+
+    Returns:
+    ----
+    {List[dict]} -- One dictionary of keyword arguments per combination. There can be fewer
+        than `samples`, if the space doesn't have that many combinations.
+
+    Usage:
+    ----
+        >>> random_parameters(space={'period': (5, 50)}, samples=10, seed=42)
+    """
+
+    random_state = np.random.RandomState(seed)
+    draws = {}
+
+    # Give up after a few misses in a row, the space may be smaller than the samples.
+    misses = 0
+
+    while len(draws) < samples and misses < 100:
+
+        parameters = {}
+
+        for name, values in space.items():
+
+            if isinstance(values, tuple) and all(isinstance(value, (int, np.integer)) for value in values):
+                parameters[name] = int(random_state.randint(values[0], values[1] + 1))
+            elif isinstance(values, tuple):
+                parameters[name] = float(random_state.uniform(values[0], values[1]))
+            else:
+                parameters[name] = values[random_state.randint(len(values))]
+
+        key = json.dumps(parameters, sort_keys=True, default=str)
+
+        if key in draws:
+            misses += 1
+        else:
+            draws[key] = parameters
+            misses = 0
+
+    return list(draws.values())
+
+
+def _code_fingerprint(value: Any) -> Any:
+    """Turns a value of a function, like its code or a constant, into something that can be hashed the same way each run."""
+
+    if isinstance(value, types.CodeType):
+        return [
+            value.co_code.hex(),
+            [_code_fingerprint(constant) for constant in value.co_consts],
+            list(value.co_names),
+            list(value.co_varnames)
+        ]
+    elif isinstance(value, types.FunctionType):
+        return strategy_fingerprint(strategy=value)
+    elif isinstance(value, (list, tuple)):
+        return [_code_fingerprint(item) for item in value]
+    elif isinstance(value, dict):
+        return {str(key): _code_fingerprint(item) for key, item in value.items()}
+
+    return repr(value)
+
+
+def strategy_fingerprint(strategy: Callable) -> str:
+    """Hashes the code of a strategy function, so a changed function isn't read from the cache.
+
+    Overview:
+    ----
+    The hash covers the bytecode and constants of the function and of the
+    functions defined inside it, its defaults, and the values it closes
+    over. The values of the globals it reads aren't part of it.
+
+    Arguments:
+    ----
+    strategy {Callable} -- The function, or an object with a `__call__` method.
+
+    Returns:
+    ----
+    {str} -- The hex digest of the function.
+    """
+
+    function = strategy if hasattr(strategy, '__code__') else type(strategy).__call__
+
+    # Without code to hash, like a `functools.partial`, its description is used. If that
+    # changes each run the cells are never read from the cache, but never read stale.
+    if not hasattr(function, '__code__'):
+        return hashlib.sha1(repr(strategy).encode('utf-8')).hexdigest()
+
+    closure = [cell.cell_contents for cell in function.__closure__ or []]
+
+    fingerprint = [
+        _code_fingerprint(function.__code__),
+        _code_fingerprint(function.__defaults__),
+        _code_fingerprint(function.__kwdefaults__),
+        _code_fingerprint(closure)
+    ]
+
+    # A callable object is also told apart by its attributes.
+    if function is not strategy:
+        fingerprint.append(_code_fingerprint(getattr(strategy, '__dict__', {})))
+
+    return hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def parameter_hash(indicator: str, parameters: dict, strategy: str, slippage: float, prices: str,
+                   engine: str = 'numpy') -> str:
+    """Hashes a single cell of a sweep, so its result can be found in the cache.
+
+    Arguments:
+    ----
+    indicator {str} -- The indicator, for example `rsi`.
+
+    parameters {dict} -- The keyword arguments of the indicator.
+
+    strategy {str} -- A description of the buy and sell rules.
+
+    slippage {float} -- The slippage of each trade.
+
+    prices {str} -- The fingerprint of the price data.
+
+    Keyword Arguments:
+    ----
+    engine {str} -- The engine the indicator is calculated with. (default: {'numpy'})
+
+    Returns:
+    ----
+    {str} -- The hex digest of the cell.
+    """
+
+    cell = {
+        'indicator': indicator,
+        'parameters': parameters,
+        'strategy': strategy,
+        'slippage': slippage,
+        'prices': prices,
+        'engine': engine
+    }
+
+    return hashlib.sha1(json.dumps(cell, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class SharedPrices():
+
+    """
+    The price columns of a StockFrame, saved once as `.npy` files so each
+    worker of a sweep can memory map them, instead of having the StockFrame
+    pickled and sent along with every cell.
+    """
+
+    def __init__(self, folder: Union[str, pathlib.Path]) -> None:
+        """Initalizes the SharedPrices object.
+
+        Arguments:
+        ----
+        folder {Union[str, pathlib.Path]} -- The folder the columns are saved in.
+        """
+
+        self.folder = pathlib.Path(folder)
+        self._meta = None
+
+    @classmethod
+    def write(cls, stock_frame: StockFrame, folder: Union[str, pathlib.Path]) -> 'SharedPrices':
+        """Saves the price columns of a StockFrame. The files are left alone if they
+        already hold the same prices.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The StockFrame to share.
+
+        folder {Union[str, pathlib.Path]} -- The folder the columns are saved in.
+
+        Returns:
+        ----
+        {SharedPrices} -- The shared prices.
+        """
+
+        shared_prices = cls(folder=folder)
+        shared_prices.folder.mkdir(parents=True, exist_ok=True)
+
+        frame = stock_frame.frame
+        symbols = frame.index.get_level_values(0)
+        unique_symbols, counts = np.unique(symbols.to_numpy(dtype=object).astype(str), return_counts=True)
+
+        columns = {
+            'datetime': frame.index.get_level_values(1).to_numpy(dtype='datetime64[ms]').astype('int64')
+        }
+
+        for column in BAR_COLUMNS:
+            columns[column] = np.ascontiguousarray(frame[column].to_numpy(dtype='float64'))
+
+        # The frame is sorted by symbol, so each symbol is a run of rows.
+        fingerprint = hashlib.sha1(json.dumps([unique_symbols.tolist(), counts.tolist()]).encode('utf-8'))
+
+        for column in ['datetime'] + BAR_COLUMNS:
+            fingerprint.update(columns[column].tobytes())
+
+        meta = {
+            'symbols': unique_symbols.tolist(),
+            'counts': counts.tolist(),
+            'fingerprint': fingerprint.hexdigest()
+        }
+
+        meta_path = shared_prices.folder.joinpath('meta.json')
+
+        if meta_path.exists() and json.loads(meta_path.read_text()) == meta:
+            return shared_prices
+
+        for column, values in columns.items():
+            np.save(shared_prices.folder.joinpath(column + '.npy'), values)
+
+        meta_path.write_text(json.dumps(meta))
+
+        return shared_prices
+
+    @property
+    def meta(self) -> dict:
+        """The symbols, their row counts and the fingerprint of the prices."""
+
+        if self._meta is None:
+            self._meta = json.loads(self.folder.joinpath('meta.json').read_text())
+
+        return self._meta
+
+    @property
+    def fingerprint(self) -> str:
+        """A hash of the prices, so cached results are only used on the same prices."""
+
+        return self.meta['fingerprint']
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """Memory maps the columns.
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- The `symbol` column, and the read only `datetime`
+            and `BAR_COLUMNS` columns.
+        """
+
+        columns = {
+            'symbol': np.repeat(np.asarray(self.meta['symbols'], dtype=object), self.meta['counts'])
+        }
+
+        for column in ['datetime'] + BAR_COLUMNS:
+            columns[column] = np.load(self.folder.joinpath(column + '.npy'), mmap_mode='r')
+
+        return columns
+
+    def to_stock_frame(self) -> StockFrame:
+        """Builds a StockFrame from the memory mapped columns.
+
+        Returns:
+        ----
+        {StockFrame} -- A new StockFrame, with the same prices as the one that was written.
+        """
+
+        return StockFrame(data=self.load())
+
+
+# The StockFrame of each worker process, built once from the shared prices.
+_worker_stock_frame: Optional[StockFrame] = None
+_worker_columns: List[str] = []
+
+
+def _initialize_worker(folder: str) -> None:
+    """Builds the StockFrame of a worker process from the shared prices."""
+
+    global _worker_stock_frame, _worker_columns
+
+    _worker_stock_frame = SharedPrices(folder=folder).to_stock_frame()
+    _worker_columns = list(_worker_stock_frame.frame.columns)
+
+
+def _run_cell(indicator: str, parameters: dict, strategy: Union[SignalEvaluator, Callable],
+              slippage: float, engine: str) -> dict:
+    """Scores a single cell of a sweep, on the StockFrame of the worker.
+
+    Arguments:
+    ----
+    indicator {str} -- The indicator, for example `rsi`.
+
+    parameters {dict} -- The keyword arguments of the indicator.
+
+    strategy {Union[SignalEvaluator, Callable]} -- The buy and sell rules, or a function that
+        builds them from the parameters.
+
+    slippage {float} -- The slippage of each trade.
+
+    engine {str} -- The engine the indicator is calculated with.
+
+    Returns:
+    ----
+    {dict} -- The metrics of the cell, for the whole universe and for each symbol.
+    """
+
+    frame = _worker_stock_frame.frame
+
+    # Drop the columns the last cell added, so each cell starts from the prices.
+    frame.drop(
+        labels=[column for column in frame.columns if column not in _worker_columns],
+        axis=1,
+        inplace=True
+    )
+
+    indicator_client = Indicators(price_data_frame=_worker_stock_frame, engine=engine)
+    getattr(indicator_client, indicator)(**parameters)
+
+    signal_evaluator = strategy if isinstance(strategy, SignalEvaluator) else strategy(parameters)
+
+    results = vectorized_backtest(
+        stock_frame=_worker_stock_frame,
+        signal_evaluator=signal_evaluator,
+        slippage=slippage
+    )
+
+    symbols = {
+        symbol: {
+            'total_return': float(total_return),
+            'max_drawdown': float(max_drawdown),
+            'number_of_trades': int(number_of_trades)
+        }
+        for symbol, total_return, max_drawdown, number_of_trades in zip(
+            results['symbol'], results['total_return'], results['max_drawdown'], results['number_of_trades']
+        )
+    }
+
+    return {
+        'total_return': float(np.mean(results['total_return'])) if symbols else 0.0,
+        'max_drawdown': float(np.max(results['max_drawdown'])) if symbols else 0.0,
+        'number_of_trades': int(np.sum(results['number_of_trades'])),
+        'symbols': symbols
+    }
+
+
+class ParameterSweep():
+
+    """
+    Runs a grid or a random search over the parameters of an indicator,
+    fanned out across a process pool. The workers memory map a single copy
+    of the prices, and each result is saved to a JSON lines cache keyed by
+    the hash of its parameters, so a rerun only calculates the new cells.
+    """
+
+    def __init__(self, stock_frame: StockFrame, indicator: str, strategy: Union[SignalEvaluator, Callable],
+                 folder: Union[str, pathlib.Path], max_workers: Optional[int] = None, slippage: float = 0.0,
+                 engine: str = 'numpy') -> None:
+        """Initalizes the ParameterSweep object.
+
+        Arguments:
+        ----
+        stock_frame {StockFrame} -- The prices to backtest on.
+
+        indicator {str} -- The name of the `Indicators` method to sweep, for example `rsi`.
+
+        strategy {Union[SignalEvaluator, Callable]} -- The buy and sell rules. Pass a function
+            that takes the parameters and returns a `SignalEvaluator` when the rules depend
+            on them. The function has to be defined at the top of a module, so the workers
+            can import it.
+
+        folder {Union[str, pathlib.Path]} -- The folder for the shared prices and the cache.
+
+        Keyword Arguments:
+        ----
+        max_workers {int} -- The number of worker processes. Pass `1` to run every cell in
+            this process. (default: {the number of CPUs})
+
+        slippage {float} -- The cost of each trade, as a fraction of the price. (default: {0.0})
+
+        engine {str} -- The engine the indicator is calculated with. (default: {'numpy'})
+
+        Usage:
+        ----
+            >>> rsi_sweep = ParameterSweep(
+                stock_frame=trading_robot.stock_frame,
+                indicator='rsi',
+                strategy=SignalEvaluator(
+                    buy_rule=Condition('rsi', '<', 30.0),
+                    sell_rule=Condition('rsi', '>', 70.0)
+                ),
+                folder='data/sweeps/rsi'
+            )
+            >>> ranked = rsi_sweep.run(parameters=parameter_grid(grid={'period': range(5, 30)}))
+            >>> ranked[0]['parameters']
+            {'period': 9}
+        """
+
+        self.stock_frame = stock_frame
+        self.indicator = indicator
+        self.strategy = strategy
+        self.folder = pathlib.Path(folder)
+        self.max_workers = max_workers
+        self.slippage = slippage
+        self.engine = engine
+
+        if not callable(getattr(Indicators, indicator, None)):
+            raise ValueError("The indicator must be a method of `Indicators`, got: {indicator}".format(indicator=indicator))
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.cache_path = self.folder.joinpath('results.jsonl')
+
+        self._shared_prices = None
+        self._cache = None
+
+    @property
+    def shared_prices(self) -> SharedPrices:
+        """The prices the workers memory map, written the first time they're needed."""
+
+        if self._shared_prices is None:
+            self._shared_prices = SharedPrices.write(
+                stock_frame=self.stock_frame,
+                folder=self.folder.joinpath('prices')
+            )
+
+        return self._shared_prices
+
+    @property
+    def strategy_key(self) -> str:
+        """A description of the strategy, used in the hash of each cell.
+
+        Overview:
+        ----
+        A function is described by its name and a hash of its code, see
+        `strategy_fingerprint`, so editing it runs the cells again.
+        """
+
+        if isinstance(self.strategy, SignalEvaluator):
+            return repr(self.strategy)
+
+        return '{module}.{name}:{fingerprint}'.format(
+            module=self.strategy.__module__,
+            name=getattr(self.strategy, '__qualname__', type(self.strategy).__qualname__),
+            fingerprint=strategy_fingerprint(strategy=self.strategy)
+        )
+
+    @property
+    def cache(self) -> Dict[str, dict]:
+        """The results of the cells that already ran, keyed by their hash."""
+
+        if self._cache is None:
+
+            self._cache = {}
+
+            if self.cache_path.exists():
+                with open(self.cache_path, mode='r') as cache_file:
+                    for line in cache_file:
+
+                        # A line cut short by a crash is skipped, the cell runs again.
+                        try:
+                            result = json.loads(line)
+                        except ValueError:
+                            continue
+
+                        self._cache[result['hash']] = result
+
+        return self._cache
+
+    def cell_hash(self, parameters: dict) -> str:
+        """Hashes a set of parameters, with the indicator, strategy, prices and engine of the sweep.
+
+        Arguments:
+        ----
+        parameters {dict} -- The keyword arguments of the indicator.
+
+        Returns:
+        ----
+        {str} -- The hex digest of the cell.
+        """
+
+        return parameter_hash(
+            indicator=self.indicator,
+            parameters=parameters,
+            strategy=self.strategy_key,
+            slippage=self.slippage,
+            prices=self.shared_prices.fingerprint,
+            engine=self.engine
+        )
+
+    def run(self, parameters: List[dict], metric: str = 'total_return') -> List[dict]:
+        """Runs every cell that isn't in the cache, and ranks all of them.
+
+        Arguments:
+        ----
+        parameters {List[dict]} -- The keyword arguments of each cell, from `parameter_grid`
+            or `random_parameters`.
+
+        Keyword Arguments:
+        ----
+        metric {str} -- The metric to rank the cells by, one of `METRICS`. (default: {'total_return'})
+
+        Returns:
+        ----
+        {List[dict]} -- The result of each cell, best first. Each result has the `hash`,
+            `indicator`, `parameters`, the `METRICS` over the whole universe, and the
+            metrics of each symbol under `symbols`.
+        """
+
+        hashes = [self.cell_hash(parameters=cell_parameters) for cell_parameters in parameters]
+
+        pending = {
+            cell_hash: cell_parameters
+            for cell_hash, cell_parameters in zip(hashes, parameters)
+            if cell_hash not in self.cache
+        }
+
+        if pending:
+            self._run_pending(pending=pending)
+
+        return self.rank(results=[self.cache[cell_hash] for cell_hash in dict.fromkeys(hashes)], metric=metric)
+
+    def _run_pending(self, pending: Dict[str, dict]) -> None:
+        """Runs the cells that aren't cached, saving each result as soon as it's ready.
+
+        Arguments:
+        ----
+        pending {Dict[str, dict]} -- The parameters of each cell, keyed by their hash.
+        """
+
+        folder = str(self.shared_prices.folder)
+
+        with open(self.cache_path, mode='a') as cache_file:
+
+            def _save(cell_hash: str, metrics: dict) -> None:
+
+                result = {'hash': cell_hash, 'indicator': self.indicator, 'parameters': pending[cell_hash]}
+                result.update(metrics)
+
+                cache_file.write(json.dumps(result) + '\n')
+                cache_file.flush()
+
+                self.cache[cell_hash] = result
+
+            if self.max_workers == 1:
+
+                _initialize_worker(folder=folder)
+
+                for cell_hash, cell_parameters in pending.items():
+                    _save(
+                        cell_hash=cell_hash,
+                        metrics=_run_cell(self.indicator, cell_parameters, self.strategy, self.slippage, self.engine)
+                    )
+
+                return
+
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_initialize_worker, initargs=(folder,)) as executor:
+
+                futures = {
+                    executor.submit(_run_cell, self.indicator, cell_parameters, self.strategy, self.slippage, self.engine): cell_hash
+                    for cell_hash, cell_parameters in pending.items()
+                }
+
+                for future in as_completed(futures):
+                    _save(cell_hash=futures[future], metrics=future.result())
+
+    def rank(self, results: List[dict], metric: str = 'total_return') -> List[dict]:
+        """Sorts the results of a sweep, best first.
+
+        Arguments:
+        ----
+        results {List[dict]} -- The results of the cells.
+
+        Keyword Arguments:
+        ----
+        metric {str} -- The metric to rank the cells by, one of `METRICS`. (default: {'total_return'})
+
+        Raises:
+        ----
+        ValueError: If the metric isn't one of `METRICS`.
+
+        Returns:
+        ----
+        {List[dict]} -- The results, best first.
+        """
+
+        if metric not in METRICS:
+            raise ValueError("The metric must be one of: {metrics}".format(metrics=', '.join(METRICS)))
+
+        return sorted(results, key=lambda result: result[metric], reverse=METRICS[metric])
@@ -1,8 +1,15 @@
+import marshal
+import numpy as np
+
 from datetime import datetime
 
+from typing import Any
 from typing import List
+from typing import Dict
+from typing import Tuple
 from typing import Union
 from typing import Optional
+from typing import Sequence
 
 class Trade():
 
@@ -28,10 +35,18 @@ class Trade():
         self.enter_or_exit = ""
         self.enter_or_exit_opposite = ""
 
+        # Set by `instrument`, a template can be built before there is one.
+        self.symbol = None
+        self.order_size = 0
+        self.asset_type = None
+
         self._order_response = {}
         self._triggered_added = False
         self._multi_leg = False
 
+        # The price field, the adjustment and the kind of adjustment of each child order's price.
+        self._brackets: List[Tuple[int, str, float, bool]] = []
+
     def new_trade(self, trade_id: str, order_type: str, side: str, enter_or_exit: str, price: float = 0.00, stop_limit_price: float = 0.00) -> dict:
         """Creates a new Trade object template.
 
@@ -293,42 +308,15 @@ class Trade():
         {bool} -- `True` if the order was added.
         """
 
-        if not self._triggered_added:
-            self._convert_to_trigger()
-        
-        if self.order_type == 'mkt':
-            # Have to make a call to Get Quotes.
-            price = self.price
-        elif self.order_type == 'lmt':
-            price = self.price
-        
         if percentage:
             adjustment = 1.0 - stop_size
-            new_price = self._calculate_new_price(price=price, adjustment=adjustment, percentage=True)
         else:
             adjustment = -stop_size
-            new_price = self._calculate_new_price(price=price, adjustment=adjustment, percentage=False)
-
-        stop_loss_order = {
-            "orderType": "STOP",
-            "session": "NORMAL",
-            "duration": "DAY",
-            "stopPrice": new_price,
-            "orderStrategyType": "SINGLE",
-            "orderLegCollection": [
-                {
-                    "instruction": self.order_instructions[self.enter_or_exit_opposite][self.side],
-                    "quantity": self.order_size,
-                    "instrument": {
-                        "symbol": self.symbol,
-                        "assetType": self.asset_type
-                    }
-                }
-            ]
-        }
 
-        self.stop_loss_order = stop_loss_order
-        self.order['childOrderStrategies'].append(self.stop_loss_order)
+        self.stop_loss_order = self._add_child_order(
+            order_type='STOP',
+            prices={'stopPrice': (adjustment, percentage)}
+        )
 
         return True
 
@@ -356,57 +344,50 @@ class Trade():
         {bool} -- `True` if the order was added.
         """
 
-        # Check to see if there is a trigger.
-        if not self._triggered_added:
-            self._convert_to_trigger()
-        
-        # Grab the price.
-        if self.order_type == 'mkt':
-            # Have to make a call to Get Quotes.
-            price = self.price
-            
-        elif self.order_type == 'lmt':
-            price = self.price
-        
-        # Calculate the Stop Price.
+        # Calculate the Stop Price, and the Limit Price.
         if stop_percentage:
-            adjustment = 1.0 - stop_size
-            stop_price = self._calculate_new_price(
-                price=price,
-                adjustment=adjustment,
-                percentage=True
-            )
+            stop_adjustment = 1.0 - stop_size
         else:
-            adjustment = -stop_size
-            stop_price = self._calculate_new_price(
-                price=price,
-                adjustment=adjustment,
-                percentage=False
-            )
+            stop_adjustment = -stop_size
 
-        # Calculate the Limit Price.
         if limit_percentage:
-            adjustment = 1.0 - limit_size
-            limit_price = self._calculate_new_price(
-                price=price,
-                adjustment=adjustment,
-                percentage=True
-            )
+            limit_adjustment = 1.0 - limit_size
         else:
-            adjustment = -limit_size
-            limit_price = self._calculate_new_price(
-                price=price,
-                adjustment=adjustment,
-                percentage=False
-            )
+            limit_adjustment = -limit_size
+
+        self.stop_limit_order = self._add_child_order(
+            order_type='STOP_LIMIT',
+            prices={
+                'price': (limit_adjustment, limit_percentage),
+                'stopPrice': (stop_adjustment, stop_percentage)
+            }
+        )
+
+        return True
+
+    def _add_child_order(self, order_type: str, prices: Dict[str, Tuple[float, bool]]) -> dict:
+        """Adds an order that exits the position, to the child orders of the trigger order.
+
+        Arguments:
+        ----
+        order_type {str} -- The type of the child order, for example `STOP`.
+
+        prices {Dict[str, Tuple[float, bool]]} -- The adjustment of each price field of the child
+            order, like `price` or `stopPrice`, and whether it's a percentage adjustment.
 
-        # Add the order.
-        stop_limit_order = {
-            "orderType": "STOP_LIMIT",
+        Returns:
+        ----
+        {dict} -- The child order.
+        """
+
+        # Check to see if we have a trigger order.
+        if not self._triggered_added:
+            self._convert_to_trigger()
+
+        child_order = {
+            "orderType": order_type,
             "session": "NORMAL",
             "duration": "DAY",
-            "price":limit_price,
-            "stopPrice": stop_price,
             "orderStrategyType": "SINGLE",
             "orderLegCollection": [
                 {
@@ -420,42 +401,67 @@ class Trade():
             ]
         }
 
-        self.stop_limit_order = stop_limit_order
-        self.order['childOrderStrategies'].append(self.stop_limit_order)
+        child_index = len(self.order['childOrderStrategies'])
+
+        # The prices are calculated off of the order's price, and again from each new price by a template.
+        for field, (adjustment, percentage) in prices.items():
+            child_order[field] = self._calculate_new_price(price=self.price, adjustment=adjustment, percentage=percentage)
+            self._brackets.append((child_index, field, adjustment, percentage))
 
-        return True        
+        self.order['childOrderStrategies'].append(child_order)
 
-    def _calculate_new_price(self, price: float, adjustment: float, percentage: bool) -> float:
+        return child_order
+
+    @staticmethod
+    def _calculate_new_price(price: Union[float, np.ndarray], adjustment: Union[float, np.ndarray],
+                             percentage: bool) -> Union[float, np.ndarray]:
         """Calculates an adjusted price given an old price.
 
+        Overview:
+        ----
+        The prices can be arrays, so the bracket prices of a whole basket of
+        orders are calculated in a single call. A single price returns a float.
+
         Arguments:
         ----
-        price {float} -- The original price.
+        price {Union[float, np.ndarray]} -- The original price, or prices.
         
-        adjustment {float} -- The adjustment to be made to the new price.
+        adjustment {Union[float, np.ndarray]} -- The adjustment to be made to the new price.
             
         percentage {bool} -- Specifies whether the adjustment is a percentage adjustment `True` or
             an absolute dollar adjustment `False`.
 
         Returns:
         ----
-        {float} -- The new price after the adjustment has been made.
+        {Union[float, np.ndarray]} -- The new price after the adjustment has been made.
         """
 
+        # A single price is cheaper without numpy.
+        if np.ndim(price) == 0 and np.ndim(adjustment) == 0:
+
+            new_price = price * adjustment if percentage else price + adjustment
+
+            # For orders below $1.00, can only have 4 decimal places, above $1.00 only 2.
+            return float(round(new_price, 4) if new_price < 1 else round(new_price, 2))
+
         if percentage:
-            new_price = price * adjustment
+            new_price = np.multiply(price, adjustment, dtype=float)
         else:
-            new_price = price + adjustment
+            new_price = np.add(price, adjustment, dtype=float)
 
-        # For orders below $1.00, can only have 4 decimal places.
-        if new_price < 1:
-            new_price = round(new_price,4)
+        # For orders below $1.00, can only have 4 decimal places, above $1.00 only 2.
+        digits = np.where(new_price < 1, 4, 2)
+        scaled = new_price * 10.0 ** digits
+        rounded = np.rint(scaled) / 10.0 ** digits
 
-        # For orders above $1.00, can only have 2 decimal places.
-        else:
-            new_price = round(new_price, 2)
-        
-        return new_price
+        # Scaling can land a price on an exact half, which `np.rint` rounds to even, so those
+        # few prices are rounded by `round`, which rounds the price itself, like a single price.
+        is_near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+
+        for index in np.flatnonzero(is_near_half):
+            rounded.flat[index] = round(float(new_price.flat[index]), int(digits.flat[index]))
+
+        return rounded
 
     def add_take_profit(self, profit_size: float, percentage: bool = False) -> bool:
         """Add's a Limit Order to exit a trade when a profit threshold is reached.
@@ -475,55 +481,16 @@ class Trade():
         {bool} -- `True` if the order was added.
         """        
         
-        # Check to see if we have a trigger order.
-        if not self._triggered_added:
-            self._convert_to_trigger()
-
-        # We need to basis to calculate off of. Use the price.
-        if self.order_type == 'mkt':
-            # Have to make a call to Get Quotes.
-            price = self.price
-        elif self.order_type == 'lmt':
-            price = self.price
-        
         # Calculate the new price.
         if percentage:
             adjustment = 1.0 + profit_size
-            new_price = self._calculate_new_price(
-                price=price,
-                adjustment=adjustment,
-                percentage=True
-            )
         else:
             adjustment = profit_size
-            new_price = self._calculate_new_price(
-                price=price,
-                adjustment=adjustment,
-                percentage=False
-            )
 
-        # Build the order.
-        take_profit_order = {
-            "orderType": "LIMIT",
-            "session": "NORMAL",
-            "price": new_price,
-            "duration": "DAY",
-            "orderStrategyType": "SINGLE",
-            "orderLegCollection": [
-                {
-                    "instruction": self.order_instructions[self.enter_or_exit_opposite][self.side],
-                    "quantity": self.order_size,
-                    "instrument": {
-                        "symbol": self.symbol,
-                        "assetType": self.asset_type
-                    }
-                }
-            ]
-        }
-
-        # Add the order.
-        self.take_profit_order = take_profit_order
-        self.order['childOrderStrategies'].append(self.take_profit_order)
+        self.take_profit_order = self._add_child_order(
+            order_type='LIMIT',
+            prices={'price': (adjustment, percentage)}
+        )
 
         return True
 
@@ -547,6 +514,29 @@ class Trade():
             # Update the state.
             self._triggered_added = True
 
+    def template(self) -> 'OrderTemplate':
+        """Compiles the order into a template, which new orders can be cloned from.
+
+        Returns:
+        ----
+        {OrderTemplate} -- A template of the order, including its child orders.
+
+        Usage:
+        ----
+            >>> trade = Trade()
+            >>> trade.new_trade(trade_id='long_enter', order_type='lmt', side='long', enter_or_exit='enter', price=1.0)
+            >>> trade.instrument(symbol='MSFT', quantity=1, asset_type='EQUITY')
+            >>> trade.add_box_range(profit_size=0.05, percentage=True)
+            >>> order_template = trade.template()
+            >>> orders = order_template.render_many(
+                symbols=['MSFT', 'AAPL'],
+                quantities=[10, 5],
+                prices=[184.10, 273.40]
+            )
+        """
+
+        return OrderTemplate(trade=self)
+
     def modify_session(self, session: str) -> None:
         """Changes which session the order is for.
 
@@ -733,7 +723,7 @@ class Trade():
         bool: `True` if the order is a Stop Limit order, `False` otherwise.
         """
 
-        if self.order_type != 'stop-lmt':
+        if self.order_type != 'stop_lmt':
             return False
         else:
             return True
@@ -750,4 +740,171 @@ class Trade():
         if self.order_type != 'lmt':
             return False
         else:
-            return True
\ No newline at end of file
+            return True
+
+
+def _builtin_order(value: Any) -> Any:
+    """Copies an order with its NumPy values, like a price from a StockFrame, turned into Python ones.
+
+    Arguments:
+    ----
+    value {Any} -- The order, or a value inside it.
+
+    Raises:
+    ----
+    TypeError: If a value isn't a dictionary, a list, a string, a number, a boolean or `None`.
+
+    Returns:
+    ----
+    {Any} -- The copy, made only of built in types.
+    """
+
+    if isinstance(value, dict):
+        return {key: _builtin_order(item) for key, item in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_builtin_order(item) for item in value]
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif value is None or isinstance(value, (str, bool, int, float)):
+        return value
+
+    raise TypeError('The order has a value of type {}, which can\'t be sent.'.format(type(value).__name__))
+
+
+class OrderTemplate():
+
+    """
+    A precompiled copy of a Trade's order, that new orders are cloned from.
+    Only the symbol, the quantity and the prices are filled in for each new
+    order, and the prices of the child orders are calculated for a whole
+    basket of orders at once.
+    """
+
+    def __init__(self, trade: Trade) -> None:
+        """Initalizes the OrderTemplate object.
+
+        Arguments:
+        ----
+        trade {Trade} -- The trade to copy, after `new_trade` and any child orders were added.
+
+        Raises:
+        ----
+        ValueError: If the trade doesn't have an order yet.
+
+        TypeError: If the order has a value that isn't a built in or a NumPy type.
+        """
+
+        if not trade.order:
+            raise ValueError('The trade has no order, call `new_trade` first.')
+
+        # `marshal` copies the order the fastest, but turns NumPy numbers into bytes,
+        # so the order is made of dictionaries, lists, strings and numbers first.
+        self._order = marshal.dumps(_builtin_order(trade.order))
+
+        self.order_type = trade.order_type
+        self._is_stop_limit_order = trade.is_stop_limit_order
+        self._brackets = list(trade._brackets)
+        self._child_count = len(trade.order.get('childOrderStrategies', []))
+
+        # The fields the price of the order itself is written to.
+        if trade.is_limit_order:
+            self._price_fields = ['price']
+        elif trade.is_stop_order or trade.is_stop_limit_order:
+            self._price_fields = ['stopPrice']
+        else:
+            self._price_fields = []
+
+    def render(self, symbol: str, quantity: int, price: float, stop_limit_price: Optional[float] = None) -> dict:
+        """Creates a single order from the template.
+
+        Arguments:
+        ----
+        symbol {str} -- The instrument ticker symbol.
+
+        quantity {int} -- The quantity of shares.
+
+        price {float} -- The price of the order. It's the limit price of a `lmt` order, the
+            stop price of a `stop` or `stop_lmt` order, and the price the child orders are
+            calculated off of for every order type.
+
+        Keyword Arguments:
+        ----
+        stop_limit_price {float} -- The limit price, if it's a `stop_lmt` order. (default: {None})
+
+        Returns:
+        ----
+        {dict} -- A new order.
+        """
+
+        return self.render_many(
+            symbols=[symbol],
+            quantities=[quantity],
+            prices=[price],
+            stop_limit_prices=None if stop_limit_price is None else [stop_limit_price]
+        )[0]
+
+    def render_many(self, symbols: Sequence[str], quantities: Sequence[int], prices: Sequence[float],
+                    stop_limit_prices: Optional[Sequence[float]] = None) -> List[dict]:
+        """Creates an order from the template for each symbol.
+
+        Arguments:
+        ----
+        symbols {Sequence[str]} -- The instrument ticker symbols.
+
+        quantities {Sequence[int]} -- The quantity of shares of each order.
+
+        prices {Sequence[float]} -- The price of each order, see `render`.
+
+        Keyword Arguments:
+        ----
+        stop_limit_prices {Sequence[float]} -- The limit price of each order, if it's a `stop_lmt` order.
+            If not passed, the limit price of the template is kept. (default: {None})
+
+        Returns:
+        ----
+        {List[dict]} -- The new orders, in the same order as `symbols`.
+        """
+
+        prices = np.asarray(prices, dtype=float)
+
+        # The prices of each child order field, for all the orders at once.
+        bracket_prices = [
+            Trade._calculate_new_price(price=prices, adjustment=adjustment, percentage=percentage).tolist()
+            for _, _, adjustment, percentage in self._brackets
+        ]
+
+        entry_prices = prices.tolist()
+        orders = []
+
+        for index, symbol in enumerate(symbols):
+
+            order = marshal.loads(self._order)
+            quantity = _builtin_order(quantities[index])
+
+            self._fill_leg(order=order, symbol=symbol, quantity=quantity)
+
+            for field in self._price_fields:
+                order[field] = entry_prices[index]
+
+            if stop_limit_prices is not None and self._is_stop_limit_order:
+                order['price'] = _builtin_order(stop_limit_prices[index])
+
+            if self._child_count:
+
+                child_orders = order['childOrderStrategies']
+
+                for child_order in child_orders:
+                    self._fill_leg(order=child_order, symbol=symbol, quantity=quantity)
+
+                for (child_index, field, _, _), values in zip(self._brackets, bracket_prices):
+                    child_orders[child_index][field] = values[index]
+
+            orders.append(order)
+
+        return orders
+
+    def _fill_leg(self, order: dict, symbol: str, quantity: int) -> None:
+
+        leg = order['orderLegCollection'][0]
+        leg['quantity'] = quantity
+        leg['instrument']['symbol'] = symbol
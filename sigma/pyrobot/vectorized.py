@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+
+from typing import Tuple
+
+
+def symbol_offsets(frame: pd.DataFrame) -> np.ndarray:
+    """Finds where each symbol starts in a sorted multi-index frame.
+
+    Overview:
+    ----
+    The functions in this module work on the flat column arrays of a StockFrame,
+    where the rows of each symbol are next to each other. The offsets mark the
+    boundaries of each symbol, the rows of symbol `i` are `offsets[i]:offsets[i + 1]`.
+
+    Arguments:
+    ----
+    frame {pd.DataFrame} -- A multi-index frame, sorted by symbol and datetime.
+
+    Raises:
+    ----
+    ValueError: If the frame is not sorted.
+
+    Returns:
+    ----
+    {np.ndarray} -- The offsets, one more than the number of symbols.
+    """
+
+    if not frame.index.is_monotonic_increasing:
+        raise ValueError(
+            "The StockFrame must be sorted by symbol and datetime to use the vectorized functions."
+        )
+
+    codes = np.asarray(frame.index.codes[0])
+
+    if codes.size == 0:
+        return np.zeros(1, dtype='int64')
+
+    return np.concatenate([
+        [0],
+        np.flatnonzero(np.diff(codes)) + 1,
+        [codes.size]
+    ]).astype('int64')
+
+
+def group_positions(offsets: np.ndarray) -> np.ndarray:
+    """Returns the position of each row inside its own symbol.
+
+    Arguments:
+    ----
+    offsets {np.ndarray} -- The symbol offsets.
+
+    Returns:
+    ----
+    {np.ndarray} -- An array where the first row of each symbol is `0`.
+    """
+
+    lengths = np.diff(offsets)
+
+    return np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+
+
+def segmented_shift(values: np.ndarray, offsets: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shifts the values of each symbol, like `groupby().shift(periods)`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    Keyword Arguments:
+    ----
+    periods {int} -- The number of rows to shift by. (default: {1})
+
+    Returns:
+    ----
+    {np.ndarray} -- The shifted values, `nan` where there is no prior row.
+    """
+
+    values = np.asarray(values, dtype=float)
+    shifted = np.full(values.size, np.nan)
+
+    if periods < values.size:
+        shifted[periods:] = values[:values.size - periods]
+
+    shifted[group_positions(offsets) < periods] = np.nan
+
+    return shifted
+
+
+def segmented_diff(values: np.ndarray, offsets: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Calculates the difference of each symbol, like `groupby().diff(periods)`."""
+
+    return np.asarray(values, dtype=float) - segmented_shift(values, offsets, periods)
+
+
+def segmented_pct_change(values: np.ndarray, offsets: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Calculates the percent change of each symbol, like `groupby().pct_change(periods)`."""
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(values, dtype=float) / segmented_shift(values, offsets, periods) - 1.0
+
+
+def _pad(values: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lays the flat values out in a 2D array, one row per symbol, padded with `nan`."""
+
+    lengths = np.diff(offsets)
+    rows = np.repeat(np.arange(lengths.size), lengths)
+    columns = group_positions(offsets)
+
+    padded = np.full((lengths.size, lengths.max() if lengths.size else 0), np.nan)
+    padded[rows, columns] = values
+
+    return padded, rows, columns
+
+
+def segmented_ewm_mean(values: np.ndarray, offsets: np.ndarray, span: float, min_periods: int = 0) -> np.ndarray:
+    """Calculates the exponentially weighted mean of each symbol, like `groupby().ewm(span).mean()`.
+
+    Overview:
+    ----
+    The recursive filter pandas uses is run once per bar position, for every
+    symbol at the same time, so the number of Python level steps depends on
+    the length of the longest symbol and not on the number of symbols.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    span {float} -- The span of the exponential window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value. (default: {0})
+
+    Returns:
+    ----
+    {np.ndarray} -- The flat exponentially weighted means.
+    """
+
+    values = np.asarray(values, dtype=float)
+
+    if values.size == 0:
+        return values.copy()
+
+    old_wt_factor = 1.0 - 2.0 / (span + 1.0)
+    min_periods = max(min_periods, 1)
+
+    padded, rows, columns = _pad(values, offsets)
+    output = np.empty_like(padded)
+
+    weighted = padded[:, 0].copy()
+    nobs = (weighted == weighted).astype('int64')
+    old_wt = np.ones(weighted.size)
+    output[:, 0] = np.where(nobs >= min_periods, weighted, np.nan)
+
+    for position in range(1, padded.shape[1]):
+
+        current = padded[:, position]
+        is_observation = current == current
+        nobs += is_observation
+
+        has_weighted = weighted == weighted
+        old_wt = np.where(has_weighted, old_wt * old_wt_factor, old_wt)
+
+        update = has_weighted & is_observation
+        changed = update & (weighted != current)
+
+        with np.errstate(invalid='ignore'):
+            weighted = np.where(changed, (old_wt * weighted + current) / (old_wt + 1.0), weighted)
+
+        old_wt = np.where(update, old_wt + 1.0, old_wt)
+        weighted = np.where(~has_weighted & is_observation, current, weighted)
+
+        output[:, position] = np.where(nobs >= min_periods, weighted, np.nan)
+
+    return output[rows, columns]
+
+
+def segmented_ewm_std(values: np.ndarray, offsets: np.ndarray, span: float, min_periods: int = 0) -> np.ndarray:
+    """Calculates the exponentially weighted standard deviation of each symbol, like `groupby().ewm(span).std()`.
+
+    Arguments:
+    ----
+    values {np.ndarray} -- The flat column values.
+
+    offsets {np.ndarray} -- The symbol offsets.
+
+    span {float} -- The span of the exponential window.
+
+    Keyword Arguments:
+    ----
+    min_periods {int} -- The minimum number of observations required
+        to have a value. (default: {0})
+
+    Returns:
+    ----
+    {np.ndarray} -- The flat exponentially weighted standard deviations.
+    """
+
+    values = np.asarray(values, dtype=float)
+
+    if values.size == 0:
+        return values.copy()
+
+    old_wt_factor = 1.0 - 2.0 / (span + 1.0)
+    min_periods = max(min_periods, 1)
+
+    padded, rows, columns = _pad(values, offsets)
+    output = np.full_like(padded, np.nan)
+
+    mean = padded[:, 0].copy()
+    nobs = (mean == mean).astype('int64')
+    cov = np.zeros(mean.size)
+    sum_wt = np.ones(mean.size)
+    sum_wt2 = np.ones(mean.size)
+    old_wt = np.ones(mean.size)
+
+    for position in range(1, padded.shape[1]):
+
+        current = padded[:, position]
+        is_observation = current == current
+        nobs += is_observation
+
+        has_mean = mean == mean
+        sum_wt = np.where(has_mean, sum_wt * old_wt_factor, sum_wt)
+        sum_wt2 = np.where(has_mean, sum_wt2 * old_wt_factor * old_wt_factor, sum_wt2)
+        old_wt = np.where(has_mean, old_wt * old_wt_factor, old_wt)
+
+        update = has_mean & is_observation
+        old_mean = mean
+
+        with np.errstate(invalid='ignore'):
+            new_mean = np.where(
+                update & (mean != current),
+                (old_wt * old_mean + current) / (old_wt + 1.0),
+                mean
+            )
+            new_cov = (
+                (old_wt * (cov + ((old_mean - new_mean) * (old_mean - new_mean)))) +
+                ((current - new_mean) * (current - new_mean))
+            ) / (old_wt + 1.0)
+
+        mean = np.where(update, new_mean, mean)
+        cov = np.where(update, new_cov, cov)
+        sum_wt = np.where(update, sum_wt + 1.0, sum_wt)
+        sum_wt2 = np.where(update, sum_wt2 + 1.0, sum_wt2)
+        old_wt = np.where(update, old_wt + 1.0, old_wt)
+        mean = np.where(~has_mean & is_observation, current, mean)
+
+        numerator = sum_wt * sum_wt
+        denominator = numerator - sum_wt2
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.where(denominator > 0.0, (numerator / denominator) * cov, np.nan)
+
+        output[:, position] = np.where(nobs >= min_periods, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+    return output[rows, columns]
@@ -4,8 +4,11 @@ import json
 import datetime
 import pathlib
 import requests
+import threading
 import urllib.parse
 
+from requests.adapters import HTTPAdapter
+
 from typing import Any
 from typing import Dict
 from typing import List
@@ -125,6 +128,18 @@ class TDClient():
         else:
             self._flask_app = None
         
+        # The session every request is sent with, so the connections to the API are reused.
+        self._request_session = None
+        self._request_session_lock = threading.Lock()
+
+        # Held while the access token is checked and refreshed, so the threads sending
+        # requests at the same time refresh it once, and then all use the new token.
+        self._token_lock = threading.RLock()
+
+        # An object with a `record(category, name, seconds, start, **args)` method, like the
+        # `pyrobot.profiler.Profiler`, which is told about each request when it's set.
+        self.profiler = None
+
         # define a new attribute called 'authstate' and initialize to `False`. This will be used by our login function.
         self.authstate = False
 
@@ -298,6 +313,49 @@ class TDClient():
         # change state to initalized so they will have to either get a
         # new access token or refresh token next time they use the API
         self._state_manager('init')
+        self.close_session()
+
+    @property
+    def request_session(self) -> requests.Session:
+        """The session the requests are sent with, created the first time it's needed.
+
+        Overview:
+        ----
+        The session keeps a pool of open connections to the API, so only the first
+        request on each connection pays for the TLS handshake. The pool holds up to
+        `pool_maxsize` connections, enough for the worker threads of the historical
+        loader and the order dispatcher to send their requests at the same time.
+
+        Returns:
+        ----
+        {requests.Session} -- A session that can be shared between threads.
+        """
+
+        if self._request_session is None:
+
+            with self._request_session_lock:
+
+                if self._request_session is None:
+
+                    request_session = requests.Session()
+                    request_session.verify = True
+
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                    request_session.mount('https://', adapter)
+                    request_session.mount('http://', adapter)
+
+                    self._request_session = request_session
+
+        return self._request_session
+
+    def close_session(self) -> None:
+        """Closes the connections of the request session, a new one is opened on the next request."""
+
+        with self._request_session_lock:
+
+            if self._request_session is not None:
+                self._request_session.close()
+                self._request_session = None
 
     def grab_access_token(self) -> bool:
         """Access token handler for AuthCode Workflow.
@@ -347,22 +405,24 @@ class TDClient():
         {bool} -- `True` if successful, `False` otherwise.
         """
 
-        # build the parameters of our request
-        data = {
-            'client_id': self.client_id,
-            'grant_type': 'refresh_token',
-            'access_type': 'offline',
-            'refresh_token': self.state['refresh_token']
-        }
+        with self._token_lock:
 
-        token_response = self._make_request(
-            method='post',
-            endpoint=self.config['token_endpoint'],
-            mode='form',
-            data=data
-        )
+            # build the parameters of our request
+            data = {
+                'client_id': self.client_id,
+                'grant_type': 'refresh_token',
+                'access_type': 'offline',
+                'refresh_token': self.state['refresh_token']
+            }
 
-        self._token_save(token_response)
+            token_response = self._make_request(
+                method='post',
+                endpoint=self.config['token_endpoint'],
+                mode='form',
+                data=data
+            )
+
+            self._token_save(token_response)
         
         return True
 
@@ -484,7 +544,12 @@ class TDClient():
         """
 
         if self._token_seconds(token_type='access_token') < nseconds and self.config['refresh_enabled']:
-            self.grab_refresh_token()
+
+            with self._token_lock:
+
+                # Another thread may have refreshed the token while this one waited for the lock.
+                if self._token_seconds(token_type='access_token') < nseconds:
+                    self.grab_refresh_token()
 
 
     def _make_request(self, method: str, endpoint: str, mode: str = None, params: dict = None, data: dict = None, json:dict = None, 
@@ -517,18 +582,16 @@ class TDClient():
         """
 
         url = self._api_endpoint(endpoint=endpoint)
-        headers = self._headers(mode=mode)
 
-        # Make sure the token is valid if it's not a Token API call.
+        # Make sure the token is valid if it's not a Token API call, before the
+        # headers are built, so they have the refreshed token.
         if endpoint != self.config['token_endpoint']:
             self._token_validation()
+            headers = self._headers(mode=mode)
         elif endpoint == self.config['token_endpoint']:
+            headers = self._headers(mode=mode)
             del headers['Authorization']
 
-        # Define a new session.
-        request_session = requests.Session()
-        request_session.verify = True
-
         # Define a new request.
         request_request = requests.Request(
             method=method.upper(),
@@ -539,10 +602,20 @@ class TDClient():
             json=json
         ).prepare()
         
-        # Send the request.
-        response: requests.Response = request_session.send(request=request_request)
-
-        request_session.close()
+        # Send the request, and time it if there's a profiler.
+        if self.profiler is not None:
+            start = time.perf_counter()
+
+        response: requests.Response = self.request_session.send(request=request_request)
+
+        if self.profiler is not None:
+            self.profiler.record(
+                category='api',
+                name=self._request_name(method=method, endpoint=endpoint),
+                seconds=time.perf_counter() - start,
+                start=start,
+                status_code=response.status_code
+            )
 
         # grab the status code
         status_code = response.status_code
@@ -590,6 +663,26 @@ class TDClient():
             elif response.status_code > 400:
                 raise GeneralError(message=response.text)
 
+    def _request_name(self, method: str, endpoint: str) -> str:
+        """Names a request by its method and endpoint, with the symbols and IDs left out.
+
+        Arguments:
+        ----
+        method {str} -- The request method, like `get`.
+
+        endpoint {str} -- The API URL endpoint, like `marketdata/MSFT/pricehistory`.
+
+        Returns:
+        ----
+        {str} -- The name of the request, like `GET marketdata/{}/pricehistory`, so the
+            requests to the same endpoint are counted together.
+        """
+
+        # The resources are lower case words, the symbols, accounts and IDs aren't.
+        parts = [part if part.isalnum() and part.islower() and part[0].isalpha() else '{}' for part in endpoint.split('/')]
+
+        return '{method} {endpoint}'.format(method=method.upper(), endpoint='/'.join(parts))
+
     def _validate_arguments(self, endpoint: str, parameter_name: str, parameter_argument: List[str]) -> bool:
         """Validates arguments for an API call.
 
@@ -0,0 +1,252 @@
+import json
+import collections
+
+from typing import List
+from typing import Union
+from typing import Callable
+
+from td.records import LevelOneRecords
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# The replacement character the stream sends in place of values it can't encode,
+# as text and as UTF-8 bytes, and what it's replaced with.
+REPLACEMENT_CHARACTER = '\ufffd'
+REPLACEMENT_CHARACTER_BYTES = REPLACEMENT_CHARACTER.encode('utf-8')
+REPLACEMENT_VALUE = '"None"'
+REPLACEMENT_VALUE_BYTES = REPLACEMENT_VALUE.encode('utf-8')
+
+# A single service of a message, like the `QUOTE` updates of a `data` message. The
+# level one services also have their updates as typed records, see `LevelOneRecords`.
+ServiceMessage = collections.namedtuple(
+    'ServiceMessage',
+    ['section', 'service', 'timestamp', 'command', 'content', 'schema', 'records']
+)
+
+# The sections of a message that hold the services.
+MESSAGE_SECTIONS = ['data', 'snapshot', 'response', 'notify']
+
+# The sections that hold the updates of the subscriptions.
+DATA_SECTIONS = ['data', 'snapshot']
+
+
+def available_backends() -> List[str]:
+    """The JSON libraries that can decode the messages, fastest first.
+
+    Returns:
+    ----
+    {List[str]} -- The names of the backends, `json` is always there.
+    """
+
+    backends = ['json']
+
+    if orjson is not None:
+        backends.insert(0, 'orjson')
+
+    return backends
+
+
+def split_services(message: dict) -> List[ServiceMessage]:
+    """Splits a decoded message into a record per service, without typing the content.
+
+    Arguments:
+    ----
+    message {dict} -- The decoded message.
+
+    Returns:
+    ----
+    {List[ServiceMessage]} -- The section of the message each service came from,
+        like `data` or `response`, its name, timestamp, command and content.
+    """
+
+    service_messages = []
+
+    for section in MESSAGE_SECTIONS:
+
+        for service_result in message.get(section, []):
+
+            # The heartbeats of the `notify` section don't belong to a service.
+            if 'service' not in service_result:
+                continue
+
+            service_messages.append(
+                ServiceMessage(
+                    section=section,
+                    service=service_result['service'],
+                    timestamp=service_result.get('timestamp'),
+                    command=service_result.get('command'),
+                    content=service_result.get('content', []),
+                    schema=None,
+                    records=None
+                )
+            )
+
+    return service_messages
+
+
+class MessageDecoder():
+
+    """
+    Decodes the messages of the stream, using the fastest JSON library that
+    is installed, `orjson` if it is, and the standard `json` module if not.
+
+    Overview:
+    ----
+    The stream sometimes sends the replacement character, U+FFFD, in place of
+    a value, which isn't valid JSON. The messages are only scanned for it
+    once, and the ones without it, which is nearly all of them, are decoded
+    straight away. A message with it is decoded as is first, since the
+    character can also be part of a string, and only repaired, by putting
+    `"None"` in its place, if that fails. Bytes are repaired as bytes and text
+    as text, so a message is never encoded and decoded again to repair it.
+
+    A message can also be decoded into a record per service with `decode`,
+    where the updates of the level one services are converted to their types
+    once, by a `LevelOneRecords`, so the rest of the stream reads typed records
+    instead of walking the raw message again.
+    """
+
+    def __init__(self, backend: str = None, level_one_records: LevelOneRecords = None) -> None:
+        """Initalizes the MessageDecoder object.
+
+        Keyword Arguments:
+        ----
+        backend {str} -- The JSON library to use, `orjson` or `json`. If not provided,
+            the fastest one that's installed is used. (default: {None})
+
+        level_one_records {LevelOneRecords} -- Types the updates of the level one services,
+            and keeps the last state of each symbol. (default: {LevelOneRecords()})
+
+        Raises:
+        ----
+        ValueError: If the backend isn't installed.
+        """
+
+        backends = available_backends()
+        backend = backend or backends[0]
+
+        if backend not in backends:
+            raise ValueError(
+                'The {backend} backend is not installed, the installed backends are: {backends}'.format(
+                    backend=backend, backends=', '.join(backends)
+                )
+            )
+
+        self.backend = backend
+        self.level_one_records = level_one_records or LevelOneRecords()
+        self.repaired = 0
+        self.invalid = 0
+
+        self._loads: Callable[[Union[str, bytes]], dict] = orjson.loads if backend == 'orjson' else json.loads
+
+    def loads(self, message: Union[str, bytes]) -> dict:
+        """Decodes a message.
+
+        Arguments:
+        ----
+        message {Union[str, bytes]} -- The raw message, as text or as UTF-8 bytes.
+
+        Returns:
+        ----
+        {dict} -- The decoded message.
+
+        Usage:
+        ----
+            >>> decoder = MessageDecoder()
+            >>> decoder.loads(message='{"notify": [{"heartbeat": "1591046000000"}]}')
+            {'notify': [{'heartbeat': '1591046000000'}]}
+        """
+
+        if isinstance(message, str):
+            has_replacement = REPLACEMENT_CHARACTER in message
+        else:
+            has_replacement = REPLACEMENT_CHARACTER_BYTES in message
+
+        if not has_replacement:
+            return self._loads(message)
+
+        try:
+            return self._loads(message)
+        except ValueError:
+            pass
+
+        self.repaired += 1
+
+        if isinstance(message, str):
+            message = message.replace(REPLACEMENT_CHARACTER, REPLACEMENT_VALUE)
+        else:
+            message = message.replace(REPLACEMENT_CHARACTER_BYTES, REPLACEMENT_VALUE_BYTES)
+
+        return self._loads(message)
+
+    def decode(self, message: Union[str, bytes]) -> List[ServiceMessage]:
+        """Decodes a message into a record per service.
+
+        Arguments:
+        ----
+        message {Union[str, bytes]} -- The raw message, as text or as UTF-8 bytes.
+
+        Returns:
+        ----
+        {List[ServiceMessage]} -- A record per service, see `services`.
+
+        Usage:
+        ----
+            >>> decoder = MessageDecoder()
+            >>> for service_message in decoder.decode(message=raw_message):
+                    if service_message.records:
+                        print(service_message.schema.columns, service_message.records)
+        """
+
+        return self.services(message=self.loads(message=message))
+
+    def services(self, message: dict) -> List[ServiceMessage]:
+        """Splits a decoded message into a record per service, typing the level one updates.
+
+        Overview:
+        ----
+        The updates of the level one services in the `data` and `snapshot`
+        sections are merged into the state of each symbol by `level_one_records`,
+        and come back as its typed records, with their schema. An update whose
+        values can't be converted is counted in `invalid`, and its service is
+        left without records.
+
+        Arguments:
+        ----
+        message {dict} -- The decoded message.
+
+        Returns:
+        ----
+        {List[ServiceMessage]} -- The section of the message each service came from,
+            its name, timestamp, command and raw content, and for the level one
+            services, the schema and the records.
+        """
+
+        service_messages = split_services(message=message)
+        level_one_records = self.level_one_records
+
+        for index, service_message in enumerate(service_messages):
+
+            if service_message.section not in DATA_SECTIONS or not level_one_records.has_schema(service=service_message.service):
+                continue
+
+            try:
+                records = level_one_records.update(
+                    service=service_message.service,
+                    timestamp=service_message.timestamp,
+                    content=service_message.content
+                )
+            except (KeyError, TypeError, ValueError):
+                self.invalid += 1
+                continue
+
+            service_messages[index] = service_message._replace(
+                schema=level_one_records.schema(service=service_message.service),
+                records=records
+            )
+
+        return service_messages
@@ -1002,3 +1002,88 @@ CSV_FIELD_KEYS_LEVEL_2 = {
     "LISTED_BOOK": "nested",
     "FUTURES_BOOK": "nested"
 }
+
+
+# The type of each level one field, by the name it's given in `CSV_FIELD_KEYS`. The fields
+# that aren't listed here are kept as text.
+LEVEL_ONE_FIELD_TYPES = {
+    "52-week-high": "float",
+    "52-week-low": "float",
+    "ask-price": "float",
+    "bid-price": "float",
+    "close-price": "float",
+    "delta": "float",
+    "dividend-amount": "float",
+    "dividend-yield": "float",
+    "fund-price": "float",
+    "future-multiplier": "float",
+    "future-percent-change": "float",
+    "future-settlement-price": "float",
+    "gamma": "float",
+    "high-price": "float",
+    "island-ask": "float",
+    "island-bid": "float",
+    "last-price": "float",
+    "low-price": "float",
+    "mark": "float",
+    "money-intrinsic-value": "float",
+    "multiplier": "float",
+    "nav": "float",
+    "net-change": "float",
+    "open-price": "float",
+    "pe-ratio": "float",
+    "percent-change": "float",
+    "regular-market-last-price": "float",
+    "regular-market-net-change": "float",
+    "rho": "float",
+    "strike-price": "float",
+    "theoretical-option-value": "float",
+    "theta": "float",
+    "tick": "float",
+    "tick-amount": "float",
+    "time-value": "float",
+    "underlying-price": "float",
+    "vega": "float",
+    "volatility": "float",
+    "volume": "float",
+    "ask-size": "int",
+    "bid-size": "int",
+    "chart-day": "int",
+    "chart-sequence": "int",
+    "chart-time": "int",
+    "count-for-keyword": "int",
+    "days-to-expiration": "int",
+    "digits": "int",
+    "error-code": "int",
+    "expiration-day": "int",
+    "expiration-month": "int",
+    "expiration-year": "int",
+    "future-expiration-date": "int",
+    "island-ask-size": "int",
+    "island-bid-size": "int",
+    "island-volume": "int",
+    "last-sequence": "int",
+    "last-size": "int",
+    "open-interest": "int",
+    "quote-day": "int",
+    "quote-time": "int",
+    "quote-time-in-long": "int",
+    "regular-market-last-size": "int",
+    "regular-market-trade-day": "int",
+    "regular-market-trade-time": "int",
+    "sequence": "int",
+    "story-datetime": "int",
+    "total-volume": "int",
+    "trade-day": "int",
+    "trade-time": "int",
+    "trade-time-in-long": "int",
+    "delayed": "bool",
+    "future-is-active": "bool",
+    "future-is-tradable": "bool",
+    "is-hot": "bool",
+    "is-tradable": "bool",
+    "marginable": "bool",
+    "regular-market-quote": "bool",
+    "regular-market-trade": "bool",
+    "shortable": "bool"
+}
@@ -1,4 +1,4 @@
-import json
+from td.decoder import MessageDecoder
 
 from datetime import datetime
 from typing import Union
@@ -13,7 +13,10 @@ class StreamingMessage():
         with the messages easier and more standard.
     """
 
-    def __init__(self, message: str) -> None:
+    # Shared by the messages, unless one is given.
+    decoder = MessageDecoder()
+
+    def __init__(self, message: str, decoder: MessageDecoder = None) -> None:
         """Initalizes the `StreamingMessage` object.
 
         During the initalization process, the raw message
@@ -22,8 +25,15 @@ class StreamingMessage():
         Arguments:
         ----
         message {str} -- The raw text message from a stream.
+
+        Keyword Arguments:
+        ----
+        decoder {MessageDecoder} -- The decoder to parse the message with. (default: {None})
         """
 
+        if decoder is not None:
+            self.decoder = decoder
+
         self.raw_message = message
         self.decoded_message = self.parse(message=self.raw_message)
 
@@ -42,14 +52,7 @@ class StreamingMessage():
         dict -- A Message dictionary.
         """
 
-        message = message.encode(
-            'utf-8').replace(
-                b'\xef\xbf\xbd',
-                bytes('"None"', 'utf-8')
-            ).decode('utf-8')
-        message = json.loads(message)
-
-        return message
+        return self.decoder.loads(message=message)
 
     def set_components(self) -> List[dict]:
         """Converts each response to a StreamingMessageComponent Object.
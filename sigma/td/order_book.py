@@ -0,0 +1,467 @@
+import array
+import bisect
+import collections
+import numpy as np
+
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Iterable
+from typing import Optional
+
+from td.decoder import ServiceMessage
+from td.decoder import DATA_SECTIONS
+from td.decoder import split_services
+
+
+# The services that stream a level two book.
+BOOK_SERVICES = [
+    'NASDAQ_BOOK',
+    'TOTAL_VIEW',
+    'LISTED_BOOK',
+    'NYSE_BOOK',
+    'OPTIONS_BOOK',
+    'FUTURES_BOOK',
+    'FUTURES_OPTIONS_BOOK',
+    'FOREX_BOOK'
+]
+
+# The top levels of both sides of a book, best first.
+BookSnapshot = collections.namedtuple(
+    'BookSnapshot',
+    ['symbol', 'timestamp', 'bid_prices', 'bid_sizes', 'bid_counts', 'ask_prices', 'ask_sizes', 'ask_counts']
+)
+
+
+class BookSide():
+
+    """
+    One side of an order book, the bids or the asks, with its price levels
+    kept in order, best first, in flat arrays. A level is found with a binary
+    search, so looking up a price is O(log n), and inserting or removing one
+    only moves the levels behind it in memory.
+    """
+
+    def __init__(self, is_bid: bool) -> None:
+        """Initalizes the BookSide object.
+
+        Arguments:
+        ----
+        is_bid {bool} -- `True` for the bids, which are best at the highest price, `False`
+            for the asks, which are best at the lowest price.
+        """
+
+        self.is_bid = is_bid
+
+        # The bids are kept by their negative price, so both sides are sorted ascending.
+        self._sign = -1.0 if is_bid else 1.0
+        self._keys = array.array('d')
+        self._sizes = array.array('d')
+        self._counts = array.array('q')
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set_level(self, price: float, size: float, count: int = 1) -> None:
+        """Sets the size of a price level, adding it if it's new.
+
+        Arguments:
+        ----
+        price {float} -- The price of the level.
+
+        size {float} -- The total size at the level. A size of `0` removes the level.
+
+        Keyword Arguments:
+        ----
+        count {int} -- The number of orders, or market makers, at the level. (default: {1})
+        """
+
+        key = self._sign * price
+        position = bisect.bisect_left(self._keys, key)
+        exists = position < len(self._keys) and self._keys[position] == key
+
+        if size <= 0:
+            if exists:
+                del self._keys[position]
+                del self._sizes[position]
+                del self._counts[position]
+
+        elif exists:
+            self._sizes[position] = size
+            self._counts[position] = count
+
+        else:
+            self._keys.insert(position, key)
+            self._sizes.insert(position, size)
+            self._counts.insert(position, count)
+
+    def replace(self, levels: List[Tuple[float, float, int]]) -> None:
+        """Replaces every level of the side, with the levels of a new snapshot.
+
+        Arguments:
+        ----
+        levels {List[Tuple[float, float, int]]} -- The price, size and count of each level.
+        """
+
+        sign = self._sign
+
+        # The levels usually come in order already, sorting them then only takes a pass.
+        levels = sorted((sign * price, size, count) for price, size, count in levels if size > 0)
+
+        self._keys = array.array('d', [level[0] for level in levels])
+        self._sizes = array.array('d', [level[1] for level in levels])
+        self._counts = array.array('q', [level[2] for level in levels])
+
+    def clear(self) -> None:
+        """Removes every level."""
+
+        self.replace(levels=[])
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        """The best level.
+
+        Returns:
+        ----
+        {Optional[Tuple[float, float]]} -- The price and size of the best level, or
+            `None` if the side is empty.
+        """
+
+        if not self._keys:
+            return None
+
+        return self._sign * self._keys[0], self._sizes[0]
+
+    def size_at(self, price: float) -> float:
+        """The size at a price, `0.0` if there's no level at that price."""
+
+        key = self._sign * price
+        position = bisect.bisect_left(self._keys, key)
+
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._sizes[position]
+
+        return 0.0
+
+    def total_size(self, levels: int = 1) -> float:
+        """The size of the best `levels` levels together."""
+
+        return sum(self._sizes[:levels])
+
+    def depth(self, levels: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The best `levels` levels, best first.
+
+        Keyword Arguments:
+        ----
+        levels {int} -- The number of levels. (default: {5})
+
+        Returns:
+        ----
+        {Tuple[np.ndarray, np.ndarray, np.ndarray]} -- The prices, sizes and counts of the levels.
+        """
+
+        levels = min(levels, len(self._keys))
+
+        prices = np.frombuffer(self._keys, dtype='float64', count=levels) * self._sign
+        sizes = np.frombuffer(self._sizes, dtype='float64', count=levels).copy()
+        counts = np.frombuffer(self._counts, dtype='int64', count=levels).copy()
+
+        return prices, sizes, counts
+
+
+class OrderBook():
+
+    """
+    The limit order book of a single symbol, kept up to date from the level
+    two messages of a book service.
+    """
+
+    def __init__(self, symbol: str, service: str = None) -> None:
+        """Initalizes the OrderBook object.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol of the book.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The service the book is streamed from, for example `NASDAQ_BOOK`. (default: {None})
+        """
+
+        self.symbol = symbol
+        self.service = service
+        self.timestamp: int = None
+        self.updates = 0
+
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+
+    def __repr__(self) -> str:
+        return 'OrderBook(symbol={symbol!r}, bid={bid}, ask={ask})'.format(
+            symbol=self.symbol, bid=self.best_bid, ask=self.best_ask
+        )
+
+    def apply(self, content: dict) -> None:
+        """Applies the content of a level two message for this symbol.
+
+        Overview:
+        ----
+        Each message holds the book time in `1`, and the bid and ask levels in
+        `2` and `3`. A level has its price in `0`, total size in `1` and number
+        of market makers in `2`. The message is a snapshot of the levels of a
+        side, so the side is replaced by them.
+
+        Arguments:
+        ----
+        content {dict} -- The content of the message for the symbol.
+        """
+
+        if '1' in content:
+            self.timestamp = content['1']
+
+        if '2' in content:
+            self.bids.replace(levels=[(level['0'], level['1'], level['2']) for level in content['2']])
+
+        if '3' in content:
+            self.asks.replace(levels=[(level['0'], level['1'], level['2']) for level in content['3']])
+
+        self.updates += 1
+
+    @property
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        """The price and size of the best bid, or `None` if there are no bids."""
+
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        """The price and size of the best ask, or `None` if there are no asks."""
+
+        return self.asks.best()
+
+    @property
+    def spread(self) -> Optional[float]:
+        """The best ask less the best bid, or `None` if a side is empty."""
+
+        best_bid = self.bids.best()
+        best_ask = self.asks.best()
+
+        if best_bid is None or best_ask is None:
+            return None
+
+        return best_ask[0] - best_bid[0]
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        """The price halfway between the best bid and the best ask, or `None` if a side is empty."""
+
+        best_bid = self.bids.best()
+        best_ask = self.asks.best()
+
+        if best_bid is None or best_ask is None:
+            return None
+
+        return (best_bid[0] + best_ask[0]) / 2
+
+    def imbalance(self, levels: int = 1) -> Optional[float]:
+        """The imbalance between the size of the bids and the asks.
+
+        Keyword Arguments:
+        ----
+        levels {int} -- The number of levels of each side to count. (default: {1})
+
+        Returns:
+        ----
+        {Optional[float]} -- Between `-1.0`, when there are only asks, and `1.0`, when
+            there are only bids, or `None` if the book is empty.
+        """
+
+        bid_size = self.bids.total_size(levels=levels)
+        ask_size = self.asks.total_size(levels=levels)
+
+        if bid_size + ask_size == 0:
+            return None
+
+        return (bid_size - ask_size) / (bid_size + ask_size)
+
+    def microprice(self) -> Optional[float]:
+        """The mid price, weighted by the size on the other side of the top of the book.
+
+        Overview:
+        ----
+        When there's more size on the bid than on the ask, the next trade is more
+        likely to be at the ask, so the microprice leans towards the ask:
+
+            microprice = (bid_price * ask_size + ask_price * bid_size) / (bid_size + ask_size)
+
+        Returns:
+        ----
+        {Optional[float]} -- The microprice, or `None` if a side is empty.
+        """
+
+        best_bid = self.bids.best()
+        best_ask = self.asks.best()
+
+        if best_bid is None or best_ask is None:
+            return None
+
+        bid_price, bid_size = best_bid
+        ask_price, ask_size = best_ask
+
+        return (bid_price * ask_size + ask_price * bid_size) / (bid_size + ask_size)
+
+    def snapshot(self, levels: int = 5) -> BookSnapshot:
+        """The best levels of both sides.
+
+        Keyword Arguments:
+        ----
+        levels {int} -- The number of levels of each side. (default: {5})
+
+        Returns:
+        ----
+        {BookSnapshot} -- The prices, sizes and counts of the levels, best first.
+
+        Usage:
+        ----
+            >>> order_book = td_stream_session.order_books.book(symbol='MSFT')
+            >>> snapshot = order_book.snapshot(levels=10)
+            >>> snapshot.bid_prices
+            array([184.2 , 184.19, 184.18, ...])
+        """
+
+        bid_prices, bid_sizes, bid_counts = self.bids.depth(levels=levels)
+        ask_prices, ask_sizes, ask_counts = self.asks.depth(levels=levels)
+
+        return BookSnapshot(
+            symbol=self.symbol,
+            timestamp=self.timestamp,
+            bid_prices=bid_prices,
+            bid_sizes=bid_sizes,
+            bid_counts=bid_counts,
+            ask_prices=ask_prices,
+            ask_sizes=ask_sizes,
+            ask_counts=ask_counts
+        )
+
+
+class OrderBooks():
+
+    """
+    Keeps an `OrderBook` for every symbol of the level two book services,
+    and applies the messages of the stream to them.
+    """
+
+    def __init__(self, services: List[str] = None) -> None:
+        """Initalizes the OrderBooks object.
+
+        Keyword Arguments:
+        ----
+        services {List[str]} -- The services to build books from. (default: {BOOK_SERVICES})
+        """
+
+        self.services = set(services or BOOK_SERVICES)
+        self._books: Dict[str, Dict[str, OrderBook]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(books) for books in self._books.values())
+
+    def __iter__(self):
+        for books in self._books.values():
+            yield from books.values()
+
+    @property
+    def symbols(self) -> List[str]:
+        """The symbols that have a book."""
+
+        return list(self._books.keys())
+
+    def book(self, symbol: str, service: str = None) -> Optional[OrderBook]:
+        """The book of a symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The service of the book. If not provided, the book of the first
+            service the symbol was seen on is returned. (default: {None})
+
+        Returns:
+        ----
+        {Optional[OrderBook]} -- The book, or `None` if the symbol doesn't have one.
+        """
+
+        books = self._books.get(symbol)
+
+        if not books:
+            return None
+
+        if service is None:
+            return next(iter(books.values()))
+
+        return books.get(service)
+
+    def update(self, message: Union[dict, List[ServiceMessage]]) -> List[OrderBook]:
+        """Applies a message of the stream to the books.
+
+        Arguments:
+        ----
+        message {Union[dict, List[ServiceMessage]]} -- The services of a message, from
+            `MessageDecoder.services`, or the decoded message.
+
+        Returns:
+        ----
+        {List[OrderBook]} -- The books the message changed.
+        """
+
+        if isinstance(message, dict):
+            message = split_services(message=message)
+
+        changed = []
+
+        for service_message in message:
+
+            service_name = service_message.service
+
+            if service_message.section not in DATA_SECTIONS or service_name not in self.services:
+                continue
+
+            for content in service_message.content:
+
+                symbol = content['key']
+                books = self._books.setdefault(symbol, {})
+                order_book = books.get(service_name)
+
+                if order_book is None:
+                    order_book = books[service_name] = OrderBook(symbol=symbol, service=service_name)
+
+                order_book.apply(content=content)
+                changed.append(order_book)
+
+        return changed
+
+    def replay(self, messages: Iterable[dict]) -> int:
+        """Applies recorded messages to the books, in order.
+
+        Arguments:
+        ----
+        messages {Iterable[dict]} -- The decoded messages.
+
+        Returns:
+        ----
+        {int} -- The number of messages replayed.
+        """
+
+        count = 0
+
+        for message in messages:
+            self.update(message=message)
+            count += 1
+
+        return count
+
+    def clear(self) -> None:
+        """Removes every book, for example after the stream reconnects."""
+
+        self._books.clear()
@@ -0,0 +1,220 @@
+import collections
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Callable
+from typing import Optional
+
+from td.enums import CSV_FIELD_KEYS
+from td.enums import LEVEL_ONE_FIELD_TYPES
+
+
+# The columns of the records of a level one service, and the type of each one.
+LevelOneSchema = collections.namedtuple('LevelOneSchema', ['service', 'columns', 'types'])
+
+
+def _to_bool(value: Any) -> bool:
+    """Turns a flag into a bool, the stream sends them as `true` or as text."""
+
+    if isinstance(value, str):
+        return value.lower() == 'true'
+
+    return bool(value)
+
+
+def _to_str(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+COERCIONS = {
+    'float': float,
+    'int': int,
+    'bool': _to_bool,
+    'str': _to_str
+}
+
+
+class LevelOneRecords():
+
+    """
+    Turns the level one messages into wide records, with one row per symbol
+    update instead of one row per field.
+
+    Overview:
+    ----
+    The stream only sends the fields that changed since the last update of a
+    symbol, so the last full state of each symbol is kept, and an update is
+    merged into it. Each row has the service `timestamp`, the `symbol` and then
+    every field of the service, forward filled from the earlier updates, or
+    `None` if it was never sent. The values are converted to their type once,
+    when they're received, using `LEVEL_ONE_FIELD_TYPES`.
+    """
+
+    def __init__(self, fields_keys: Dict[str, Dict[str, str]] = None, field_types: Dict[str, str] = None,
+                 subscribed_fields: Callable[[str], Optional[List[str]]] = None) -> None:
+        """Initalizes the LevelOneRecords object.
+
+        Keyword Arguments:
+        ----
+        fields_keys {Dict[str, Dict[str, str]]} -- The name of each field ID, per service.
+            (default: {CSV_FIELD_KEYS})
+
+        field_types {Dict[str, str]} -- The type of each field name, one of 'float', 'int',
+            'bool' or 'str'. (default: {LEVEL_ONE_FIELD_TYPES})
+
+        subscribed_fields {Callable[[str], Optional[List[str]]]} -- Returns the field IDs
+            a service was subscribed to, so the records only have those columns. If it isn't
+            provided, or returns `None`, the records have every field of the service. (default: {None})
+        """
+
+        self.fields_keys = fields_keys or CSV_FIELD_KEYS
+        self.field_types = field_types or LEVEL_ONE_FIELD_TYPES
+        self.subscribed_fields = subscribed_fields
+
+        self._schemas: Dict[str, LevelOneSchema] = {}
+        self._positions: Dict[str, Dict[str, int]] = {}
+        self._coercions: Dict[str, List[Callable]] = {}
+        self._states: Dict[Tuple[str, str], list] = {}
+
+    def schema(self, service: str) -> LevelOneSchema:
+        """The columns of the records of a service.
+
+        Overview:
+        ----
+        The schema is made the first time the service is seen, and then kept,
+        so every record of a service has the same columns. The numbered fields
+        come in the order of their IDs, followed by the named ones, like `delayed`.
+
+        Arguments:
+        ----
+        service {str} -- The name of the service, for example `QUOTE`.
+
+        Returns:
+        ----
+        {LevelOneSchema} -- The service, the column names and the column types.
+        """
+
+        if service in self._schemas:
+            return self._schemas[service]
+
+        field_names = self.fields_keys[service]
+        subscribed = self.subscribed_fields(service) if self.subscribed_fields else None
+
+        numbered = sorted((key for key in field_names if key.isdigit()), key=int)
+        named = [key for key in field_names if not key.isdigit() and key != 'key']
+
+        if subscribed is not None:
+            subscribed = set(subscribed)
+            numbered = [key for key in numbered if key in subscribed]
+
+        field_keys = numbered + named
+        columns = ('timestamp', 'symbol') + tuple(field_names[key] for key in field_keys)
+        types = ('int', 'str') + tuple(self.field_types.get(field_names[key], 'str') for key in field_keys)
+
+        self._schemas[service] = LevelOneSchema(service=service, columns=columns, types=types)
+        self._positions[service] = {key: position for position, key in enumerate(field_keys, start=2)}
+        self._coercions[service] = [COERCIONS[column_type] for column_type in types]
+
+        return self._schemas[service]
+
+    def has_schema(self, service: str) -> bool:
+        """Whether the updates of a service can be turned into records.
+
+        Arguments:
+        ----
+        service {str} -- The name of the service.
+
+        Returns:
+        ----
+        {bool} -- `True` for the level one services, `False` for the chart history,
+            the actives, and the services without field names.
+        """
+
+        return service in self.fields_keys and service != 'CHART_HISTORY_FUTURES' and 'ACTIVES_' not in service
+
+    def update(self, service: str, timestamp: int, content: List[dict]) -> List[list]:
+        """Merges the updates of a message into the state of each symbol.
+
+        Arguments:
+        ----
+        service {str} -- The name of the service.
+
+        timestamp {int} -- The timestamp of the service, in milliseconds.
+
+        content {List[dict]} -- The content of the service, one update per symbol.
+
+        Returns:
+        ----
+        {List[list]} -- A record per update, in the columns of `schema(service)`.
+
+        Usage:
+        ----
+            >>> level_one_records = LevelOneRecords()
+            >>> level_one_records.update(
+                service='QUOTE',
+                timestamp=1591046000000,
+                content=[{'key': 'MSFT', '1': 184.2, '2': 184.25}]
+            )
+            [[1591046000000, 'MSFT', 184.2, 184.25, None, ...]]
+        """
+
+        schema = self.schema(service=service)
+        positions = self._positions[service]
+        coercions = self._coercions[service]
+
+        records = []
+
+        for update in content:
+
+            symbol = update['key']
+            state = self._states.get((service, symbol))
+
+            if state is None:
+                state = [None] * len(schema.columns)
+                state[1] = symbol
+                self._states[(service, symbol)] = state
+
+            state[0] = timestamp
+
+            for key, value in update.items():
+
+                position = positions.get(key)
+
+                # Leave out the fields that aren't in the schema, like the ones that weren't subscribed to.
+                if position is None:
+                    continue
+
+                state[position] = None if value is None else coercions[position](value)
+
+            records.append(state.copy())
+
+        return records
+
+    def state(self, service: str, symbol: str) -> Dict[str, Any]:
+        """The last full state of a symbol.
+
+        Arguments:
+        ----
+        service {str} -- The name of the service.
+
+        symbol {str} -- The symbol.
+
+        Returns:
+        ----
+        {Dict[str, Any]} -- The value of each column, or an empty dictionary if
+            the symbol wasn't seen yet.
+        """
+
+        state = self._states.get((service, symbol))
+
+        if state is None:
+            return {}
+
+        return dict(zip(self._schemas[service].columns, state))
+
+    def reset(self) -> None:
+        """Forgets the state of every symbol, for example after the stream reconnects."""
+
+        self._states.clear()
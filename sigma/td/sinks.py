@@ -0,0 +1,696 @@
+import abc
+import csv
+import json
+import time
+import asyncio
+import pathlib
+import numpy as np
+
+from typing import Any
+from typing import List
+from typing import Dict
+from typing import Tuple
+from typing import Union
+from typing import Callable
+from typing import Optional
+
+from td.records import LevelOneSchema
+
+
+# The position of each value in a level two row, the other positions hold their labels.
+LEVEL_TWO_COLUMNS = {
+    'timestamp': 0,
+    'symbol': 1,
+    'service': 2,
+    'book_type': 3,
+    'section_id': 4,
+    'price': 6,
+    'total_size': 8,
+    'total_count': 10,
+    'mpid': 12,
+    'size': 14,
+    'time': 16
+}
+
+LEVEL_ONE_COLUMNS = {
+    'timestamp': 0,
+    'service': 1,
+    'field_id': 2,
+    'field_name': 3,
+    'value': 4
+}
+
+
+# The value a missing field is stored as in a column array, next to a mask of the missing values.
+FILL_VALUES = {
+    'float': np.nan,
+    'int': 0,
+    'bool': False,
+    'str': ''
+}
+
+DTYPES = {
+    'float': 'float64',
+    'int': 'int64',
+    'bool': 'bool',
+    'str': str
+}
+
+
+def level_two_path(file_path: Union[str, pathlib.Path]) -> pathlib.Path:
+    """The path the level two rows are written to, next to the level one file.
+
+    Arguments:
+    ----
+    file_path {Union[str, pathlib.Path]} -- The path of the level one file, for example `data_dump.csv`.
+
+    Returns:
+    ----
+    {pathlib.Path} -- The same path, with `_level_2` added to the name, for example `data_dump_level_2.csv`.
+    """
+
+    file_path = pathlib.Path(file_path)
+
+    return file_path.with_name(file_path.stem + '_level_2' + file_path.suffix)
+
+
+def records_path(file_path: Union[str, pathlib.Path], service: str) -> pathlib.Path:
+    """The path the wide level one records of a service are written to, next to the level one file.
+
+    Arguments:
+    ----
+    file_path {Union[str, pathlib.Path]} -- The path of the level one file, for example `data_dump.csv`.
+
+    service {str} -- The name of the service, for example `QUOTE`.
+
+    Returns:
+    ----
+    {pathlib.Path} -- The same path, with the service added to the name, for example `data_dump_quote.csv`.
+    """
+
+    file_path = pathlib.Path(file_path)
+
+    return file_path.with_name(file_path.stem + '_' + service.lower() + file_path.suffix)
+
+
+# Put on the queue to stop the writer, after the messages before it.
+_CLOSE = object()
+
+
+class StreamSink(abc.ABC):
+
+    """
+    The base class of the destinations the rows of a stream are written to.
+    A sink receives batches of level one and level two rows, in the layout
+    of `TDStreamerClient._message_rows`, from the `StreamWriter`'s thread,
+    so its methods can block on the disk without holding up the stream.
+    The wide level one records, see `LevelOneRecords`, come in a batch per
+    service, through `write_records`.
+    """
+
+    @abc.abstractmethod
+    def write_rows(self, level_one_rows: List[list], level_two_rows: List[list]) -> None:
+        """Writes a batch of rows.
+
+        Arguments:
+        ----
+        level_one_rows {List[list]} -- The level one rows, `[timestamp, service, field_id, field_name, value]`.
+
+        level_two_rows {List[list]} -- The level two rows, see `LEVEL_TWO_COLUMNS`.
+        """
+
+    @abc.abstractmethod
+    def write_records(self, schema: LevelOneSchema, records: List[list]) -> None:
+        """Writes a batch of wide level one records, all from the same service.
+
+        Arguments:
+        ----
+        schema {LevelOneSchema} -- The service, and the columns of the records.
+
+        records {List[list]} -- The records, in the order of `schema.columns`.
+        """
+
+    def flush(self) -> None:
+        """Makes sure the rows written so far are on disk."""
+
+        pass
+
+    def close(self) -> None:
+        """Flushes the rows, and closes the files."""
+
+        pass
+
+
+class CsvSink(StreamSink):
+
+    """Writes the rows to two CSV files, one for the level one services and one for the level two services."""
+
+    def __init__(self, file_path: Union[str, pathlib.Path], append_mode: bool = True) -> None:
+        """Initalizes the CsvSink object.
+
+        Arguments:
+        ----
+        file_path {Union[str, pathlib.Path]} -- The path of the level one file, the level two
+            file is written next to it, see `level_two_path`.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- If `True`, the rows are added to the existing files, otherwise
+            the files are written over. (default: {True})
+        """
+
+        mode = 'a+' if append_mode else 'w+'
+
+        self.file_path = pathlib.Path(file_path)
+        self._mode = mode
+        self._level_one_file = open(file=self.file_path, mode=mode, newline='')
+        self._level_two_file = open(file=level_two_path(file_path=self.file_path), mode=mode, newline='')
+
+        # The writers are created once, and write a whole batch at a time.
+        self._level_one_writer = csv.writer(self._level_one_file)
+        self._level_two_writer = csv.writer(self._level_two_file)
+
+        # The records of each service go to their own file, opened the first time the service is seen.
+        self._records_files = {}
+        self._records_writers = {}
+
+    def write_rows(self, level_one_rows: List[list], level_two_rows: List[list]) -> None:
+        self._level_one_writer.writerows(level_one_rows)
+        self._level_two_writer.writerows(level_two_rows)
+
+    def write_records(self, schema: LevelOneSchema, records: List[list]) -> None:
+
+        if schema.service not in self._records_files:
+
+            records_file = open(file=records_path(file_path=self.file_path, service=schema.service), mode=self._mode, newline='')
+            records_writer = csv.writer(records_file)
+
+            # A new file starts with the column names.
+            if records_file.tell() == 0:
+                records_writer.writerow(schema.columns)
+
+            self._records_files[schema.service] = records_file
+            self._records_writers[schema.service] = records_writer
+
+        self._records_writers[schema.service].writerows(records)
+
+    def flush(self) -> None:
+        self._level_one_file.flush()
+        self._level_two_file.flush()
+
+        for records_file in self._records_files.values():
+            records_file.flush()
+
+    def close(self) -> None:
+        self._level_one_file.close()
+        self._level_two_file.close()
+
+        for records_file in self._records_files.values():
+            records_file.close()
+
+
+class JsonLinesSink(StreamSink):
+
+    """Writes the rows to two line delimited JSON files, with one object per row."""
+
+    def __init__(self, file_path: Union[str, pathlib.Path], append_mode: bool = True) -> None:
+        """Initalizes the JsonLinesSink object.
+
+        Arguments:
+        ----
+        file_path {Union[str, pathlib.Path]} -- The path of the level one file, the level two
+            file is written next to it, see `level_two_path`.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- If `True`, the rows are added to the existing files, otherwise
+            the files are written over. (default: {True})
+        """
+
+        mode = 'a' if append_mode else 'w'
+
+        self.file_path = pathlib.Path(file_path)
+        self._level_one_file = open(file=self.file_path, mode=mode, encoding='utf-8')
+        self._level_two_file = open(file=level_two_path(file_path=self.file_path), mode=mode, encoding='utf-8')
+
+    def _write(self, file, columns: Dict[str, int], rows: List[list]) -> None:
+
+        if rows:
+            file.write(''.join(
+                json.dumps({name: row[index] for name, index in columns.items()}) + '\n'
+                for row in rows
+            ))
+
+    def write_rows(self, level_one_rows: List[list], level_two_rows: List[list]) -> None:
+        self._write(file=self._level_one_file, columns=LEVEL_ONE_COLUMNS, rows=level_one_rows)
+        self._write(file=self._level_two_file, columns=LEVEL_TWO_COLUMNS, rows=level_two_rows)
+
+    def write_records(self, schema: LevelOneSchema, records: List[list]) -> None:
+
+        # The records of every service share the level one file, each one says which service it's from.
+        columns = ('service',) + schema.columns
+        service = [schema.service]
+
+        self._level_one_file.write(''.join(
+            json.dumps(dict(zip(columns, service + record))) + '\n' for record in records
+        ))
+
+    def flush(self) -> None:
+        self._level_one_file.flush()
+        self._level_two_file.flush()
+
+    def close(self) -> None:
+        self._level_one_file.close()
+        self._level_two_file.close()
+
+
+class ColumnarSink(StreamSink):
+
+    """
+    Writes each batch of rows to a folder as column arrays, in a `.npz` file
+    per batch and level, like `level_1_000001.npz`. The timestamps are stored
+    as integers and the other columns as strings, since a field's values
+    can be numbers or text. Use `ColumnarSink.read` to load them back.
+
+    The wide level one records keep the type of each column, in a file per
+    batch and service, like `records_QUOTE_000002.npz`, and the missing
+    values are stored with a mask. Use `ColumnarSink.read_records` to load
+    them back.
+    """
+
+    def __init__(self, folder: Union[str, pathlib.Path]) -> None:
+        """Initalizes the ColumnarSink object.
+
+        Arguments:
+        ----
+        folder {Union[str, pathlib.Path]} -- The folder the batches are written to.
+        """
+
+        self.folder = pathlib.Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        # Carry on from the last batch, if the folder was written to before.
+        self._batch_number = len(list(self.folder.glob('*.npz')))
+
+    def _save(self, prefix: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Saves the arrays of a batch, under the next batch number."""
+
+        self._batch_number += 1
+        path = self.folder.joinpath('{prefix}_{number:06d}.npz'.format(prefix=prefix, number=self._batch_number))
+
+        # Write to a temporary file first, so a reader never sees half a batch.
+        temporary_path = path.with_suffix('.tmp')
+
+        with open(file=temporary_path, mode='wb') as batch_file:
+            np.savez(batch_file, **arrays)
+
+        temporary_path.replace(path)
+
+    def _write(self, level: int, columns: Dict[str, int], rows: List[list]) -> None:
+
+        if not rows:
+            return
+
+        arrays = {}
+
+        for name, index in columns.items():
+
+            values = [row[index] for row in rows]
+
+            if name == 'timestamp':
+                arrays[name] = np.asarray(values, dtype='int64')
+            else:
+                arrays[name] = np.asarray([str(value) for value in values], dtype=str)
+
+        self._save(prefix='level_{level}'.format(level=level), arrays=arrays)
+
+    def write_rows(self, level_one_rows: List[list], level_two_rows: List[list]) -> None:
+        self._write(level=1, columns=LEVEL_ONE_COLUMNS, rows=level_one_rows)
+        self._write(level=2, columns=LEVEL_TWO_COLUMNS, rows=level_two_rows)
+
+    def write_records(self, schema: LevelOneSchema, records: List[list]) -> None:
+
+        if not records:
+            return
+
+        arrays = {}
+
+        for index, (name, column_type) in enumerate(zip(schema.columns, schema.types)):
+
+            values = [record[index] for record in records]
+            missing = [value is None for value in values]
+
+            if any(missing):
+                fill_value = FILL_VALUES[column_type]
+                values = [fill_value if value is None else value for value in values]
+                arrays[name + '.mask'] = np.asarray(missing, dtype=bool)
+
+            arrays[name] = np.asarray(values, dtype=DTYPES[column_type])
+
+        self._save(prefix='records_{service}'.format(service=schema.service), arrays=arrays)
+
+    @staticmethod
+    def read_records(folder: Union[str, pathlib.Path], service: str) -> Dict[str, np.ndarray]:
+        """Reads the wide level one records of a service back, in the order they were written.
+
+        Arguments:
+        ----
+        folder {Union[str, pathlib.Path]} -- The folder the batches were written to.
+
+        service {str} -- The name of the service, for example `QUOTE`.
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- One array per column, in the type of the column. The
+            columns with missing values are masked arrays.
+
+        Usage:
+        ----
+            >>> quotes = pd.DataFrame(ColumnarSink.read_records(folder='data_dump', service='QUOTE'))
+        """
+
+        batches = []
+
+        for path in sorted(pathlib.Path(folder).glob('records_{service}_*.npz'.format(service=service))):
+            with np.load(path) as batch:
+                batches.append({name: batch[name] for name in batch.files})
+
+        columns = {}
+
+        for batch in batches:
+            for name in batch:
+                if not name.endswith('.mask'):
+                    columns.setdefault(name, [])
+
+        for name in columns:
+
+            arrays = [batch[name] for batch in batches]
+            masks = [batch.get(name + '.mask', np.zeros(len(batch[name]), dtype=bool)) for batch in batches]
+            masks = np.concatenate(masks)
+
+            if masks.any():
+                columns[name] = np.ma.masked_array(np.concatenate(arrays), mask=masks)
+            else:
+                columns[name] = np.concatenate(arrays)
+
+        return columns
+
+    @staticmethod
+    def read(folder: Union[str, pathlib.Path], level: int = 1) -> Dict[str, np.ndarray]:
+        """Reads the batches of a level back, in the order they were written.
+
+        Arguments:
+        ----
+        folder {Union[str, pathlib.Path]} -- The folder the batches were written to.
+
+        Keyword Arguments:
+        ----
+        level {int} -- The level of the rows, `1` or `2`. (default: {1})
+
+        Returns:
+        ----
+        {Dict[str, np.ndarray]} -- One array per column.
+        """
+
+        columns = LEVEL_ONE_COLUMNS if level == 1 else LEVEL_TWO_COLUMNS
+        batches = []
+
+        for path in sorted(pathlib.Path(folder).glob('level_{level}_*.npz'.format(level=level))):
+            with np.load(path) as batch:
+                batches.append({name: batch[name] for name in columns})
+
+        if not batches:
+            return {name: np.array([], dtype='int64' if name == 'timestamp' else str) for name in columns}
+
+        return {name: np.concatenate([batch[name] for batch in batches]) for name in columns}
+
+
+# The level one rows, the level two rows and the wide level one records of a message.
+ParsedMessage = Tuple[List[list], List[list], Dict[LevelOneSchema, List[list]]]
+
+
+class StreamWriter():
+
+    """
+    Takes the messages of a stream off the event loop, and writes them to
+    one or more sinks in batches.
+
+    Overview:
+    ----
+    The messages are put on a bounded queue as they're received, which only
+    costs a few microseconds. A background task turns them into rows and
+    hands a batch to the sinks once it has `batch_size` rows, or once
+    `flush_interval` seconds passed since the last batch. The sinks are run
+    in a worker thread, so a slow disk never holds up the websocket. If the
+    queue is full, the message is dropped and counted, or, if `drop_when_full`
+    is `False`, the stream waits for room, which pushes back on the server.
+    """
+
+    def __init__(self, sinks: List[StreamSink], parse_message: Callable[[Any], ParsedMessage],
+                 max_queue_size: int = 10000, batch_size: int = 1000, flush_interval: float = 1.0,
+                 drop_when_full: bool = True) -> None:
+        """Initalizes the StreamWriter object.
+
+        Arguments:
+        ----
+        sinks {List[StreamSink]} -- The sinks the rows are written to.
+
+        parse_message {Callable[[Any], ParsedMessage]} -- Turns a message into its level
+            one rows, its level two rows and its wide level one records, by schema.
+
+        Keyword Arguments:
+        ----
+        max_queue_size {int} -- The number of messages that can wait to be written. (default: {10000})
+
+        batch_size {int} -- The number of rows that are written at once. (default: {1000})
+
+        flush_interval {float} -- The longest number of seconds a row waits to be written. (default: {1.0})
+
+        drop_when_full {bool} -- If `True`, messages are dropped when the queue is full,
+            otherwise the stream waits for room in the queue. (default: {True})
+        """
+
+        self.sinks = list(sinks)
+        self.parse_message = parse_message
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_when_full = drop_when_full
+
+        self.received = 0
+        self.dropped = 0
+        self.written_rows = 0
+        self.batches = 0
+        self.errors = 0
+        self.waits = 0
+        self.max_queue_depth = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._level_one_rows = []
+        self._level_two_rows = []
+        self._records: Dict[LevelOneSchema, List[list]] = {}
+        self._record_count = 0
+        self._batch_started = time.monotonic()
+
+    def add_sink(self, sink: StreamSink) -> None:
+        """Adds a sink, which gets the rows of the next batches.
+
+        Arguments:
+        ----
+        sink {StreamSink} -- The sink to add.
+        """
+
+        self.sinks.append(sink)
+
+    def _start(self) -> None:
+        """Creates the queue and the background task, on the running event loop."""
+
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.ensure_future(self._run())
+
+    async def put(self, message: Any) -> bool:
+        """Queues a message to be written.
+
+        Arguments:
+        ----
+        message {Any} -- The message, in whatever form `parse_message` takes, like
+            the services of a decoded message.
+
+        Returns:
+        ----
+        {bool} -- `True` if the message was queued, `False` if it was dropped.
+        """
+
+        self._start()
+        self.received += 1
+
+        try:
+            self._queue.put_nowait(message)
+
+        except asyncio.QueueFull:
+
+            if self.drop_when_full:
+                self.dropped += 1
+                return False
+
+            self.waits += 1
+            await self._queue.put(message)
+
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+        return True
+
+    @property
+    def backpressure(self) -> float:
+        """How full the queue is, between `0.0` and `1.0`."""
+
+        if self._queue is None:
+            return 0.0
+
+        return self._queue.qsize() / self.max_queue_size
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """The counters of the writer.
+
+        Returns:
+        ----
+        {Dict[str, Any]} -- The messages `received`, `dropped` and still `queued`, the
+            `backpressure`, the deepest the queue got, the number of times the stream
+            waited for room, and the rows, batches and errors written.
+        """
+
+        return {
+            'received': self.received,
+            'dropped': self.dropped,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'backpressure': self.backpressure,
+            'max_queue_depth': self.max_queue_depth,
+            'waits': self.waits,
+            'written_rows': self.written_rows,
+            'batches': self.batches,
+            'errors': self.errors
+        }
+
+    async def _run(self) -> None:
+        """Moves the messages from the queue into batches, and writes them, until the writer is closed."""
+
+        while True:
+
+            # Only wait as long as the oldest row is allowed to.
+            timeout = None
+
+            if self._row_count:
+                timeout = self._batch_started + self.flush_interval - time.monotonic()
+
+            if timeout is not None and timeout <= 0:
+                message = None
+            else:
+                try:
+                    message = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    message = None
+
+            if message is _CLOSE:
+                break
+
+            if message is not None:
+                self._add_message(message=message)
+
+                # Take whatever else is waiting, without going back to the loop for each message.
+                while not self._queue.empty() and self._row_count < self.batch_size:
+
+                    message = self._queue.get_nowait()
+
+                    if message is _CLOSE:
+                        await self._write_batch()
+                        return
+
+                    self._add_message(message=message)
+
+            if self._row_count >= self.batch_size or message is None:
+                await self._write_batch()
+
+        await self._write_batch()
+
+    @property
+    def _row_count(self) -> int:
+        return len(self._level_one_rows) + len(self._level_two_rows) + self._record_count
+
+    def _add_message(self, message: Any) -> None:
+
+        if not self._row_count:
+            self._batch_started = time.monotonic()
+
+        try:
+            level_one_rows, level_two_rows, records = self.parse_message(message)
+        except Exception as error:
+            self.errors += 1
+            self.last_error = error
+            return
+
+        self._level_one_rows.extend(level_one_rows)
+        self._level_two_rows.extend(level_two_rows)
+
+        for schema, schema_records in records.items():
+            self._records.setdefault(schema, []).extend(schema_records)
+            self._record_count += len(schema_records)
+
+    async def _write_batch(self) -> None:
+        """Hands the rows collected so far to the sinks, in a worker thread."""
+
+        if not self._row_count:
+            return
+
+        row_count = self._row_count
+
+        level_one_rows, self._level_one_rows = self._level_one_rows, []
+        level_two_rows, self._level_two_rows = self._level_two_rows, []
+        records, self._records = self._records, {}
+        self._record_count = 0
+
+        loop = asyncio.get_event_loop()
+
+        try:
+            await loop.run_in_executor(None, self._write_to_sinks, level_one_rows, level_two_rows, records)
+        except Exception as error:
+            self.errors += 1
+            self.last_error = error
+            print('Could not write {count} rows of the stream: {error}'.format(count=row_count, error=error))
+            return
+
+        self.written_rows += row_count
+        self.batches += 1
+
+    def _write_to_sinks(self, level_one_rows: List[list], level_two_rows: List[list],
+                        records: Dict[LevelOneSchema, List[list]]) -> None:
+
+        for sink in self.sinks:
+
+            if level_one_rows or level_two_rows:
+                sink.write_rows(level_one_rows=level_one_rows, level_two_rows=level_two_rows)
+
+            for schema, schema_records in records.items():
+                sink.write_records(schema=schema, records=schema_records)
+
+            sink.flush()
+
+    async def close(self) -> None:
+        """Writes the messages still in the queue, and closes the sinks."""
+
+        if self._task is not None:
+
+            # The writer stops once it reaches the end of the queue.
+            if not self._task.done():
+                await self._queue.put(_CLOSE)
+                await self._task
+
+            self._task = None
+
+        await self._write_batch()
+
+        for sink in self.sinks:
+            sink.close()
@@ -1,6 +1,4 @@
 import asyncio
-import csv
-import io
 import json
 import os
 import textwrap
@@ -9,12 +7,27 @@ import urllib
 
 from typing import List
 from typing import Union
+from typing import Callable
 
 import websockets
+import websockets.client
 
 from td.enums import CSV_FIELD_KEYS
 from td.enums import CSV_FIELD_KEYS_LEVEL_2
 from td.enums import STREAM_FIELD_IDS
+from td.decoder import MessageDecoder
+from td.decoder import ServiceMessage
+from td.decoder import DATA_SECTIONS
+from td.order_book import OrderBooks
+from td.records import LevelOneRecords
+from td.sinks import ParsedMessage
+from td.sinks import StreamSink
+from td.sinks import StreamWriter
+from td.sinks import CsvSink
+from td.sinks import JsonLinesSink
+from td.sinks import ColumnarSink
+from td.supervisor import StreamGap
+from td.supervisor import StreamSupervisor
 
 
 class TDStreamerClient():
@@ -59,8 +72,10 @@ class TDStreamerClient():
         self.credentials = credentials
         self.user_principal_data = user_principal_data
         self.connection: websockets.WebSocketClientProtocol = None
-        self.file_stream_level_1: io.TextIOWrapper = None
-        self.file_stream_level_2: io.TextIOWrapper = None
+        self.stream_writer: StreamWriter = None
+        self.order_books: OrderBooks = None
+        self.supervisor: StreamSupervisor = None
+        self.level_one_format = 'long'
 
         # this will hold all of our requests
         self.data_requests = {"requests": []}
@@ -72,6 +87,15 @@ class TDStreamerClient():
         self.approved_writes_level_1 = list(self.fields_keys_write.keys())
         self.approved_writes_level_2 = list(self.fields_keys_write_level_2.keys())
 
+        # Types the level one updates of the subscribed fields, and keeps the last state of each symbol.
+        self.level_one_records = LevelOneRecords(
+            fields_keys=self.fields_keys_write,
+            subscribed_fields=self._subscribed_fields
+        )
+
+        # Decodes the messages, with the fastest JSON library that's installed.
+        self.decoder = MessageDecoder(level_one_records=self.level_one_records)
+
         self.print_to_console = True
         self.write_flag = False
 
@@ -83,23 +107,51 @@ class TDStreamerClient():
 
         self.unsubscribe_count = 0
 
-    def write_behavior(self, file_path: str, write: str = 'csv', append_mode: bool = True) -> None:        
-        """Sets the csv dump location and the append mode.
+    def write_behavior(self, file_path: str, write: str = 'csv', append_mode: bool = True, max_queue_size: int = 10000,
+                       batch_size: int = 1000, flush_interval: float = 1.0, drop_when_full: bool = True,
+                       level_one_format: str = 'long') -> None:
+        """Sets the dump location, the format and the append mode.
+
+        Overview:
+        ----
+        The messages are written off the event loop: each message is put on a
+        bounded queue as it's received, and a background task writes the rows
+        in batches, once there are `batch_size` of them or `flush_interval`
+        seconds passed. Use `sink_stats` to see how many messages were dropped,
+        and how full the queue is.
 
         Arguments:
         ----
 
-        file_path {str} -- Specifies where you would like the CSV file to be written to. 
-            If nothing is provided then current working directory is used.
+        file_path {str} -- Specifies where you would like the file to be written to. For
+            'columnar', it's the folder the batches are written to.
 
         Keyword Arguments:
         ----
         
-        write {str} -- Defines where you want to write the streaming data to. Right now can only specify
-            'csv'. (default: {'csv'})
+        write {str} -- Defines where you want to write the streaming data to. Can be 'csv',
+            'json' for line delimited JSON, or 'columnar' for a folder of column arrays. (default: {'csv'})
 
         append_mode {bool} -- Defines whether the write mode should be append or new. If append-mode is True, 
-            then all CSV data will go to the existing file. Can either be `True` or `False`. (default: {True})
+            then all the data will go to the existing file. Can either be `True` or `False`. (default: {True})
+
+        max_queue_size {int} -- The number of messages that can wait to be written. (default: {10000})
+
+        batch_size {int} -- The number of rows that are written at once. (default: {1000})
+
+        flush_interval {float} -- The longest number of seconds a row waits to be written. (default: {1.0})
+
+        drop_when_full {bool} -- If `True`, messages are dropped when the queue is full, otherwise
+            the stream waits for room in the queue. (default: {True})
+
+        level_one_format {str} -- With 'long', each level one field is written as its own row. With
+            'wide', each symbol update is written as one typed record, with every subscribed field
+            forward filled from the earlier updates, see `LevelOneRecords`. The records of a service
+            go to their own CSV file, like `data_dump_quote.csv`. (default: {'long'})
+
+        Raises:
+        ----
+        ValueError: If `write` or `level_one_format` isn't one of the formats.
 
         Usage:
         ----
@@ -113,29 +165,29 @@ class TDStreamerClient():
             >>> td_stream_session.write_behavior(file_path='data_dump.csv')
         """
 
+        if level_one_format not in ['long', 'wide']:
+            raise ValueError("The level one format must be one of: 'long', 'wide'.")
+
         if write == 'csv':
-            self.CSV_PATH = file_path
-            self.CSV_PATH_STREAM = self.CSV_PATH.replace(".csv", "_level_2.csv")
-
-            # Define Storage mode for CSV files.
-            if append_mode == True:
-                self.CSV_APPEND_MODE = 'a+'
-            elif append_mode == False:
-                self.CSV_APPEND_MODE = 'w+'
-
-            self.file_stream_level_1 = open(
-                file=self.CSV_PATH, 
-                mode=self.CSV_APPEND_MODE, 
-                newline=''
-            )
+            sink = CsvSink(file_path=file_path, append_mode=append_mode)
+        elif write == 'json':
+            sink = JsonLinesSink(file_path=file_path, append_mode=append_mode)
+        elif write == 'columnar':
+            sink = ColumnarSink(folder=file_path)
+        else:
+            raise ValueError("The write format must be one of: 'csv', 'json', 'columnar'.")
 
-            self.file_stream_level_2 = open(
-                file=self.CSV_PATH_STREAM,
-                mode=self.CSV_APPEND_MODE,
-                newline=''
-            )
+        self.level_one_format = level_one_format
 
-            self.write_flag = True
+        self.stream_writer = StreamWriter(
+            sinks=[sink],
+            parse_message=self._message_rows,
+            max_queue_size=max_queue_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            drop_when_full=drop_when_full
+        )
+        self.write_flag = True
 
     def _write_non_chart_services(self, data_content: dict, service_name: str) -> List:
         """Takes a Non-Chart Services and parses the values to write.
@@ -325,79 +377,168 @@ class TDStreamerClient():
         
         return all_data
 
-    async def _write_to_csv(self, data: dict) -> None:
-        """Writes the stream to a CSV file.
+    def _subscribed_fields(self, service: str) -> Union[List[str], None]:
+        """The field IDs a service was subscribed to.
 
-        Takes the data from a stream, determines which sections can be
-        written and then writes it to a CSV file for further manipulation.
+        Arguments:
+        ----
+        service {str} -- The name of the service.
+
+        Returns:
+        ----
+        {Union[List[str], None]} -- The field IDs of the subscriptions to the service,
+            or `None` if the service wasn't subscribed to.
+        """
+
+        fields = None
+
+        for request in self.data_requests['requests']:
+            if request['service'] == service and request['parameters'].get('fields'):
+                fields = (fields or []) + request['parameters']['fields'].split(',')
+
+        return fields
+
+    def _message_rows(self, data: Union[dict, List[ServiceMessage]]) -> ParsedMessage:
+        """Parses a message into the rows that can be written.
+
+        Takes the services of a message, determines which ones can be
+        written and turns them into level one and level two rows, each
+        starting with the timestamp of the service. If the level one
+        format is 'wide', the typed level one records the decoder made
+        are written instead, see `MessageDecoder.services`.
 
         Arguments:
         ----
-        data {dict} -- The data stream.
+        data {Union[dict, List[ServiceMessage]]} -- The services of a message, from
+            `MessageDecoder.services`, or the decoded message.
+
+        Returns:
+        ----
+        {ParsedMessage} -- The level one rows, the level two rows, and the
+            level one records by schema.
+
+        Raises:
+        ----
+        ValueError: If the level one format is 'wide', and the updates of a
+            level one service couldn't be converted to records.
         """
 
-        # Deterimne what part of the message we need to get.
-        if 'data' in data.keys():
-            data = data['data']
-        elif 'snapshot' in data.keys():
-            data = data['snapshot']
-        else:
-            return None
+        level_one_rows = []
+        level_two_rows = []
+        records = {}
+
+        if isinstance(data, dict):
+            data = self.decoder.services(message=data)
 
-        stream_writer_level_1 = csv.writer(self.file_stream_level_1)
-        stream_writer_level_2 = csv.writer(self.file_stream_level_2)
+        for service_message in data:
 
-        for service_result in data:
+            if service_message.section not in DATA_SECTIONS:
+                continue
 
-            # A Service response should have the following keys.
-            service_name = service_result['service']
-            service_timestamp = service_result['timestamp']
-            service_contents = service_result['content']
+            service_name = service_message.service
+            service_timestamp = service_message.timestamp
+            service_contents = service_message.content
 
             approved_level_1 = service_name in self.approved_writes_level_1
             approved_level_2 = service_name in self.approved_writes_level_2
             chart_history_service = service_name == 'CHART_HISTORY_FUTURES'
             active_service = 'ACTIVES_' in service_name
 
-            # Write the non-chart level 1 services.
-            if approved_level_1 and chart_history_service == False and active_service == False:
+            # Grab the non-chart level 1 services, as records.
+            if approved_level_1 and chart_history_service == False and active_service == False and self.level_one_format == 'wide':
 
-                # Grab the data
-                new_data = self._write_non_chart_services(data_content=service_contents, service_name=service_name)
+                if service_message.records is None:
+                    raise ValueError('The {service} updates could not be converted to records.'.format(service=service_name))
 
-                for row in new_data:
-                    new_row = [service_timestamp] + row
-                    stream_writer_level_1.writerow(new_row)  
+                records.setdefault(service_message.schema, []).extend(service_message.records)
+                continue
+
+            # Grab the non-chart level 1 services.
+            elif approved_level_1 and chart_history_service == False and active_service == False:
+                new_data = self._write_non_chart_services(data_content=service_contents, service_name=service_name)
+                rows = level_one_rows
 
-            # Write the Chart Services.
+            # Grab the Chart Services.
             elif approved_level_1 and chart_history_service and active_service == False:
-                
-                # Grab the data
                 new_data = self._write_chart_services(data_content=service_contents, service_name=service_name)
+                rows = level_one_rows
 
-                for row in new_data:
-                    new_row = [service_timestamp] + row
-                    stream_writer_level_1.writerow(new_row)  
-
-            # Write the Active Services.
+            # Grab the Active Services.
             elif approved_level_1 and chart_history_service == False and active_service:
-                
-                # Grab the data
                 new_data = self._write_active_services(data_content=service_contents, service_name=service_name)
+                rows = level_one_rows
 
-                for row in new_data:
-                    new_row = [service_timestamp] + row
-                    stream_writer_level_1.writerow(new_row)  
-
-            # Write the Level 2 Services
+            # Grab the Level 2 Services
             elif approved_level_2:
-                    
-                # Grab the data
                 new_data = self._write_level_two_services(data_content=service_contents, service_name=service_name)
+                rows = level_two_rows
+
+            else:
+                continue
+
+            rows.extend([service_timestamp] + row for row in new_data)
+
+        return level_one_rows, level_two_rows, records
+
+    def add_sink(self, sink: StreamSink) -> None:
+        """Adds another destination for the streaming data.
+
+        Arguments:
+        ----
+        sink {StreamSink} -- The sink, for example a `CsvSink`, `JsonLinesSink`,
+            `ColumnarSink` or your own subclass of `StreamSink`.
+
+        Usage:
+        ----
+            >>> td_stream_session.write_behavior(file_path='data_dump.csv')
+            >>> td_stream_session.add_sink(sink=ColumnarSink(folder='data_dump'))
+        """
+
+        if self.stream_writer is None:
+            self.stream_writer = StreamWriter(sinks=[sink], parse_message=self._message_rows)
+            self.write_flag = True
+        else:
+            self.stream_writer.add_sink(sink=sink)
+
+    def track_order_books(self, services: List[str] = None) -> OrderBooks:
+        """Keeps an in-memory order book for every symbol of the level two book services.
+
+        Keyword Arguments:
+        ----
+        services {List[str]} -- The services to build books from, by default every
+            book service, like `NASDAQ_BOOK`, `LISTED_BOOK` and `TOTAL_VIEW`. (default: {None})
+
+        Returns:
+        ----
+        {OrderBooks} -- The books, which are updated as the messages are received.
+
+        Usage:
+        ----
+            >>> td_stream_session.level_two_nasdaq(symbols=['MSFT'], fields=[0, 1, 2, 3])
+            >>> order_books = td_stream_session.track_order_books()
+            >>> td_stream_session.stream()
+            >>> order_books.book(symbol='MSFT').microprice()
+        """
+
+        self.order_books = OrderBooks(services=services)
+
+        return self.order_books
 
-                for row in new_data:
-                    new_row = [service_timestamp] + row
-                    stream_writer_level_2.writerow(new_row)
+    @property
+    def sink_stats(self) -> dict:
+        """The counters of the stream writer.
+
+        Returns:
+        ----
+        {dict} -- The messages received, dropped and queued, the backpressure on the
+            queue, and the rows written, see `StreamWriter.stats`. Empty if nothing
+            is being written.
+        """
+
+        if self.stream_writer is None:
+            return {}
+
+        return self.stream_writer.stats
 
     async def unsubscribe(self, service: str) -> dict:
         """Unsubscribe from a service.
@@ -514,7 +655,7 @@ class TDStreamerClient():
 
         return await self._receive_message(return_value=True)
 
-    def stream(self, print_to_console: bool = True) -> None:
+    def stream(self, print_to_console: bool = True, reconnect: bool = True) -> None:
         """Starts the stream and prints the output to the console.
 
         Initalizes the stream by building a login request, starting 
@@ -525,11 +666,26 @@ class TDStreamerClient():
         ----
         print_to_console {bool} -- Specifies whether the content is to be printed
             to the console or not. (default: {True})
+
+        reconnect {bool} -- If `True`, the stream reconnects and subscribes again
+            when the connection drops, see `supervise`. Otherwise the stream is
+            closed. (default: {True})
         """        
 
         # Print it to the console.
         self.print_to_console = print_to_console
 
+        # Let the supervisor connect, and keep the stream connected.
+        if reconnect:
+
+            if self.supervisor is None:
+                self.supervise()
+
+            asyncio.ensure_future(self._supervise())
+            self.loop.run_forever()
+
+            return
+
         # Connect to the Websocket.
         self.loop.run_until_complete(self._connect())
 
@@ -542,6 +698,73 @@ class TDStreamerClient():
         # Keep the Loop going, until an exception is reached.
         self.loop.run_forever()
 
+    def supervise(self, initial_delay: float = 1.0, max_delay: float = 60.0, max_attempts: int = None,
+                  on_gap: Callable[[StreamGap], None] = None) -> StreamSupervisor:
+        """Sets how the stream reconnects when the connection drops.
+
+        Arguments:
+        ----
+        See `StreamSupervisor`.
+
+        Keyword Arguments:
+        ----
+        initial_delay {float} -- The number of seconds to wait before the first reconnect,
+            doubled after each failed attempt. (default: {1.0})
+
+        max_delay {float} -- The longest number of seconds to wait between attempts. (default: {60.0})
+
+        max_attempts {int} -- The number of failed attempts in a row before giving up, and
+            closing the stream. If not provided, it never gives up. (default: {None})
+
+        on_gap {Callable[[StreamGap], None]} -- Called with each interval the stream was
+            down, once it's back. (default: {None})
+
+        Returns:
+        ----
+        {StreamSupervisor} -- The supervisor, which keeps the gaps.
+
+        Usage:
+        ----
+            >>> td_stream_session.level_one_quotes(symbols=['MSFT'], fields=list(range(0, 10)))
+            >>> td_stream_session.supervise(on_gap=lambda gap: print(gap))
+            >>> td_stream_session.stream()
+        """
+
+        self.supervisor = StreamSupervisor(
+            stream_client=self,
+            initial_delay=initial_delay,
+            max_delay=max_delay,
+            max_attempts=max_attempts,
+            on_gap=on_gap
+        )
+
+        return self.supervisor
+
+    @property
+    def gaps(self) -> List[StreamGap]:
+        """The intervals the stream was down, while it reconnected.
+
+        Returns:
+        ----
+        {List[StreamGap]} -- The start and end of each gap, in milliseconds since the
+            epoch, why the connection dropped, and the number of attempts to reconnect.
+        """
+
+        if self.supervisor is None:
+            return []
+
+        return self.supervisor.gaps
+
+    async def _supervise(self) -> None:
+        """Runs the supervisor, and closes the stream once it stops or gives up."""
+
+        try:
+            await self.supervisor.run()
+        except ConnectionError as error:
+            print(error)
+        finally:
+            await self.close_stream()
+
     def close_logic(self, logic_type: str) -> bool:
         """Defines how the stream should close.
 
@@ -564,8 +787,17 @@ class TDStreamerClient():
     async def close_stream(self) -> None:
         """Closes the connection to the streaming service."""        
         
+        # Stop the supervisor from reconnecting.
+        if self.supervisor is not None and not self.supervisor.is_stopping:
+            await self.supervisor.stop()
+
         # close the connection.
-        await self.connection.close()
+        if self.connection is not None:
+            await self.connection.close()
+
+        # Write what's left in the queue, and close the files.
+        if self.stream_writer is not None:
+            await self.stream_writer.close()
 
         # Define the Message.
         message = textwrap.dedent("""
@@ -582,7 +814,7 @@ class TDStreamerClient():
 
         # Stop the loop.
         if self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop())
+            self.loop.call_soon_threadsafe(self.loop.stop)
             print(message)
             await asyncio.sleep(3)
 
@@ -700,25 +932,11 @@ class TDStreamerClient():
                 # Parse Message
                 message_decoded = await self._parse_json_message(message=message)
 
-                # Write the data if needed.
-                if self.write_flag:
-                    try:
-                        await self._write_to_csv(data = message_decoded)
-                    except:
-                        print('Could not write content to CSV file, closing stream')
-                        await self.close_stream()
-                        break
-
                 if return_value:
+                    await self._handle_message(message_decoded=message_decoded, print_message=False)
                     return message_decoded
 
-                elif self.print_to_console:
-                    print('='*20)
-                    print('Message Received:')
-                    print('-'*20)
-                    print(message_decoded)
-                    print('-'*20)
-                    print('')         
+                await self._handle_message(message_decoded=message_decoded)
 
             except websockets.exceptions.ConnectionClosed:
 
@@ -726,6 +944,43 @@ class TDStreamerClient():
                 await self.close_stream()
                 break           
 
+    async def _handle_message(self, message_decoded: dict, print_message: bool = True) -> None:
+        """Updates the order books, queues the message to be written, and prints it.
+
+        Overview:
+        ----
+        The message is split into its services once, with the level one updates
+        typed, see `MessageDecoder.services`, and the order books and the writer
+        both read those records.
+
+        Arguments:
+        ----
+        message_decoded {dict} -- The decoded message.
+
+        Keyword Arguments:
+        ----
+        print_message {bool} -- Whether the message can be printed, if printing
+            to the console is on. (default: {True})
+        """
+
+        service_messages = self.decoder.services(message=message_decoded)
+
+        # Keep the order books up to date.
+        if self.order_books is not None:
+            self.order_books.update(message=service_messages)
+
+        # Queue the data to be written, the writer runs in the background.
+        if self.write_flag:
+            await self.stream_writer.put(message=service_messages)
+
+        if print_message and self.print_to_console:
+            print('='*20)
+            print('Message Received:')
+            print('-'*20)
+            print(message_decoded)
+            print('-'*20)
+            print('')
+
     async def _parse_json_message(self, message: str) -> dict:
         """Parses incoming messages from the stream
 
@@ -738,13 +993,7 @@ class TDStreamerClient():
         dict -- A python dictionary containing the original values.
         """
 
-        try:
-            message_decoded = json.loads(message)
-        except:
-            message = message.encode('utf-8').replace(b'\xef\xbf\xbd', bytes('"None"','utf-8')).decode('utf-8')
-            message_decoded = json.loads(message)
-
-        return message_decoded
+        return self.decoder.loads(message=message)
 
     async def heartbeat(self) -> None:
         """Sending heartbeat to server every 5 seconds."""
@@ -754,7 +1003,11 @@ class TDStreamerClient():
                 await self.connection.send('ping')
                 await asyncio.sleep(5)
             except websockets.exceptions.ConnectionClosed:
-                self.close_stream()
+
+                # The supervisor reconnects on its own, otherwise the stream is done.
+                if self.supervisor is None:
+                    await self.close_stream()
+
                 break
 
     def _new_request_template(self) -> dict:
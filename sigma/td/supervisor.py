@@ -0,0 +1,269 @@
+import time
+import random
+import asyncio
+import collections
+
+from websockets.exceptions import ConnectionClosed
+from websockets.exceptions import WebSocketException
+
+from typing import List
+from typing import Callable
+from typing import Optional
+
+
+# An interval the stream was down, in milliseconds since the epoch, from the last message
+# before the connection dropped to when the subscriptions were sent again.
+StreamGap = collections.namedtuple('StreamGap', ['start', 'end', 'reason', 'attempts'])
+
+# The errors that mean the connection, or the login, failed and can be tried again.
+CONNECTION_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    WebSocketException,
+)
+
+
+def _now() -> int:
+    """The time, in milliseconds since the epoch, like the timestamps of the stream."""
+
+    return int(time.time() * 1000)
+
+
+class StreamSupervisor():
+
+    """
+    Keeps a `TDStreamerClient` connected, reconnecting when the connection
+    drops instead of letting the stream die.
+
+    Overview:
+    ----
+    After a dropped connection the supervisor waits, connects and logs in
+    again with `_build_login_request`, and sends the subscriptions of
+    `data_requests` again. The wait starts at `initial_delay` and grows by
+    `multiplier` after each failed attempt, up to `max_delay`, with some
+    jitter so many clients don't all reconnect at once. Every interval the
+    stream was down is kept in `gaps`, so the consumers know which data
+    they missed and can fill it in from the price history.
+    """
+
+    def __init__(self, stream_client, initial_delay: float = 1.0, max_delay: float = 60.0, multiplier: float = 2.0,
+                 jitter: float = 0.1, max_attempts: int = None, login_timeout: float = 10.0,
+                 on_gap: Callable[[StreamGap], None] = None) -> None:
+        """Initalizes the StreamSupervisor object.
+
+        Arguments:
+        ----
+        stream_client {TDStreamerClient} -- The streaming client, with its subscriptions.
+
+        Keyword Arguments:
+        ----
+        initial_delay {float} -- The number of seconds to wait before the first reconnect. (default: {1.0})
+
+        max_delay {float} -- The longest number of seconds to wait between attempts. (default: {60.0})
+
+        multiplier {float} -- How much longer to wait after each failed attempt. (default: {2.0})
+
+        jitter {float} -- The fraction the wait is randomly made longer or shorter by. (default: {0.1})
+
+        max_attempts {int} -- The number of failed attempts in a row before giving up. If not
+            provided, the supervisor never gives up. (default: {None})
+
+        login_timeout {float} -- The number of seconds to wait for the response to the login. (default: {10.0})
+
+        on_gap {Callable[[StreamGap], None]} -- Called with each gap, once the stream is back. (default: {None})
+        """
+
+        self.stream_client = stream_client
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.login_timeout = login_timeout
+        self.on_gap = on_gap
+
+        self.gaps: List[StreamGap] = []
+        self.connections = 0
+        self.failed_attempts = 0
+        self.last_message_at: Optional[int] = None
+        self.last_error: Optional[BaseException] = None
+
+        self._stop_event: asyncio.Event = None
+
+    @property
+    def reconnects(self) -> int:
+        """The number of times the stream was connected again, after the first time."""
+
+        return max(self.connections - 1, 0)
+
+    @property
+    def is_stopping(self) -> bool:
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    def delay(self, attempt: int) -> float:
+        """The number of seconds to wait before an attempt to reconnect.
+
+        Arguments:
+        ----
+        attempt {int} -- The attempt, starting at `1`.
+
+        Returns:
+        ----
+        {float} -- The wait, with jitter.
+        """
+
+        delay = min(self.initial_delay * self.multiplier ** (attempt - 1), self.max_delay)
+
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def run(self) -> None:
+        """Streams until `stop` is called, reconnecting whenever the connection drops.
+
+        Raises:
+        ----
+        ConnectionError: If `max_attempts` attempts in a row failed.
+        """
+
+        self._stop_event = asyncio.Event()
+
+        attempt = 0
+        disconnected_at = None
+        reason = None
+
+        while not self.is_stopping:
+
+            if attempt > 0 and await self._wait(seconds=self.delay(attempt=attempt)):
+                break
+
+            try:
+                await self._connect()
+
+            except CONNECTION_ERRORS as error:
+
+                attempt += 1
+                self.failed_attempts += 1
+                self.last_error = error
+                reason = reason or str(error)
+
+                print('Could not connect to the stream (attempt {attempt}): {error}'.format(attempt=attempt, error=error))
+
+                # Don't leave a connection open that didn't log in.
+                if self.stream_client.connection is not None:
+                    await self.stream_client.connection.close()
+
+                if self.max_attempts is not None and attempt >= self.max_attempts:
+                    raise ConnectionError(
+                        'Gave up reconnecting to the stream after {attempts} attempts.'.format(attempts=attempt)
+                    ) from error
+
+                continue
+
+            self.connections += 1
+
+            if disconnected_at is not None:
+                self._add_gap(start=disconnected_at, reason=reason, attempts=attempt)
+
+            attempt = 0
+            reason = None
+
+            try:
+                await self._receive()
+
+            except ConnectionClosed as error:
+
+                if self.is_stopping:
+                    break
+
+                self.last_error = error
+                reason = str(error)
+
+                print('The stream was disconnected, reconnecting: {error}'.format(error=error))
+
+            # Measure the gap from the last message, or from now if none came in.
+            disconnected_at = self.last_message_at or _now()
+            attempt = 1
+
+    async def stop(self) -> None:
+        """Stops the stream, closing the connection."""
+
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+        if self.stream_client.connection is not None:
+            await self.stream_client.connection.close()
+
+    async def _wait(self, seconds: float) -> bool:
+        """Waits before the next attempt, returns `True` if the supervisor was stopped in the meantime."""
+
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+    async def _connect(self) -> None:
+        """Connects, logs in, and sends the subscriptions again."""
+
+        stream_client = self.stream_client
+
+        connection = await stream_client._connect()
+
+        if connection is None:
+            raise ConnectionError('The connection was closed before it was opened.')
+
+        await asyncio.wait_for(self._login_response(), timeout=self.login_timeout)
+
+        # The first updates after subscribing are full again, so start the records over.
+        if stream_client.level_one_records is not None:
+            stream_client.level_one_records.reset()
+
+        if stream_client.data_requests['requests']:
+            await stream_client._send_message(stream_client._build_data_request())
+
+    async def _login_response(self) -> None:
+        """Waits for the response to the login, handling any other messages that come first."""
+
+        stream_client = self.stream_client
+
+        while True:
+
+            message = await stream_client.connection.recv()
+            message_decoded = await stream_client._parse_json_message(message=message)
+
+            for response in message_decoded.get('response', []):
+                if response.get('service') == 'ADMIN' and response.get('command') == 'LOGIN':
+
+                    content = response.get('content', {})
+
+                    if content.get('code', 0) != 0:
+                        raise ConnectionRefusedError(
+                            'The login was refused: {msg}'.format(msg=content.get('msg'))
+                        )
+
+                    return
+
+            await stream_client._handle_message(message_decoded=message_decoded)
+
+    async def _receive(self) -> None:
+        """Receives and handles the messages, until the connection drops."""
+
+        stream_client = self.stream_client
+
+        while not self.is_stopping:
+
+            message = await stream_client.connection.recv()
+            self.last_message_at = _now()
+
+            message_decoded = await stream_client._parse_json_message(message=message)
+            await stream_client._handle_message(message_decoded=message_decoded)
+
+    def _add_gap(self, start: int, reason: str, attempts: int) -> None:
+
+        gap = StreamGap(start=start, end=_now(), reason=reason, attempts=attempts)
+        self.gaps.append(gap)
+
+        print('The stream is back, data from {start} to {end} was missed.'.format(start=gap.start, end=gap.end))
+
+        if self.on_gap:
+            self.on_gap(gap)
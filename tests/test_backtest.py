@@ -0,0 +1,201 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.trades import Trade
+from pyrobot.signals import Condition
+from pyrobot.signals import SignalEvaluator
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.backtest import Backtester
+from pyrobot.backtest import SimulatedBroker
+from pyrobot.backtest import vectorized_backtest
+
+
+def create_trade(symbol: str, enter_or_exit: str, order_type: str = 'mkt', price: float = 0.0) -> Trade:
+    """Creates a single leg trade for 10 shares."""
+
+    trade = Trade()
+    trade.new_trade(
+        trade_id='{symbol}_{enter_or_exit}'.format(symbol=symbol, enter_or_exit=enter_or_exit),
+        order_type=order_type,
+        side='long',
+        enter_or_exit=enter_or_exit,
+        price=price
+    )
+    trade.instrument(symbol=symbol, quantity=10, asset_type='EQUITY')
+
+    return trade
+
+
+def create_bars(closes: dict) -> list:
+    """Creates one minute bars, where each bar opens at the last close."""
+
+    bars = []
+
+    for symbol, symbol_closes in closes.items():
+        for minute, close in enumerate(symbol_closes):
+            open_price = symbol_closes[minute - 1] if minute else close
+            bars.append({
+                'symbol': symbol,
+                'datetime': 1586390400000 + minute * 60000,
+                'open': open_price,
+                'close': close,
+                'high': max(open_price, close) + 0.5,
+                'low': min(open_price, close) - 0.5,
+                'volume': 1000.0
+            })
+
+    return bars
+
+
+class SimulatedBrokerTest(TestCase):
+
+    """Will perform a unit test for the `SimulatedBroker` object."""
+
+    def setUp(self) -> None:
+        """Set up a broker with slippage."""
+
+        self.broker = SimulatedBroker(cash=10000.0, slippage=0.01)
+
+    def test_market_orders_fill_on_the_next_open(self):
+        """Market orders fill at the next open, and pay the slippage."""
+
+        self.broker.submit(order=create_trade(symbol='MSFT', enter_or_exit='enter').order, timestamp=1)
+
+        self.assertEqual(self.broker.process_bar(symbol='MSFT', timestamp=1, open_price=100.0, high_price=101.0, low_price=99.0), [])
+
+        fills = self.broker.process_bar(symbol='MSFT', timestamp=2, open_price=100.0, high_price=101.0, low_price=99.0)
+
+        self.assertAlmostEqual(fills[0]['price'], 101.0)
+        self.assertEqual(self.broker.positions['MSFT'], 10)
+        self.assertAlmostEqual(self.broker.cash, 10000.0 - 1010.0)
+
+    def test_box_range_children_cancel_each_other(self):
+        """The take profit and the stop loss are sent when the entry fills, and only one fills."""
+
+        trade = create_trade(symbol='MSFT', enter_or_exit='enter', order_type='lmt', price=100.0)
+        trade.add_box_range(profit_size=0.05, percentage=True)
+
+        self.broker.submit(order=trade.order, timestamp=1)
+
+        # The limit isn't reached, then it is.
+        self.broker.process_bar(symbol='MSFT', timestamp=2, open_price=102.0, high_price=103.0, low_price=101.0)
+        self.broker.process_bar(symbol='MSFT', timestamp=3, open_price=101.0, high_price=101.5, low_price=99.5)
+
+        # The take profit at 105 fills, the stop loss at 95 is cancelled.
+        self.broker.process_bar(symbol='MSFT', timestamp=4, open_price=104.0, high_price=106.0, low_price=94.0)
+        self.broker.process_bar(symbol='MSFT', timestamp=5, open_price=90.0, high_price=91.0, low_price=89.0)
+
+        self.assertEqual([(fill['instruction'], fill['price']) for fill in self.broker.fills], [('BUY', 100.0), ('SELL', 105.0)])
+        self.assertEqual(self.broker.positions['MSFT'], 0)
+        self.assertEqual([order['status'] for order in self.broker.orders], ['FILLED', 'FILLED', 'CANCELED'])
+
+    def test_selling_without_a_position_is_rejected(self):
+        """You can't sell shares you don't own."""
+
+        self.broker.submit(order=create_trade(symbol='MSFT', enter_or_exit='exit').order, timestamp=1)
+        self.broker.process_bar(symbol='MSFT', timestamp=2, open_price=100.0, high_price=101.0, low_price=99.0)
+
+        self.assertEqual(self.broker.orders[0]['status'], 'REJECTED')
+        self.assertEqual(self.broker.fills, [])
+
+
+class BacktesterTest(TestCase):
+
+    """Will perform a unit test for the `Backtester` object."""
+
+    def setUp(self) -> None:
+        """Set up a rising and a falling symbol."""
+
+        self.bars = create_bars(closes={
+            'UP': [10.0 + minute for minute in range(30)],
+            'DOWN': [50.0 - minute for minute in range(30)]
+        })
+
+    def test_replay_trades_on_signals(self):
+        """The replay goes through the indicators and signals, and trades on the next bar."""
+
+        backtester = Backtester(
+            bars=self.bars,
+            warmup_bars=5,
+            trades_to_execute={
+                'UP': {'trade_func': create_trade(symbol='UP', enter_or_exit='enter')},
+                'DOWN': {'trade_func': create_trade(symbol='DOWN', enter_or_exit='enter')}
+            }
+        )
+        self.addCleanup(backtester.close)
+        backtester.indicators.sma(period=3)
+        backtester.indicators.set_signal_rules(
+            buy_rule=Condition('close', '>', 'sma') & Condition('close', '>=', 30.0)
+        )
+
+        backtest_result = backtester.run()
+
+        # The rule first holds on the close of 30, so the first buy is at the next open of 30.
+        self.assertEqual(backtest_result.fills[0]['symbol'], 'UP')
+        self.assertEqual(backtest_result.fills[0]['price'], 30.0)
+        self.assertEqual(backtest_result.fills[0]['datetime'], 1586390400000 + 21 * 60000)
+        self.assertTrue(all(fill['symbol'] == 'UP' for fill in backtest_result.fills))
+
+        self.assertEqual(backtest_result.bars, 50)
+        self.assertEqual(backtest_result.equity.size, 25)
+        self.assertGreater(backtest_result.summary()['total_return'], 0.0)
+
+        # The orders went through `PyRobot.execute_signals`, which tracks the ownership and saves the orders.
+        portfolio = backtester.trading_robot.portfolio
+
+        self.assertTrue(portfolio.get_ownership_status(symbol='UP'))
+        self.assertFalse(portfolio.get_ownership_status(symbol='DOWN'))
+        self.assertTrue(backtester.trades_to_execute['UP']['has_executed'])
+
+        journaled_orders = backtester.order_journal.orders_for_symbol(symbol='UP')
+
+        self.assertEqual(len(journaled_orders), len(backtester.order_responses))
+        self.assertEqual(journaled_orders[0]['order_id'], backtest_result.orders[0]['order_id'])
+
+    def test_vectorized_backtest(self):
+        """The fast path goes long on the next open, and flat again after a sell."""
+
+        stock_frame = StockFrame(data=self.bars)
+        indicator_client = Indicators(price_data_frame=stock_frame, engine='numpy')
+        indicator_client.sma(period=3)
+
+        signal_evaluator = SignalEvaluator(
+            buy_rule=Condition('close', '>', 'sma'),
+            sell_rule=Condition('close', '>=', 35.0)
+        )
+
+        results = vectorized_backtest(stock_frame=stock_frame, signal_evaluator=signal_evaluator)
+
+        self.assertEqual(results['symbol'].tolist(), ['DOWN', 'UP'])
+        self.assertEqual(results['number_of_trades'].tolist(), [0.0, 2.0])
+
+        # UP is bought on the open of 12, after the sma is first available, and sold on the open of 35.
+        self.assertAlmostEqual(results['total_return'][1], 35.0 / 12.0 - 1.0)
+        self.assertEqual(results['total_return'][0], 0.0)
+        np.testing.assert_allclose(results['max_drawdown'], [0.0, 0.0], atol=1e-12)
+
+    def test_vectorized_backtest_drawdown(self):
+        """The drawdown starts again for each symbol."""
+
+        bars = create_bars(closes={'A': [10.0, 10.0, 12.0, 9.0, 9.0], 'B': [10.0, 10.0, 11.0, 12.0, 12.0]})
+        stock_frame = StockFrame(data=bars)
+        results = vectorized_backtest(
+            stock_frame=stock_frame,
+            signal_evaluator=SignalEvaluator(buy_rule=Condition('close', '>', 0.0))
+        )
+
+        np.testing.assert_allclose(results['max_drawdown'], [0.25, 0.0], atol=1e-12)
+        np.testing.assert_allclose(results['total_return'], [-0.1, 0.2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,248 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.bar_buffer import BarBuffer
+from pyrobot.bar_buffer import BAR_COLUMNS
+from pyrobot.bar_buffer import SymbolBarBuffer
+from pyrobot.stock_frame import StockFrame
+
+
+def create_values(closes: list) -> np.ndarray:
+    """Creates the bar values, one row per column in `BAR_COLUMNS`, from the closes."""
+
+    closes = np.asarray(closes, dtype='float64')
+
+    return np.vstack([closes - 0.5, closes, closes + 1.0, closes - 1.0, np.full(closes.size, 1000.0)])
+
+
+class SymbolBarBufferTest(TestCase):
+
+    """Will perform a unit test for the `SymbolBarBuffer` object."""
+
+    def setUp(self) -> None:
+        """Set up a buffer with five bars, one per minute."""
+
+        self.symbol_buffer = SymbolBarBuffer(initial_capacity=4)
+        self.symbol_buffer.extend(
+            datetime=np.arange(5, dtype='int64') * 60000,
+            values=create_values(closes=[100.0, 101.0, 102.0, 103.0, 104.0])
+        )
+
+    def test_append_grows_the_buffer(self):
+        """Appending past the capacity doubles it, and keeps the bars."""
+
+        self.assertEqual(len(self.symbol_buffer), 5)
+        self.assertEqual(self.symbol_buffer._capacity, 8)
+
+        for minute in range(5, 20):
+            self.symbol_buffer.extend(
+                datetime=np.array([minute * 60000], dtype='int64'),
+                values=create_values(closes=[100.0 + minute])
+            )
+
+        self.assertEqual(len(self.symbol_buffer), 20)
+        self.assertEqual(self.symbol_buffer._capacity, 32)
+        np.testing.assert_array_equal(self.symbol_buffer.datetime, np.arange(20) * 60000)
+        np.testing.assert_array_equal(self.symbol_buffer.column('close'), 100.0 + np.arange(20))
+
+        # Appending in order isn't a rewrite.
+        self.assertEqual(self.symbol_buffer.rewrites, 0)
+
+    def test_same_timestamp_replaces_the_last_bar(self):
+        """A bar with the timestamp of the last bar replaces it, and more bars can follow it."""
+
+        self.symbol_buffer.extend(
+            datetime=np.array([4, 5], dtype='int64') * 60000,
+            values=create_values(closes=[50.0, 105.0])
+        )
+
+        self.assertEqual(len(self.symbol_buffer), 6)
+        np.testing.assert_array_equal(self.symbol_buffer.column('close'), [100.0, 101.0, 102.0, 103.0, 50.0, 105.0])
+
+        self.assertEqual(self.symbol_buffer.rewrites, 1)
+        self.assertEqual(self.symbol_buffer.rewritten_from, 4)
+
+    def test_out_of_order_bars_are_merged(self):
+        """Older bars are merged in sorted, and replace the bars with the same timestamp."""
+
+        self.symbol_buffer.extend(
+            datetime=np.array([6, 1, 2], dtype='int64') * 60000 + np.array([0, 30000, 0]),
+            values=create_values(closes=[106.0, 101.5, 20.0])
+        )
+
+        np.testing.assert_array_equal(
+            self.symbol_buffer.datetime,
+            np.array([0, 60000, 90000, 120000, 180000, 240000, 360000])
+        )
+        np.testing.assert_array_equal(
+            self.symbol_buffer.column('close'),
+            [100.0, 101.0, 101.5, 20.0, 103.0, 104.0, 106.0]
+        )
+
+        self.assertEqual(self.symbol_buffer.rewrites, 1)
+        self.assertEqual(self.symbol_buffer.rewritten_from, 2)
+
+        # Replacing the last bar again is one more rewrite, from the last bar.
+        self.symbol_buffer.extend(
+            datetime=np.array([360000], dtype='int64'),
+            values=create_values(closes=[107.0])
+        )
+
+        self.assertEqual(self.symbol_buffer.rewrites, 2)
+        self.assertEqual(self.symbol_buffer.rewritten_from, 6)
+        self.assertEqual(self.symbol_buffer.column('close')[-1], 107.0)
+
+    def test_values_are_views(self):
+        """The columns are views on the buffer, without copies."""
+
+        self.assertTrue(np.shares_memory(self.symbol_buffer.column('close'), self.symbol_buffer.values))
+        self.assertEqual(self.symbol_buffer.values.shape, (len(BAR_COLUMNS), 5))
+
+
+class BarBufferTest(TestCase):
+
+    """Will perform a unit test for the `BarBuffer` object."""
+
+    def test_extend_splits_the_symbols(self):
+        """A batch with several symbols goes to one buffer per symbol, and `to_frame` sorts them."""
+
+        bar_buffer = BarBuffer()
+
+        bar_buffer.extend(
+            symbols=['MSFT', 'AAPL', 'MSFT'],
+            datetime=[0, 0, 60000],
+            columns={column: [1.0, 2.0, 3.0] for column in BAR_COLUMNS}
+        )
+
+        self.assertEqual(bar_buffer.symbols, ['AAPL', 'MSFT'])
+        self.assertEqual(len(bar_buffer), 3)
+        self.assertEqual(bar_buffer.version, 1)
+        np.testing.assert_array_equal(bar_buffer.symbol('MSFT').column('close'), [1.0, 3.0])
+
+        frame = bar_buffer.to_frame()
+
+        self.assertEqual(list(frame.index.get_level_values('symbol')), ['AAPL', 'MSFT', 'MSFT'])
+        self.assertEqual(list(frame['close']), [2.0, 1.0, 3.0])
+        self.assertTrue(frame.index.is_monotonic_increasing)
+
+    def test_single_bar_as_scalars(self):
+        """A single bar can be passed as scalars."""
+
+        bar_buffer = BarBuffer()
+        bar_buffer.extend(symbols='MSFT', datetime=0, columns={column: 1.0 for column in BAR_COLUMNS})
+
+        self.assertEqual(len(bar_buffer.symbol('MSFT')), 1)
+
+
+class StockFrameBufferTest(TestCase):
+
+    """Will perform a unit test for the buffer behind a `StockFrame`."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with three bars of MSFT, and an indicator column."""
+
+        self.stock_frame = StockFrame(
+            data=[
+                {
+                    'symbol': 'MSFT',
+                    'datetime': minute * 60000,
+                    'open': 100.0,
+                    'close': 100.0 + minute,
+                    'high': 101.0,
+                    'low': 99.0,
+                    'volume': 1000.0
+                }
+                for minute in range(3)
+            ]
+        )
+
+        self.stock_frame.frame['sma'] = [1.0, 2.0, 3.0]
+
+    def test_other_columns_are_carried_over(self):
+        """Indicator columns are kept for the old bars, and left empty for the new ones."""
+
+        self.stock_frame.add_rows(
+            data={
+                'symbol': ['MSFT'],
+                'datetime': [3 * 60000],
+                'open': [100.0],
+                'close': [103.0],
+                'high': [101.0],
+                'low': [99.0],
+                'volume': [1000.0]
+            }
+        )
+
+        frame = self.stock_frame.frame
+
+        self.assertEqual(len(frame), 4)
+        np.testing.assert_array_equal(frame['sma'].to_numpy(), [1.0, 2.0, 3.0, np.nan])
+        np.testing.assert_array_equal(frame['close'].to_numpy(), [100.0, 101.0, 102.0, 103.0])
+
+    def test_replaced_bar_keeps_its_row(self):
+        """A bar sent again with the same timestamp replaces the row, without adding one."""
+
+        self.stock_frame.add_rows(
+            data={
+                'symbol': ['MSFT'],
+                'datetime': [2 * 60000],
+                'open': [100.0],
+                'close': [50.0],
+                'high': [101.0],
+                'low': [49.0],
+                'volume': [2000.0]
+            }
+        )
+
+        frame = self.stock_frame.frame
+
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame['close'].iloc[-1], 50.0)
+        self.assertEqual(frame.index[-1], ('MSFT', pd.Timestamp(2 * 60000, unit='ms')))
+        self.assertEqual(self.stock_frame.buffer.symbol('MSFT').rewrites, 1)
+
+    def test_frame_is_built_from_the_new_bars(self):
+        """Frames built as bars are appended, replaced and merged in match a frame built from scratch."""
+
+        rows = list(self.stock_frame._data)
+        batches = [
+            [('MSFT', 3), ('AAPL', 1), ('AAPL', 2)],
+            [('MSFT', 3), ('AAPL', 4)],
+            [('SQ', 0)],
+            [('AAPL', 0), ('MSFT', 5)],
+            [('SQ', 2)]
+        ]
+
+        for batch in batches:
+
+            sma = self.stock_frame.frame['sma']
+            batch_rows = [
+                {'symbol': symbol, 'datetime': minute * 60000, 'open': 1.0, 'close': float(minute), 'high': 2.0, 'low': 0.0, 'volume': 10.0}
+                for symbol, minute in batch
+            ]
+
+            self.stock_frame.add_rows(data=batch_rows)
+            rows.extend(batch_rows)
+
+            frame = self.stock_frame.frame
+            expected = StockFrame(data=rows).frame
+            expected = expected[~expected.index.duplicated(keep='last')]
+
+            pd.testing.assert_frame_equal(frame[BAR_COLUMNS], expected)
+            pd.testing.assert_series_equal(frame['sma'], sma.reindex(index=frame.index))
+
+        # Each timestamp is in the datetime level once, in order.
+        np.testing.assert_array_equal(self.stock_frame.buffer._datetime_level, np.arange(6) * 60000)
+
+
+if __name__ == '__main__':
+    unittest.main()
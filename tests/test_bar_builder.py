@@ -0,0 +1,156 @@
+import sys
+import pathlib
+import unittest
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.bar_builder import BarBuilder
+
+START = 1586390400000
+
+
+def chart_message(symbol: str, minute: int, open_price: float, close_price: float, volume: float) -> dict:
+    """Creates a CHART_EQUITY message for a single one minute bar."""
+
+    return {
+        'data': [
+            {
+                'service': 'CHART_EQUITY',
+                'timestamp': START + (minute + 1) * 60000,
+                'command': 'SUBS',
+                'content': [
+                    {
+                        'seq': minute,
+                        'key': symbol,
+                        '1': open_price,
+                        '2': max(open_price, close_price) + 1.0,
+                        '3': min(open_price, close_price) - 1.0,
+                        '4': close_price,
+                        '5': volume,
+                        '6': minute,
+                        '7': START + minute * 60000,
+                        '8': 18361
+                    }
+                ]
+            }
+        ]
+    }
+
+
+def timesale_message(symbol: str, timestamp: int, price: float, size: float) -> dict:
+    """Creates a TIMESALE_EQUITY message for a single trade."""
+
+    return {
+        'data': [
+            {
+                'service': 'TIMESALE_EQUITY',
+                'timestamp': timestamp,
+                'command': 'SUBS',
+                'content': [
+                    {'seq': 1, 'key': symbol, '1': timestamp, '2': price, '3': size, '4': 1}
+                ]
+            }
+        ]
+    }
+
+
+class BarBuilderTest(TestCase):
+
+    """Will perform a unit test for the `BarBuilder` object."""
+
+    def test_chart_equity_one_minute_bars(self):
+        """Each one minute chart update is a completed bar."""
+
+        bar_builder = BarBuilder(bar_size=1, bar_type='minute')
+
+        new_bars = bar_builder.add_message(
+            message=chart_message(symbol='MSFT', minute=0, open_price=10.0, close_price=11.0, volume=100)
+        )
+
+        self.assertEqual(len(new_bars), 1)
+        self.assertEqual(bar_builder.latest_bars(), [{
+            'symbol': 'MSFT',
+            'open': 10.0,
+            'close': 11.0,
+            'high': 12.0,
+            'low': 9.0,
+            'volume': 100,
+            'datetime': START
+        }])
+
+        # Sending the same minute again doesn't count the volume twice.
+        bar_builder.add_message(
+            message=chart_message(symbol='MSFT', minute=0, open_price=10.0, close_price=11.0, volume=100)
+        )
+        self.assertEqual(bar_builder.latest_bars()[0]['volume'], 100)
+
+    def test_chart_equity_five_minute_bars(self):
+        """One minute chart updates are combined into larger bars."""
+
+        bar_builder = BarBuilder(bar_size=5, bar_type='minute')
+
+        for minute in range(5):
+
+            new_bars = bar_builder.add_message(
+                message=chart_message(
+                    symbol='MSFT',
+                    minute=minute,
+                    open_price=10.0 + minute,
+                    close_price=11.0 + minute,
+                    volume=100
+                )
+            )
+
+            self.assertEqual(len(new_bars), 1 if minute == 4 else 0)
+
+        bar = bar_builder.latest_bars(symbols=['MSFT', 'AAPL'])[0]
+
+        self.assertEqual(bar['open'], 10.0)
+        self.assertEqual(bar['close'], 15.0)
+        self.assertEqual(bar['high'], 16.0)
+        self.assertEqual(bar['low'], 9.0)
+        self.assertEqual(bar['volume'], 500)
+        self.assertEqual(bar['datetime'], START)
+
+    def test_timesale_bars(self):
+        """Trades are combined into bars, closed by the next bar or by the clock."""
+
+        bar_builder = BarBuilder(bar_size=1, bar_type='minute')
+
+        bar_builder.add_message(message=timesale_message('SQ', START + 1000, 50.0, 10))
+        bar_builder.add_message(message=timesale_message('SQ', START + 2000, 52.0, 20))
+        bar_builder.add_message(message=timesale_message('SQ', START + 3000, 49.0, 30))
+        bar_builder.add_message(message=timesale_message('AAPL', START + 4000, 250.0, 5))
+
+        self.assertEqual(bar_builder.latest_bars(), [])
+
+        new_bars = bar_builder.add_message(message=timesale_message('SQ', START + 61000, 48.0, 10))
+
+        self.assertEqual(new_bars, [{
+            'symbol': 'SQ',
+            'open': 50.0,
+            'close': 49.0,
+            'high': 52.0,
+            'low': 49.0,
+            'volume': 60,
+            'datetime': START
+        }])
+
+        # AAPL didn't trade again, so its bar is closed on the clock.
+        closed_bars = bar_builder.close_bars(timestamp=START + 60000)
+
+        self.assertEqual([bar['symbol'] for bar in closed_bars], ['AAPL'])
+        self.assertEqual(len(bar_builder.latest_bars(symbols=['SQ', 'AAPL'])), 2)
+
+    def test_unsupported_bar_type(self):
+        """Bars that can't be built from the stream are rejected."""
+
+        with self.assertRaises(ValueError):
+            BarBuilder(bar_size=1, bar_type='daily')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+import sys
+import mmap
+import time
+import pathlib
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.stock_frame import StockFrame
+from pyrobot.bar_store import BarStore
+from pyrobot.historical import RateLimiter
+from pyrobot.historical import HistoricalLoader
+
+from test_indicators import create_bars
+
+
+class FakePriceHistoryClient():
+
+    """Stands in for the `TDClient`, serving the bars in the requested range."""
+
+    def __init__(self, bars: list) -> None:
+        self.bars = bars
+        self.requests = []
+
+    def get_price_history(self, symbol: str, start_date: str, end_date: str, **kwargs) -> dict:
+
+        self.requests.append((symbol, int(start_date), int(end_date)))
+
+        candles = [
+            {column: bar[column] for column in ['open', 'close', 'high', 'low', 'volume', 'datetime']}
+            for bar in self.bars
+            if bar['symbol'] == symbol and int(start_date) <= bar['datetime'] <= int(end_date)
+        ]
+
+        return {'candles': candles, 'symbol': symbol, 'empty': not candles}
+
+
+class SlowPriceHistoryClient(FakePriceHistoryClient):
+
+    """Takes a while to serve each request, and counts how many are in flight at once."""
+
+    def __init__(self, bars: list, delay: float = 0.05) -> None:
+        super().__init__(bars=bars)
+        self.delay = delay
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_price_history(self, symbol: str, start_date: str, end_date: str, **kwargs) -> dict:
+
+        with self._lock:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+
+        time.sleep(self.delay)
+
+        with self._lock:
+            self.in_flight -= 1
+
+        return super().get_price_history(symbol=symbol, start_date=start_date, end_date=end_date, **kwargs)
+
+
+class BarStoreTest(TestCase):
+
+    """Will perform a unit test for the `BarStore` object."""
+
+    def setUp(self) -> None:
+        """Set up a store in a temporary folder, and two days and a half of minute bars."""
+
+        self.folder = tempfile.TemporaryDirectory()
+        self.bar_store = BarStore(folder=self.folder.name)
+
+        self.symbols = ['MSFT', 'AAPL', '/ES']
+        self.bars = create_bars(symbols=self.symbols, start=0, count=3600)
+        self.expected = StockFrame(data=self.bars).frame
+
+        self.td_client = FakePriceHistoryClient(bars=self.bars)
+        self.historical_loader = HistoricalLoader(
+            td_client=self.td_client,
+            max_workers=2,
+            rate_limiter=RateLimiter(max_calls=1000, period=1.0),
+            backoff=0.0
+        )
+
+    def timestamp(self, minute: int) -> int:
+        """The timestamp of a bar of `create_bars`."""
+
+        return 1586390400000 + minute * 60000
+
+    def test_write_and_read_a_range(self):
+        """The bars are split into one partition per date, and a range is read back from them."""
+
+        columns = {
+            column: np.asarray([bar[column] for bar in self.bars])
+            for column in ['symbol', 'datetime', 'open', 'close', 'high', 'low', 'volume']
+        }
+
+        # One partition per symbol and date.
+        self.assertEqual(self.bar_store.write(bar_size='1minute', columns=columns), 9)
+
+        self.assertEqual(self.bar_store.symbols(bar_size='1minute'), sorted(self.symbols))
+        self.assertEqual(self.bar_store.dates(symbol='/ES', bar_size='1minute'), ['2020-04-09', '2020-04-10', '2020-04-11'])
+
+        start, end = self.timestamp(minute=1000), self.timestamp(minute=3000)
+        stock_frame = StockFrame.from_bar_store(
+            bar_store=self.bar_store,
+            symbols=['MSFT', 'AAPL'],
+            bar_size='1minute',
+            start=start,
+            end=end
+        )
+
+        datetime = self.expected.index.get_level_values('datetime').values.astype('datetime64[ms]').astype('int64')
+        in_range = (datetime >= start) & (datetime <= end) & self.expected.index.get_level_values('symbol').isin(['MSFT', 'AAPL'])
+        expected = self.expected[in_range]
+
+        self.assertTrue(stock_frame.frame.index.equals(expected.index))
+        np.testing.assert_array_equal(stock_frame.frame.to_numpy(), expected.to_numpy())
+
+        # The partitions are memory mapped.
+        datetime, values = next(self.bar_store.partitions(symbol='MSFT', bar_size='1minute'))
+        while isinstance(datetime, np.ndarray):
+            datetime = datetime.base
+
+        self.assertIsInstance(memoryview(datetime).obj, mmap.mmap)
+
+    def test_update_only_grabs_the_gap(self):
+        """A second run only grabs the bars since the last stored bar, and refreshes that bar."""
+
+        start = self.timestamp(minute=0)
+        first_end = self.timestamp(minute=2000)
+
+        counts = self.historical_loader.update_store(
+            bar_store=self.bar_store,
+            symbols=self.symbols,
+            bar_size='1minute',
+            start=start,
+            end=first_end
+        )
+
+        self.assertEqual(counts, {symbol: 2001 for symbol in self.symbols})
+
+        # The last bar was still forming during the first run.
+        for bar in self.bars:
+            if bar['datetime'] == first_end:
+                bar['close'] += 1.0
+
+        self.td_client.requests = []
+        end = self.timestamp(minute=3599)
+
+        counts = self.historical_loader.update_store(
+            bar_store=self.bar_store,
+            symbols=self.symbols,
+            bar_size='1minute',
+            start=start,
+            end=end
+        )
+
+        self.assertEqual(counts, {symbol: 1600 for symbol in self.symbols})
+        self.assertEqual(sorted(self.td_client.requests), sorted((symbol, first_end, end) for symbol in self.symbols))
+
+        stock_frame = StockFrame.from_bar_store(bar_store=self.bar_store, symbols=self.symbols, bar_size='1minute')
+        expected = StockFrame(data=self.bars).frame
+
+        self.assertTrue(stock_frame.frame.index.equals(expected.index))
+        np.testing.assert_array_equal(stock_frame.frame.to_numpy(), expected.to_numpy())
+
+    def test_gaps_with_different_starts_are_grabbed_together(self):
+        """Symbols whose last stored bars differ are still requested at the same time."""
+
+        # Each symbol was stored up to a different bar.
+        for minute, symbol in zip([100, 200], self.symbols):
+            stock_frame = StockFrame(data=[bar for bar in self.bars if bar['symbol'] == symbol][:minute + 1])
+            self.bar_store.save(buffer=stock_frame.buffer, bar_size='1minute')
+
+        td_client = SlowPriceHistoryClient(bars=self.bars)
+        historical_loader = HistoricalLoader(
+            td_client=td_client,
+            max_workers=3,
+            rate_limiter=RateLimiter(max_calls=1000, period=1.0),
+            backoff=0.0
+        )
+        self.addCleanup(historical_loader.close)
+
+        start = self.timestamp(minute=0)
+        end = self.timestamp(minute=300)
+
+        counts = historical_loader.update_store(bar_store=self.bar_store, symbols=self.symbols, bar_size='1minute', start=start, end=end)
+
+        self.assertEqual(counts, {'MSFT': 201, 'AAPL': 101, '/ES': 301})
+        self.assertEqual(
+            sorted(td_client.requests),
+            sorted([('MSFT', self.timestamp(minute=100), end), ('AAPL', self.timestamp(minute=200), end), ('/ES', start, end)])
+        )
+        self.assertEqual(td_client.most_in_flight, 3)
+
+    def test_save_writes_the_new_bars(self):
+        """Saving a StockFrame's buffer only rewrites the partitions from the last stored bar."""
+
+        stock_frame = StockFrame(data=self.bars[:100])
+        self.assertEqual(self.bar_store.save(buffer=stock_frame.buffer, bar_size='1minute'), 1)
+
+        stock_frame.add_rows(data=self.bars[100:3600])
+        self.assertEqual(self.bar_store.save(buffer=stock_frame.buffer, bar_size='1minute'), 3)
+        self.assertEqual(self.bar_store.save(buffer=stock_frame.buffer, bar_size='1minute'), 1)
+
+        loaded = StockFrame.from_bar_store(bar_store=self.bar_store, symbols=['MSFT'], bar_size='1minute')
+        np.testing.assert_array_equal(loaded.frame.to_numpy(), stock_frame.frame.loc[['MSFT']].to_numpy())
+
+    def tearDown(self) -> None:
+        """Teardown the loader and the temporary folder."""
+
+        self.historical_loader.close()
+        self.folder.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
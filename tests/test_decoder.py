@@ -0,0 +1,144 @@
+import sys
+import json
+import pathlib
+import unittest
+
+from unittest import TestCase
+
+# The `td` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.decoder import MessageDecoder
+from td.decoder import available_backends
+from td.message import StreamingMessage
+from td.stream import TDStreamerClient
+
+from test_sinks import SlowSink
+from test_sinks import create_book_message
+from test_sinks import create_quote_message
+
+
+class MessageDecoderTest(TestCase):
+
+    """Will perform a unit test for the `MessageDecoder` object."""
+
+    def setUp(self) -> None:
+        """Set up a message with a value the stream couldn't encode."""
+
+        self.message = json.dumps(create_quote_message(timestamp=1000))
+        self.broken_message = '{"data": [{"service": "QUOTE", "timestamp": 1000, "content": [{"key": "MSFT", "25": \ufffd}]}]}'
+
+    def test_backends_decode_the_same(self):
+        """Every installed backend decodes text and bytes to the same message."""
+
+        for backend in available_backends():
+
+            decoder = MessageDecoder(backend=backend)
+
+            self.assertEqual(decoder.loads(message=self.message), create_quote_message(timestamp=1000), msg=backend)
+            self.assertEqual(decoder.loads(message=self.message.encode('utf-8')), create_quote_message(timestamp=1000), msg=backend)
+            self.assertEqual(decoder.repaired, 0)
+
+    def test_replacement_character(self):
+        """A bare replacement character is repaired, in text and in bytes, and one inside a string is kept."""
+
+        for backend in available_backends():
+
+            decoder = MessageDecoder(backend=backend)
+
+            for message in [self.broken_message, self.broken_message.encode('utf-8')]:
+                decoded = decoder.loads(message=message)
+                self.assertEqual(decoded['data'][0]['content'][0]['25'], 'None', msg=backend)
+
+            decoded = decoder.loads(message='{"headline": "caf\ufffd"}')
+
+            self.assertEqual(decoded['headline'], 'caf\ufffd')
+            self.assertEqual(decoder.repaired, 2)
+
+    def test_unknown_backend(self):
+        """Only the installed backends can be used."""
+
+        with self.assertRaises(ValueError):
+            MessageDecoder(backend='simplejson')
+
+    def test_decode_into_typed_services(self):
+        """A message is split into a record per service, with the level one updates typed, and the heartbeats left out."""
+
+        decoder = MessageDecoder()
+
+        service_messages = decoder.decode(message=self.message)
+
+        self.assertEqual(len(service_messages), 1)
+        self.assertEqual(service_messages[0].section, 'data')
+        self.assertEqual(service_messages[0].service, 'QUOTE')
+        self.assertEqual(service_messages[0].timestamp, 1000)
+        self.assertEqual(service_messages[0].schema.columns[:4], ('timestamp', 'symbol', 'bid-price', 'ask-price'))
+        self.assertEqual(service_messages[0].records[0][:4], [1000, 'MSFT', 100.5, 100.75])
+
+        # The next update only sends the bid, as text, the ask is kept from the last one.
+        update = '{"data": [{"service": "QUOTE", "timestamp": 2000, "content": [{"key": "MSFT", "1": "101"}]}]}'
+        records = decoder.decode(message=update.encode('utf-8'))[0].records
+
+        self.assertEqual(records[0][:4], [2000, 'MSFT', 101.0, 100.75])
+        self.assertIsInstance(records[0][2], float)
+
+        # The books aren't level one, so they keep their raw content.
+        book_message = decoder.services(message=create_book_message(timestamp=3000))[0]
+
+        self.assertEqual(book_message.service, 'NASDAQ_BOOK')
+        self.assertIsNone(book_message.records)
+        self.assertEqual(book_message.content[0]['2'][0]['0'], 100.5)
+
+        self.assertEqual(decoder.decode(message='{"notify": [{"heartbeat": "1591046000000"}]}'), [])
+
+    def test_invalid_updates_are_counted(self):
+        """An update that can't be typed is counted, and its service is left without records."""
+
+        decoder = MessageDecoder()
+        service_messages = decoder.decode(
+            message='{"data": [{"service": "QUOTE", "timestamp": 1000, "content": [{"key": "MSFT", "1": "bid"}]}]}'
+        )
+
+        self.assertIsNone(service_messages[0].records)
+        self.assertEqual(decoder.invalid, 1)
+
+    def test_stream_reads_the_decoded_services(self):
+        """The stream decodes a message once, for the order books and for the wide records."""
+
+        stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+        stream_client.print_to_console = False
+        stream_client.data_requests['requests'].append({'service': 'QUOTE', 'parameters': {'keys': 'MSFT', 'fields': '0,1,2'}})
+        stream_client.track_order_books()
+
+        sink = SlowSink()
+        stream_client.level_one_format = 'wide'
+        stream_client.add_sink(sink=sink)
+
+        async def run():
+            for timestamp in range(3):
+                await stream_client._handle_message(message_decoded=create_quote_message(timestamp=timestamp))
+                await stream_client._handle_message(message_decoded=create_book_message(timestamp=timestamp))
+            await stream_client.stream_writer.close()
+
+        stream_client.loop.run_until_complete(run())
+
+        self.assertEqual([record[:4] for record in sink.records], [[timestamp, 'MSFT', 100.5, 100.75] for timestamp in range(3)])
+        self.assertEqual(len(sink.level_two_rows), 6)
+        self.assertEqual(stream_client.order_books.book(symbol='MSFT').best_bid, (100.5, 300))
+        self.assertEqual(stream_client.level_one_records.state(service='QUOTE', symbol='MSFT')['timestamp'], 2)
+
+    def test_streaming_message(self):
+        """The `StreamingMessage` parses with the decoder."""
+
+        streaming_message = StreamingMessage(message=self.broken_message)
+
+        self.assertTrue(streaming_message.is_data_response)
+        self.assertEqual(streaming_message.decoded_message['data'][0]['content'][0]['25'], 'None')
+
+        streaming_message = StreamingMessage(message=self.message, decoder=MessageDecoder(backend='json'))
+
+        self.assertEqual(streaming_message.decoder.backend, 'json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import sys
+import time
+import pathlib
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.stock_frame import StockFrame
+from pyrobot.historical import RateLimiter
+from pyrobot.historical import HistoricalLoader
+from pyrobot.historical import decode_candles
+
+
+class FakePriceHistoryClient():
+
+    """Stands in for the `TDClient`, and tracks how many requests are in flight."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def get_price_history(self, symbol: str, **kwargs) -> dict:
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.calls[symbol] = self.calls.get(symbol, 0) + 1
+
+        time.sleep(1.0 if symbol == 'SLOW' else self.delay)
+
+        with self._lock:
+            self.in_flight -= 1
+
+        if symbol == 'FAIL':
+            raise ValueError('Bad symbol.')
+
+        # The first request for a flaky symbol returns an error.
+        if symbol == 'FLAKY' and self.calls[symbol] == 1:
+            return {'error': 'Individual App\'s transactions per seconds restriction reached.'}
+
+        seed = sum(ord(character) for character in symbol)
+
+        candles = [
+            {
+                'open': seed + index + 0.25,
+                'close': seed + index + 0.5,
+                'high': seed + index + 1.0,
+                'low': seed + index - 1.0,
+                'volume': 1000 + index,
+                'datetime': 1586390400000 + index * 60000
+            }
+            for index in range(5)
+        ]
+
+        return {'candles': candles, 'symbol': symbol, 'empty': False}
+
+
+class HistoricalLoaderTest(TestCase):
+
+    """Will perform a unit test for the `HistoricalLoader` object."""
+
+    def setUp(self) -> None:
+        """Set up the HistoricalLoader with a fake client."""
+
+        self.td_client = FakePriceHistoryClient()
+        self.historical_loader = HistoricalLoader(
+            td_client=self.td_client,
+            max_workers=4,
+            rate_limiter=RateLimiter(max_calls=1000, period=1.0),
+            backoff=0.0
+        )
+
+    def test_decode_candles(self):
+        """Candles are decoded into typed column arrays."""
+
+        candles = self.td_client.get_price_history(symbol='MSFT')['candles']
+        columns = decode_candles(symbol='MSFT', candles=candles)
+
+        self.assertEqual(columns['datetime'].dtype, np.dtype('int64'))
+        self.assertEqual(columns['close'].dtype, np.dtype('float64'))
+        self.assertEqual(list(columns['symbol']), ['MSFT'] * 5)
+        self.assertEqual(columns['volume'].tolist(), [candle['volume'] for candle in candles])
+
+    def test_load_matches_list_of_bars(self):
+        """The loaded columns build the same StockFrame as the old list of bars."""
+
+        symbols = ['MSFT', 'AAPL', 'SQ', 'TSLA']
+        candles, columns = self.historical_loader.load(symbols=symbols, period_type='day')
+
+        self.assertEqual(list(candles), symbols)
+
+        bars = [
+            dict(symbol=symbol, **candle)
+            for symbol in symbols
+            for candle in candles[symbol]
+        ]
+
+        # The volume is stored as a float, like the rest of the bar buffer.
+        pd.testing.assert_frame_equal(
+            StockFrame(data=columns).frame,
+            StockFrame(data=bars).frame,
+            check_dtype=False
+        )
+
+    def test_load_bounds_the_workers(self):
+        """No more than `max_workers` requests are made at the same time."""
+
+        self.historical_loader.load(symbols=['SYM{}'.format(index) for index in range(20)])
+
+        self.assertGreater(self.td_client.max_in_flight, 1)
+        self.assertLessEqual(self.td_client.max_in_flight, 4)
+
+    def test_load_raises_errors(self):
+        """An error for one symbol is raised to the caller."""
+
+        with self.assertRaises(ValueError):
+            self.historical_loader.load(symbols=['MSFT', 'FAIL'])
+
+    def test_load_retries_errors(self):
+        """A symbol that returns an error is retried."""
+
+        candles, _ = self.historical_loader.load(symbols=['FLAKY'])
+
+        self.assertEqual(len(candles['FLAKY']), 5)
+        self.assertEqual(self.td_client.calls['FLAKY'], 2)
+
+    def test_load_latest_skips_slow_and_failed_symbols(self):
+        """A slow or failing symbol doesn't hold up the latest bars of the others."""
+
+        start = time.monotonic()
+        latest_bars, missed_symbols = self.historical_loader.load_latest(
+            symbols=['MSFT', 'SLOW', 'FAIL', 'AAPL'],
+            timeout=0.5
+        )
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual([bar['symbol'] for bar in latest_bars], ['MSFT', 'AAPL'])
+        self.assertEqual(missed_symbols, ['SLOW', 'FAIL'])
+        self.assertEqual(latest_bars[0]['datetime'], 1586390400000 + 4 * 60000)
+
+        # The slow request is still in flight, so it isn't sent again.
+        self.historical_loader.load_latest(symbols=['SLOW'], timeout=0.1)
+        self.assertEqual(self.td_client.calls['SLOW'], 1)
+
+    def test_rate_limiter(self):
+        """The rate limiter waits once the window is full."""
+
+        rate_limiter = RateLimiter(max_calls=3, period=0.2)
+
+        start = time.monotonic()
+
+        for _ in range(4):
+            rate_limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def tearDown(self) -> None:
+        """Teardown the HistoricalLoader."""
+
+        self.historical_loader.close()
+        self.historical_loader = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.signals import Condition
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.indicator_graph import IndicatorGraph
+from pyrobot.indicator_graph import frame_column
+
+from test_indicators import create_bars
+
+
+class IndicatorGraphTest(TestCase):
+
+    """Will perform a unit test for the `IndicatorGraph` object."""
+
+    def setUp(self) -> None:
+        """Set up a graph over a StockFrame with three symbols."""
+
+        self.stock_frame = StockFrame(data=create_bars(symbols=['MSFT', 'AAPL', 'SQ'], start=0, count=50))
+        self.graph = IndicatorGraph(engine='numpy')
+        self.graph.reset(frame=self.stock_frame.frame)
+
+    def test_shared_nodes_are_evaluated_once(self):
+        """Two descriptions of the same calculation share one result."""
+
+        close = frame_column('close')
+        fast = close.ewm(span=12, min_periods=12)
+
+        self.graph.evaluate(node=fast - close.ewm(span=26, min_periods=26))
+        evaluations = self.graph.evaluations
+
+        # The same EMA, described again, and the difference with a constant.
+        values = self.graph.evaluate(node=frame_column('close').ewm(span=12, min_periods=12) * 2)
+
+        self.assertEqual(self.graph.evaluations, evaluations + 2)
+        np.testing.assert_allclose(values, 2 * self.graph.evaluate(node=fast), equal_nan=True)
+
+    def test_engines_match(self):
+        """The pandas and the numpy engines give the same values."""
+
+        node = (frame_column('close').diff(periods=2) / frame_column('close').shift(periods=2)).rolling(window=5, statistic='sum')
+
+        pandas_graph = IndicatorGraph(engine='pandas')
+        pandas_graph.reset(frame=self.stock_frame.frame)
+
+        np.testing.assert_allclose(
+            self.graph.evaluate(node=node),
+            pandas_graph.evaluate(node=node),
+            equal_nan=True
+        )
+
+    def test_refresh_only_calculates_the_signal_columns(self):
+        """The columns the signals don't read are calculated when the frame is read."""
+
+        indicator_client = Indicators(price_data_frame=self.stock_frame, engine='numpy')
+        indicator_client.rsi(period=14)
+        indicator_client.sma(period=5)
+        indicator_client.macd()
+        indicator_client.set_signal_rules(buy_rule=Condition('rsi', '<', 99.0))
+
+        self.stock_frame.add_rows(data=create_bars(symbols=['MSFT', 'AAPL', 'SQ'], start=50, count=3, seed=1))
+        indicator_client.refresh()
+
+        # The signal column is up to date, the others are still missing the new rows.
+        frame = self.stock_frame.frame
+        self.assertFalse(frame.loc['MSFT', 'rsi'].iloc[-3:].isna().any())
+        self.assertTrue(frame.loc['MSFT', 'sma'].iloc[-3:].isna().all())
+        last_rsi = frame['rsi'].groupby(level=0).last()
+        self.assertEqual(indicator_client.check_signals().buys.tolist(), last_rsi[last_rsi < 99.0].index.tolist())
+
+        # Reading the frame from the client calculates the rest.
+        frame = indicator_client.price_data_frame
+        expected = frame['close'].groupby(level=0).transform(lambda x: x.rolling(window=5).mean())
+
+        np.testing.assert_allclose(frame['sma'].to_numpy(), expected.to_numpy(), equal_nan=True)
+        self.assertFalse(frame['macd'].iloc[-3:].isna().any())
+        self.assertEqual(len(indicator_client._graph), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,329 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+
+
+INDICATORS = [
+    ('rsi', {'period': 14}),
+    ('sma', {'period': 10}),
+    ('ema', {'period': 10}),
+    ('rate_of_change', {'period': 3}),
+    ('bollinger_bands', {'period': 20}),
+    ('average_true_range', {'period': 14}),
+    ('stochastic_oscillator', {}),
+    ('macd', {'fast_period': 12, 'slow_period': 26}),
+    ('mass_index', {'period': 9}),
+    ('force_index', {'period': 2}),
+    ('ease_of_movement', {'period': 5}),
+    ('commodity_channel_index', {'period': 20}),
+    ('standard_deviation', {'period': 10}),
+    ('chaikin_oscillator', {'period': 3})
+]
+
+
+def create_bars(symbols: list, start: int, count: int, seed: int = 0) -> list:
+    """Creates a list of random bars, one per minute, for each symbol."""
+
+    random_state = np.random.RandomState(seed)
+    bars = []
+
+    for symbol in symbols:
+
+        closes = 100 + random_state.standard_normal(count).cumsum()
+
+        for index in range(count):
+            bars.append({
+                'symbol': symbol,
+                'datetime': 1586390400000 + (start + index) * 60000,
+                'open': closes[index] + random_state.uniform(-0.5, 0.5),
+                'close': closes[index],
+                'high': closes[index] + random_state.uniform(0.1, 1.0),
+                'low': closes[index] - random_state.uniform(0.1, 1.0),
+                'volume': float(random_state.randint(1000, 5000))
+            })
+
+    return bars
+
+
+class IndicatorsIncrementalTest(TestCase):
+
+    """Will perform a unit test for the incremental `Indicators` refresh."""
+
+    def setUp(self) -> None:
+        """Set up a batch and an incremental Indicators client over the same bars."""
+
+        self.symbols = ['MSFT', 'AAPL', 'SQ']
+        history = create_bars(symbols=self.symbols, start=0, count=120)
+
+        self.batch_frame = StockFrame(data=history)
+        self.incremental_frame = StockFrame(data=history)
+
+        self.batch_indicators = Indicators(price_data_frame=self.batch_frame)
+        self.incremental_indicators = Indicators(
+            price_data_frame=self.incremental_frame,
+            incremental=True
+        )
+
+        for indicator, arguments in INDICATORS:
+            getattr(self.batch_indicators, indicator)(**arguments)
+            getattr(self.incremental_indicators, indicator)(**arguments)
+
+    def assert_frames_match(self) -> None:
+        """Make sure the batch and the incremental frames have the same values."""
+
+        batch = self.batch_indicators.price_data_frame
+        incremental = self.incremental_indicators.price_data_frame
+
+        self.assertEqual(set(batch.columns), set(incremental.columns))
+        self.assertTrue(batch.index.equals(incremental.index))
+
+        for column in batch.columns:
+            np.testing.assert_allclose(
+                incremental[column].to_numpy(dtype=float),
+                batch[column].to_numpy(dtype=float),
+                rtol=1e-7,
+                atol=1e-9,
+                equal_nan=True,
+                err_msg=column
+            )
+
+    def test_refresh_matches_batch_after_each_new_bar(self):
+        """Append bars one at a time and compare after every refresh."""
+
+        new_bars = create_bars(symbols=self.symbols, start=120, count=15, seed=1)
+
+        for index in range(15):
+
+            bars = new_bars[index::15]
+
+            self.batch_frame.add_rows(data=bars)
+            self.incremental_frame.add_rows(data=bars)
+
+            self.batch_indicators.refresh()
+            self.incremental_indicators.refresh()
+
+            self.assert_frames_match()
+
+    def test_refresh_matches_batch_with_multiple_new_bars(self):
+        """Append several bars per symbol between refreshes."""
+
+        new_bars = create_bars(symbols=self.symbols, start=120, count=10, seed=2)
+
+        self.batch_frame.add_rows(data=new_bars)
+        self.incremental_frame.add_rows(data=new_bars)
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        self.assert_frames_match()
+
+    def test_refresh_handles_new_symbols(self):
+        """A symbol that shows up after the first refresh starts with a fresh state."""
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        new_bars = create_bars(symbols=['TSLA'], start=0, count=40, seed=3)
+
+        self.batch_frame.add_rows(data=new_bars)
+        self.incremental_frame.add_rows(data=new_bars)
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        self.assert_frames_match()
+
+    def test_changed_arguments_reset_the_state(self):
+        """Calling an indicator again with new arguments rebuilds its state."""
+
+        self.incremental_indicators.refresh()
+
+        self.batch_indicators.sma(period=5)
+        self.incremental_indicators.sma(period=5)
+
+        new_bars = create_bars(symbols=self.symbols, start=120, count=3, seed=4)
+
+        self.batch_frame.add_rows(data=new_bars)
+        self.incremental_frame.add_rows(data=new_bars)
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        self.assert_frames_match()
+
+    def test_refresh_recalculates_a_replaced_bar(self):
+        """A bar sent again with the same timestamp, like the forming bar of a poll, is calculated again."""
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        new_bars = create_bars(symbols=self.symbols, start=120, count=5, seed=5)
+
+        for index in range(5):
+
+            bars = new_bars[index::5]
+
+            # The bar is polled a few times while it forms, with a different close each time.
+            for close in [200.0, 50.0, bars[0]['close']]:
+
+                polled_bars = [dict(bar) for bar in bars]
+                polled_bars[0]['close'] = close
+
+                self.batch_frame.add_rows(data=polled_bars)
+                self.incremental_frame.add_rows(data=polled_bars)
+
+                self.batch_indicators.refresh()
+                self.incremental_indicators.refresh()
+
+                self.assert_frames_match()
+
+    def test_refresh_recalculates_back_filled_bars(self):
+        """Bars merged in out of order, or several rewrites between refreshes, replay the symbol."""
+
+        history = create_bars(symbols=self.symbols, start=0, count=120)
+        gaps = [bar for bar in history if bar['symbol'] == 'MSFT'][60:70]
+
+        # Start over with a gap in the MSFT bars, which is filled in later.
+        with_gap = [bar for bar in history if bar not in gaps]
+
+        self.batch_frame = StockFrame(data=with_gap)
+        self.incremental_frame = StockFrame(data=with_gap)
+        self.batch_indicators = Indicators(price_data_frame=self.batch_frame)
+        self.incremental_indicators = Indicators(price_data_frame=self.incremental_frame, incremental=True)
+
+        for indicator, arguments in INDICATORS:
+            getattr(self.batch_indicators, indicator)(**arguments)
+            getattr(self.incremental_indicators, indicator)(**arguments)
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        self.batch_frame.add_rows(data=gaps)
+        self.incremental_frame.add_rows(data=gaps)
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        self.assert_frames_match()
+
+        # Two rewrites of the same symbol before the next refresh.
+        for close in [200.0, 50.0]:
+
+            bar = dict(gaps[0], close=close)
+
+            self.batch_frame.add_rows(data=[bar])
+            self.incremental_frame.add_rows(data=[bar])
+
+        self.batch_indicators.refresh()
+        self.incremental_indicators.refresh()
+
+        self.assert_frames_match()
+
+    def tearDown(self) -> None:
+        """Teardown the Indicators clients."""
+
+        self.batch_indicators = None
+        self.incremental_indicators = None
+
+
+class IndicatorsEngineTest(TestCase):
+
+    """Will perform a unit test for the `numpy` engine of the `Indicators` object."""
+
+    def setUp(self) -> None:
+        """Set up a pandas and a numpy Indicators client over the same bars."""
+
+        # Give the symbols a different number of bars, so the groups aren't aligned.
+        history = (
+            create_bars(symbols=['MSFT', 'AAPL'], start=0, count=90) +
+            create_bars(symbols=['SQ'], start=0, count=35, seed=5) +
+            create_bars(symbols=['TSLA'], start=0, count=4, seed=6)
+        )
+
+        self.pandas_indicators = Indicators(price_data_frame=StockFrame(data=history))
+        self.numpy_indicators = Indicators(price_data_frame=StockFrame(data=history), engine='numpy')
+
+    def test_numpy_engine_matches_pandas(self):
+        """Calculate every indicator with both engines and compare."""
+
+        for indicator, arguments in INDICATORS + [('change_in_price', {}), ('kst_oscillator', {})]:
+            getattr(self.pandas_indicators, indicator)(**arguments)
+            getattr(self.numpy_indicators, indicator)(**arguments)
+
+        pandas_frame = self.pandas_indicators.price_data_frame
+        numpy_frame = self.numpy_indicators.price_data_frame
+
+        self.assertEqual(list(pandas_frame.columns), list(numpy_frame.columns))
+
+        for column in pandas_frame.columns:
+            np.testing.assert_allclose(
+                numpy_frame[column].to_numpy(dtype=float),
+                pandas_frame[column].to_numpy(dtype=float),
+                rtol=1e-7,
+                atol=1e-9,
+                equal_nan=True,
+                err_msg=column
+            )
+
+    def test_numpy_engine_after_refresh(self):
+        """New rows are picked up by the numpy engine after a refresh."""
+
+        self.pandas_indicators.ema(period=10)
+        self.numpy_indicators.ema(period=10)
+
+        new_bars = create_bars(symbols=['AAPL', 'SQ'], start=200, count=5, seed=7)
+
+        for indicators in [self.pandas_indicators, self.numpy_indicators]:
+            indicators._stock_frame.add_rows(data=new_bars)
+            indicators.refresh()
+
+        np.testing.assert_allclose(
+            self.numpy_indicators.price_data_frame['ema'].to_numpy(dtype=float),
+            self.pandas_indicators.price_data_frame['ema'].to_numpy(dtype=float),
+            rtol=1e-7,
+            equal_nan=True
+        )
+
+    def test_kst_oscillator_is_calculated_per_symbol(self):
+        """The KST Oscillator doesn't mix the rates of change of different symbols."""
+
+        self.numpy_indicators.kst_oscillator(r1=3, r2=4, r3=5, r4=6, n1=3, n2=3, n3=3, n4=4, signal_period=3)
+
+        frame = self.numpy_indicators.price_data_frame
+        closes = frame.loc['SQ', 'close']
+
+        def rate_of_change(period: int, window: int) -> pd.Series:
+            return (closes.diff(period - 1) / closes.shift(period - 1)).rolling(window=window).sum()
+
+        kst_oscillator = 100 * (
+            rate_of_change(3, 3) + 2 * rate_of_change(4, 3) + 3 * rate_of_change(5, 3) + 4 * rate_of_change(6, 4)
+        )
+
+        np.testing.assert_allclose(frame.loc['SQ', 'kst_oscillator'].to_numpy(), kst_oscillator.to_numpy(), equal_nan=True)
+        np.testing.assert_allclose(
+            frame.loc['SQ', 'kst_oscillator_signal'].to_numpy(),
+            kst_oscillator.rolling(window=3).mean().to_numpy(),
+            equal_nan=True
+        )
+        self.assertNotIn('roc_1', frame.columns)
+
+    def test_unknown_engine(self):
+        """An unknown engine is rejected."""
+
+        with self.assertRaises(ValueError):
+            Indicators(price_data_frame=self.pandas_indicators._stock_frame, engine='numba')
+
+
+if __name__ == '__main__':
+    unittest.main()
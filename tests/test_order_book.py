@@ -0,0 +1,179 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `td` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.order_book import BookSide
+from td.order_book import OrderBook
+from td.order_book import OrderBooks
+
+
+def create_book_levels(prices: list, sizes: list) -> list:
+    """The levels of a side of a book, with a single market maker at each level."""
+
+    return [
+        {'0': price, '1': size, '2': 1, '3': [{'0': 'NSDQ', '1': size, '2': 1000}]}
+        for price, size in zip(prices, sizes)
+    ]
+
+
+def create_book_message(symbol: str, timestamp: int, bids: list, asks: list, service: str = 'NASDAQ_BOOK') -> dict:
+    """A level two message, with the bid and ask levels as `(prices, sizes)`."""
+
+    return {
+        'data': [
+            {
+                'service': service,
+                'timestamp': timestamp,
+                'command': 'SUBS',
+                'content': [
+                    {
+                        'key': symbol,
+                        '1': timestamp,
+                        '2': create_book_levels(*bids),
+                        '3': create_book_levels(*asks)
+                    }
+                ]
+            }
+        ]
+    }
+
+
+class BookSideTest(TestCase):
+
+    """Will perform a unit test for the `BookSide` object."""
+
+    def test_levels_stay_in_order(self):
+        """The bids are best at the highest price, and a size of zero removes a level."""
+
+        bids = BookSide(is_bid=True)
+
+        for price, size in [(100.0, 5), (100.5, 3), (99.5, 7), (100.25, 1)]:
+            bids.set_level(price=price, size=size)
+
+        prices, sizes, counts = bids.depth(levels=10)
+
+        np.testing.assert_array_equal(prices, [100.5, 100.25, 100.0, 99.5])
+        np.testing.assert_array_equal(sizes, [3, 1, 5, 7])
+
+        bids.set_level(price=100.5, size=0)
+        bids.set_level(price=100.0, size=9, count=2)
+        bids.set_level(price=98.0, size=0)
+
+        self.assertEqual(bids.best(), (100.25, 1))
+        self.assertEqual(bids.size_at(price=100.0), 9)
+        self.assertEqual(bids.size_at(price=101.0), 0)
+        self.assertEqual(len(bids), 3)
+        self.assertEqual(bids.total_size(levels=2), 10)
+
+    def test_replace(self):
+        """A snapshot replaces every level, and the asks are best at the lowest price."""
+
+        asks = BookSide(is_bid=False)
+        asks.set_level(price=105.0, size=1)
+        asks.replace(levels=[(101.0, 2, 1), (100.5, 4, 2), (102.0, 0, 0)])
+
+        prices, sizes, counts = asks.depth(levels=5)
+
+        np.testing.assert_array_equal(prices, [100.5, 101.0])
+        np.testing.assert_array_equal(counts, [2, 1])
+
+        asks.clear()
+
+        self.assertIsNone(asks.best())
+        self.assertEqual(len(asks.depth(levels=5)[0]), 0)
+
+
+class OrderBookTest(TestCase):
+
+    """Will perform a unit test for the `OrderBook` and `OrderBooks` objects."""
+
+    def setUp(self) -> None:
+        """Set up a book with three levels on each side."""
+
+        self.order_books = OrderBooks()
+        self.order_books.update(
+            message=create_book_message(
+                symbol='MSFT',
+                timestamp=1000,
+                bids=([100.0, 99.9, 99.8], [300, 200, 100]),
+                asks=([100.1, 100.2, 100.3], [100, 400, 500])
+            )
+        )
+
+    def test_top_of_book(self):
+        """The best levels, spread, mid price, imbalance and microprice."""
+
+        order_book = self.order_books.book(symbol='MSFT')
+
+        self.assertEqual(order_book.best_bid, (100.0, 300))
+        self.assertEqual(order_book.best_ask, (100.1, 100))
+        self.assertAlmostEqual(order_book.spread, 0.1)
+        self.assertAlmostEqual(order_book.mid_price, 100.05)
+        self.assertAlmostEqual(order_book.imbalance(levels=1), 0.5)
+        self.assertAlmostEqual(order_book.imbalance(levels=3), (600 - 1000) / 1600)
+
+        # There's more size on the bid, so the microprice leans towards the ask.
+        self.assertAlmostEqual(order_book.microprice(), (100.0 * 100 + 100.1 * 300) / 400)
+        self.assertGreater(order_book.microprice(), order_book.mid_price)
+
+    def test_messages_replace_the_book(self):
+        """Each message is a snapshot of the book, and the snapshots are best first."""
+
+        changed = self.order_books.update(
+            message=create_book_message(
+                symbol='MSFT',
+                timestamp=2000,
+                bids=([100.05, 100.0], [50, 250]),
+                asks=([100.1], [80])
+            )
+        )
+
+        order_book = self.order_books.book(symbol='MSFT', service='NASDAQ_BOOK')
+        snapshot = order_book.snapshot(levels=5)
+
+        self.assertEqual(changed, [order_book])
+        self.assertEqual(snapshot.timestamp, 2000)
+        np.testing.assert_array_equal(snapshot.bid_prices, [100.05, 100.0])
+        np.testing.assert_array_equal(snapshot.ask_sizes, [80])
+        self.assertEqual(order_book.updates, 2)
+
+    def test_books_are_kept_per_service(self):
+        """The same symbol on another service has its own book, and other services are ignored."""
+
+        self.order_books.update(
+            message=create_book_message(
+                symbol='MSFT',
+                timestamp=1000,
+                bids=([99.0], [10]),
+                asks=([101.0], [10]),
+                service='LISTED_BOOK'
+            )
+        )
+        self.order_books.update(message={'data': [{'service': 'QUOTE', 'timestamp': 1, 'content': [{'key': 'MSFT'}]}]})
+
+        self.assertEqual(len(self.order_books), 2)
+        self.assertEqual(self.order_books.symbols, ['MSFT'])
+        self.assertEqual(self.order_books.book(symbol='MSFT').best_bid, (100.0, 300))
+        self.assertEqual(self.order_books.book(symbol='MSFT', service='LISTED_BOOK').best_bid, (99.0, 10))
+        self.assertIsNone(self.order_books.book(symbol='AAPL'))
+
+    def test_empty_book(self):
+        """The queries of an empty book are `None`."""
+
+        order_book = OrderBook(symbol='AAPL')
+
+        self.assertIsNone(order_book.best_bid)
+        self.assertIsNone(order_book.spread)
+        self.assertIsNone(order_book.microprice())
+        self.assertIsNone(order_book.imbalance())
+
+
+if __name__ == '__main__':
+    unittest.main()
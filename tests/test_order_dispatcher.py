@@ -0,0 +1,251 @@
+import sys
+import json
+import time
+import pathlib
+import tempfile
+import threading
+import unittest
+
+from unittest import TestCase
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.historical import RateLimiter
+from pyrobot.order_dispatcher import OrderDispatcher
+from td.client import TDClient
+from td.exceptions import ExdLmtError
+from td.exceptions import ServerError
+
+
+class FakeOrderClient():
+
+    """Stands in for the `TDClient`, placing each order after a delay."""
+
+    def __init__(self, delay: float = 0.05, failing_symbols: tuple = (), rate_limited_once: tuple = ()) -> None:
+        self.delay = delay
+        self.failing_symbols = failing_symbols
+        self.rate_limited = set(rate_limited_once)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def place_order(self, account: str, order: dict) -> dict:
+
+        symbol = order['symbol']
+
+        with self._lock:
+            self.calls.append(symbol)
+            is_rate_limited = symbol in self.rate_limited
+            self.rate_limited.discard(symbol)
+
+        time.sleep(self.delay)
+
+        if is_rate_limited:
+            raise ExdLmtError(message='Too many requests.')
+
+        if symbol in self.failing_symbols:
+            raise ServerError(message='Order rejected.')
+
+        return {'order_id': 'ID_' + symbol, 'request_body': json.dumps(order).encode('utf-8'), 'status_code': 201}
+
+
+class OrderDispatcherTest(TestCase):
+
+    """Will perform a unit test for the `OrderDispatcher` object."""
+
+    def setUp(self) -> None:
+        """Set up twenty orders."""
+
+        self.orders = [{'symbol': 'SYM{:02d}'.format(index), 'quantity': index + 1} for index in range(20)]
+
+    def test_orders_are_placed_at_the_same_time(self):
+        """The results are in the same order as the orders, in a fraction of the time one at a time would take."""
+
+        td_client = FakeOrderClient(delay=0.05)
+        order_dispatcher = OrderDispatcher(td_client=td_client, max_workers=10)
+
+        start = time.perf_counter()
+        results = order_dispatcher.place_orders(account='ACCOUNT', orders=self.orders)
+        elapsed = time.perf_counter() - start
+
+        order_dispatcher.close()
+
+        self.assertLess(elapsed, 20 * 0.05 / 2)
+        self.assertEqual([result.order for result in results], self.orders)
+        self.assertEqual([result.response['order_id'] for result in results], ['ID_' + order['symbol'] for order in self.orders])
+        self.assertTrue(all(result.error is None for result in results))
+
+    def test_partial_failure(self):
+        """A failed order doesn't stop the others, and only the rate limit errors are retried."""
+
+        td_client = FakeOrderClient(delay=0.0, failing_symbols=('SYM03', 'SYM11'), rate_limited_once=('SYM05',))
+        order_dispatcher = OrderDispatcher(
+            td_client=td_client,
+            max_workers=4,
+            rate_limiter=RateLimiter(max_calls=1000, period=1.0),
+            backoff=0.0
+        )
+
+        results = order_dispatcher.place_orders(account='ACCOUNT', orders=self.orders)
+        order_dispatcher.close()
+
+        failed = [result.order['symbol'] for result in results if result.error is not None]
+
+        self.assertEqual(failed, ['SYM03', 'SYM11'])
+        self.assertIsInstance(results[3].error, ServerError)
+        self.assertEqual(results[5].response['order_id'], 'ID_SYM05')
+
+        # The rejected order was placed once, the rate limited one twice.
+        self.assertEqual(td_client.calls.count('SYM03'), 1)
+        self.assertEqual(td_client.calls.count('SYM05'), 2)
+
+
+class OrderHandler(BaseHTTPRequestHandler):
+
+    """Accepts every order, and keeps the connections open between requests."""
+
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_POST(self):
+
+        self.connections.add(self.client_address)
+        self.rfile.read(int(self.headers['Content-Length']))
+
+        self.send_response(201)
+        self.send_header('Location', 'http://127.0.0.1/v1/accounts/ACCOUNT/orders/1234')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledSessionTest(TestCase):
+
+    """Will perform a unit test for the `TDClient` request session."""
+
+    def test_requests_reuse_the_connection(self):
+        """The orders are sent over the same connection, instead of a new one each."""
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), OrderHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        with tempfile.TemporaryDirectory() as folder:
+
+            td_client = TDClient(
+                client_id='TEST',
+                redirect_uri='http://localhost',
+                credentials_path=str(pathlib.Path(folder).joinpath('credentials.json')),
+                _do_init=False
+            )
+            td_client.config['api_endpoint'] = 'http://127.0.0.1:{port}'.format(port=server.server_address[1])
+            td_client.state['access_token'] = 'TEST'
+            td_client.state['access_token_expires_at'] = time.time() + 3600
+
+            for _ in range(5):
+                response = td_client.place_order(account='ACCOUNT', order={'orderType': 'MARKET'})
+                self.assertEqual(response['order_id'], '1234')
+
+            td_client.close_session()
+
+        server.shutdown()
+        server.server_close()
+
+        self.assertEqual(len(OrderHandler.connections), 1)
+
+
+class TokenHandler(BaseHTTPRequestHandler):
+
+    """Hands out a new access token after a delay, and records the token each order was sent with."""
+
+    protocol_version = 'HTTP/1.1'
+    refreshes = 0
+    order_tokens = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+
+        self.rfile.read(int(self.headers['Content-Length']))
+
+        if self.path.endswith('oauth2/token'):
+
+            with self.lock:
+                TokenHandler.refreshes += 1
+
+            time.sleep(0.1)
+            self.send_json(content={
+                'access_token': 'NEW',
+                'refresh_token': 'REFRESH',
+                'expires_in': 1800,
+                'refresh_token_expires_in': 7776000
+            })
+
+        else:
+
+            with self.lock:
+                self.order_tokens.append(self.headers['Authorization'])
+
+            self.send_response(201)
+            self.send_header('Location', 'http://127.0.0.1/v1/accounts/ACCOUNT/orders/1234')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def send_json(self, content: dict) -> None:
+
+        body = json.dumps(content).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TokenRefreshTest(TestCase):
+
+    """Will perform a unit test for refreshing the `TDClient` token from several threads."""
+
+    def test_expired_token_is_refreshed_once(self):
+        """Orders placed at the same time with an expired token refresh it once, and all use the new one."""
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), TokenHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        with tempfile.TemporaryDirectory() as folder:
+
+            td_client = TDClient(
+                client_id='TEST',
+                redirect_uri='http://localhost',
+                credentials_path=str(pathlib.Path(folder).joinpath('credentials.json')),
+                _do_init=False
+            )
+            td_client.config['api_endpoint'] = 'http://127.0.0.1:{port}'.format(port=server.server_address[1])
+            td_client.state['access_token'] = 'OLD'
+            td_client.state['access_token_expires_at'] = time.time() - 10
+            td_client.state['refresh_token'] = 'REFRESH'
+
+            order_dispatcher = OrderDispatcher(td_client=td_client, max_workers=8)
+            results = order_dispatcher.place_orders(
+                account='ACCOUNT',
+                orders=[{'orderType': 'MARKET', 'symbol': 'SYM{index}'.format(index=index)} for index in range(8)]
+            )
+
+            order_dispatcher.close()
+            td_client.close_session()
+
+        server.shutdown()
+        server.server_close()
+
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(TokenHandler.refreshes, 1)
+        self.assertEqual(TokenHandler.order_tokens, ['Bearer NEW'] * 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
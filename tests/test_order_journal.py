@@ -0,0 +1,136 @@
+import sys
+import pathlib
+import tempfile
+import unittest
+import requests
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.order_journal import OrderJournal
+
+
+def create_order(number: int, symbol: str, day: str = '2020-04-09') -> dict:
+    """Creates an order response, like the ones saved by `PyRobot.execute_signals`."""
+
+    return {
+        'order_id': '{symbol}_long_enter_{number}'.format(symbol=symbol, number=number),
+        'request_body': {
+            'orderType': 'MARKET',
+            'orderLegCollection': [
+                {
+                    'instruction': 'BUY',
+                    'quantity': 1,
+                    'instrument': {'symbol': symbol, 'assetType': 'EQUITY'}
+                }
+            ]
+        },
+        'timestamp': '{day}T10:00:{second:02d}'.format(day=day, second=number % 60)
+    }
+
+
+class OrderJournalTest(TestCase):
+
+    """Will perform a unit test for the `OrderJournal` object."""
+
+    def setUp(self) -> None:
+        """Set up a journal in a temporary folder."""
+
+        self.temporary_folder = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.temporary_folder.name)
+
+    def test_append_and_index(self):
+        """Orders are written in the background, and can be found by ID, symbol and day."""
+
+        with OrderJournal(folder=self.folder) as order_journal:
+
+            for number in range(10):
+                order_journal.append(order=create_order(number=number, symbol=['MSFT', 'AAPL'][number % 2]))
+
+            order_journal.append(order=create_order(number=10, symbol='SQ', day='2020-04-10'))
+
+            self.assertEqual(order_journal.get(order_id='AAPL_long_enter_3')['timestamp'], '2020-04-09T10:00:03')
+            self.assertIsNone(order_journal.get(order_id='TSLA_long_enter_1'))
+            self.assertEqual(len(order_journal.orders_for_symbol(symbol='MSFT')), 5)
+            self.assertEqual(order_journal.days, ['2020-04-09', '2020-04-10'])
+
+            replayed = [order['order_id'] for order in order_journal.replay(day='2020-04-09')]
+
+        self.assertEqual(replayed, [create_order(number=number, symbol=['MSFT', 'AAPL'][number % 2])['order_id'] for number in range(10)])
+
+    def test_rotation_and_reopen(self):
+        """Segments rotate on size, and a reopened journal indexes them, skipping partial lines."""
+
+        with OrderJournal(folder=self.folder, max_bytes=1024, background=False) as order_journal:
+            order_journal.extend(orders=[create_order(number=number, symbol='MSFT') for number in range(20)])
+
+        segments = sorted(self.folder.glob('orders-*.jsonl'))
+        self.assertGreater(len(segments), 1)
+
+        # Simulate a crash in the middle of writing a line.
+        with open(segments[-1], 'ab') as segment:
+            segment.write(b'{"order_id": "MSFT_long_en')
+
+        with OrderJournal(folder=self.folder, background=False) as order_journal:
+
+            self.assertEqual(len(order_journal), 20)
+
+            order_journal.append(order=create_order(number=20, symbol='MSFT'))
+
+            self.assertEqual(len(list(order_journal.replay(day='2020-04-09'))), 21)
+            self.assertEqual(order_journal.get(order_id='MSFT_long_enter_20')['order_id'], 'MSFT_long_enter_20')
+
+    def test_request_body_as_sent(self):
+        """A live order holds the body of the request as bytes, which is decoded before it's indexed."""
+
+        order = create_order(number=0, symbol='MSFT')
+        prepared_request = requests.Request(
+            method='POST',
+            url='https://api.tdameritrade.com/v1/accounts/123456789/orders',
+            json=order['request_body']
+        ).prepare()
+
+        self.assertIsInstance(prepared_request.body, bytes)
+
+        with OrderJournal(folder=self.folder) as order_journal:
+
+            order_journal.append(order=dict(order, request_body=prepared_request.body))
+
+            saved_order = order_journal.get(order_id=order['order_id'])
+
+            self.assertEqual(saved_order['request_body'], order['request_body'])
+            self.assertEqual(len(order_journal.orders_for_symbol(symbol='MSFT')), 1)
+
+    def test_bad_order_keeps_the_writer_running(self):
+        """An order that can't be written is skipped, and the orders after it are still written."""
+
+        with OrderJournal(folder=self.folder) as order_journal:
+
+            order_journal.append(order=dict(create_order(number=0, symbol='MSFT'), timestamp=12345))
+            order_journal.append(order=create_order(number=1, symbol='MSFT'))
+            order_journal.flush()
+
+            self.assertEqual(order_journal.errors, 1)
+            self.assertIsInstance(order_journal.last_error, TypeError)
+            self.assertEqual(order_journal.order_ids, ['MSFT_long_enter_1'])
+            self.assertTrue(order_journal._writer.is_alive())
+
+    def test_closed_journal(self):
+        """A closed journal doesn't accept orders."""
+
+        order_journal = OrderJournal(folder=self.folder)
+        order_journal.close()
+
+        with self.assertRaises(ValueError):
+            order_journal.append(order=create_order(number=0, symbol='MSFT'))
+
+    def tearDown(self) -> None:
+        """Teardown the temporary folder."""
+
+        self.temporary_folder.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
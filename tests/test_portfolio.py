@@ -0,0 +1,199 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.portfolio import Portfolio
+from pyrobot.historical import HistoricalLoader
+from pyrobot.stock_frame import StockFrame
+
+from test_historical import FakePriceHistoryClient
+
+
+class QuotesClient():
+
+    """Stands in for the `TDClient`, returning fixed quotes."""
+
+    def __init__(self, prices: dict) -> None:
+        self.prices = prices
+
+    def get_quotes(self, instruments: list) -> dict:
+        return {symbol: {'lastPrice': self.prices[symbol]} for symbol in instruments}
+
+
+class PortfolioTest(TestCase):
+
+    """Will perform a unit test for the vectorized Portfolio analytics."""
+
+    def setUp(self) -> None:
+        """Set up a Portfolio with three positions and a year of daily prices."""
+
+        self.portfolio = Portfolio()
+        self.portfolio.add_positions(positions=[
+            {'symbol': 'MSFT', 'asset_type': 'equity', 'quantity': 10, 'purchase_price': 150.0, 'purchase_date': '2020-01-31'},
+            {'symbol': 'AAPL', 'asset_type': 'equity', 'quantity': 5, 'purchase_price': 300.0, 'purchase_date': '2020-01-31'},
+            {'symbol': 'SQ', 'asset_type': 'equity', 'quantity': 20, 'purchase_price': 60.0}
+        ])
+        self.portfolio.td_client = QuotesClient(prices={'MSFT': 165.0, 'AAPL': 280.0, 'SQ': 60.0})
+
+        random_state = np.random.RandomState(7)
+        bars = []
+
+        for symbol in ['AAPL', 'MSFT', 'SQ']:
+
+            closes = 100.0 * np.cumprod(1.0 + random_state.normal(0.0, 0.02, size=60))
+
+            for day, close in enumerate(closes):
+                bars.append({
+                    'symbol': symbol,
+                    'datetime': 1577836800000 + day * 86400000,
+                    'open': close,
+                    'close': close,
+                    'high': close,
+                    'low': close,
+                    'volume': 1000.0
+                })
+
+        self.portfolio._stock_frame_daily = StockFrame(data=bars)
+
+    def test_positions_table(self):
+        """The table reads like the old dictionary of positions, and removes in place."""
+
+        self.assertEqual(list(self.portfolio.positions), ['MSFT', 'AAPL', 'SQ'])
+        self.assertTrue(self.portfolio.get_ownership_status(symbol='MSFT'))
+        self.assertFalse(self.portfolio.get_ownership_status(symbol='SQ'))
+
+        self.portfolio.set_ownership_status(symbol='MSFT', ownership=False)
+        self.assertFalse(self.portfolio.positions['MSFT']['ownership_status'])
+
+        self.assertEqual(self.portfolio.remove_position(symbol='MSFT')[0], True)
+        self.assertEqual(self.portfolio.remove_position(symbol='MSFT')[0], False)
+        self.assertEqual(sorted(self.portfolio.positions), ['AAPL', 'SQ'])
+        self.assertEqual(self.portfolio.positions['SQ']['quantity'], 20)
+
+    def test_positions_write_through(self):
+        """Changing a field of a position changes the table, and the valuation."""
+
+        position = self.portfolio.positions['MSFT']
+        self.portfolio.positions['MSFT']['quantity'] = 99
+
+        self.assertEqual(position['quantity'], 99)
+        self.assertEqual(self.portfolio.positions['MSFT']['quantity'], 99)
+        self.assertEqual(self.portfolio.projected_market_value(current_prices={'MSFT': {'lastPrice': 165.0}})['MSFT']['total_market_value'], 99 * 165.0)
+
+        # The position follows its symbol when another row is moved into its place.
+        self.portfolio.remove_position(symbol='AAPL')
+        self.portfolio.positions['SQ'].update(purchase_price=55.0, ownership_status=True)
+
+        self.assertEqual(
+            self.portfolio.positions.to_dict()['SQ'],
+            {
+                'symbol': 'SQ',
+                'quantity': 20.0,
+                'purchase_price': 55.0,
+                'purchase_date': None,
+                'asset_type': 'equity',
+                'ownership_status': True
+            }
+        )
+
+        with self.assertRaises(KeyError):
+            position['symbol'] = 'AAPL'
+
+        with self.assertRaises(KeyError):
+            position['cost_basis'] = 1.0
+
+        with self.assertRaises(TypeError):
+            del position['quantity']
+
+        with self.assertRaises(TypeError):
+            self.portfolio.positions['MSFT'] = {'quantity': 1}
+
+    def test_projected_market_value(self):
+        """The projected values and totals match the position by position values."""
+
+        projected_value = self.portfolio.projected_market_value(
+            current_prices={'MSFT': {'lastPrice': 165.0}, 'AAPL': {'lastPrice': 280.0}, 'TSLA': {'lastPrice': 700.0}}
+        )
+
+        self.assertEqual(projected_value['MSFT']['total_market_value'], 1650.0)
+        self.assertEqual(projected_value['MSFT']['total_loss_or_gain_$'], 150.0)
+        self.assertEqual(projected_value['MSFT']['total_loss_or_gain_%'], 0.1)
+        self.assertFalse(projected_value['AAPL']['is_profitable'])
+        self.assertNotIn('TSLA', projected_value)
+
+        self.assertEqual(projected_value['total']['total_market_value'], 1650.0 + 1400.0)
+        self.assertEqual(projected_value['total']['total_profit_or_loss'], 150.0 - 100.0)
+        self.assertEqual(projected_value['total']['number_of_profitable_positions'], 1)
+        self.assertEqual(projected_value['total']['number_of_non_profitable_positions'], 1)
+
+    def test_portfolio_metrics(self):
+        """The metrics match pandas, and the covariance can be updated one day at a time."""
+
+        metrics = self.portfolio.portfolio_metrics()
+
+        frame = self.portfolio._stock_frame_daily.frame
+        returns = frame['close'].groupby(level=0).pct_change().unstack(level=0)
+        weights = pd.Series(self.portfolio.portfolio_weights())[returns.columns]
+
+        self.assertAlmostEqual(metrics['MSFT']['average_returns'], returns['MSFT'].mean())
+        self.assertAlmostEqual(metrics['MSFT']['standard_deviation_of_returns'], returns['MSFT'].std())
+        self.assertAlmostEqual(metrics['MSFT']['covariance_of_returns']['SQ']['MSFT'], returns.cov().loc['MSFT', 'SQ'])
+        self.assertAlmostEqual(metrics['portfolio']['variance'], weights @ returns.cov() @ weights)
+
+        # Adding a day updates the covariance as if it was recalculated.
+        new_day = {'AAPL': 0.01, 'MSFT': -0.02, 'SQ': 0.03}
+        variance = self.portfolio.update_daily_returns(returns=new_day)
+
+        returns.loc[returns.index[-1] + pd.Timedelta(days=1)] = pd.Series(new_day)
+        self.assertAlmostEqual(variance, weights @ returns.cov() @ weights)
+
+    def test_daily_prices_use_the_shared_loader(self):
+        """The daily prices are grabbed with the loader the robot shares, which is left open."""
+
+        td_client = FakePriceHistoryClient(delay=0.0)
+        historical_loader = HistoricalLoader(td_client=td_client)
+
+        self.portfolio.td_client = td_client
+        self.portfolio.historical_loader = historical_loader
+
+        stock_frame = self.portfolio._grab_daily_historical_prices()
+
+        self.assertIs(self.portfolio.historical_loader, historical_loader)
+        self.assertEqual(sorted(td_client.calls), ['AAPL', 'MSFT', 'SQ'])
+        self.assertEqual(len(stock_frame.frame), 15)
+        self.assertIsNotNone(historical_loader._executor)
+
+        historical_loader.close()
+
+    def test_daily_prices_without_a_shared_loader(self):
+        """Without a shared loader, the Portfolio keeps one of its own, and closes its workers."""
+
+        td_client = FakePriceHistoryClient(delay=0.0)
+        self.portfolio.td_client = td_client
+
+        self.portfolio._grab_daily_historical_prices()
+        historical_loader = self.portfolio.historical_loader
+
+        self.portfolio._grab_daily_historical_prices()
+
+        self.assertIs(self.portfolio.historical_loader, historical_loader)
+        self.assertIs(historical_loader.rate_limiter, self.portfolio.quote_cache.rate_limiter)
+        self.assertIsNone(historical_loader._executor)
+        self.assertEqual(td_client.calls['MSFT'], 2)
+
+    def tearDown(self) -> None:
+        """Teardown the Portfolio."""
+
+        self.portfolio = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.profiler import Profiler
+from pyrobot.profiler import LatencyHistogram
+from td.client import TDClient
+
+from test_indicators import create_bars
+
+
+class LatencyHistogramTest(TestCase):
+
+    """Will perform a unit test for the `LatencyHistogram` object."""
+
+    def test_percentiles_are_close_to_the_durations(self):
+        """The percentiles are within a bucket of the exact ones, and never past the longest duration."""
+
+        durations = np.random.RandomState(0).lognormal(mean=-6, sigma=1, size=5000)
+        histogram = LatencyHistogram()
+
+        for duration in durations:
+            histogram.add(seconds=duration)
+
+        self.assertEqual(histogram.count, 5000)
+        self.assertAlmostEqual(histogram.mean, durations.mean())
+
+        for percent in [50, 90, 99]:
+            exact = np.percentile(durations, percent)
+            self.assertLess(abs(histogram.percentile(percent=percent) / exact - 1), 0.2)
+
+        self.assertEqual(histogram.percentile(percent=100), durations.max())
+        self.assertEqual(sum(count for _, count in histogram.histogram()), 5000)
+
+
+class ProfilerTest(TestCase):
+
+    """Will perform a unit test for the `Profiler` object."""
+
+    def setUp(self) -> None:
+        """Set up a profiled StockFrame and indicator client."""
+
+        self.profiler = Profiler()
+
+        self.stock_frame = StockFrame(data=create_bars(symbols=['MSFT', 'AAPL'], start=0, count=100))
+        self.indicators = Indicators(price_data_frame=self.stock_frame)
+        self.indicators.sma(period=5)
+        self.indicators.rsi(period=14)
+
+        self.stock_frame.profiler = self.profiler
+        self.indicators.profiler = self.profiler
+
+    def test_records_the_cycle_and_each_indicator(self):
+        """Each stage is counted once per cycle, and each indicator once per refresh."""
+
+        # The same indicators, without a profiler.
+        expected = Indicators(price_data_frame=StockFrame(data=create_bars(symbols=['MSFT', 'AAPL'], start=0, count=100)))
+        expected.sma(period=5)
+        expected.rsi(period=14)
+
+        for cycle in range(3):
+
+            new_bars = create_bars(symbols=['MSFT', 'AAPL'], start=100 + cycle, count=1)
+
+            for indicators in [self.indicators, expected]:
+                indicators._stock_frame.add_rows(data=new_bars)
+                indicators.refresh()
+                indicators.check_signals()
+
+        summary = self.profiler.summary()
+
+        for key in [('cycle', 'add_rows'), ('cycle', 'refresh'), ('cycle', 'check_signals'),
+                    ('indicator', 'sma'), ('indicator', 'rsi'), ('stock_frame', 'build_frame')]:
+            self.assertEqual(summary.loc[key, 'count'], 3, msg=key)
+
+        self.assertTrue((summary['p50'] <= summary['max']).all())
+        self.assertEqual(list(summary.columns), ['count', 'total', 'mean', 'p50', 'p90', 'p99', 'max'])
+
+        # Refreshing one indicator at a time gives the same columns.
+        for column in ['sma', 'rsi']:
+            np.testing.assert_array_equal(
+                self.indicators.price_data_frame[column].to_numpy(dtype=float),
+                expected.price_data_frame[column].to_numpy(dtype=float)
+            )
+
+    def test_export_trace(self):
+        """The trace file is in the Chrome trace event format, with one complete event per call."""
+
+        self.stock_frame.add_rows(data=create_bars(symbols=['MSFT'], start=100, count=1))
+        self.indicators.refresh()
+
+        with tempfile.TemporaryDirectory() as folder:
+
+            path = self.profiler.export_trace(path=pathlib.Path(folder).joinpath('trace.json'))
+
+            with open(path) as trace_file:
+                trace = json.load(trace_file)
+
+        names = [event['name'] for event in trace['traceEvents']]
+
+        self.assertIn('refresh', names)
+        self.assertIn('sma', names)
+        self.assertTrue(all(event['ph'] == 'X' and event['dur'] >= 0 for event in trace['traceEvents']))
+
+        self.profiler.reset()
+        self.assertTrue(self.profiler.summary().empty)
+
+    def test_request_names_leave_out_symbols_and_ids(self):
+        """The requests to the same endpoint are counted together."""
+
+        td_client = TDClient(client_id='client_id', redirect_uri='https://localhost', _do_init=False)
+
+        self.assertEqual(td_client._request_name(method='get', endpoint='marketdata/MSFT/pricehistory'), 'GET marketdata/{}/pricehistory')
+        self.assertEqual(td_client._request_name(method='delete', endpoint='accounts/123456/orders/987'), 'DELETE accounts/{}/orders/{}')
+        self.assertEqual(td_client._request_name(method='post', endpoint='oauth2/token'), 'POST oauth2/token')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import time
+import pathlib
+import threading
+import unittest
+
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.quotes import QuoteCache
+from pyrobot.portfolio import Portfolio
+
+
+class SlowQuotesClient():
+
+    """Stands in for the `TDClient`, recording each Get Quotes request."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get_quotes(self, instruments: list) -> dict:
+
+        with self._lock:
+            self.requests.append(list(instruments))
+
+        time.sleep(self.delay)
+
+        return {
+            symbol: {'symbol': symbol, 'lastPrice': 100.0}
+            for symbol in instruments
+            if symbol != 'DELISTED'
+        }
+
+
+class QuoteCacheTest(TestCase):
+
+    """Will perform a unit test for the `QuoteCache` object."""
+
+    def setUp(self) -> None:
+        """Set up a quote cache on a slow client."""
+
+        self.td_client = SlowQuotesClient(delay=0.1)
+        self.quote_cache = QuoteCache(td_client=self.td_client, ttl=60.0, chunk_size=100)
+
+    def test_chunks_are_fetched_concurrently(self):
+        """Large symbol lists are split into chunks, fetched at the same time."""
+
+        symbols = ['SYM{number}'.format(number=number) for number in range(350)]
+
+        start = time.perf_counter()
+        quotes = self.quote_cache.get_quotes(symbols=symbols)
+
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(len(quotes), 350)
+        self.assertEqual(sorted(len(request) for request in self.td_client.requests), [50, 100, 100, 100])
+
+    def test_fresh_quotes_are_cached(self):
+        """Fresh quotes are served from the cache, and `max_age` forces a new request."""
+
+        self.quote_cache.get_quotes(symbols=['MSFT', 'AAPL'])
+        quotes = self.quote_cache.get_quotes(symbols=['AAPL', 'MSFT', 'SQ', 'DELISTED'])
+
+        self.assertEqual(self.td_client.requests, [['MSFT', 'AAPL'], ['SQ', 'DELISTED']])
+        self.assertEqual(list(quotes), ['AAPL', 'MSFT', 'SQ'])
+
+        self.quote_cache.get_quotes(symbols=['MSFT'], max_age=0.0)
+        self.assertEqual(self.td_client.requests[-1], ['MSFT'])
+
+    def test_concurrent_callers_share_requests(self):
+        """Callers asking for the same symbols while they're in flight share the request."""
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: self.quote_cache.get_quotes(symbols=['MSFT', 'AAPL']),
+                range(4)
+            ))
+
+        self.assertEqual(len(self.td_client.requests), 1)
+        self.assertTrue(all(len(result) == 2 for result in results))
+
+    def test_portfolio_summary_makes_one_request(self):
+        """The summary grabs the quotes once, for the market value and the weights."""
+
+        portfolio = Portfolio()
+        portfolio.td_client = self.td_client
+        portfolio.quote_cache = self.quote_cache
+        portfolio.add_position(symbol='MSFT', asset_type='equity', quantity=2, purchase_price=90.0)
+        portfolio.add_position(symbol='AAPL', asset_type='equity', quantity=2, purchase_price=110.0)
+
+        portfolio_summary = portfolio.portfolio_summary()
+
+        self.assertEqual(len(self.td_client.requests), 1)
+        self.assertEqual(portfolio_summary['portfolio_weights'], {'MSFT': 0.5, 'AAPL': 0.5})
+
+    def tearDown(self) -> None:
+        """Teardown the quote cache."""
+
+        self.quote_cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
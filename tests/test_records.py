@@ -0,0 +1,156 @@
+import sys
+import csv
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `td` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.stream import TDStreamerClient
+from td.records import LevelOneRecords
+from td.sinks import ColumnarSink
+from td.sinks import records_path
+
+from test_sinks import create_quote_message
+
+
+class LevelOneRecordsTest(TestCase):
+
+    """Will perform a unit test for the `LevelOneRecords` object."""
+
+    def setUp(self) -> None:
+        """Set up the records, subscribed to the bid, ask, last price and total volume of the quotes."""
+
+        self.level_one_records = LevelOneRecords(subscribed_fields=lambda service: ['0', '1', '2', '3', '8'])
+
+    def test_schema(self):
+        """The subscribed fields come in the order of their IDs, followed by the named fields."""
+
+        schema = self.level_one_records.schema(service='QUOTE')
+
+        self.assertEqual(
+            schema.columns[:7],
+            ('timestamp', 'symbol', 'bid-price', 'ask-price', 'last-price', 'total-volume', 'asset-main-type')
+        )
+        self.assertEqual(schema.types[:6], ('int', 'str', 'float', 'float', 'float', 'int'))
+        self.assertIn('delayed', schema.columns)
+        self.assertNotIn('high-price', schema.columns)
+
+    def test_updates_are_forward_filled(self):
+        """A delta update keeps the fields it didn't send, and the values are converted to their type."""
+
+        first = self.level_one_records.update(
+            service='QUOTE',
+            timestamp=1000,
+            content=[{'key': 'MSFT', '1': 184, '2': 184.25, '3': '184.1', '8': 1000, 'delayed': False}]
+        )
+        second = self.level_one_records.update(
+            service='QUOTE',
+            timestamp=2000,
+            content=[{'key': 'MSFT', '2': 184.3}, {'key': 'AAPL', '1': 320.5, '12': 321.0}]
+        )
+
+        self.assertEqual(first[0][:6], [1000, 'MSFT', 184.0, 184.25, 184.1, 1000])
+        self.assertIsInstance(first[0][2], float)
+        self.assertEqual(second[0][:6], [2000, 'MSFT', 184.0, 184.3, 184.1, 1000])
+        self.assertEqual(second[1][:6], [2000, 'AAPL', 320.5, None, None, None])
+
+        # The records are copies, the earlier ones don't change.
+        self.assertEqual(first[0][3], 184.25)
+
+        state = self.level_one_records.state(service='QUOTE', symbol='MSFT')
+        self.assertEqual(state['ask-price'], 184.3)
+        self.assertFalse(state['delayed'])
+
+        self.level_one_records.reset()
+        self.assertEqual(self.level_one_records.state(service='QUOTE', symbol='MSFT'), {})
+
+
+class WideLevelOneTest(TestCase):
+
+    """Will perform a unit test for writing the level one quotes as wide records."""
+
+    def setUp(self) -> None:
+        """Set up a streaming client subscribed to the bid and ask of the quotes."""
+
+        self.stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+        self.stream_client.data_requests['requests'].append(
+            {'service': 'QUOTE', 'parameters': {'keys': 'MSFT', 'fields': '0,1,2'}}
+        )
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def write(self, write: str, file_path: pathlib.Path, level_one_format: str) -> None:
+        """Writes a hundred quotes through the stream."""
+
+        self.stream_client.write_behavior(
+            file_path=str(file_path),
+            write=write,
+            append_mode=False,
+            batch_size=30,
+            level_one_format=level_one_format
+        )
+
+        async def run():
+            for timestamp in range(100):
+                await self.stream_client.stream_writer.put(message=create_quote_message(timestamp=timestamp))
+            await self.stream_client.stream_writer.close()
+
+        self.stream_client.loop.run_until_complete(run())
+
+    def test_csv_records_are_smaller(self):
+        """One row per update, with a header, in a fraction of the bytes of a row per field."""
+
+        long_path = pathlib.Path(self.folder.name).joinpath('long.csv')
+        wide_path = pathlib.Path(self.folder.name).joinpath('wide.csv')
+
+        self.write(write='csv', file_path=long_path, level_one_format='long')
+        self.write(write='csv', file_path=wide_path, level_one_format='wide')
+
+        with open(records_path(file_path=wide_path, service='QUOTE'), newline='') as records_file:
+            rows = list(csv.reader(records_file))
+
+        self.assertEqual(rows[0][:4], ['timestamp', 'symbol', 'bid-price', 'ask-price'])
+        self.assertEqual(rows[1][:4], ['0', 'MSFT', '100.5', '100.75'])
+        self.assertEqual(len(rows), 101)
+
+        # The quotes don't go to the level one file anymore.
+        self.assertEqual(wide_path.stat().st_size, 0)
+        self.assertLess(
+            records_path(file_path=wide_path, service='QUOTE').stat().st_size,
+            long_path.stat().st_size / 2
+        )
+
+    def test_columnar_records_keep_their_types(self):
+        """The columns are read back in their type, with the missing values masked."""
+
+        folder = pathlib.Path(self.folder.name).joinpath('data_dump')
+        self.write(write='columnar', file_path=folder, level_one_format='wide')
+
+        records = ColumnarSink.read_records(folder=folder, service='QUOTE')
+
+        self.assertEqual(records['timestamp'].tolist(), list(range(100)))
+        self.assertEqual(records['bid-price'].dtype, np.float64)
+        self.assertTrue(all(price == 100.75 for price in records['ask-price']))
+        self.assertTrue(np.ma.getmaskarray(records['delayed']).all())
+        self.assertEqual(self.stream_client.sink_stats['written_rows'], 100)
+
+    def test_unknown_level_one_format(self):
+        """Only the known level one formats can be written."""
+
+        with self.assertRaises(ValueError):
+            self.stream_client.write_behavior(
+                file_path=str(pathlib.Path(self.folder.name).joinpath('data_dump.csv')),
+                level_one_format='tall'
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.resample import timeframe_milliseconds
+
+
+def create_bars(symbols: list, start: int, count: int, seed: int = 0) -> list:
+    """Creates a list of random bars, one per minute, for each symbol."""
+
+    random_state = np.random.RandomState(seed)
+    bars = []
+
+    for symbol in symbols:
+
+        closes = 100 + random_state.standard_normal(count).cumsum()
+
+        for index in range(count):
+            bars.append({
+                'symbol': symbol,
+                'datetime': 1586390400000 + (start + index) * 60000,
+                'open': closes[index] + random_state.uniform(-0.5, 0.5),
+                'close': closes[index],
+                'high': closes[index] + random_state.uniform(0.1, 1.0),
+                'low': closes[index] - random_state.uniform(0.1, 1.0),
+                'volume': float(random_state.randint(1000, 5000))
+            })
+
+    return bars
+
+
+def pandas_resample(frame: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Resamples a StockFrame's frame with pandas, for comparison."""
+
+    resampled = frame.groupby(level='symbol').resample(rule, level='datetime').agg({
+        'open': 'first',
+        'close': 'last',
+        'high': 'max',
+        'low': 'min',
+        'volume': 'sum'
+    })
+
+    return resampled.dropna()[['open', 'close', 'high', 'low', 'volume']]
+
+
+class ResampleTest(TestCase):
+
+    """Will perform a unit test for the higher timeframe views of a `StockFrame`."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with two symbols, starting at 00:07."""
+
+        self.symbols = ['MSFT', 'AAPL']
+        self.stock_frame = StockFrame(data=create_bars(symbols=self.symbols, start=7, count=200))
+
+    def assert_matches_pandas(self, stock_frame: StockFrame, timeframe: str, rule: str) -> None:
+        """Make sure a view has the same bars as a pandas resample of the base frame."""
+
+        view = stock_frame.timeframe(timeframe=timeframe).frame[['open', 'close', 'high', 'low', 'volume']]
+        expected = pandas_resample(frame=stock_frame.frame, rule=rule)
+
+        self.assertTrue(view.index.equals(expected.index))
+        np.testing.assert_allclose(view.to_numpy(), expected.to_numpy())
+
+    def test_timeframe_milliseconds(self):
+        """Timeframes are parsed, and bad ones are rejected."""
+
+        self.assertEqual(timeframe_milliseconds(timeframe='5min'), 300000)
+        self.assertEqual(timeframe_milliseconds(timeframe='1h'), 3600000)
+        self.assertEqual(timeframe_milliseconds(timeframe='daily'), 86400000)
+
+        for timeframe in ['5', 'min', '0min', '5sec']:
+            with self.assertRaises(ValueError):
+                timeframe_milliseconds(timeframe=timeframe)
+
+    def test_views_match_pandas(self):
+        """The views have the same bars as a pandas resample, and are cached."""
+
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='5min', rule='5min')
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='15min', rule='15min')
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='1h', rule='1h')
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='daily', rule='1D')
+
+        self.assertIs(self.stock_frame.timeframe(timeframe='5min'), self.stock_frame.timeframe(timeframe='5min'))
+
+    def test_views_follow_new_rows(self):
+        """New rows, an update of the last row and a late row only change the bars they fall in."""
+
+        view = self.stock_frame.timeframe(timeframe='15min')
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='15min', rule='15min')
+
+        new_bars = create_bars(symbols=self.symbols, start=207, count=20, seed=1)
+
+        for index in range(20):
+
+            self.stock_frame.add_rows(data=new_bars[index::20])
+            self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='15min', rule='15min')
+
+        # The open bar of MSFT is updated, so only the last 15 minute bar is built again.
+        symbol_buffer = view.buffer.symbol('MSFT')
+        size, rewrites = len(symbol_buffer), symbol_buffer.rewrites
+
+        update = dict(new_bars[19], close=500.0, high=501.0)
+        self.stock_frame.add_rows(data=[update])
+
+        self.assertEqual(view.frame.loc[('MSFT', view.frame.loc['MSFT'].index[-1]), 'close'], 500.0)
+        self.assertEqual((len(symbol_buffer), symbol_buffer.rewrites), (size, rewrites + 1))
+        self.assertEqual(symbol_buffer.rewritten_from, size - 1)
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='15min', rule='15min')
+
+        # A late bar in the middle of the history.
+        late_bar = dict(new_bars[0], datetime=1586390400000 + 30 * 60000, close=1.0, low=0.5)
+        self.stock_frame.add_rows(data=[late_bar])
+        self.assert_matches_pandas(stock_frame=self.stock_frame, timeframe='15min', rule='15min')
+
+    def test_indicators_on_a_timeframe(self):
+        """Indicators can be calculated on a view, and refreshed when new rows are added."""
+
+        indicator_client = Indicators(price_data_frame=self.stock_frame, engine='numpy', timeframe='5min')
+        indicator_client.sma(period=3)
+
+        self.stock_frame.add_rows(data=create_bars(symbols=self.symbols, start=207, count=8, seed=2))
+        indicator_client.refresh()
+
+        expected = pandas_resample(frame=self.stock_frame.frame, rule='5min')
+        expected_sma = expected['close'].groupby(level='symbol').transform(lambda x: x.rolling(window=3).mean())
+
+        np.testing.assert_allclose(
+            indicator_client.price_data_frame['sma'].to_numpy(),
+            expected_sma.to_numpy(),
+            equal_nan=True
+        )
+        self.assertNotIn('sma', self.stock_frame.frame.columns)
+
+    def test_incremental_indicators_on_a_timeframe(self):
+        """The forming bar of a view changes with each new row, and the incremental refresh follows it."""
+
+        history = create_bars(symbols=self.symbols, start=7, count=200)
+        batch_frame = StockFrame(data=history)
+        incremental_frame = StockFrame(data=history)
+
+        batch_client = Indicators(price_data_frame=batch_frame, timeframe='5min')
+        incremental_client = Indicators(price_data_frame=incremental_frame, timeframe='5min', incremental=True)
+
+        for indicator_client in [batch_client, incremental_client]:
+            indicator_client.sma(period=3)
+            indicator_client.ema(period=4)
+            indicator_client.rsi(period=5)
+            indicator_client.bollinger_bands(period=4)
+
+        new_bars = create_bars(symbols=self.symbols, start=207, count=12, seed=3)
+
+        # One row per symbol at a time, so the last bar of the view is rewritten several times.
+        for index in range(12):
+
+            for stock_frame in [batch_frame, incremental_frame]:
+                stock_frame.add_rows(data=new_bars[index::12])
+
+            batch_client.refresh()
+            incremental_client.refresh()
+
+            batch = batch_client.price_data_frame
+            incremental = incremental_client.price_data_frame
+
+            self.assertTrue(batch.index.equals(incremental.index))
+
+            for column in batch.columns:
+                np.testing.assert_allclose(
+                    incremental[column].to_numpy(dtype=float),
+                    batch[column].to_numpy(dtype=float),
+                    rtol=1e-7,
+                    equal_nan=True,
+                    err_msg=column
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
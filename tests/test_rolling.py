@@ -0,0 +1,214 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot import rolling
+from pyrobot.incremental import Lag
+from pyrobot.incremental import ExponentialMean
+from pyrobot.incremental import ExponentialStd
+from pyrobot.incremental import RollingWindow
+from pyrobot.incremental import RollingExtremes
+
+
+def mean_absolute_deviation(window: np.ndarray) -> float:
+    """The mean absolute deviation of a window, for comparison."""
+
+    return np.abs(window - window.mean()).mean()
+
+
+class RollingKernelsTest(TestCase):
+
+    """Will perform a unit test for the rolling kernels."""
+
+    def setUp(self) -> None:
+        """Set up symbols of uneven lengths, including empty ones, with a few missing values."""
+
+        random_state = np.random.RandomState(0)
+        lengths = [1, 3, 50, 7, 200, 0, 33]
+
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.values = 100 + random_state.standard_normal(self.offsets[-1]).cumsum()
+        self.values[[5, 40, 41, 100]] = np.nan
+
+        self.groups = pd.Series(self.values).groupby(np.repeat(np.arange(len(lengths)), lengths))
+
+    def test_kernels_match_pandas(self):
+        """Each kernel gives the same values as a grouped pandas rolling window."""
+
+        kernels = {
+            'sum': rolling.rolling_sum,
+            'mean': rolling.rolling_mean,
+            'std': rolling.rolling_std,
+            'min': rolling.rolling_min,
+            'max': rolling.rolling_max
+        }
+
+        for window in [1, 2, 5, 7, 20]:
+            for min_periods in [None, 1, 3]:
+
+                if min_periods and min_periods > window:
+                    continue
+
+                for statistic, kernel in kernels.items():
+
+                    expected = self.groups.transform(
+                        lambda x: getattr(x.rolling(window=window, min_periods=min_periods), statistic)()
+                    )
+
+                    np.testing.assert_allclose(
+                        kernel(values=self.values, offsets=self.offsets, window=window, min_periods=min_periods),
+                        expected.to_numpy(),
+                        rtol=1e-9,
+                        atol=1e-9,
+                        equal_nan=True,
+                        err_msg='{statistic}, window {window}, min_periods {min_periods}'.format(
+                            statistic=statistic,
+                            window=window,
+                            min_periods=min_periods
+                        )
+                    )
+
+            expected = self.groups.transform(lambda x: x.rolling(window=window).apply(mean_absolute_deviation, raw=True))
+
+            np.testing.assert_allclose(
+                rolling.rolling_mean_absolute_deviation(values=self.values, offsets=self.offsets, window=window),
+                expected.to_numpy(),
+                rtol=1e-9,
+                atol=1e-9,
+                equal_nan=True
+            )
+
+    def test_kernels_without_missing_values(self):
+        """The counts of a column without missing values are taken from the layout, and give the same values."""
+
+        values = self.groups.transform(lambda x: x.ffill().bfill()).to_numpy()
+        layout = rolling.BlockLayout(offsets=self.offsets, window=5)
+
+        for statistic in ['sum', 'mean', 'std']:
+
+            expected = pd.Series(values).groupby(self.groups.ngroup()).transform(
+                lambda x: getattr(x.rolling(window=5, min_periods=2), statistic)()
+            )
+
+            np.testing.assert_allclose(
+                getattr(rolling, 'rolling_' + statistic)(
+                    values=values,
+                    offsets=self.offsets,
+                    window=5,
+                    min_periods=2,
+                    layout=layout
+                ),
+                expected.to_numpy(),
+                rtol=1e-9,
+                atol=1e-9,
+                equal_nan=True,
+                err_msg=statistic
+            )
+
+    def test_kernels_write_into_the_output_array(self):
+        """The results are written into the array that's passed, which has to have one value per row."""
+
+        out = np.empty(self.offsets[-1])
+        result = rolling.rolling_std(values=self.values, offsets=self.offsets, window=5, out=out)
+
+        self.assertIs(result, out)
+
+        with self.assertRaises(ValueError):
+            rolling.rolling_mean(values=self.values, offsets=self.offsets, window=5, out=np.empty(3))
+
+    def test_variance_of_a_drifting_series(self):
+        """A small variance on top of a large, drifting price is still accurate."""
+
+        rows = np.arange(200000)
+        values = 1e6 + rows * 10.0 + np.sin(rows) * 1e-3
+
+        windows = np.lib.stride_tricks.sliding_window_view(values, 20)
+        expected = np.full(values.size, np.nan)
+        expected[19:] = windows.std(axis=1, ddof=1)
+
+        np.testing.assert_allclose(
+            rolling.rolling_std(values=values, offsets=np.array([0, values.size]), window=20),
+            expected,
+            rtol=1e-9,
+            equal_nan=True
+        )
+
+
+class IncrementalWindowsTest(TestCase):
+
+    """Will perform a unit test for the incremental rolling windows."""
+
+    def test_extremes_and_deviation_match_pandas(self):
+        """The monotonic deques, and the mean absolute deviation, match a pandas rolling window."""
+
+        random_state = np.random.RandomState(1)
+        values = random_state.standard_normal(300)
+        values[[10, 11, 150]] = np.nan
+
+        extremes = RollingExtremes(window=7)
+        rolling_window = RollingWindow(window=7)
+
+        results = []
+
+        for value in values:
+            extremes.update(value)
+            rolling_window.update(value)
+            results.append([extremes.min, extremes.max, rolling_window.mean_absolute_deviation])
+
+        series = pd.Series(values).rolling(window=7)
+        expected = np.column_stack([
+            series.min().to_numpy(),
+            series.max().to_numpy(),
+            series.apply(mean_absolute_deviation, raw=True).to_numpy()
+        ])
+
+        np.testing.assert_allclose(np.array(results), expected, rtol=1e-12, equal_nan=True)
+
+    def test_rollback_undoes_one_update(self):
+        """Replacing every value with `rollback` gives the same results as never seeing the replaced values."""
+
+        random_state = np.random.RandomState(2)
+        values = random_state.standard_normal(200)
+        replaced = random_state.standard_normal(200)
+        values[[3, 4, 90]] = np.nan
+        replaced[[5, 60, 61]] = np.nan
+
+        def run(undo: bool) -> np.ndarray:
+
+            windows = [Lag(periods=3), ExponentialMean(span=5), ExponentialStd(span=5), RollingWindow(window=6), RollingExtremes(window=6)]
+            results = []
+
+            for value, replaced_value in zip(values, replaced):
+
+                for window in windows:
+                    if undo:
+                        window.checkpoint()
+                        window.update(replaced_value)
+                        window.rollback()
+
+                lag, exponential_mean, exponential_std, rolling_window, extremes = windows
+                results.append([
+                    lag.update(value),
+                    exponential_mean.update(value),
+                    exponential_std.update(value),
+                    rolling_window.update(value).mean,
+                    rolling_window.std,
+                    extremes.update(value).min,
+                    extremes.max
+                ])
+
+            return np.array(results)
+
+        np.testing.assert_allclose(run(undo=True), run(undo=False), rtol=1e-12, equal_nan=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import sys
+import time
+import asyncio
+import pathlib
+import unittest
+
+from datetime import datetime
+from datetime import timezone
+from datetime import timedelta
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.scheduler import BarClock
+from pyrobot.scheduler import BarScheduler
+from pyrobot.scheduler import parse_market_hours
+
+MARKET_HOURS = {
+    'equity': {
+        'EQ': {
+            'date': '2020-04-09',
+            'marketType': 'EQUITY',
+            'product': 'EQ',
+            'isOpen': True,
+            'sessionHours': {
+                'preMarket': [
+                    {'start': '2020-04-09T07:00:00-04:00', 'end': '2020-04-09T09:30:00-04:00'}
+                ],
+                'regularMarket': [
+                    {'start': '2020-04-09T09:30:00-04:00', 'end': '2020-04-09T16:00:00-04:00'}
+                ]
+            }
+        }
+    }
+}
+
+
+def exchange_time(hour: int, minute: int, second: int = 0) -> datetime:
+    """Returns a time on the sample market day, in exchange time."""
+
+    return datetime(2020, 4, 9, hour, minute, second, tzinfo=timezone(timedelta(hours=-4)))
+
+
+class BarClockTest(TestCase):
+
+    """Will perform a unit test for the `BarClock` object."""
+
+    def setUp(self) -> None:
+        """Set up a clock aligned to the regular market session."""
+
+        self.sessions = parse_market_hours(market_hours=MARKET_HOURS)
+
+    def test_parse_market_hours(self):
+        """The regular session is parsed into timezone aware datetimes."""
+
+        self.assertEqual(self.sessions, [(exchange_time(9, 30), exchange_time(16, 0))])
+
+    def test_next_close_without_sessions(self):
+        """Without sessions, the bars are aligned to the epoch."""
+
+        bar_clock = BarClock(bar_size=5, bar_type='minute')
+        now = datetime(2020, 4, 9, 13, 32, 10, tzinfo=timezone.utc)
+
+        self.assertEqual(bar_clock.next_close(now=now), datetime(2020, 4, 9, 13, 35, tzinfo=timezone.utc))
+
+    def test_next_close_with_sessions(self):
+        """With sessions, the bars are aligned to the session and end with it."""
+
+        bar_clock = BarClock(bar_size=7, bar_type='minute', sessions=self.sessions)
+
+        self.assertEqual(bar_clock.next_close(now=exchange_time(8, 0)), exchange_time(9, 37))
+        self.assertEqual(bar_clock.next_close(now=exchange_time(9, 37)), exchange_time(9, 44))
+        self.assertEqual(bar_clock.next_close(now=exchange_time(15, 58)), exchange_time(16, 0))
+        self.assertIsNone(bar_clock.next_close(now=exchange_time(16, 0)))
+
+    def test_daily_bars_close_with_the_session(self):
+        """A daily bar closes at the end of the session."""
+
+        bar_clock = BarClock(bar_size=1, bar_type='daily', sessions=self.sessions)
+
+        self.assertEqual(bar_clock.next_close(now=exchange_time(11, 0)), exchange_time(16, 0))
+
+    def test_weekly_and_monthly_bars(self):
+        """Weekly bars close at the start of Monday, monthly bars at the start of the month."""
+
+        now = datetime(2020, 4, 9, 13, 32, 10, tzinfo=timezone.utc)
+
+        self.assertEqual(BarClock(bar_type='weekly').next_close(now=now), datetime(2020, 4, 13, tzinfo=timezone.utc))
+        self.assertEqual(BarClock(bar_size=2, bar_type='weekly').next_close(now=now), datetime(2020, 4, 20, tzinfo=timezone.utc))
+        self.assertEqual(BarClock(bar_type='monthly').next_close(now=now), datetime(2020, 5, 1, tzinfo=timezone.utc))
+        self.assertEqual(BarClock(bar_size=3, bar_type='monthly').next_close(now=now), datetime(2020, 7, 1, tzinfo=timezone.utc))
+
+    def test_weekly_and_monthly_bars_with_sessions(self):
+        """With sessions, a weekly or monthly bar closes with the last session of the week or month."""
+
+        friday = (exchange_time(9, 30) + timedelta(days=1), exchange_time(16, 0) + timedelta(days=1))
+        bar_clock = BarClock(bar_type='weekly', sessions=self.sessions + [friday])
+
+        self.assertEqual(bar_clock.next_close(now=exchange_time(11, 0)), friday[1])
+        self.assertIsNone(BarClock(bar_type='monthly', sessions=self.sessions + [friday]).next_close(now=exchange_time(11, 0)))
+
+        thursday = (datetime(2020, 4, 30, 9, 30, tzinfo=timezone(timedelta(hours=-4))), datetime(2020, 4, 30, 16, 0, tzinfo=timezone(timedelta(hours=-4))))
+        bar_clock = BarClock(bar_type='monthly', sessions=[thursday])
+
+        self.assertEqual(bar_clock.next_close(now=thursday[0]), thursday[1])
+
+    def test_add_bars(self):
+        """Monthly bars step by calendar months, the others by their duration."""
+
+        last_bar_time = datetime(2020, 1, 31, tzinfo=timezone.utc)
+
+        self.assertEqual(BarClock(bar_type='monthly').add_bars(moment=last_bar_time), datetime(2020, 2, 29, tzinfo=timezone.utc))
+        self.assertEqual(BarClock(bar_type='monthly').add_bars(moment=last_bar_time, bars=12), datetime(2021, 1, 31, tzinfo=timezone.utc))
+        self.assertEqual(BarClock(bar_type='weekly').add_bars(moment=last_bar_time), datetime(2020, 2, 7, tzinfo=timezone.utc))
+        self.assertEqual(BarClock(bar_size=5, bar_type='minute').add_bars(moment=last_bar_time), datetime(2020, 1, 31, 0, 5, tzinfo=timezone.utc))
+
+    def test_unsupported_bar_type(self):
+        """Unknown bar types are rejected."""
+
+        with self.assertRaises(ValueError):
+            BarClock(bar_size=1, bar_type='fortnight')
+
+
+class BarSchedulerTest(TestCase):
+
+    """Will perform a unit test for the `BarScheduler` object."""
+
+    def setUp(self) -> None:
+        """Set up a scheduler with very short bars."""
+
+        bar_clock = BarClock(bar_size=1, bar_type='minute')
+        bar_clock.bar_duration = timedelta(milliseconds=100)
+
+        self.bar_scheduler = BarScheduler(bar_clock=bar_clock)
+        self.loop = asyncio.new_event_loop()
+
+    def test_tasks_run_concurrently(self):
+        """Blocking and async tasks run at the same time, and errors are recorded."""
+
+        def blocking_task(bar_close):
+            time.sleep(0.2)
+
+        async def async_task(bar_close):
+            await asyncio.sleep(0.2)
+
+        def failing_task(bar_close):
+            raise RuntimeError('Order rejected.')
+
+        self.bar_scheduler.add_task(name='signals', task=blocking_task)
+        self.bar_scheduler.add_task(name='orders', task=async_task)
+        self.bar_scheduler.add_task(name='save', task=failing_task)
+
+        start = time.perf_counter()
+        bar_metrics = self.loop.run_until_complete(
+            self.bar_scheduler.run_bar(bar_close=datetime.now(tz=timezone.utc))
+        )
+
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(set(bar_metrics.task_durations), {'signals', 'orders', 'save'})
+        self.assertIsInstance(bar_metrics.task_errors['save'], RuntimeError)
+
+    def test_run_records_metrics(self):
+        """Each bar is recorded, and slow tasks show up as skipped bars."""
+
+        bar_closes = []
+
+        def slow_task(bar_close):
+            bar_closes.append(bar_close)
+            time.sleep(0.25)
+
+        self.bar_scheduler.add_task(name='slow', task=slow_task)
+        self.loop.run_until_complete(self.bar_scheduler.run(max_bars=3))
+
+        summary = self.bar_scheduler.summary()
+
+        self.assertEqual(summary['bars'], 3)
+        self.assertGreaterEqual(summary['drift_mean'], 0.0)
+        self.assertGreaterEqual(summary['lateness_max'], 0.25)
+        self.assertGreater(summary['skipped_bars'], 0)
+        self.assertEqual(len(bar_closes), 3)
+
+        for bar_close in bar_closes:
+            self.assertEqual(bar_close.timestamp() * 1000 % 100, 0)
+
+    def tearDown(self) -> None:
+        """Teardown the event loop."""
+
+        self.loop.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+from multiprocessing.shared_memory import SharedMemory
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.sharding import balance_shards
+
+from test_indicators import create_bars, INDICATORS
+
+
+class BalanceShardsTest(TestCase):
+
+    """Will perform a unit test for `balance_shards`."""
+
+    def test_shards_have_about_the_same_rows(self):
+        """The cuts fall on the symbol boundaries closest to an even split."""
+
+        offsets = np.cumsum([0, 100, 10, 10, 80])
+
+        self.assertEqual(balance_shards(offsets=offsets, shards=2), [(0, 1), (1, 4)])
+        self.assertEqual(balance_shards(offsets=offsets, shards=1), [(0, 4)])
+
+        offsets = np.cumsum([0] + [10] * 9)
+        self.assertEqual(balance_shards(offsets=offsets, shards=3), [(0, 3), (3, 6), (6, 9)])
+
+    def test_more_shards_than_symbols(self):
+        """Empty shards are left out."""
+
+        self.assertEqual(balance_shards(offsets=np.array([0, 5, 10]), shards=4), [(0, 1), (1, 2)])
+        self.assertEqual(balance_shards(offsets=np.array([0]), shards=4), [])
+
+
+class ShardedIndicatorsTest(TestCase):
+
+    """Will perform a unit test for the `Indicators` object with `max_workers`."""
+
+    def setUp(self) -> None:
+        """Set up the bars of five symbols, with a different number of rows each."""
+
+        self.bars = []
+
+        for index, symbol in enumerate(['MSFT', 'AAPL', 'SQ', 'TSLA', 'AMZN']):
+            self.bars += create_bars(symbols=[symbol], start=0, count=40 + 30 * index, seed=index)
+
+        self.new_bars = create_bars(symbols=['MSFT', 'SQ', 'NFLX'], start=200, count=5, seed=9)
+
+    def test_sharded_refresh_matches_a_single_process(self):
+        """The columns are the same with two processes, after a refresh with new rows.
+
+        The rolling sums of the `numpy` engine start from a different row in each
+        shard, so the values can differ in the last few digits.
+        """
+
+        for engine in ['pandas', 'numpy']:
+
+            single = Indicators(price_data_frame=StockFrame(data=self.bars), engine=engine)
+            sharded = Indicators(price_data_frame=StockFrame(data=self.bars), engine=engine, max_workers=2)
+
+            for indicators in [single, sharded]:
+
+                for indicator, arguments in INDICATORS + [('kst_oscillator', {})]:
+                    getattr(indicators, indicator)(**arguments)
+
+                indicators._stock_frame.add_rows(data=self.new_bars)
+                indicators.refresh()
+
+            self.assertEqual(list(single.price_data_frame.columns), list(sharded.price_data_frame.columns))
+
+            for column in single.price_data_frame.columns:
+                np.testing.assert_allclose(
+                    sharded.price_data_frame[column].to_numpy(dtype=float),
+                    single.price_data_frame[column].to_numpy(dtype=float),
+                    rtol=1e-7,
+                    atol=1e-9,
+                    equal_nan=True,
+                    err_msg=column
+                )
+
+            sharded.close()
+
+    def test_close_frees_the_shared_memory(self):
+        """Closing the client stops the pool, and unlinks the blocks."""
+
+        indicators = Indicators(price_data_frame=StockFrame(data=self.bars), max_workers=2)
+        indicators.sma(period=5)
+
+        names = [block.name for block in indicators._sharded_evaluator._blocks]
+        self.assertEqual(len(names), 2)
+
+        indicators.close()
+
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(name=name)
+
+        # The client can still be used, with a new pool.
+        indicators.ema(period=5)
+        self.assertFalse(indicators.price_data_frame['ema'].isna().all())
+        indicators.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import sys
+import pathlib
+import operator
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.signals import Condition
+from pyrobot.signals import Signals
+from pyrobot.signals import SignalEvaluator
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+
+
+def create_bar(symbol: str, minute: int, close: float) -> dict:
+    """Creates a single one minute bar."""
+
+    return {
+        'symbol': symbol,
+        'datetime': 1586390400000 + minute * 60000,
+        'open': close,
+        'close': close,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'volume': 1000.0
+    }
+
+
+class SignalsTest(TestCase):
+
+    """Will perform a unit test for the compiled signal rules."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame with a `score` column."""
+
+        bars = []
+
+        for symbol, closes in [('AAPL', [10, 20, 30]), ('MSFT', [50, 40, 35]), ('SQ', [5, 6, 7])]:
+            for minute, close in enumerate(closes):
+                bars.append(create_bar(symbol=symbol, minute=minute, close=close))
+
+        self.stock_frame = StockFrame(data=bars)
+        self.stock_frame.frame['score'] = self.stock_frame.frame['close'] / 10.0
+
+    def test_last_rows(self):
+        """The last row of each symbol is returned as arrays."""
+
+        symbols, values = self.stock_frame.last_rows(columns=['close'])
+
+        self.assertEqual(symbols.tolist(), ['AAPL', 'MSFT', 'SQ'])
+        self.assertEqual(values['close'].tolist(), [30.0, 35.0, 7.0])
+
+        # New rows move the last row.
+        self.stock_frame.add_rows(data=create_bar(symbol='MSFT', minute=3, close=33.0))
+        symbols, values = self.stock_frame.last_rows(columns=['close'])
+
+        self.assertEqual(values['close'].tolist(), [30.0, 33.0, 7.0])
+
+    def test_indicator_signals(self):
+        """Signals set with `set_indicator_signal` are compiled, including the max thresholds."""
+
+        indicator_signals = {
+            'score': {
+                'buy': 2.0,
+                'sell': 1.0,
+                'buy_operator': operator.gt,
+                'sell_operator': '<',
+                'buy_max': 3.2,
+                'sell_max': None,
+                'buy_operator_max': operator.lt,
+                'sell_operator_max': None
+            }
+        }
+
+        signals = self.stock_frame._check_signals(indicators=indicator_signals)
+
+        self.assertIsInstance(signals, Signals)
+        self.assertEqual(signals.buys.tolist(), ['AAPL'])
+        self.assertEqual(signals.sells.tolist(), ['SQ'])
+
+    def test_rule_trees(self):
+        """Rules can be combined with AND and OR, and compared with other columns."""
+
+        buy_rule = Condition('score', '>', 2.0) & (Condition('close', '<', 32.0) | Condition('open', '==', 7.0))
+        sell_rule = Condition('close', '<', 'high') & Condition('score', '<=', 0.7)
+
+        signals = self.stock_frame._check_signals(
+            signal_evaluator=SignalEvaluator(buy_rule=buy_rule, sell_rule=sell_rule)
+        )
+
+        self.assertEqual(signals.buys.tolist(), ['AAPL'])
+        self.assertEqual(signals.sells.tolist(), ['SQ'])
+
+    def test_missing_values_never_signal(self):
+        """A symbol without a value for the indicator doesn't signal."""
+
+        self.stock_frame.frame.loc[('SQ', self.stock_frame.frame.loc['SQ'].index[-1]), 'score'] = np.nan
+
+        signals = self.stock_frame._check_signals(
+            signal_evaluator=SignalEvaluator(buy_rule=Condition('score', '<', 100.0))
+        )
+
+        self.assertEqual(signals.buys.tolist(), ['AAPL', 'MSFT'])
+        self.assertEqual(signals.sells.tolist(), [])
+
+    def test_missing_columns(self):
+        """Rules on columns that don't exist raise a KeyError."""
+
+        with self.assertRaises(KeyError):
+            self.stock_frame._check_signals(
+                signal_evaluator=SignalEvaluator(buy_rule=Condition('rsi', '<', 30.0))
+            )
+
+    def test_indicators_check_signals(self):
+        """The Indicators client uses its rules over its signals, once they're set."""
+
+        indicator_client = Indicators(price_data_frame=self.stock_frame)
+        indicator_client.sma(period=2)
+        indicator_client.set_indicator_signal(
+            indicator='sma',
+            buy=30.0,
+            sell=10.0,
+            condition_buy=operator.gt,
+            condition_sell=operator.lt
+        )
+
+        signals = indicator_client.check_signals()
+
+        self.assertEqual(signals.buys.tolist(), ['MSFT'])
+        self.assertEqual(signals.sells.tolist(), ['SQ'])
+
+        indicator_client.set_signal_rules(buy_rule=Condition('close', '>', 'sma'))
+        signals = indicator_client.check_signals()
+
+        self.assertEqual(signals.buys.tolist(), ['AAPL', 'SQ'])
+        self.assertEqual(signals.sells.tolist(), [])
+
+    def tearDown(self) -> None:
+        """Teardown the StockFrame."""
+
+        self.stock_frame = None
+
+
+if __name__ == '__main__':
+    unittest.main()
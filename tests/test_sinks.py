@@ -0,0 +1,293 @@
+import sys
+import csv
+import json
+import time
+import asyncio
+import pathlib
+import tempfile
+import unittest
+
+from unittest import TestCase
+
+# The `td` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.stream import TDStreamerClient
+from td.sinks import StreamSink
+from td.sinks import StreamWriter
+from td.sinks import ColumnarSink
+from td.sinks import level_two_path
+
+
+def create_quote_message(timestamp: int, symbol: str = 'MSFT') -> dict:
+    """A level one quote message, with three fields."""
+
+    return {
+        'data': [
+            {
+                'service': 'QUOTE',
+                'timestamp': timestamp,
+                'command': 'SUBS',
+                'content': [{'key': symbol, '1': 100.5, '2': 100.75}]
+            }
+        ]
+    }
+
+
+def create_book_message(timestamp: int, symbol: str = 'MSFT') -> dict:
+    """A level two book message, with one bid and one ask from a single market maker."""
+
+    return {
+        'data': [
+            {
+                'service': 'NASDAQ_BOOK',
+                'timestamp': timestamp,
+                'command': 'SUBS',
+                'content': [
+                    {
+                        'key': symbol,
+                        '1': timestamp,
+                        '2': [{'0': 100.5, '1': 300, '2': 1, '3': [{'0': 'NSDQ', '1': 300, '2': 1000}]}],
+                        '3': [{'0': 100.75, '1': 200, '2': 1, '3': [{'0': 'ARCA', '1': 200, '2': 1001}]}]
+                    }
+                ]
+            }
+        ]
+    }
+
+
+class SlowSink(StreamSink):
+
+    """Keeps the rows in memory, taking a while to write each batch."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.level_one_rows = []
+        self.level_two_rows = []
+        self.records = []
+        self.batches = 0
+        self.closed = False
+
+    def write_rows(self, level_one_rows: list, level_two_rows: list) -> None:
+        time.sleep(self.delay)
+        self.level_one_rows.extend(level_one_rows)
+        self.level_two_rows.extend(level_two_rows)
+        self.batches += 1
+
+    def write_records(self, schema, records: list) -> None:
+        self.records.extend(records)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class StreamWriterTest(TestCase):
+
+    """Will perform a unit test for the `StreamWriter` object."""
+
+    def setUp(self) -> None:
+        """Set up a streaming client, without a connection."""
+
+        self.stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+
+    def test_rows_are_written_in_batches(self):
+        """Every row is written once, in batches, and the sinks are closed."""
+
+        sink = SlowSink()
+        stream_writer = StreamWriter(sinks=[sink], parse_message=self.stream_client._message_rows, batch_size=30)
+
+        async def run():
+            for timestamp in range(50):
+                await stream_writer.put(message=create_quote_message(timestamp=timestamp))
+                await stream_writer.put(message=create_book_message(timestamp=timestamp))
+            await stream_writer.close()
+
+        self.stream_client.loop.run_until_complete(run())
+
+        # Three fields per quote, and a bid and an ask per book.
+        self.assertEqual(len(sink.level_one_rows), 150)
+        self.assertEqual(len(sink.level_two_rows), 100)
+        self.assertEqual(sink.level_one_rows[0], [0, 'QUOTE', 'key', 'symbol', 'MSFT'])
+        self.assertEqual(sink.level_two_rows[1][:7], [0, 'MSFT', 'NASDAQ_BOOK', 'book_ask', '0_0', 'book_ask_price', 100.75])
+        self.assertGreater(sink.batches, 1)
+        self.assertTrue(sink.closed)
+
+        stats = stream_writer.stats
+        self.assertEqual(stats['received'], 100)
+        self.assertEqual(stats['dropped'], 0)
+        self.assertEqual(stats['written_rows'], 250)
+
+    def test_flush_interval(self):
+        """A batch smaller than the batch size is written after the flush interval."""
+
+        sink = SlowSink()
+        stream_writer = StreamWriter(
+            sinks=[sink],
+            parse_message=self.stream_client._message_rows,
+            batch_size=1000,
+            flush_interval=0.05
+        )
+
+        async def run():
+            await stream_writer.put(message=create_quote_message(timestamp=1))
+            await asyncio.sleep(0.2)
+            written = len(sink.level_one_rows)
+            await stream_writer.close()
+            return written
+
+        self.assertEqual(self.stream_client.loop.run_until_complete(run()), 3)
+
+    def test_a_slow_sink_drops_messages_instead_of_blocking(self):
+        """When the queue is full the messages are dropped and counted, and the loop never waits on the disk."""
+
+        sink = SlowSink(delay=0.2)
+        stream_writer = StreamWriter(
+            sinks=[sink],
+            parse_message=self.stream_client._message_rows,
+            max_queue_size=10,
+            batch_size=1
+        )
+
+        async def run():
+
+            start = time.perf_counter()
+
+            for timestamp in range(100):
+                await stream_writer.put(message=create_quote_message(timestamp=timestamp))
+
+            elapsed = time.perf_counter() - start
+            stats = stream_writer.stats
+
+            await stream_writer.close()
+
+            return elapsed, stats
+
+        elapsed, stats = self.stream_client.loop.run_until_complete(run())
+
+        self.assertLess(elapsed, 0.1)
+        self.assertEqual(stats['received'], 100)
+        self.assertGreater(stats['dropped'], 0)
+        self.assertEqual(stats['max_queue_depth'], 10)
+        self.assertEqual(len(sink.level_one_rows), 3 * (100 - stats['dropped']))
+
+    def test_waits_for_room_when_not_dropping(self):
+        """Without dropping, every message is written."""
+
+        sink = SlowSink(delay=0.01)
+        stream_writer = StreamWriter(
+            sinks=[sink],
+            parse_message=self.stream_client._message_rows,
+            max_queue_size=5,
+            batch_size=3,
+            drop_when_full=False
+        )
+
+        async def run():
+            for timestamp in range(40):
+                await stream_writer.put(message=create_quote_message(timestamp=timestamp))
+            await stream_writer.close()
+
+        self.stream_client.loop.run_until_complete(run())
+
+        self.assertEqual(stream_writer.dropped, 0)
+        self.assertGreater(stream_writer.waits, 0)
+        self.assertEqual(len(sink.level_one_rows), 120)
+
+
+class StreamSinkTest(TestCase):
+
+    """Will perform a unit test for the `CsvSink`, `JsonLinesSink` and `ColumnarSink` objects."""
+
+    def setUp(self) -> None:
+        """Set up a streaming client, and a folder to write to."""
+
+        self.stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+        self.folder = tempfile.TemporaryDirectory()
+        self.messages = [create_quote_message(timestamp=1), create_book_message(timestamp=2), create_quote_message(timestamp=3)]
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def write(self, write: str, file_path: pathlib.Path) -> None:
+        """Writes the messages through the stream, in batches of two rows."""
+
+        self.stream_client.write_behavior(file_path=str(file_path), write=write, append_mode=False, batch_size=2)
+
+        async def run():
+            for message in self.messages:
+                await self.stream_client.stream_writer.put(message=message)
+            await self.stream_client.stream_writer.close()
+
+        self.stream_client.loop.run_until_complete(run())
+
+    def test_csv_sink(self):
+        """The CSV files hold the same rows the stream used to write."""
+
+        file_path = pathlib.Path(self.folder.name).joinpath('data_dump.csv')
+        self.write(write='csv', file_path=file_path)
+
+        with open(file_path, newline='') as level_one_file:
+            level_one_rows = list(csv.reader(level_one_file))
+
+        with open(level_two_path(file_path=file_path), newline='') as level_two_file:
+            level_two_rows = list(csv.reader(level_two_file))
+
+        self.assertEqual(len(level_one_rows), 6)
+        self.assertEqual(level_one_rows[1], ['1', 'QUOTE', '1', 'bid-price', '100.5'])
+        self.assertEqual(len(level_two_rows), 2)
+        self.assertEqual(level_two_rows[0][12], 'NSDQ')
+        self.assertEqual(self.stream_client.sink_stats['written_rows'], 8)
+
+    def test_json_lines_sink(self):
+        """Each row is a JSON object on its own line."""
+
+        file_path = pathlib.Path(self.folder.name).joinpath('data_dump.jsonl')
+        self.write(write='json', file_path=file_path)
+
+        with open(file_path) as level_one_file:
+            level_one_rows = [json.loads(line) for line in level_one_file]
+
+        with open(level_two_path(file_path=file_path)) as level_two_file:
+            level_two_rows = [json.loads(line) for line in level_two_file]
+
+        self.assertEqual(level_one_rows[2], {'timestamp': 1, 'service': 'QUOTE', 'field_id': '2', 'field_name': 'ask-price', 'value': 100.75})
+        self.assertEqual([row['book_type'] for row in level_two_rows], ['book_bid', 'book_ask'])
+        self.assertEqual(level_two_rows[1]['mpid'], 'ARCA')
+
+    def test_columnar_sink(self):
+        """The batches are read back as columns, in the order they were written."""
+
+        folder = pathlib.Path(self.folder.name).joinpath('data_dump')
+        self.write(write='columnar', file_path=folder)
+
+        level_one = ColumnarSink.read(folder=folder, level=1)
+        level_two = ColumnarSink.read(folder=folder, level=2)
+
+        self.assertEqual(level_one['timestamp'].tolist(), [1, 1, 1, 3, 3, 3])
+        self.assertEqual(level_one['field_name'].tolist()[:3], ['symbol', 'bid-price', 'ask-price'])
+        self.assertEqual(level_two['price'].tolist(), ['100.5', '100.75'])
+        self.assertEqual(list(folder.glob('*.tmp')), [])
+
+    def test_unknown_format(self):
+        """Only the known formats can be written."""
+
+        with self.assertRaises(ValueError):
+            self.stream_client.write_behavior(file_path='data_dump.parquet', write='parquet')
+
+    def test_sinks_implement_both_writes(self):
+        """A sink without `write_rows` or `write_records` can't be created."""
+
+        class RowsOnlySink(StreamSink):
+
+            def write_rows(self, level_one_rows: list, level_two_rows: list) -> None:
+                pass
+
+        with self.assertRaises(TypeError):
+            StreamSink()
+
+        with self.assertRaises(TypeError):
+            RowsOnlySink()
+
+
+if __name__ == '__main__':
+    unittest.main()
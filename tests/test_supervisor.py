@@ -0,0 +1,184 @@
+import sys
+import json
+import asyncio
+import pathlib
+import unittest
+import websockets
+
+from unittest import TestCase
+
+# The `td` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from td.stream import TDStreamerClient
+from td.supervisor import StreamSupervisor
+
+from test_order_book import create_book_message
+
+
+class StubStreamer():
+
+    """
+    Stands in for the TD streaming server. It answers the login, and after
+    the subscriptions sends a few book messages, then drops the connection
+    until the last planned connection, which it keeps open.
+    """
+
+    def __init__(self, connections: int = 2, messages: int = 3, refused_logins: int = 0) -> None:
+        self.planned_connections = connections
+        self.messages = messages
+        self.refused_logins = refused_logins
+
+        self.connections = 0
+        self.logins = []
+        self.subscriptions = []
+
+    async def handler(self, websocket, path: str = None) -> None:
+
+        self.connections += 1
+        number = self.connections
+
+        login = json.loads(await websocket.recv())
+        self.logins.append(login)
+
+        if number <= self.refused_logins:
+            content = {'code': 3, 'msg': 'Login denied'}
+        else:
+            content = {'code': 0, 'msg': '02-29-2020'}
+
+        await websocket.send(json.dumps({'response': [{'service': 'ADMIN', 'command': 'LOGIN', 'content': content}]}))
+
+        if content['code'] != 0:
+            await websocket.wait_closed()
+            return
+
+        self.subscriptions.append(json.loads(await websocket.recv()))
+
+        for index in range(self.messages):
+            await websocket.send(
+                json.dumps(
+                    create_book_message(
+                        symbol='MSFT',
+                        timestamp=number * 1000 + index,
+                        bids=([100.0], [100]),
+                        asks=([100.1], [100])
+                    )
+                )
+            )
+
+        if number - self.refused_logins < self.planned_connections:
+            await websocket.close(code=1011, reason='Stub dropped the connection.')
+        else:
+            await websocket.wait_closed()
+
+
+class StreamSupervisorTest(TestCase):
+
+    """Will perform a unit test for the `StreamSupervisor` object."""
+
+    def setUp(self) -> None:
+        """Set up a streaming client, subscribed to a level two book."""
+
+        self.stream_client = TDStreamerClient(
+            websocket_url='localhost',
+            user_principal_data={
+                'accounts': [{'accountId': '123456789'}],
+                'streamerInfo': {'appId': 'APP', 'token': 'TOKEN'}
+            },
+            credentials={'userid': '123456789', 'token': 'TOKEN'}
+        )
+        self.stream_client.print_to_console = False
+        self.stream_client.level_two_nasdaq(symbols=['MSFT'], fields=[0, 1, 2, 3])
+        self.order_books = self.stream_client.track_order_books()
+
+    def run_against(self, stub: StubStreamer, supervisor: StreamSupervisor, updates: int) -> None:
+        """Runs the supervisor against the stub, until the book got a number of updates."""
+
+        async def run():
+
+            server = await websockets.serve(stub.handler, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            self.stream_client.websocket_url = 'ws://127.0.0.1:{port}/ws'.format(port=port)
+
+            task = asyncio.ensure_future(supervisor.run())
+
+            for _ in range(500):
+
+                order_book = self.order_books.book(symbol='MSFT')
+
+                if (order_book and order_book.updates >= updates) or task.done():
+                    break
+
+                await asyncio.sleep(0.01)
+
+            await supervisor.stop()
+            await asyncio.wait_for(task, timeout=5)
+
+            server.close()
+            await server.wait_closed()
+
+        self.stream_client.loop.run_until_complete(run())
+
+    def test_reconnects_and_subscribes_again(self):
+        """After the connection drops, the client logs in, subscribes again, and the gap is kept."""
+
+        stub = StubStreamer(connections=2, messages=3)
+        gaps = []
+        supervisor = StreamSupervisor(stream_client=self.stream_client, initial_delay=0.01, on_gap=gaps.append)
+
+        self.run_against(stub=stub, supervisor=supervisor, updates=6)
+
+        self.assertEqual(supervisor.connections, 2)
+        self.assertEqual(supervisor.reconnects, 1)
+        self.assertEqual(self.order_books.book(symbol='MSFT').updates, 6)
+
+        # Both logins were built from the credentials, and the same subscriptions were sent both times.
+        self.assertEqual(len(stub.logins), 2)
+        self.assertEqual(stub.logins[1]['requests'][0]['command'], 'LOGIN')
+        self.assertEqual(stub.subscriptions, [self.stream_client.data_requests] * 2)
+
+        self.assertEqual(len(supervisor.gaps), 1)
+        self.assertEqual(gaps, supervisor.gaps)
+        self.assertLessEqual(supervisor.gaps[0].start, supervisor.gaps[0].end)
+        self.assertIn('1011', supervisor.gaps[0].reason)
+        self.assertEqual(supervisor.gaps[0].attempts, 1)
+
+    def test_refused_logins_are_retried(self):
+        """A refused login counts as a failed attempt, and is tried again after a wait."""
+
+        stub = StubStreamer(connections=1, messages=1, refused_logins=2)
+        supervisor = StreamSupervisor(stream_client=self.stream_client, initial_delay=0.01)
+
+        self.run_against(stub=stub, supervisor=supervisor, updates=1)
+
+        self.assertEqual(supervisor.failed_attempts, 2)
+        self.assertEqual(supervisor.connections, 1)
+        self.assertEqual(len(stub.logins), 3)
+        self.assertIsInstance(supervisor.last_error, ConnectionRefusedError)
+        self.assertEqual(supervisor.gaps, [])
+
+    def test_gives_up_after_max_attempts(self):
+        """With every login refused, the supervisor gives up after the last attempt."""
+
+        stub = StubStreamer(connections=1, messages=1, refused_logins=10)
+        supervisor = StreamSupervisor(stream_client=self.stream_client, initial_delay=0.01, max_attempts=3)
+
+        with self.assertRaises(ConnectionError):
+            self.run_against(stub=stub, supervisor=supervisor, updates=1)
+
+        self.assertEqual(len(stub.logins), 3)
+
+    def test_backoff(self):
+        """The wait doubles after each failed attempt, up to the longest wait."""
+
+        supervisor = StreamSupervisor(stream_client=self.stream_client, initial_delay=1.0, max_delay=10.0, jitter=0.0)
+
+        self.assertEqual([supervisor.delay(attempt=attempt) for attempt in range(1, 7)], [1.0, 2.0, 4.0, 8.0, 10.0, 10.0])
+
+        supervisor.jitter = 0.1
+
+        self.assertTrue(all(0.9 <= supervisor.delay(attempt=1) <= 1.1 for _ in range(100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import sys
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.signals import Condition
+from pyrobot.signals import SignalEvaluator
+from pyrobot.stock_frame import StockFrame
+from pyrobot.indicators import Indicators
+from pyrobot.backtest import vectorized_backtest
+from pyrobot.sweep import SharedPrices
+from pyrobot.sweep import ParameterSweep
+from pyrobot.sweep import parameter_grid
+from pyrobot.sweep import random_parameters
+from pyrobot.sweep import strategy_fingerprint
+
+
+# Buy when the close crosses above the SMA, sell when it falls below it.
+SMA_CROSS = SignalEvaluator(
+    buy_rule=Condition('close', '>', 'sma'),
+    sell_rule=Condition('close', '<', 'sma')
+)
+
+
+def bollinger_strategy(parameters: dict) -> SignalEvaluator:
+    """Rules that depend on the parameters, defined at the top so the workers can import it."""
+
+    return SignalEvaluator(
+        buy_rule=Condition('band_upper', '>', 0.0),
+        sell_rule=Condition('band_lower', '<', -parameters['period'])
+    )
+
+
+def create_columns(symbols: list, count: int, seed: int = 0) -> dict:
+    """Creates a random walk of one minute bars for each symbol."""
+
+    random_state = np.random.RandomState(seed)
+    columns = {column: [] for column in ['symbol', 'datetime', 'open', 'close', 'high', 'low', 'volume']}
+
+    for symbol in symbols:
+
+        close = 100.0 * np.cumprod(1.0 + random_state.normal(0.0, 0.01, size=count))
+        open_price = np.concatenate([[close[0]], close[:-1]])
+
+        columns['symbol'].extend([symbol] * count)
+        columns['datetime'].extend((1586390400000 + np.arange(count) * 60000).tolist())
+        columns['open'].extend(open_price.tolist())
+        columns['close'].extend(close.tolist())
+        columns['high'].extend((np.maximum(open_price, close) + 0.1).tolist())
+        columns['low'].extend((np.minimum(open_price, close) - 0.1).tolist())
+        columns['volume'].extend([1000.0] * count)
+
+    return columns
+
+
+class ParameterGeneratorTest(TestCase):
+
+    """Will perform a unit test for the parameter generators."""
+
+    def test_parameter_grid(self):
+        """Every combination is built, in order."""
+
+        self.assertEqual(
+            parameter_grid(grid={'fast_period': [8, 12], 'slow_period': range(26, 28)}),
+            [
+                {'fast_period': 8, 'slow_period': 26},
+                {'fast_period': 8, 'slow_period': 27},
+                {'fast_period': 12, 'slow_period': 26},
+                {'fast_period': 12, 'slow_period': 27}
+            ]
+        )
+
+    def test_random_parameters(self):
+        """Random draws are repeatable, unique and inside the space."""
+
+        space = {'period': (5, 9), 'width': (1.0, 3.0), 'column': ['close', 'open']}
+        draws = random_parameters(space=space, samples=8, seed=1)
+
+        self.assertEqual(draws, random_parameters(space=space, samples=8, seed=1))
+        self.assertEqual(len(draws), 8)
+        self.assertEqual(len({(draw['period'], draw['width'], draw['column']) for draw in draws}), 8)
+        self.assertTrue(all(5 <= draw['period'] <= 9 and 1.0 <= draw['width'] <= 3.0 for draw in draws))
+
+        # A space with only five combinations can't give ten.
+        self.assertEqual(len(random_parameters(space={'period': (5, 9)}, samples=10, seed=1)), 5)
+
+
+class ParameterSweepTest(TestCase):
+
+    """Will perform a unit test for the `ParameterSweep` object."""
+
+    def setUp(self) -> None:
+        """Set up a StockFrame and a temporary folder."""
+
+        self.temp_folder = tempfile.TemporaryDirectory()
+        self.folder = pathlib.Path(self.temp_folder.name)
+        self.stock_frame = StockFrame(data=create_columns(symbols=['MSFT', 'AAPL', 'SQ'], count=300))
+
+    def test_shared_prices_round_trip(self):
+        """The memory mapped columns build the same StockFrame."""
+
+        shared_prices = SharedPrices.write(stock_frame=self.stock_frame, folder=self.folder)
+        columns = shared_prices.load()
+
+        self.assertIsInstance(columns['close'], np.memmap)
+
+        frame = shared_prices.to_stock_frame().frame
+        self.assertTrue(frame.index.equals(self.stock_frame.frame.index))
+        np.testing.assert_array_equal(frame['close'].to_numpy(), self.stock_frame.frame['close'].to_numpy())
+
+    def test_sweep_ranks_and_matches_a_single_backtest(self):
+        """The workers give the same results as a backtest in this process, ranked best first."""
+
+        sma_sweep = ParameterSweep(
+            stock_frame=self.stock_frame,
+            indicator='sma',
+            strategy=SMA_CROSS,
+            folder=self.folder,
+            max_workers=2
+        )
+        ranked = sma_sweep.run(parameters=parameter_grid(grid={'period': [5, 10, 20, 40]}))
+
+        self.assertEqual(sorted(result['parameters']['period'] for result in ranked), [5, 10, 20, 40])
+        self.assertEqual(
+            [result['total_return'] for result in ranked],
+            sorted([result['total_return'] for result in ranked], reverse=True)
+        )
+
+        stock_frame = StockFrame(data=create_columns(symbols=['MSFT', 'AAPL', 'SQ'], count=300))
+        Indicators(price_data_frame=stock_frame, engine='numpy').sma(period=ranked[0]['parameters']['period'])
+        results = vectorized_backtest(stock_frame=stock_frame, signal_evaluator=SMA_CROSS)
+
+        self.assertAlmostEqual(ranked[0]['total_return'], results['total_return'].mean())
+        self.assertAlmostEqual(ranked[0]['symbols']['SQ']['total_return'], results['total_return'][2])
+
+        by_drawdown = sma_sweep.rank(results=ranked, metric='max_drawdown')
+        self.assertLessEqual(by_drawdown[0]['max_drawdown'], by_drawdown[-1]['max_drawdown'])
+
+    def test_reruns_skip_cached_cells(self):
+        """A new sweep over the same folder only runs the cells it hasn't seen."""
+
+        arguments = {
+            'stock_frame': self.stock_frame,
+            'indicator': 'bollinger_bands',
+            'strategy': bollinger_strategy,
+            'folder': self.folder,
+            'max_workers': 1
+        }
+
+        ParameterSweep(**arguments).run(parameters=[{'period': 10}, {'period': 20}])
+
+        cache_path = self.folder.joinpath('results.jsonl')
+        self.assertEqual(len(cache_path.read_text().splitlines()), 2)
+
+        ranked = ParameterSweep(**arguments).run(parameters=[{'period': 20}, {'period': 10}, {'period': 30}])
+
+        self.assertEqual(len(ranked), 3)
+        self.assertEqual(len(cache_path.read_text().splitlines()), 3)
+
+        # Different slippage is a different cell.
+        ParameterSweep(slippage=0.001, **arguments).run(parameters=[{'period': 10}])
+        self.assertEqual(len(cache_path.read_text().splitlines()), 4)
+
+        # So is a different engine.
+        ParameterSweep(engine='pandas', **arguments).run(parameters=[{'period': 10}])
+        self.assertEqual(len(cache_path.read_text().splitlines()), 5)
+
+    def test_changed_strategy_is_a_new_cell(self):
+        """Editing the body, the closure or the defaults of a strategy function changes its key."""
+
+        def create_strategy(threshold: float):
+
+            def strategy(parameters: dict, sell_below: float = -1.0) -> SignalEvaluator:
+                return SignalEvaluator(
+                    buy_rule=Condition('band_upper', '>', threshold),
+                    sell_rule=Condition('band_lower', '<', sell_below)
+                )
+
+            return strategy
+
+        def create_other_strategy(threshold: float):
+
+            def strategy(parameters: dict, sell_below: float = -1.0) -> SignalEvaluator:
+                return SignalEvaluator(
+                    buy_rule=Condition('band_upper', '>=', threshold),
+                    sell_rule=Condition('band_lower', '<', sell_below)
+                )
+
+            return strategy
+
+        def strategy_key(strategy) -> str:
+            return ParameterSweep(stock_frame=self.stock_frame, indicator='bollinger_bands', strategy=strategy, folder=self.folder).strategy_key
+
+        strategy = create_strategy(threshold=0.0)
+
+        self.assertEqual(strategy_key(strategy), strategy_key(create_strategy(threshold=0.0)))
+        self.assertNotEqual(strategy_key(strategy), strategy_key(create_strategy(threshold=1.0)))
+        self.assertNotEqual(strategy_fingerprint(strategy), strategy_fingerprint(create_other_strategy(threshold=0.0)))
+
+        strategy.__defaults__ = (-2.0,)
+        self.assertNotEqual(strategy_key(strategy), strategy_key(create_strategy(threshold=0.0)))
+
+    def test_unknown_indicator(self):
+        """The indicator has to be a method of `Indicators`."""
+
+        with self.assertRaises(ValueError):
+            ParameterSweep(stock_frame=self.stock_frame, indicator='price_data_frame', strategy=SMA_CROSS, folder=self.folder)
+
+    def tearDown(self) -> None:
+        """Teardown the temporary folder."""
+
+        self.temp_folder.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
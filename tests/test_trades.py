@@ -0,0 +1,142 @@
+import sys
+import pathlib
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+# The `pyrobot` package is imported from the `sigma` folder.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1].joinpath('sigma')))
+
+from pyrobot.trades import Trade
+
+
+def create_bracket_trade(symbol: str, quantity: int, price: float, order_type: str = 'lmt') -> Trade:
+    """A trade with a take profit, a stop loss and a stop limit order, built from scratch."""
+
+    trade = Trade()
+    trade.new_trade(
+        trade_id='long_enter',
+        order_type=order_type,
+        side='long',
+        enter_or_exit='enter',
+        price=price,
+        stop_limit_price=price * 0.99
+    )
+    trade.instrument(symbol=symbol, quantity=quantity, asset_type='EQUITY')
+    trade.add_take_profit(profit_size=0.05, percentage=True)
+    trade.add_stop_loss(stop_size=0.25)
+    trade.add_stop_limit(stop_size=0.03, limit_size=0.04, stop_percentage=True, limit_percentage=True)
+
+    return trade
+
+
+class TradeTest(TestCase):
+
+    """Will perform a unit test for the `Trade` object."""
+
+    def test_calculate_new_price_of_a_basket(self):
+        """The prices of a basket are the same as one price at a time."""
+
+        prices = np.random.RandomState(0).uniform(0.05, 500.0, size=1000)
+
+        for adjustment, percentage in [(1.05, True), (-0.25, False)]:
+
+            new_prices = Trade._calculate_new_price(price=prices, adjustment=adjustment, percentage=percentage)
+            expected = [Trade._calculate_new_price(price=price, adjustment=adjustment, percentage=percentage) for price in prices]
+
+            self.assertIsInstance(expected[0], float)
+            np.testing.assert_array_equal(new_prices, expected)
+
+        # Scaled by 100, the price is an exact half, which `np.rint` would round down to the even cent.
+        np.testing.assert_array_equal(Trade._calculate_new_price(price=np.array([184.10]), adjustment=1.05, percentage=True), [193.31])
+
+        self.assertEqual(Trade._calculate_new_price(price=0.51237, adjustment=1.0, percentage=True), 0.5124)
+        self.assertEqual(Trade._calculate_new_price(price=12.3456, adjustment=0.0, percentage=False), 12.35)
+
+    def test_template_orders_match_new_trades(self):
+        """The orders rendered from a template are the same as trades built from scratch."""
+
+        symbols = ['MSFT', 'AAPL', 'PENNY']
+        quantities = [10, 5, 1000]
+        prices = [184.10, 273.40, 0.5731]
+
+        for order_type in ['lmt', 'mkt', 'stop', 'stop_lmt']:
+
+            order_template = create_bracket_trade(symbol='TEMPLATE', quantity=1, price=1.0, order_type=order_type).template()
+            orders = order_template.render_many(
+                symbols=symbols,
+                quantities=quantities,
+                prices=prices,
+                stop_limit_prices=[price * 0.99 for price in prices]
+            )
+
+            for order, symbol, quantity, price in zip(orders, symbols, quantities, prices):
+                expected = create_bracket_trade(symbol=symbol, quantity=quantity, price=price, order_type=order_type).order
+                self.assertEqual(order, expected)
+
+            self.assertEqual(order_template.render(symbol='MSFT', quantity=10, price=184.10, stop_limit_price=184.10 * 0.99), orders[0])
+
+    def test_template_orders_are_independent(self):
+        """Changing a rendered order doesn't change the template, or the other orders."""
+
+        order_template = create_bracket_trade(symbol='MSFT', quantity=1, price=100.0).template()
+        first, second = order_template.render_many(symbols=['MSFT', 'MSFT'], quantities=[1, 1], prices=[100.0, 100.0])
+
+        first['childOrderStrategies'][0]['orderLegCollection'][0]['instrument']['symbol'] = 'CHANGED'
+
+        self.assertEqual(second['childOrderStrategies'][0]['orderLegCollection'][0]['instrument']['symbol'], 'MSFT')
+        self.assertEqual(
+            order_template.render(symbol='MSFT', quantity=1, price=100.0)['childOrderStrategies'][0]['orderLegCollection'][0]['instrument']['symbol'],
+            'MSFT'
+        )
+
+    def test_template_from_numpy_prices(self):
+        """Prices and quantities from a StockFrame, as NumPy numbers, come out of the template as Python numbers."""
+
+        trade = create_bracket_trade(symbol='MSFT', quantity=np.int64(10), price=np.float64(100.0), order_type='stop_lmt')
+        trade.order['price'] = np.float64(101.0)
+
+        order_template = trade.template()
+
+        def assert_builtin(value):
+            if isinstance(value, dict):
+                for item in value.values():
+                    assert_builtin(item)
+            elif isinstance(value, list):
+                for item in value:
+                    assert_builtin(item)
+            else:
+                self.assertIn(type(value), (str, int, float, bool, type(None)), msg=repr(value))
+
+        # The limit price isn't passed, so the one of the template is kept.
+        order = order_template.render(symbol='MSFT', quantity=np.int64(10), price=np.float64(100.0))
+
+        assert_builtin(order)
+        self.assertEqual(order['price'], 101.0)
+        self.assertEqual(order['stopPrice'], 100.0)
+
+        orders = order_template.render_many(
+            symbols=['MSFT'],
+            quantities=np.array([5]),
+            prices=np.array([100.0]),
+            stop_limit_prices=np.array([99.0])
+        )
+
+        assert_builtin(orders)
+        self.assertEqual(orders[0]['price'], 99.0)
+        self.assertEqual(orders[0]['orderLegCollection'][0]['quantity'], 5)
+
+    def test_template_rejects_other_types(self):
+        """An order with a value that can't be sent is rejected."""
+
+        trade = create_bracket_trade(symbol='MSFT', quantity=10, price=100.0)
+        trade.order['price'] = object()
+
+        with self.assertRaises(TypeError):
+            trade.template()
+
+
+if __name__ == '__main__':
+    unittest.main()